@@ -0,0 +1,221 @@
+"""
+Benchmarks reproducibles del pipeline de cálculo.
+
+Mide filas por segundo y memoria máxima (tracemalloc) de process_multiple_calculations para cada
+combinación de modo e imss_breakdown, y de export_to_excel, con entradas sintéticas generadas con
+una semilla fija. El resultado se escribe en JSON y se puede comparar contra una línea base guardada.
+
+Uso:
+    python benchmarks/bench_pipeline.py --output benchmarks/results.json
+    python benchmarks/bench_pipeline.py --sizes 1000 --baseline benchmarks/baseline.json
+    python benchmarks/bench_pipeline.py --engine object vectorized --scenarios pure pure_special
+"""
+import argparse
+import contextlib
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np  # noqa: E402
+from payroll_calculator.exporters import export_to_excel  # noqa: E402
+from payroll_calculator.processors import process_multiple_calculations  # noqa: E402
+
+DEFAULT_SIZES = (1_000, 10_000, 100_000)
+DEFAULT_SEED = 20240101
+DEFAULT_MAX_REGRESSION = 0.20
+
+# Modo -> argumentos extra de process_multiple_calculations ('productivities' y 'net_salaries' se generan)
+SCENARIOS = {
+    'traditional': {},
+    'pure': {'is_pure_mode': True},
+    'percentage': {'productivities': True},
+    'keep_declared': {'is_keep_declared_salary': True},
+    'pure_special': {'is_pure_special_mode': True, 'net_salaries': True},
+    'standard': {'is_standard_mode': True},
+    'staggered': {'is_staggered_mode': True},
+}
+
+IMSS_KEYS = ['base_salary', 'daily_salary', 'integration_factor', 'integrated_daily_wage', 'imss_employer_fee',
+             'imss_employee_fee', 'rcv_employer', 'rcv_employee', 'infonavit_employer', 'payroll_tax']
+ISR_KEYS = ['base_salary', 'isr_lower_limit', 'isr_surplus', 'isr_percentage_applied_to_surplus', 'isr_surplus_tax',
+            'isr_fixed_fee', 'isr_total_tax', 'salary_credit', 'isr_tax_payable', 'isr_tax_in_favor']
+SAVING_KEYS = ['base_salary', 'dsi_salary', 'productivity', 'dsi_commission', 'traditional_scheme_biweekly',
+               'dsi_scheme_biweekly', 'traditional_scheme_monthly', 'dsi_scheme_monthly', 'saving_amount',
+               'saving_percentage', 'current_perception', 'dsi_perception', 'increment', 'total_retentions']
+
+
+def make_inputs(size, seed=DEFAULT_SEED):
+    """Entradas sintéticas de una nómina de `size` empleados (siempre las mismas para la misma semilla)"""
+    rnd = random.Random(seed)
+    return {
+        'salaries': [rnd.choice([278.8, 300.0, 450.0, rnd.uniform(280, 6000)]) for _ in range(size)],
+        'payment_periods': [rnd.choice([7, 15, 30]) for _ in range(size)],
+        'integration_factors': [rnd.choice([1.0493, 1.0452]) for _ in range(size)],
+        'other_perceptions': [rnd.choice([0.0, 500.0]) for _ in range(size)],
+        'commissions_and_bonus_for_isr': [rnd.choice([0.0, 250.0]) for _ in range(size)],
+        'productivities': [rnd.choice([0.0, 1200.0, 3000.0]) for _ in range(size)],
+        'net_salaries': [rnd.uniform(3000, 40000) for _ in range(size)],
+    }
+
+
+def calculation_kwargs(inputs, scenario, imss_breakdown, engine):
+    """Argumentos de process_multiple_calculations para un escenario"""
+    kwargs = dict(
+        salaries=inputs['salaries'], period_salaries=None, payment_periods=inputs['payment_periods'], periodicity=15,
+        integration_factors=inputs['integration_factors'], use_increment_percentage=True, risk_class='I',
+        smg_multiplier=1, commission_percentage_dsi=0.03, count_minimum_salary=1, stricted_mode=False,
+        imss_breakdown=imss_breakdown, other_perceptions=inputs['other_perceptions'],
+        commissions_and_bonus_for_isr=inputs['commissions_and_bonus_for_isr'], vectorized=engine == 'vectorized',
+    )
+    for name, value in SCENARIOS[scenario].items():
+        kwargs[name] = inputs[name] if value is True and name in inputs else value
+    return kwargs
+
+
+def measure(function, repeats):
+    """
+    Ejecuta `function` y regresa el mejor tiempo de `repeats` corridas y la memoria máxima de una corrida extra.
+
+    La memoria se mide aparte porque tracemalloc hace más lenta la ejecución.
+    """
+    best = float('inf')
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        for _ in range(repeats):
+            start = time.perf_counter()
+            function()
+            best = min(best, time.perf_counter() - start)
+        tracemalloc.start()
+        try:
+            function()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+    return best, peak
+
+
+def _result(name, size, seconds, peak, **extra):
+    return dict(name=name, rows=size, seconds=seconds, rows_per_second=size / seconds if seconds else None,
+                peak_memory_bytes=peak, **extra)
+
+
+def bench_calculations(sizes, scenarios, engines, repeats, seed=DEFAULT_SEED):
+    results = []
+    for size in sizes:
+        inputs = make_inputs(size, seed)
+        for engine in engines:
+            for scenario in scenarios:
+                for imss_breakdown in (None, True):
+                    kwargs = calculation_kwargs(inputs, scenario, imss_breakdown, engine)
+                    name = f"calculate/{engine}/{scenario}/{'breakdown' if imss_breakdown else 'no_breakdown'}"
+                    details = dict(engine=engine, scenario=scenario, imss_breakdown=bool(imss_breakdown))
+                    try:
+                        seconds, peak = measure(lambda: process_multiple_calculations(**kwargs), repeats)
+                    except Exception as error:
+                        # Algunas combinaciones no están soportadas por el motor; se registran sin detener la corrida
+                        results.append(dict(name=name, rows=size, error=f"{type(error).__name__}: {error}", **details))
+                        print(f"{name} rows={size}: error {results[-1]['error']}")
+                        continue
+                    results.append(_result(name, size, seconds, peak, **details))
+                    print(f"{name} rows={size}: {results[-1]['rows_per_second']:,.0f} rows/s, "
+                          f"peak {peak / 2 ** 20:.1f} MiB")
+    return results
+
+
+def bench_export(sizes, repeats, seed=DEFAULT_SEED):
+    results = []
+    for size in sizes:
+        inputs = make_inputs(size, seed)
+        with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+            rows = process_multiple_calculations(**calculation_kwargs(inputs, 'traditional', True, 'vectorized'))
+        imss = [[row[key] for key in IMSS_KEYS] for row in rows]
+        isr = [[row[key] for key in ISR_KEYS] for row in rows]
+        saving = [[row[key] for key in SAVING_KEYS] for row in rows]
+        with tempfile.TemporaryDirectory() as directory:
+            for constant_memory in (False, True):
+                filepath = os.path.join(directory, f"bench_{constant_memory}.xlsx")
+                seconds, peak = measure(
+                    lambda: export_to_excel(imss, IMSS_KEYS, None, isr, ISR_KEYS, None, saving, SAVING_KEYS, None,
+                                            constant_memory=constant_memory, filepath=filepath), repeats)
+                name = f"export/{'constant_memory' if constant_memory else 'dataframe'}"
+                results.append(_result(name, size, seconds, peak, constant_memory=constant_memory))
+                print(f"{name} rows={size}: {results[-1]['rows_per_second']:,.0f} rows/s, peak {peak / 2 ** 20:.1f} MiB")
+    return results
+
+
+def compare(results, baseline, max_regression=DEFAULT_MAX_REGRESSION):
+    """
+    Compara contra una línea base (mismo formato JSON).
+
+    Returns:
+        list: Mensajes de las mediciones cuyo rows_per_second bajó más de max_regression
+    """
+    previous = {(entry['name'], entry['rows']): entry for entry in baseline.get('results', [])}
+    regressions = []
+    for entry in results:
+        old = previous.get((entry['name'], entry['rows']))
+        if not old or not old.get('rows_per_second') or not entry.get('rows_per_second'):
+            continue
+        ratio = entry['rows_per_second'] / old['rows_per_second']
+        memory_ratio = entry['peak_memory_bytes'] / old['peak_memory_bytes'] if old.get('peak_memory_bytes') else float('nan')
+        print(f"{entry['name']} rows={entry['rows']}: {ratio:.2f}x throughput, {memory_ratio:.2f}x peak memory vs baseline")
+        if ratio < 1 - max_regression:
+            regressions.append(f"{entry['name']} rows={entry['rows']}: {ratio:.2f}x of baseline throughput")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmarks del pipeline de cálculo de nómina')
+    parser.add_argument('--sizes', type=int, nargs='+', default=list(DEFAULT_SIZES), help='Número de filas por medición')
+    parser.add_argument('--scenarios', nargs='+', choices=list(SCENARIOS), default=list(SCENARIOS))
+    parser.add_argument('--engine', nargs='+', choices=['object', 'vectorized'], default=['object'],
+                        help='Motor de process_multiple_calculations')
+    parser.add_argument('--repeats', type=int, default=3, help='Corridas por medición (se guarda la mejor)')
+    parser.add_argument('--seed', type=int, default=DEFAULT_SEED)
+    parser.add_argument('--skip-export', action='store_true', help='No medir export_to_excel')
+    parser.add_argument('--output', default='benchmarks/results.json', help='Archivo JSON de resultados')
+    parser.add_argument('--baseline', help='JSON de una corrida anterior para comparar')
+    parser.add_argument('--max-regression', type=float, default=DEFAULT_MAX_REGRESSION,
+                        help='Caída máxima aceptada de rows/s contra la línea base (0.2 = 20%%)')
+    args = parser.parse_args(argv)
+
+    results = bench_calculations(args.sizes, args.scenarios, args.engine, args.repeats, args.seed)
+    if not args.skip_export:
+        results += bench_export(args.sizes, args.repeats, args.seed)
+
+    report = {
+        'meta': {
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'platform': platform.platform(),
+            'seed': args.seed,
+            'repeats': args.repeats,
+        },
+        'results': results,
+    }
+    output_directory = os.path.dirname(args.output)
+    if output_directory:
+        os.makedirs(output_directory, exist_ok=True)
+    with open(args.output, 'w') as file:
+        json.dump(report, file, indent=2)
+    print(f"Results written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as file:
+            regressions = compare(results, json.load(file), args.max_regression)
+        if regressions:
+            print("Regressions:\n  " + "\n  ".join(regressions))
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -1,7 +1,13 @@
 """
 Payroll Calculator Package
 A package for calculating IMSS, ISR, and savings for Mexican payroll.
+
+Las clases del cálculo por objetos (IMSS, ISR, Saving, totales, parámetros) se importan al cargar el
+paquete y no dependen de NumPy ni de pandas. El motor vectorizado, los procesadores, las curvas de
+costo y los exportadores se importan al primer acceso (PEP 562), así `import payroll_calculator`
+no paga el costo de cargar NumPy, pandas o SQLite cuando solo se necesita IMSS o ISR.
 """
+import importlib
 
 __version__ = '0.1.0'
 
@@ -9,6 +15,42 @@ from .imss import IMSS
 from .isr import ISR
 from .saving import Saving
 from .employees import Employee
-from .totals import TotalCalculator
-from .processors import process_single_calculation, process_multiple_calculations
-from .exporters import export_to_excel, format_totals_for_excel
\ No newline at end of file
+from .totals import TotalCalculator, TotalsAccumulator, GroupedTotals, group_totals
+from .parameter_set import ParameterSet
+from .metrics import StageMetrics
+from .progress import ProgressEvent, print_progress
+
+# Nombre -> submódulo donde se define; se importa la primera vez que se pide
+_LAZY_ATTRIBUTES = {
+    'PayrollResults': 'results',
+    'ImssCostCurves': 'cost_curves',
+    'compile_imss_curves': 'cost_curves',
+    'solve_gross_for_net': 'net_to_gross',
+    'net_for_gross': 'net_to_gross',
+    'NetToGrossResult': 'net_to_gross',
+    'process_single_calculation': 'processors',
+    'process_multiple_calculations': 'processors',
+    'iter_calculations': 'processors',
+    'RowCache': 'processors',
+    'ResultCache': 'processors',
+    'export_to_excel': 'exporters',
+    'format_totals_for_excel': 'exporters',
+}
+
+# Subpaquetes y módulos pesados que se pueden usar como atributo (payroll_calculator.exporters)
+_LAZY_SUBMODULES = ('processors', 'exporters', 'readers', 'results', 'cost_curves', 'net_to_gross')
+
+
+def __getattr__(name):
+    if name in _LAZY_ATTRIBUTES:
+        value = getattr(importlib.import_module(f'.{_LAZY_ATTRIBUTES[name]}', __name__), name)
+        # Los siguientes accesos ya no pasan por __getattr__
+        globals()[name] = value
+        return value
+    if name in _LAZY_SUBMODULES:
+        return importlib.import_module(f'.{name}', __name__)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES) | set(_LAZY_SUBMODULES))
@@ -0,0 +1,3 @@
+from payroll_calculator.cli import main
+
+raise SystemExit(main())
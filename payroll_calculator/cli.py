@@ -0,0 +1,504 @@
+"""
+Línea de comandos no interactiva.
+
+    payroll-calc batch clientes/*.csv --params parametros.json --format csv --output-dir resultados --jobs 4
+    cat nomina.csv | payroll-calc stream --params parametros.json > resultados.jsonl
+    payroll-calc serve --params parametros.json --port 8080
+
+`batch` calcula cada archivo de entrada (CSV/TSV con las columnas de readers.salary_reader) con los
+parámetros del archivo JSON y escribe, por archivo, los resultados por fila y los totales de IMSS,
+ISR y Ahorro en el formato elegido. Los archivos se procesan en paralelo con un grupo acotado de
+procesos (--jobs) y al final se imprime un resumen de filas por segundo.
+
+`stream` es un filtro para tuberías: lee filas por stdin y escribe una línea JSON de resultado por
+fila en stdout, en micro-lotes (ver payroll_calculator.streaming). `serve` levanta el servicio local
+de cotizaciones por HTTP/JSON (ver payroll_calculator.service).
+
+Cada archivo se lee y se calcula por bloques (--chunk-size), así que la memoria no crece con el
+tamaño del archivo. Todos los bloques usan el mismo ParameterSet, resuelto una sola vez por archivo.
+
+Archivos de salida en --output-dir, donde <nombre> es el nombre del archivo de entrada sin extensión:
+- csv: <nombre>.csv y <nombre>.totals.csv
+- jsonl: <nombre>.jsonl (una fila por línea) y <nombre>.totals.json
+- json: <nombre>.json con {"rows": [...], "totals": {...}}
+- xlsx: <nombre>.xlsx con las hojas "Resultados" y "Totales"
+
+Archivo de parámetros (JSON; todas las llaves son opcionales):
+    {
+        "mode": "traditional",          # traditional, pure, keep_declared, pure_special, standard, staggered
+        "periodicity": 15,
+        "risk_class": "I",
+        "smg_multiplier": 1,
+        "commission_percentage_dsi": 0.03,
+        "count_minimum_salary": 1,
+        "use_increment_percentage": false,
+        "stricted_mode": false,
+        "imss_breakdown": true,
+        "applied_commission_to": "salary",
+        "productivity_to_zero": false,
+        "payment_period": 15,           # Cuando el archivo no trae la columna
+        "integration_factor": 1.0493,   # Cuando el archivo no trae la columna
+        "uma": 113.14,
+        "rcv_year": 2025,
+        "parameters": {"smg": 278.8}    # Valores que reemplazan a los de Parameters (ParameterSet.from_parameters)
+    }
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from payroll_calculator.parameter_set import ParameterSet, DEFAULT_UMA
+from payroll_calculator.parameters import Parameters
+from payroll_calculator.serialization import dumps_row
+from payroll_calculator.totals import TotalsAccumulator, TOTALS_SECTIONS
+
+FORMATS = ('csv', 'jsonl', 'json', 'xlsx')
+# Formatos de entrada de `stream` (ver streaming.RecordParser)
+INPUT_FORMATS = ('auto', 'csv', 'jsonl')
+DEFAULT_CHUNK_SIZE = 10000
+
+# Modo -> bandera de process_multiple_calculations. El modo porcentaje se activa solo cuando el
+# archivo trae la columna de productividad
+MODES = {
+    'traditional': None,
+    'pure': 'is_pure_mode',
+    'keep_declared': 'is_keep_declared_salary',
+    'pure_special': 'is_pure_special_mode',
+    'standard': 'is_standard_mode',
+    'staggered': 'is_staggered_mode',
+}
+
+# Valores por defecto del archivo de parámetros
+DEFAULT_OPTIONS = {
+    'mode': 'traditional',
+    'periodicity': 15,
+    'risk_class': 'I',
+    'smg_multiplier': 1,
+    'commission_percentage_dsi': 0.0,
+    'count_minimum_salary': 1,
+    'use_increment_percentage': False,
+    'stricted_mode': False,
+    'imss_breakdown': True,
+    'applied_commission_to': 'salary',
+    'productivity_to_zero': False,
+    'payment_period': 15,
+    'integration_factor': Parameters.INTEGRATION_FACTOR,
+    'uma': DEFAULT_UMA,
+    'rcv_year': None,
+    'parameters': {},
+}
+
+# Columnas que solo aparecen en algunas filas; se agregan al encabezado aunque la primera fila no las traiga
+OPTIONAL_COLUMNS = ('isr_tax_payable_dsi', 'employer_contributions')
+
+TOTALS_HEADERS = ('Sección', 'Concepto', 'Total')
+
+
+def load_options(path):
+    """
+    Lee el archivo de parámetros y lo completa con DEFAULT_OPTIONS.
+
+    Raises:
+        ValueError: Si el archivo trae llaves desconocidas o un modo inválido
+    """
+    with open(path, encoding='utf-8') as file:
+        values = json.load(file)
+    if not isinstance(values, dict):
+        raise ValueError(f"{path}: se esperaba un objeto JSON")
+    unknown = sorted(set(values) - set(DEFAULT_OPTIONS))
+    if unknown:
+        raise ValueError(f"{path}: llaves desconocidas: {', '.join(unknown)}")
+    options = dict(DEFAULT_OPTIONS, **values)
+    if options['mode'] not in MODES:
+        raise ValueError(f"{path}: modo inválido {options['mode']!r} (opciones: {', '.join(MODES)})")
+    return options
+
+
+def calculation_options(options):
+    """
+    Argumentos de process_multiple_calculations (sin las columnas por fila) a partir del archivo de parámetros.
+
+    El ParameterSet se crea aquí una sola vez, así todos los bloques del archivo usan los mismos valores.
+    """
+    kwargs = {name: options[name] for name in (
+        'periodicity', 'risk_class', 'smg_multiplier', 'commission_percentage_dsi', 'count_minimum_salary',
+        'use_increment_percentage', 'stricted_mode', 'imss_breakdown', 'applied_commission_to', 'productivity_to_zero')}
+    flag = MODES[options['mode']]
+    if flag:
+        kwargs[flag] = True
+    kwargs['parameters'] = ParameterSet.from_parameters(uma=options['uma'], rcv_year=options['rcv_year'],
+                                                        **options['parameters'])
+    return kwargs
+
+
+def iter_file_rows(path, options, vectorized=False, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Calcula un archivo de entrada por bloques.
+
+    Yields:
+        list: Filas (dicts de process_multiple_calculations) de cada bloque del archivo
+    """
+    from payroll_calculator.processors import process_multiple_calculations
+    from payroll_calculator.readers import read_salary_columns
+
+    kwargs = calculation_options(options)
+    for columns in read_salary_columns(path, chunk_size=chunk_size):
+        yield process_multiple_calculations(**row_arguments(columns, options), **kwargs, vectorized=vectorized)
+
+
+def row_arguments(columns, options):
+    """
+    Argumentos por fila de process_multiple_calculations para un bloque de columnas leídas.
+
+    Returns:
+        dict: Los de readers.calculation_arguments, como listas de Python
+    """
+    from payroll_calculator.readers import calculation_arguments
+
+    arguments = calculation_arguments(columns, options['payment_period'], options['integration_factor'])
+    # Listas de Python, igual que las entradas del flujo interactivo
+    arguments = {name: None if values is None else values.tolist() for name, values in arguments.items()}
+    # El motor por objetos suma estas columnas en cada fila; si el archivo no las trae valen 0
+    size = len(arguments['payment_periods'])
+    for name in ('other_perceptions', 'commissions_and_bonus_for_isr'):
+        if arguments[name] is None:
+            arguments[name] = [0.0] * size
+    return arguments
+
+
+def totals_by_section(accumulator):
+    """Totales del archivo: {'count': filas, 'IMSS': {...}, 'ISR': {...}, 'Ahorro': {...}}"""
+    totals = {'count': accumulator.count}
+    for section, method in TOTALS_SECTIONS:
+        totals[section] = getattr(accumulator, method)()
+    return totals
+
+
+def totals_rows(totals):
+    """Filas (sección, concepto, total) para los formatos tabulares"""
+    return [(section, name, value) for section, _ in TOTALS_SECTIONS for name, value in totals[section].items()]
+
+
+def _columns(first_row):
+    return list(first_row) + [column for column in OPTIONAL_COLUMNS if column not in first_row]
+
+
+class _FileWriter:
+    """
+    Base de los escritores de salida. `paths` son los archivos que genera; `file` es el archivo de
+    resultados abierto.
+    """
+
+    def _close_output(self):
+        self.file.close()
+
+    def abort(self):
+        """Cierra la salida sin terminarla y borra los archivos parciales"""
+        try:
+            self._close_output()
+        finally:
+            for path in self.paths:
+                if os.path.exists(path):
+                    os.remove(path)
+
+
+class _CsvWriter(_FileWriter):
+    def __init__(self, base):
+        self.paths = [base + '.csv', base + '.totals.csv']
+        self.file = open(self.paths[0], 'w', newline='', encoding='utf-8')
+        self.writer = None
+
+    def write(self, rows):
+        if self.writer is None:
+            self.writer = csv.DictWriter(self.file, fieldnames=_columns(rows[0]), extrasaction='ignore')
+            self.writer.writeheader()
+        self.writer.writerows(rows)
+
+    def close(self, totals):
+        self.file.close()
+        with open(self.paths[1], 'w', newline='', encoding='utf-8') as file:
+            writer = csv.writer(file)
+            writer.writerow(TOTALS_HEADERS)
+            writer.writerows(totals_rows(totals))
+
+
+class _JsonlWriter(_FileWriter):
+    def __init__(self, base):
+        self.paths = [base + '.jsonl', base + '.totals.json']
+        self.file = open(self.paths[0], 'w', encoding='utf-8')
+
+    def write(self, rows):
+        self.file.writelines(dumps_row(row) + '\n' for row in rows)
+
+    def close(self, totals):
+        self.file.close()
+        with open(self.paths[1], 'w', encoding='utf-8') as file:
+            file.write(dumps_row(totals))
+
+
+class _JsonWriter(_FileWriter):
+    def __init__(self, base):
+        self.paths = [base + '.json']
+        self.file = open(self.paths[0], 'w', encoding='utf-8')
+        self.file.write('{"rows": [')
+        self.separator = '\n'
+
+    def write(self, rows):
+        for row in rows:
+            self.file.write(self.separator + dumps_row(row))
+            self.separator = ',\n'
+
+    def close(self, totals):
+        self.file.write('\n], "totals": ' + dumps_row(totals) + '}\n')
+        self.file.close()
+
+
+class _XlsxWriter(_FileWriter):
+    def __init__(self, base):
+        import xlsxwriter
+        from payroll_calculator.exporters.excel_exporter import write_row
+        self._write_row = write_row
+        self.paths = [base + '.xlsx']
+        # constant_memory: cada fila se escribe al disco en cuanto se termina la siguiente
+        self.workbook = xlsxwriter.Workbook(self.paths[0], {'constant_memory': True})
+        self.worksheet = self.workbook.add_worksheet('Resultados')
+        self.columns = None
+        self.row = 0
+
+    def write(self, rows):
+        if self.columns is None:
+            self.columns = _columns(rows[0])
+            self._write_row(self.worksheet, 0, 0, self.columns)
+            self.row = 1
+        for row in rows:
+            self._write_row(self.worksheet, self.row, 0, [row.get(column) for column in self.columns])
+            self.row += 1
+
+    def close(self, totals):
+        worksheet = self.workbook.add_worksheet('Totales')
+        self._write_row(worksheet, 0, 0, TOTALS_HEADERS)
+        for row, values in enumerate(totals_rows(totals), start=1):
+            self._write_row(worksheet, row, 0, values)
+        self.workbook.close()
+
+    def _close_output(self):
+        # Cerrar el libro también borra los archivos temporales de constant_memory
+        if not self.workbook.fileclosed:
+            self.workbook.close()
+
+
+WRITERS = {'csv': _CsvWriter, 'jsonl': _JsonlWriter, 'json': _JsonWriter, 'xlsx': _XlsxWriter}
+
+
+def output_base(path, output_dir):
+    """Ruta de salida sin extensión para un archivo de entrada"""
+    return os.path.join(output_dir, os.path.splitext(os.path.basename(path))[0])
+
+
+def process_file(path, options, output_dir, output_format, vectorized=False, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Calcula un archivo y escribe sus resultados y totales. Se ejecuta en los procesos del grupo.
+
+    Si el archivo falla, sus salidas parciales se borran.
+
+    Returns:
+        dict: path, rows, seconds, outputs y error (None si todo salió bien)
+    """
+    start = time.perf_counter()
+    accumulator = TotalsAccumulator()
+    writer = None
+    error = None
+    completed = False
+    try:
+        os.makedirs(output_dir, exist_ok=True)
+        writer = WRITERS[output_format](output_base(path, output_dir))
+        for rows in iter_file_rows(path, options, vectorized, chunk_size):
+            if rows:
+                accumulator.add_rows(rows)
+                writer.write(rows)
+        writer.close(totals_by_section(accumulator))
+        completed = True
+    except Exception as exception:
+        error = f"{type(exception).__name__}: {exception}"
+    finally:
+        # Un archivo que falló (o se interrumpió) no deja salidas a medias
+        if writer is not None and not completed:
+            writer.abort()
+    return dict(path=path, rows=accumulator.count, seconds=time.perf_counter() - start,
+                outputs=writer.paths if completed else [], error=error)
+
+
+def _rate(rows, seconds):
+    return rows / seconds if seconds else 0.0
+
+
+def format_summary(summaries, elapsed, jobs):
+    """Resumen de throughput de la corrida"""
+    rows = sum(summary['rows'] for summary in summaries if summary['error'] is None)
+    failed = sum(1 for summary in summaries if summary['error'] is not None)
+    line = (f"Processed {len(summaries) - failed} files, {rows:,} rows in {elapsed:.2f} s "
+            f"({_rate(rows, elapsed):,.0f} rows/s, {jobs} jobs)")
+    if failed:
+        line += f"; {failed} files failed"
+    return line
+
+
+def _format_file(summary):
+    if summary['error'] is not None:
+        return f"{summary['path']}: error {summary['error']}"
+    return (f"{summary['path']}: {summary['rows']:,} rows in {summary['seconds']:.2f} s "
+            f"({_rate(summary['rows'], summary['seconds']):,.0f} rows/s) -> {', '.join(summary['outputs'])}")
+
+
+def run_batch(inputs, options, output_dir, output_format, jobs=1, vectorized=False, chunk_size=DEFAULT_CHUNK_SIZE,
+              stream=None):
+    """
+    Procesa varios archivos con a lo más `jobs` procesos e imprime una línea por archivo al terminarlo.
+
+    Returns:
+        list: Resumen de cada archivo (ver process_file), en el orden de `inputs`
+    """
+    stream = stream or sys.stdout
+    arguments = [(path, options, output_dir, output_format, vectorized, chunk_size) for path in inputs]
+    if jobs <= 1 or len(inputs) <= 1:
+        summaries = []
+        for args in arguments:
+            summaries.append(process_file(*args))
+            print(_format_file(summaries[-1]), file=stream)
+        return summaries
+
+    summaries = [None] * len(inputs)
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        futures = {executor.submit(process_file, *args): index for index, args in enumerate(arguments)}
+        for future in as_completed(futures):
+            summaries[futures[future]] = future.result()
+            print(_format_file(summaries[futures[future]]), file=stream)
+    return summaries
+
+
+def _positive_int(value):
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError("debe ser al menos 1")
+    return number
+
+
+def _non_negative_float(value):
+    number = float(value)
+    if number < 0:
+        raise argparse.ArgumentTypeError("no puede ser negativo")
+    return number
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='payroll-calc', description='Cálculo de nómina sin menú interactivo')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    batch = commands.add_parser('batch', help='Calcula uno o más archivos de clientes')
+    batch.add_argument('inputs', nargs='+', help='Archivos CSV/TSV de entrada')
+    batch.add_argument('--params', required=True, help='Archivo JSON de parámetros')
+    batch.add_argument('--format', choices=FORMATS, default='csv', help='Formato de salida (csv por defecto)')
+    batch.add_argument('--output-dir', default='.', help='Directorio de salida (el actual por defecto)')
+    batch.add_argument('--jobs', type=int, default=None,
+                       help='Archivos en paralelo (por defecto el número de CPUs, sin pasar del número de archivos)')
+    batch.add_argument('--vectorized', action='store_true', help='Usar el motor vectorizado de NumPy')
+    batch.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE, help='Filas por bloque de lectura')
+
+    # Los valores por defecto (None) los resuelven streaming y service, que se importan solo al usarlos
+    stream = commands.add_parser('stream', help='Filtro: filas por stdin, una línea JSON de resultado por stdout')
+    stream.add_argument('--params', help='Archivo JSON de parámetros (opcional)')
+    stream.add_argument('--input-format', choices=INPUT_FORMATS, default='auto',
+                        help='Formato de la entrada (auto: JSONL si la primera línea empieza con "{")')
+    stream.add_argument('--batch-size', type=_positive_int, help='Filas máximas por micro-lote')
+    stream.add_argument('--max-delay', type=_non_negative_float, help='Segundos máximos que una fila espera a que se llene su micro-lote')
+    stream.add_argument('--buffer-size', type=_positive_int, help='Líneas de entrada leídas por adelantado como máximo')
+    stream.add_argument('--vectorized', action='store_true', help='Calcular los micro-lotes con el motor vectorizado de NumPy')
+
+    serve = commands.add_parser('serve', help='Servicio local HTTP/JSON de cotizaciones')
+    serve.add_argument('--params', help='Archivo JSON de parámetros (opcional)')
+    serve.add_argument('--host')
+    serve.add_argument('--port', type=int)
+    serve.add_argument('--backlog', type=_positive_int, help='Conexiones en espera de ser aceptadas como máximo')
+    serve.add_argument('--max-delay', type=_non_negative_float,
+                       help='Segundos que una cotización espera a otras para calcularlas en el mismo lote')
+    serve.add_argument('--max-batch', type=_positive_int, help='Cotizaciones máximas por lote')
+    serve.add_argument('--max-pending', type=_positive_int, help='Cotizaciones pendientes antes de responder 503')
+    serve.add_argument('--vectorized', action='store_true', help='Calcular los lotes con el motor vectorizado de NumPy')
+    serve.add_argument('--report-interval', type=float, default=10.0,
+                       help='Segundos entre reportes de latencia en stderr (0 = solo al terminar)')
+    return parser
+
+
+def _given(**values):
+    """Opciones que se indicaron en la línea de comandos; las demás toman el valor por defecto de la función"""
+    return {name: value for name, value in values.items() if value is not None}
+
+
+def _run_serve(args, options):
+    import asyncio
+    from payroll_calculator.service import serve
+
+    try:
+        asyncio.run(serve(options, report_interval=args.report_interval, vectorized=args.vectorized,
+                          **_given(host=args.host, port=args.port, backlog=args.backlog, max_delay=args.max_delay,
+                                   max_batch=args.max_batch, max_pending=args.max_pending)))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+def _run_stream(args, options):
+    from payroll_calculator.streaming import stream_calculations
+
+    start = time.perf_counter()
+    try:
+        calculated, failed = stream_calculations(
+            sys.stdin, sys.stdout, options, args.input_format, vectorized=args.vectorized,
+            **_given(batch_size=args.batch_size, max_delay=args.max_delay, buffer_size=args.buffer_size))
+    except BrokenPipeError:
+        # El siguiente comando de la tubería terminó antes (por ejemplo head); no es un error
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return 0
+    elapsed = time.perf_counter() - start
+    # El resumen va a stderr para no mezclarse con los resultados
+    print(f"Streamed {calculated:,} rows ({failed:,} errors) in {elapsed:.2f} s "
+          f"({_rate(calculated + failed, elapsed):,.0f} rows/s)", file=sys.stderr)
+    return 0
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+
+    try:
+        options = load_options(args.params) if args.params else dict(DEFAULT_OPTIONS)
+    except (OSError, ValueError) as error:
+        parser.error(str(error))
+
+    if args.command == 'stream':
+        return _run_stream(args, options)
+    if args.command == 'serve':
+        return _run_serve(args, options)
+
+    missing = [path for path in args.inputs if not os.path.isfile(path)]
+    if missing:
+        parser.error(f"no existe: {', '.join(missing)}")
+    bases = [output_base(path, args.output_dir) for path in args.inputs]
+    if len(set(bases)) != len(bases):
+        parser.error("hay archivos de entrada con el mismo nombre; sus salidas se sobrescribirían")
+    jobs = args.jobs or min(len(args.inputs), os.cpu_count() or 1)
+    if jobs < 1:
+        parser.error("--jobs debe ser al menos 1")
+
+    start = time.perf_counter()
+    summaries = run_batch(args.inputs, options, args.output_dir, args.format, jobs, args.vectorized, args.chunk_size)
+    print(format_summary(summaries, time.perf_counter() - start, jobs))
+    return 1 if any(summary['error'] is not None for summary in summaries) else 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,151 @@
+"""
+Curvas de costo IMSS precompiladas.
+
+Con período, factor de integración, clase de riesgo y ParameterSet fijos, cada columna IMSS/RCV/
+INFONAVIT es una función lineal por tramos del salario diario integrado. Los cambios de tramo solo
+ocurren en 0, el tope CF (3 UMA), el SMG, el tope de 25 UMA y las fronteras de la tabla RCV del año,
+y en esas fronteras puede haber saltos (por ejemplo las cuotas del trabajador que empiezan arriba
+del SMG). compile_imss_curves evalúa el modelo una vez en cada frontera y en cada tramo, y guarda el
+valor de cada frontera y la pendiente y ordenada de cada tramo abierto; después cada empleado es una
+búsqueda binaria y una multiplicación por columna.
+"""
+import functools
+from bisect import bisect_left
+import numpy as np
+from .parameter_set import ParameterSet
+from .processors.batch import _imss_columns
+
+# Columnas que produce cada curva (mismas llaves que processors.batch._imss_columns)
+CURVE_COLUMNS = (
+    'quota_employer', 'quota_employee', 'retirement_employer', 'severance_employer',
+    'total_rcv_employer', 'severance_employee', 'infonavit_employer',
+)
+
+# Tolerancia relativa con la que se valida que cada tramo sea lineal
+_LINEARITY_TOLERANCE = 1e-9
+
+
+class ImssCostCurves:
+    """
+    Columnas IMSS como funciones lineales por tramos del salario diario.
+
+    Attributes:
+        payment_period (int): Días del período
+        integration_factor (float): Factor de integración (salario integrado = salario diario * factor)
+        risk_class: Clase de riesgo o porcentaje directo
+        parameters (ParameterSet): Parámetros con los que se compiló
+        boundaries (list): Fronteras en salario diario integrado, ordenadas
+    """
+
+    def __init__(self, payment_period, integration_factor, risk_class, parameters, boundaries, boundary_values, slopes, intercepts):
+        self.payment_period = payment_period
+        self.integration_factor = integration_factor
+        self.risk_class = risk_class
+        self.parameters = parameters
+        self.boundaries = boundaries
+        # Columna -> arreglo; boundary_values[i] es el valor exacto del modelo en boundaries[i] y
+        # slopes/intercepts[i] describen el tramo abierto (boundaries[i - 1], boundaries[i])
+        self.boundary_values = boundary_values
+        self.slopes = slopes
+        self.intercepts = intercepts
+        self._boundaries_array = np.array(boundaries)
+
+    def _evaluate_integrated(self, wage):
+        index = bisect_left(self.boundaries, wage)
+        if index < len(self.boundaries) and self.boundaries[index] == wage:
+            return {column: float(values[index]) for column, values in self.boundary_values.items()}
+        return {column: float(self.slopes[column][index] * wage + self.intercepts[column][index]) for column in CURVE_COLUMNS}
+
+    def evaluate(self, daily_salary):
+        """
+        Columnas IMSS de un empleado en O(log k).
+
+        Args:
+            daily_salary (float): Salario diario (salario del período / días)
+
+        Returns:
+            dict: Columna -> valor del período
+        """
+        return self._evaluate_integrated(daily_salary * self.integration_factor)
+
+    def evaluate_many(self, daily_salaries):
+        """
+        Versión vectorizada de evaluate.
+
+        Returns:
+            dict: Columna -> np.ndarray
+        """
+        wage = np.asarray(daily_salaries, dtype=float) * self.integration_factor
+        index = np.searchsorted(self._boundaries_array, wage, side='left')
+        safe_index = np.minimum(index, len(self.boundaries) - 1)
+        on_boundary = (index < len(self.boundaries)) & (self._boundaries_array[safe_index] == wage)
+        return {
+            column: np.where(on_boundary, self.boundary_values[column][safe_index],
+                             self.slopes[column][index] * wage + self.intercepts[column][index])
+            for column in CURVE_COLUMNS
+        }
+
+    def __repr__(self):
+        return (f"ImssCostCurves(payment_period={self.payment_period}, integration_factor={self.integration_factor}, "
+                f"risk_class={self.risk_class!r}, segments={len(self.boundaries) + 1})")
+
+
+def _curve_boundaries(parameters):
+    """Fronteras (en salario diario integrado) donde alguna columna cambia de pendiente o salta"""
+    uma = parameters.uma
+    boundaries = {0.0, uma * 3, uma * 25, parameters.smg}
+    boundaries.update(parameters.rcv_table().boundaries)
+    return sorted(boundaries)
+
+
+@functools.lru_cache(maxsize=256)
+def _compile(payment_period, integration_factor, risk_class, parameters):
+    risk_percentage = parameters.risk_percentage(risk_class)
+    rcv_table = parameters.rcv_table()
+
+    def model(wages):
+        return _imss_columns(np.asarray(wages, dtype=float), payment_period, parameters, risk_percentage, rcv_table)
+
+    boundaries = _curve_boundaries(parameters)
+    boundary_values = model(boundaries)
+
+    # Dos puntos interiores por tramo para la recta y uno más para validar que sea lineal
+    lows = [boundaries[0] - 2.0] + boundaries
+    highs = boundaries + [boundaries[-1] + 2.0]
+    lows, highs = np.array(lows), np.array(highs)
+    width = highs - lows
+    first, second, middle = lows + width / 4, lows + 3 * width / 4, lows + width / 2
+    first_values, second_values, middle_values = model(first), model(second), model(middle)
+
+    slopes = {}
+    intercepts = {}
+    for column in CURVE_COLUMNS:
+        slope = (second_values[column] - first_values[column]) / (second - first)
+        intercept = first_values[column] - slope * first
+        predicted = slope * middle + intercept
+        scale = np.maximum(np.abs(middle_values[column]), 1.0)
+        if np.any(np.abs(predicted - middle_values[column]) > _LINEARITY_TOLERANCE * scale):
+            raise ValueError(f"La columna {column} no es lineal entre las fronteras calculadas")
+        slopes[column] = slope
+        intercepts[column] = intercept
+
+    boundary_values = {column: np.asarray(boundary_values[column], dtype=float) for column in CURVE_COLUMNS}
+    return ImssCostCurves(payment_period, integration_factor, risk_class, parameters, boundaries, boundary_values, slopes, intercepts)
+
+
+def compile_imss_curves(payment_period, integration_factor, risk_class='I', parameters=None):
+    """
+    Compila (o regresa de caché) las curvas de costo IMSS para una configuración.
+
+    Args:
+        payment_period (int): Días del período
+        integration_factor (float): Factor de integración
+        risk_class: Clase de riesgo ('I'...'V') o porcentaje directo
+        parameters (ParameterSet): Parámetros; por defecto una foto de Parameters
+
+    Returns:
+        ImssCostCurves
+    """
+    if parameters is None:
+        parameters = ParameterSet.from_parameters()
+    return _compile(payment_period, integration_factor, risk_class, parameters)
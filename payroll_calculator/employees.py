@@ -1,11 +1,10 @@
-import inspect
+from . import tracing
 
 class Employee:
 
     def __init__(self, imss_salary, payment_period, compensation=0, double_overtime=0, christmas_bonus=0):
-        frame_llamador = inspect.currentframe().f_back
-        info = inspect.getframeinfo(frame_llamador)
-        # print(f"Instanciado desde {info.filename}, función {info.function}, línea {info.lineno}")
+        if tracing.enabled:
+            tracing.record_call_site('Employee')
         self.imss_salary = imss_salary
         self.payment_period = payment_period
         self.compensation = compensation
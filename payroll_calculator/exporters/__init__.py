@@ -1,5 +1,25 @@
 """
 Exporters module for Payroll Calculator
+
+excel_exporter carga XlsxWriter o pandas solo al exportar; aun así se importa al primer acceso (PEP 562).
 """
+import importlib
+
+_LAZY_ATTRIBUTES = {
+    'export_to_excel': 'excel_exporter',
+    'format_totals_for_excel': 'excel_exporter',
+    'rows_from_columns': 'excel_exporter',
+    'write_row': 'excel_exporter',
+}
+
+
+def __getattr__(name):
+    if name in _LAZY_ATTRIBUTES:
+        value = getattr(importlib.import_module(f'.{_LAZY_ATTRIBUTES[name]}', __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
-from .excel_exporter import export_to_excel, format_totals_for_excel
\ No newline at end of file
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES))
@@ -1,50 +1,195 @@
-import pandas as pd
+import itertools
+import math
 import os
 from datetime import datetime
 
+# Encabezados de las tres secciones de la hoja Ahorro y la posición de cada columna en saving_results
+TRADITIONAL_HEADERS = [
+    'Salario',
+    'Productividad',
+    'Esquema Tradicional Quincenal',
+    'Esquema Tradicional Mensual',
+    'Percepción Actual',
+]
+TRADITIONAL_INDEXES = [0, 2, 4, 6, 10]
+
+DSI_HEADERS = [
+    'Salario',
+    'Salario DSI',
+    'Comisión DSI',
+    'Esquema DSI Quincenal',
+    'Esquema DSI Mensual',
+    'Percepción DSI',
+]
+DSI_INDEXES = [0, 1, 3, 5, 7, 11]
+
+COMPARISON_HEADERS = [
+    'Salario',
+    'Incremento',
+    'Porcentaje Incremento'
+]
+COMPARISON_INDEXES = [0, 12, 13]
+
+
+def _results_filepath():
+    """Ruta del archivo con fecha y hora dentro de resultado_calculos (crea la carpeta si no existe)"""
+    # Create timestamp for filename
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    filename = f"payroll_calculations_{timestamp}.xlsx"
+
+    # Create results directory if it doesn't exist
+    results_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "resultado_calculos")
+    if not os.path.exists(results_dir):
+        os.makedirs(results_dir)
+
+    return os.path.join(results_dir, filename)
+
+
+def rows_from_columns(columns, keys):
+    """
+    Genera filas (listas) a partir de columnas, por ejemplo las de process_batch_calculations.
+
+    Args:
+        columns (dict): Columna -> arreglo o lista
+        keys (list): Columnas a incluir en cada fila, en orden
+
+    Yields:
+        list: Valores de la fila en el orden de keys
+    """
+    selected = [columns[key] for key in keys]
+    return (list(values) for values in zip(*selected))
+
+
+def _cell_value(value):
+    # Igual que pandas: None y NaN quedan como celda vacía; los tipos de NumPy se convierten a Python
+    if value is None or isinstance(value, str):
+        return value
+    if hasattr(value, 'item'):
+        value = value.item()
+    if isinstance(value, float) and (math.isnan(value) or math.isinf(value)):
+        return None
+    return value
+
+
+def write_row(worksheet, row, col, values):
+    """
+    Escribe una fila de valores en una hoja de XlsxWriter a partir de (row, col).
+
+    Las celdas None, NaN o infinitas quedan vacías y los escalares de NumPy se convierten a tipos de
+    Python, igual que al exportar un DataFrame con pandas.
+    """
+    for offset, value in enumerate(values):
+        value = _cell_value(value)
+        if value is not None:
+            worksheet.write(row, col + offset, value)
+
+
+def _export_constant_memory(filepath, imss_results, imss_headers, isr_results, isr_headers, saving_results):
+    """
+    Escribe el mismo libro que export_to_excel fila por fila con la opción constant_memory de XlsxWriter.
+
+    Los resultados pueden ser cualquier iterable (listas o generadores); se recorren una sola vez y
+    en paralelo, así que solo se guarda en memoria la fila actual de cada hoja.
+    """
+    import xlsxwriter
+
+    workbook = xlsxwriter.Workbook(filepath, {'constant_memory': True})
+    try:
+        # Add number formats
+        number_format = workbook.add_format({'num_format': '#,##0.00'})
+        percentage_format = workbook.add_format({'num_format': '0.00"%"'})  # Changed format to show actual percentage
+        header_format = workbook.add_format({
+            'bold': True,
+            'text_wrap': True,
+            'valign': 'top',
+            'fg_color': '#D7E4BC',
+            'border': 1
+        })
+        # Mismo estilo que pandas usa para los encabezados de un DataFrame
+        column_header_format = workbook.add_format({'bold': True, 'border': 1, 'align': 'center', 'valign': 'top'})
+
+        imss_sheet = workbook.add_worksheet('IMSS')
+        isr_sheet = workbook.add_worksheet('ISR')
+        saving_sheet = workbook.add_worksheet('Ahorro')
+
+        # En modo constant_memory los formatos de columna se definen antes de escribir las filas
+        imss_sheet.set_column(0, len(imss_headers) - 1, 15, number_format)
+        isr_sheet.set_column(0, len(isr_headers) - 1, 15, number_format)
+
+        dsi_col = len(TRADITIONAL_HEADERS) + 1
+        comparison_col = len(TRADITIONAL_HEADERS) + len(DSI_HEADERS) + 2
+        saving_sheet.set_column(0, len(TRADITIONAL_HEADERS) - 1, 15, number_format)
+        saving_sheet.set_column(dsi_col, dsi_col + len(DSI_HEADERS) - 1, 15, number_format)
+        saving_sheet.set_column(comparison_col, comparison_col + 1, 15, number_format)  # Salary, Increment
+        saving_sheet.set_column(comparison_col + 2, comparison_col + 2, 15, percentage_format)  # Percentage
+
+        for worksheet, headers in ((imss_sheet, imss_headers), (isr_sheet, isr_headers)):
+            for col, header in enumerate(headers):
+                worksheet.write(0, col, header, column_header_format)
+
+        saving_sheet.write(0, 0, 'Esquema Tradicional', header_format)
+        saving_sheet.write(0, dsi_col, 'Esquema DSI', header_format)
+        saving_sheet.write(0, comparison_col, 'Comparativa', header_format)
+        for start_col, headers in ((0, TRADITIONAL_HEADERS), (dsi_col, DSI_HEADERS), (comparison_col, COMPARISON_HEADERS)):
+            for col, header in enumerate(headers):
+                saving_sheet.write(1, start_col + col, header, column_header_format)
+
+        # Las tres fuentes se recorren a la par (pueden venir del mismo generador de resultados)
+        for row, (imss_row, isr_row, saving_row) in enumerate(itertools.zip_longest(imss_results, isr_results, saving_results), start=1):
+            if imss_row is not None:
+                write_row(imss_sheet, row, 0, imss_row)
+            if isr_row is not None:
+                write_row(isr_sheet, row, 0, isr_row)
+            if saving_row is not None:
+                # La hoja Ahorro tiene una fila extra de títulos
+                write_row(saving_sheet, row + 1, 0, [saving_row[index] for index in TRADITIONAL_INDEXES])
+                write_row(saving_sheet, row + 1, dsi_col, [saving_row[index] for index in DSI_INDEXES])
+                write_row(saving_sheet, row + 1, comparison_col, [saving_row[index] for index in COMPARISON_INDEXES])
+    finally:
+        workbook.close()
+
+
 def export_to_excel(imss_results, imss_headers, imss_totals, 
                    isr_results, isr_headers, isr_totals,
-                   saving_results, saving_headers, saving_totals):
+                   saving_results, saving_headers, saving_totals,
+                   constant_memory=False, filepath=None, metrics=None):
+    """
+    Exporta los resultados de IMSS, ISR y Ahorro a un libro de Excel.
+
+    Args:
+        constant_memory (bool): Si es True, escribe fila por fila con XlsxWriter sin crear DataFrames.
+            Los resultados pueden ser generadores (por ejemplo rows_from_columns sobre las columnas del
+            motor vectorizado) y cada uno se recorre una sola vez
+        filepath (str): Ruta del archivo; por defecto resultado_calculos/payroll_calculations_<fecha>.xlsx
+        metrics (StageMetrics): Si se indica, registra el tiempo de la exportación en la etapa export
+
+    Returns:
+        str: Ruta del archivo generado, o None si hubo un error
+    """
+    if metrics is not None:
+        with metrics.stage('export'):
+            return export_to_excel(imss_results, imss_headers, imss_totals, isr_results, isr_headers, isr_totals,
+                                   saving_results, saving_headers, saving_totals, constant_memory, filepath)
     try:
-        # Create traditional and DSI scheme DataFrames
-        traditional_headers = [
-            'Salario',
-            'Productividad',
-            'Esquema Tradicional Quincenal',
-            'Esquema Tradicional Mensual',
-            'Percepción Actual',
-        ]
-        
-        dsi_headers = [
-            'Salario',
-            'Salario DSI',
-            'Comisión DSI',
-            'Esquema DSI Quincenal',
-            'Esquema DSI Mensual',
-            'Percepción DSI',
-        ]
-        
-        comparison_headers = [
-            'Salario',
-            'Incremento',
-            'Porcentaje Incremento'
-        ]
+        if constant_memory:
+            filepath = filepath or _results_filepath()
+            _export_constant_memory(filepath, imss_results, imss_headers, isr_results, isr_headers, saving_results)
+            print(f"\nResults exported successfully to: {filepath}")
+            return filepath
+
+        # pandas solo se carga para la exportación con DataFrames
+        import pandas as pd
+
+        traditional_headers = TRADITIONAL_HEADERS
+        dsi_headers = DSI_HEADERS
+        comparison_headers = COMPARISON_HEADERS
 
         # Extract data for each scheme
-        traditional_data = [[row[0], row[2], row[4], row[6], row[10]] for row in saving_results]
-        dsi_data = [[row[0], row[1], row[3], row[5], row[7], row[11]] for row in saving_results]
-        comparison_data = [[row[0], row[12], row[13]] for row in saving_results]  # Removed division by 100
+        traditional_data = [[row[index] for index in TRADITIONAL_INDEXES] for row in saving_results]
+        dsi_data = [[row[index] for index in DSI_INDEXES] for row in saving_results]
+        comparison_data = [[row[index] for index in COMPARISON_INDEXES] for row in saving_results]  # Removed division by 100
 
-        # Create timestamp for filename
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"payroll_calculations_{timestamp}.xlsx"
-        
-        # Create results directory if it doesn't exist
-        results_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "resultado_calculos")
-        if not os.path.exists(results_dir):
-            os.makedirs(results_dir)
-            
-        filepath = os.path.join(results_dir, filename)
+        filepath = filepath or _results_filepath()
         
         # Create a Pandas Excel writer using XlsxWriter as the engine
         writer = pd.ExcelWriter(filepath, engine='xlsxwriter')
@@ -1,13 +1,86 @@
 from .employees import Employee
 from .parameters import Parameters
 from .rcv import RCV
+from .parameter_set import ParameterSet
 import math
-from typing import Optional
 import inspect
+import functools
+from typing import Optional
+from . import tracing
+
+
+# Bases salariales para el salario diario integrado. La base SMG se representa como
+# (WAGE_BASIS_SMG, minimum_threshold_salary_override), ver smg_wage_basis()
+WAGE_BASIS_DECLARED = None
+WAGE_BASIS_DIRECT = 'direct'
+WAGE_BASIS_SMG = 'smg'
+
+# Atributos de los que dependen los cálculos; al modificarlos se limpia la caché
+_CACHE_INPUTS = frozenset([
+    'salary', 'daily_salary', 'payment_period', 'days', 'integration_factor', 'employee', 'fixed_fee', 'vsdf',
+    'contribution_ceiling', 'contribution_ceiling_2', 'surplus_employer', 'surplus_employee', 'tcf', 'smg',
+    'risk_percentage', 'retirement_employer', 'increase', 'infonavit_employer', 'total_salary', 'state_payroll_tax',
+    'severance_and_old_age_employee', 'smg_total_monthly_salary', 'cash_benefits_employer', 'cash_benefits_employee',
+    'benefits_in_kind_employer', 'benefits_in_kind_employee', 'invalidity_and_retirement_employer',
+    'invalidity_and_retirement_employee', 'childcare', 'rcv_year',
+])
+
+_MISSING = object()
+
+
+def smg_wage_basis(minimum_threshold_salary_override: Optional[float] = None):
+    """Base salarial que calcula el salario diario integrado a partir del salario mínimo (ver get_fixed_fee_for_smg)"""
+    return (WAGE_BASIS_SMG, minimum_threshold_salary_override)
+
+
+def _resolve_wage_basis(use_direct_daily_salary, wage_basis):
+    # El salario diario directo solo sustituye a la base declarada; una base SMG se conserva
+    if use_direct_daily_salary and wage_basis is WAGE_BASIS_DECLARED:
+        return WAGE_BASIS_DIRECT
+    return wage_basis
+
+
+def _memoized(method):
+    """
+    Guarda el resultado de un getter de IMSS por combinación de argumentos.
+
+    Los argumentos se completan con sus valores por defecto, así que la llave es la misma sin importar
+    si se pasaron posicionales o por nombre. Como la base salarial (wage_basis) es un argumento más,
+    cada variante (declarado, salario diario directo o SMG) ocupa su propia entrada.
+
+    Los getters no modifican la instancia, de modo que varios hilos pueden evaluar el mismo objeto:
+    en el peor caso dos hilos calculan el mismo valor y guardan el mismo resultado.
+    """
+    name = method.__name__
+    parameters = list(inspect.signature(method).parameters.values())[1:]
+    names = tuple(parameter.name for parameter in parameters)
+    defaults = tuple(parameter.default for parameter in parameters)
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if len(args) < len(names):
+            args = args + tuple(kwargs.get(names[i], defaults[i]) for i in range(len(args), len(names)))
+        key = (name,) + args
+        cache = self._cache
+        value = cache.get(key, _MISSING)
+        if value is _MISSING:
+            value = cache[key] = method(self, *args)
+        return value
+    return wrapper
 
 
 class IMSS:
-    def __init__(self, uma, imss_salary, daily_salary, payment_period, integration_factor, risk_class='I', minimum_threshold_salary=None, use_increment_percentage=None, imss_breakdown=None, is_salary_bigger_than_smg=False):
+    def __init__(self, uma, imss_salary, daily_salary, payment_period, integration_factor, risk_class='I', minimum_threshold_salary=None, use_increment_percentage=None, imss_breakdown=None, is_salary_bigger_than_smg=False, rcv_year=None, parameters: Optional[ParameterSet] = None):
+        # Caché de getters por variante (ver _memoized)
+        self._cache = {}
+
+        # Tasas y umbrales del cálculo; si no se recibe un ParameterSet se toma una foto de Parameters.
+        # Con un ParameterSet, la UMA y el año RCV salen del conjunto
+        if parameters is None:
+            parameters = ParameterSet.from_parameters(uma=uma, rcv_year=rcv_year)
+        self.parameter_set = parameters
+        uma = parameters.uma
+
         # Handle the case where payment_period might be a risk class
         if isinstance(payment_period, str):
             risk_class = risk_class
@@ -17,6 +90,8 @@ class IMSS:
         self._init_base_parameters(uma, imss_salary, daily_salary, integration_factor, risk_class, payment_period, minimum_threshold_salary, use_increment_percentage, imss_breakdown, is_salary_bigger_than_smg)
         # Inicialización de parámetros de beneficios
         self._init_benefit_parameters()
+        # Año de la tabla RCV, fijo durante la vida de la instancia
+        self.rcv_year = parameters.rcv_year
 
     # Método auxiliar para inicializar parámetros base
     def _init_base_parameters(self, uma, imss_salary, daily_salary, integration_factor, risk_class, payment_period, minimum_threshold_salary=None, use_increment_percentage=None, imss_breakdown=None, is_salary_bigger_than_smg=False):
@@ -29,24 +104,24 @@ class IMSS:
         self.days = self.employee.payment_period
         self.integration_factor = integration_factor
         self.imss_breakdown = imss_breakdown
-        self.fixed_fee = Parameters.FIXED_FEE
+        self.fixed_fee = self.parameter_set.fixed_fee
         self.vsdf = uma
         self.contribution_ceiling = self.vsdf * 25
         self.contribution_ceiling_2 = self.vsdf * 25
-        self.surplus_employer = Parameters.SURPLUS_EMPLOYER
-        self.surplus_employee = Parameters.SURPLUS_EMPLOYEE
+        self.surplus_employer = self.parameter_set.surplus_employer
+        self.surplus_employee = self.parameter_set.surplus_employee
         self.tcf = self.vsdf * 3
-        self.smg = Parameters.SMG
-        self.risk_percentage = Parameters.get_risk_percentage(risk_class) if type(risk_class) == str else risk_class
-        self.retirement_employer = Parameters.RETIREMENT_EMPLOYER
-        self.increase = Parameters.INCREASE if use_increment_percentage else 0
+        self.smg = self.parameter_set.smg
+        self.risk_percentage = self.parameter_set.risk_percentage(risk_class)
+        self.retirement_employer = self.parameter_set.retirement_employer
+        self.increase = self.parameter_set.increase if use_increment_percentage else 0
 
         # Inicializamos RCV después de tener el salario diario integrado
         self.rcv = None  # Se inicializará cuando se necesite
-        self.infonavit_employer = Parameters.INFONAVIT_EMPLOYER
+        self.infonavit_employer = self.parameter_set.infonavit_employer
         self.total_salary = self.employee.calculate_total_salary()
-        self.state_payroll_tax = Parameters.STATE_PAYROLL_TAX
-        self.severance_and_old_age_employee = Parameters.SEVERANCE_AND_OLD_AGE_EMPLOYEE
+        self.state_payroll_tax = self.parameter_set.state_payroll_tax
+        self.severance_and_old_age_employee = self.parameter_set.severance_and_old_age_employee
         self.smg_total_salary = self.employee.calculate_total_minimum_salary(self.smg)
         self.smg_total_monthly_salary = minimum_threshold_salary
         
@@ -57,16 +132,26 @@ class IMSS:
         self.tax_payroll_with_daily_salary = None
         self.is_salary_bigger_than_smg = is_salary_bigger_than_smg
 
+    def __setattr__(self, name, value):
+        # Cualquier cambio en un dato de entrada invalida los resultados guardados
+        if name in _CACHE_INPUTS and self.__dict__.get('_cache'):
+            self._cache.clear()
+        object.__setattr__(self, name, value)
+
+    def invalidate_cache(self):
+        """Descarta los resultados guardados (por ejemplo, después de modificar self.employee)"""
+        self._cache.clear()
+
     # Método auxiliar para inicializar parámetros de beneficios
 
     def _init_benefit_parameters(self):
-        self.cash_benefits_employer = Parameters.CASH_BENEFITS_EMPLOYER
-        self.cash_benefits_employee = Parameters.CASH_BENEFITS_EMPLOYEE
-        self.benefits_in_kind_employer = Parameters.BENEFITS_IN_KIND_EMPLOYER
-        self.benefits_in_kind_employee = Parameters.BENEFITS_IN_KIND_EMPLOYEE
-        self.invalidity_and_retirement_employer = Parameters.INVALIDITY_AND_RETIREMENT_EMPLOYER
-        self.invalidity_and_retirement_employee = Parameters.INVALIDITY_AND_RETIREMENT_EMPLOYEE
-        self.childcare = Parameters.CHILDCARE
+        self.cash_benefits_employer = self.parameter_set.cash_benefits_employer
+        self.cash_benefits_employee = self.parameter_set.cash_benefits_employee
+        self.benefits_in_kind_employer = self.parameter_set.benefits_in_kind_employer
+        self.benefits_in_kind_employee = self.parameter_set.benefits_in_kind_employee
+        self.invalidity_and_retirement_employer = self.parameter_set.invalidity_and_retirement_employer
+        self.invalidity_and_retirement_employee = self.parameter_set.invalidity_and_retirement_employee
+        self.childcare = self.parameter_set.childcare
 
     def get_integration_factor(self):
         return self.integration_factor
@@ -74,24 +159,32 @@ class IMSS:
     # ------------------------------------------------------ CALCULO DE CUOTAS DEL IMSS PATRÓN ------------------------------------------------------
 
     #  TOPE DE SALARIO 25 SMG DF ------- Columna Gnumero
-    def get_salary_cap_25_smg(self):
-        return min(self.get_integrated_daily_wage(), self.contribution_ceiling)
+    @_memoized
+    def get_salary_cap_25_smg(self, wage_basis=WAGE_BASIS_DECLARED):
+        return min(self.get_integrated_daily_wage(wage_basis=wage_basis), self.contribution_ceiling)
 
     # SALARIO DIARIO INTEGRADO, después de aplicar el factor de integración ------- Columna Enumero
-    def get_integrated_daily_wage(self, use_direct_daily_salary=False):
-        if use_direct_daily_salary:
+    @_memoized
+    def get_integrated_daily_wage(self, use_direct_daily_salary=False, wage_basis=WAGE_BASIS_DECLARED):
+        wage_basis = _resolve_wage_basis(use_direct_daily_salary, wage_basis)
+        if wage_basis is WAGE_BASIS_DECLARED:
+            daily_salary_integrated = self.employee.calculate_salary_dialy()
+            return daily_salary_integrated * self.integration_factor
+        if wage_basis == WAGE_BASIS_DIRECT:
             return self.daily_salary * self.integration_factor
-        daily_salary_integrated = self.employee.calculate_salary_dialy()
-        return daily_salary_integrated * self.integration_factor
+        # Base SMG: (WAGE_BASIS_SMG, minimum_threshold_salary_override)
+        return self.get_integrated_daily_wage_for_smg(wage_basis[1])
 
     # ENFERMEDADES Y MATERNIDAD CUOTA DEL PATRÓN ------- Columna Hnumero
-    def get_diseases_and_maternity_employer_quota(self):
-        daily_wage = self.get_integrated_daily_wage()
+    @_memoized
+    def get_diseases_and_maternity_employer_quota(self, wage_basis=WAGE_BASIS_DECLARED):
+        daily_wage = self.get_integrated_daily_wage(wage_basis=wage_basis)
         return self.vsdf * self.days * self.fixed_fee if daily_wage > 0 else 0
 
     # ENFERMEDADES Y MATERNIDAD EXCEDENTE DEL PATRÓN ------- Columna Inumero
-    def get_diseases_and_maternity_employer_surplus(self):
-        salary_cap_25_smg = self.get_salary_cap_25_smg()
+    @_memoized
+    def get_diseases_and_maternity_employer_surplus(self, wage_basis=WAGE_BASIS_DECLARED):
+        salary_cap_25_smg = self.get_salary_cap_25_smg(wage_basis)
         return ((salary_cap_25_smg - self.tcf) * self.surplus_employer * self.days) if salary_cap_25_smg > self.tcf else 0
 
     # Método auxiliar para calcular beneficios con lógica común
@@ -102,22 +195,25 @@ class IMSS:
         return (base_salary * (employer_rate + employee_rate)) * self.days
 
     # PRESTACIONES EN DINERO PATRÓN ------- Columna Knumero
-    def get_employer_cash_benefits(self):
+    @_memoized
+    def get_employer_cash_benefits(self, wage_basis=WAGE_BASIS_DECLARED):
         return self._calculate_benefit(
-            self.get_salary_cap_25_smg(),
+            self.get_salary_cap_25_smg(wage_basis),
             self.cash_benefits_employer,
             self.cash_benefits_employee
         )
 
     # PRESTACIONES EN DINERO TRABAJADOR ------- Columna Lnumero
-    def get_employee_cash_benefits(self):
-        salary_cap_25_smg = self.get_salary_cap_25_smg()
+    @_memoized
+    def get_employee_cash_benefits(self, wage_basis=WAGE_BASIS_DECLARED):
+        salary_cap_25_smg = self.get_salary_cap_25_smg(wage_basis)
         return (salary_cap_25_smg * self.cash_benefits_employee * self.days) if salary_cap_25_smg > self.smg else 0
 
     # PRESTACIONES EN ESPECIE PATRÓN (GASTOS MÉDICOS) ------- Columna Mnumero
-    def get_benefits_in_kind_medical_expenses_employer(self):
+    @_memoized
+    def get_benefits_in_kind_medical_expenses_employer(self, wage_basis=WAGE_BASIS_DECLARED):
         return self._calculate_benefit(
-            self.get_salary_cap_25_smg(),
+            self.get_salary_cap_25_smg(wage_basis),
             self.benefits_in_kind_employer,
             self.benefits_in_kind_employee
         )
@@ -125,171 +221,155 @@ class IMSS:
     # RIESGOS DEL TRABAJO PATRÓN ------- Columna Onumero
     # NOTA: En caso de que se lea mal el risk_percentage, puede generar números muy grandes, por ejemplo, si se coloca en la Nómina Ciega 1.25 así se hará
     # muy grande, por ejemplo, 7 * 278.80 * 1.25 = 2,439.5, mientras que si es 1.25% se hace 7 * 278.80 * 0.0125 = 20.40
-    def get_occupational_risks_employer(self):
-        return self.days * self.get_salary_cap_25_smg() * self.risk_percentage
+    @_memoized
+    def get_occupational_risks_employer(self, wage_basis=WAGE_BASIS_DECLARED):
+        return self.days * self.get_salary_cap_25_smg(wage_basis) * self.risk_percentage
 
     # TOPE DE SALARIO 25 SMG DF CON TC2 ------- Columna Qnumero
-    def get_salary_cap_25_smg_2(self, use_direct_daily_salary=False):
-        if use_direct_daily_salary:
-            return min(self.get_integrated_daily_wage(True), self.contribution_ceiling_2)
-        return min(self.get_integrated_daily_wage(), self.contribution_ceiling_2)
+    @_memoized
+    def get_salary_cap_25_smg_2(self, use_direct_daily_salary=False, wage_basis=WAGE_BASIS_DECLARED):
+        return min(self.get_integrated_daily_wage(use_direct_daily_salary, wage_basis), self.contribution_ceiling_2)
 
     # INVALIDEZ Y VIDA PATRÓN ------- Columna Rnumero
-    def get_invalidity_and_retirement_employer(self):
+    @_memoized
+    def get_invalidity_and_retirement_employer(self, wage_basis=WAGE_BASIS_DECLARED):
         return self._calculate_benefit(
-            self.get_salary_cap_25_smg_2(),
+            self.get_salary_cap_25_smg_2(wage_basis=wage_basis),
             self.invalidity_and_retirement_employer,
             self.invalidity_and_retirement_employee
         )
 
     # GUARDERIAS Y PS PATRÓN ------- Columna Tnumero
-    def get_childcare_employer(self):
-        return self.childcare * self.get_salary_cap_25_smg() * self.days
+    @_memoized
+    def get_childcare_employer(self, wage_basis=WAGE_BASIS_DECLARED):
+        return self.childcare * self.get_salary_cap_25_smg(wage_basis) * self.days
 
     # CUOTAS IMSS PATRÓN ------- Columna Vnumero
                 
-    def get_quota_employer(self, use_direct_daily_salary=False):
-        # Guardar el método original
-        original_method = self.get_integrated_daily_wage
+    @_memoized
+    def get_quota_employer(self, use_direct_daily_salary=False, wage_basis=WAGE_BASIS_DECLARED):
         if use_direct_daily_salary:
-            # Override que usa daily_salary directo (captura original_method)
-            def get_integrated_daily_wage_override():
-                return original_method(True)
-            self.get_integrated_daily_wage = get_integrated_daily_wage_override
-        try:
-            # Formatear el print de manera legible
-            # print("\n=== DESGLOSE DE CUOTAS IMSS PATRÓN ===")
-            # print(f"Enfermedades y Maternidad (Cuota): {self.get_diseases_and_maternity_employer_quota():.4f}")
-            # print(f"Enfermedades y Maternidad (Excedente): {self.get_diseases_and_maternity_employee_surplus():.4f}")
-            # print(f"Prestaciones en Dinero: {self.get_employer_cash_benefits():.4f}")
-            # print(f"Prestaciones en Especie (Gastos Médicos): {self.get_benefits_in_kind_medical_expenses_employer():.4f}")
-            # print(f"Riesgos del Trabajo: {self.get_occupational_risks_employer():.4f}")
-            # print(f"Invalidez y Vida: {self.get_invalidity_and_retirement_employer():.4f}")
-            # print(f"Guarderías y PS: {self.get_childcare_employer():.4f}")
-            
-            quotas = [
-                self.get_diseases_and_maternity_employer_quota(),
-                self.get_diseases_and_maternity_employer_surplus(),
-                self.get_employer_cash_benefits(),
-                self.get_benefits_in_kind_medical_expenses_employer(),
-                self.get_occupational_risks_employer(),
-                self.get_invalidity_and_retirement_employer(),
-                self.get_childcare_employer()
-            ]
-            
-            total = sum(quotas)
-            # print(f"TOTAL CUOTAS IMSS PATRÓN: {total:.4f}")
-            # print("=" * 45)
-            
-            return total
-        finally:
-            if use_direct_daily_salary:
-                self.get_integrated_daily_wage = original_method
+            # Mismo cálculo con el salario diario directo como base
+            return self.get_quota_employer(wage_basis=_resolve_wage_basis(True, wage_basis))
+
+        # Formatear el print de manera legible
+        # print("\n=== DESGLOSE DE CUOTAS IMSS PATRÓN ===")
+        # print(f"Enfermedades y Maternidad (Cuota): {self.get_diseases_and_maternity_employer_quota():.4f}")
+        # print(f"Enfermedades y Maternidad (Excedente): {self.get_diseases_and_maternity_employee_surplus():.4f}")
+        # print(f"Prestaciones en Dinero: {self.get_employer_cash_benefits():.4f}")
+        # print(f"Prestaciones en Especie (Gastos Médicos): {self.get_benefits_in_kind_medical_expenses_employer():.4f}")
+        # print(f"Riesgos del Trabajo: {self.get_occupational_risks_employer():.4f}")
+        # print(f"Invalidez y Vida: {self.get_invalidity_and_retirement_employer():.4f}")
+        # print(f"Guarderías y PS: {self.get_childcare_employer():.4f}")
+
+        quotas = [
+            self.get_diseases_and_maternity_employer_quota(wage_basis),
+            self.get_diseases_and_maternity_employer_surplus(wage_basis),
+            self.get_employer_cash_benefits(wage_basis),
+            self.get_benefits_in_kind_medical_expenses_employer(wage_basis),
+            self.get_occupational_risks_employer(wage_basis),
+            self.get_invalidity_and_retirement_employer(wage_basis),
+            self.get_childcare_employer(wage_basis)
+        ]
+
+        total = sum(quotas)
+        # print(f"TOTAL CUOTAS IMSS PATRÓN: {total:.4f}")
+        # print("=" * 45)
+
+        return total
 
 
     # ------------------------------------------------------ CALCULO DE CUOTAS DEL IMSS TRABAJADOR ------------------------------------------------------
 
     # ENFERMEDADES Y MATERNIDAD EXCEDENTE DEL TRABAJADOR ------- Columna Jnumero
-    def get_diseases_and_maternity_employee_surplus(self):
-        salary_cap_25_smg = self.get_salary_cap_25_smg()
+    @_memoized
+    def get_diseases_and_maternity_employee_surplus(self, wage_basis=WAGE_BASIS_DECLARED):
+        salary_cap_25_smg = self.get_salary_cap_25_smg(wage_basis)
         # print("Columna G: ", salary_cap_25_smg, "Columna H: ", self.get_diseases_and_maternity_employer_quota(), "Columna I: ", self.get_diseases_and_maternity_employer_surplus())
         return ((salary_cap_25_smg - self.tcf) * self.surplus_employee * self.days) if salary_cap_25_smg > self.tcf else 0
 
     # PRESTACIONES EN ESPECIE TRABAJADOR (GASTOS MÉDICOS) ------- Columna Nnumero
-    def get_benefits_in_kind_medical_expenses_employee(self):
-        salary_cap_25_smg = self.get_salary_cap_25_smg()
+    @_memoized
+    def get_benefits_in_kind_medical_expenses_employee(self, wage_basis=WAGE_BASIS_DECLARED):
+        salary_cap_25_smg = self.get_salary_cap_25_smg(wage_basis)
         return ((salary_cap_25_smg * self.benefits_in_kind_employee) * self.days) if salary_cap_25_smg > self.smg else 0
 
     # INVALIDEZ Y VIDA TRABAJADOR ------- Columna Snumero
-    def get_invalidity_and_retirement_employee(self):
-        salary_cap_25_smg_2 = self.get_salary_cap_25_smg_2()
+    @_memoized
+    def get_invalidity_and_retirement_employee(self, wage_basis=WAGE_BASIS_DECLARED):
+        salary_cap_25_smg_2 = self.get_salary_cap_25_smg_2(wage_basis=wage_basis)
         return ((salary_cap_25_smg_2 * self.invalidity_and_retirement_employee) * self.days) if salary_cap_25_smg_2 > self.smg else 0
 
     # CUOTAS IMSS TRABAJADOR ------- Columna Wnumero
-    def get_quota_employee(self, use_direct_daily_salary=False):
+    @_memoized
+    def get_quota_employee(self, use_direct_daily_salary=False, wage_basis=WAGE_BASIS_DECLARED):
         # print("Columna J: ", self.get_diseases_and_maternity_employee_surplus(), "Columna L: ", self.get_employee_cash_benefits(), "Columna N: ", self.get_benefits_in_kind_medical_expenses_employee(), "Columna S: ", self.get_invalidity_and_retirement_employee())
-        
-        # Guardar el método original
-        original_method = self.get_integrated_daily_wage
         if use_direct_daily_salary:
-            # Override que usa daily_salary directo (captura original_method)
-            def get_integrated_daily_wage_override():
-                return original_method(True)
-            self.get_integrated_daily_wage = get_integrated_daily_wage_override
-        try:
-            quotas = [
-                self.get_diseases_and_maternity_employee_surplus(),
-                self.get_employee_cash_benefits(),
-                self.get_benefits_in_kind_medical_expenses_employee(),
-                self.get_invalidity_and_retirement_employee()
-            ]
-            return sum(quotas)
-        finally:
-            if use_direct_daily_salary:
-                self.get_integrated_daily_wage = original_method
+            # Mismo cálculo con el salario diario directo como base
+            return self.get_quota_employee(wage_basis=_resolve_wage_basis(True, wage_basis))
+
+        quotas = [
+            self.get_diseases_and_maternity_employee_surplus(wage_basis),
+            self.get_employee_cash_benefits(wage_basis),
+            self.get_benefits_in_kind_medical_expenses_employee(wage_basis),
+            self.get_invalidity_and_retirement_employee(wage_basis)
+        ]
+        return sum(quotas)
 
     # ------------------------------------------------------ TOTAL IMSS ------------------------------------------------------
 
     # CUOTAS IMSS TOTAL ------- Columna Xnumero
-    def get_total_imss(self):
-        return self.get_quota_employer() + self.get_quota_employee()
+    @_memoized
+    def get_total_imss(self, wage_basis=WAGE_BASIS_DECLARED):
+        return self.get_quota_employer(wage_basis=wage_basis) + self.get_quota_employee(wage_basis=wage_basis)
 
     # ------------------------------------------------------ CALCULO DE TOTAL DEL RCV PATRÓN ------------------------------------------------------
 
     # RETIRO PATRÓN ------- Columna Znumero
-    def get_retirement_employer(self, use_direct_daily_salary=False):
-        if use_direct_daily_salary:
-            # Tope con salario diario directo
-            salary_cap = min(self.get_integrated_daily_wage(True), self.contribution_ceiling)
-        else:
-            # Tope estándar
-            salary_cap = self.get_salary_cap_25_smg()
+    @_memoized
+    def get_retirement_employer(self, use_direct_daily_salary=False, wage_basis=WAGE_BASIS_DECLARED):
+        # Tope estándar o con salario diario directo según la base
+        salary_cap = self.get_salary_cap_25_smg(_resolve_wage_basis(use_direct_daily_salary, wage_basis))
         return salary_cap * self.days * self.retirement_employer
 
     # CESANTIA Y VEJEZ PATRÓN ------- Columna AAnumero
-    def _get_rcv(self, use_direct_daily_salary=False):
-        caller_frame = inspect.currentframe().f_back
-        info = inspect.getframeinfo(caller_frame)
-        # print(f"_get_rcv invocada desde {info.filename}, función {info.function}, línea {info.lineno}")
+    def _get_rcv(self, use_direct_daily_salary=False, wage_basis=WAGE_BASIS_DECLARED):
+        if tracing.enabled:
+            tracing.record_call_site('IMSS._get_rcv')
         # Siempre crear una nueva instancia con el valor actual del salario diario integrado
-        result_rcv = self.get_integrated_daily_wage(use_direct_daily_salary)
-        self.rcv = RCV(result_rcv, self.payment_period)
-        return self.rcv
+        result_rcv = self.get_integrated_daily_wage(use_direct_daily_salary, wage_basis)
+        rcv = RCV(result_rcv, self.payment_period, self.rcv_year)
+        # Solo como referencia del último RCV creado; los cálculos usan la instancia local
+        self.rcv = rcv
+        return rcv
 
     # CESANTIA Y VEJEZ PATRÓN ------- Columna AAnumero
-    def get_severance_and_old_age_employer(self, use_direct_daily_salary=False):
-        return self._get_rcv(use_direct_daily_salary).get_quota_employer()
+    @_memoized
+    def get_severance_and_old_age_employer(self, use_direct_daily_salary=False, wage_basis=WAGE_BASIS_DECLARED):
+        return self._get_rcv(use_direct_daily_salary, wage_basis).get_quota_employer()
 
     # ------------------------------------------------------ TOTAL RCV PATRÓN ------------------------------------------------------
     # TOTAL RCV PATRÓN ------- Columna ACnumero
-    def get_total_rcv_employer(self, use_direct_daily_salary=False):
-        # Ya no necesitamos reemplazar temporalmente el método
-        # Simplemente pasamos el parámetro a los métodos que lo necesitan
-        return self.get_retirement_employer() + self.get_severance_and_old_age_employer(use_direct_daily_salary)
+    @_memoized
+    def get_total_rcv_employer(self, use_direct_daily_salary=False, wage_basis=WAGE_BASIS_DECLARED):
+        # El retiro conserva la base recibida; solo la cesantía usa el salario diario directo
+        return self.get_retirement_employer(wage_basis=wage_basis) + self.get_severance_and_old_age_employer(use_direct_daily_salary, wage_basis)
 
     # ------------------------------------------------------ CALCULO DE INFONAVIT DEL PATRÓN ------------------------------------------------------
 
     # INFONAVIT PATRÓN ------- Columna AEnumero
-    def get_infonavit_employer(self, use_direct_daily_salary=False):
-        original_method = self.get_integrated_daily_wage
-
+    @_memoized
+    def get_infonavit_employer(self, use_direct_daily_salary=False, wage_basis=WAGE_BASIS_DECLARED):
         if use_direct_daily_salary:
-            # Override que usa daily_salary directamente
-            def get_integrated_daily_wage_override():
-                return original_method(True)
-            self.get_integrated_daily_wage = get_integrated_daily_wage_override
-
-        try:
-            return self.get_salary_cap_25_smg_2() * self.days * self.infonavit_employer
-        finally:
-            if use_direct_daily_salary:
-                # Restaurar el método original
-                self.get_integrated_daily_wage = original_method
+            # Mismo cálculo con el salario diario directo como base
+            return self.get_infonavit_employer(wage_basis=_resolve_wage_basis(True, wage_basis))
+        return self.get_salary_cap_25_smg_2(wage_basis=wage_basis) * self.days * self.infonavit_employer
 
 
     # ------------------------------------------------------ CALCULO DE IMPUESTO SOBRE NÓMINA ------------------------------------------------------
 
     # IMPUESTO SOBRE NÓMINA ------- Columna AFnumero
+    @_memoized
     def get_tax_payroll(self, use_smg=False, minimum_threshold_salary_override: Optional[float] = None, use_direct_daily_salary=False):
         if use_direct_daily_salary and not use_smg:
             # Calcular el total_salary basado en daily_salary
@@ -311,45 +391,54 @@ class IMSS:
     # ------------------------------------------------------ CALCULO TOTAL DEL PATRÓN ------------------------------------------------------
 
     # TOTAL PATRÓN ------- Columna AHnumero
-    def get_total_employer(self, use_smg=False, minimum_threshold_salary_override: Optional[float] = None):
+    @_memoized
+    def get_total_employer(self, use_smg=False, minimum_threshold_salary_override: Optional[float] = None, wage_basis=WAGE_BASIS_DECLARED):
         # print("Columna V: ", self.get_quota_employer(), "Columna AC: ", self.get_total_rcv_employer(), "Columna AEnumero: ", self.get_infonavit_employer(), "Columna AFnumero: ", self.get_tax_payroll(use_smg, minimum_threshold_salary_override=minimum_threshold_salary_override))
-        return self.get_quota_employer() + self.get_total_rcv_employer() + self.get_infonavit_employer() + self.get_tax_payroll(use_smg, minimum_threshold_salary_override=minimum_threshold_salary_override)
+        return self.get_quota_employer(wage_basis=wage_basis) + self.get_total_rcv_employer(wage_basis=wage_basis) + self.get_infonavit_employer(wage_basis=wage_basis) + self.get_tax_payroll(use_smg, minimum_threshold_salary_override=minimum_threshold_salary_override)
 
     # ------------------------------------------------------ CALCULO DE TOTAL DEL RCV TRABAJADOR ------------------------------------------------------
 
     # CESANTÍA Y VEJEZ TRABAJADOR ------- Columna ABnumero
-    def get_severance_and_old_age_employee(self, use_direct_daily_salary=False):
-        return (self.get_salary_cap_25_smg_2(use_direct_daily_salary) * self.severance_and_old_age_employee) * self.days if self.get_salary_cap_25_smg_2(use_direct_daily_salary) > self.smg else 0
+    @_memoized
+    def get_severance_and_old_age_employee(self, use_direct_daily_salary=False, wage_basis=WAGE_BASIS_DECLARED):
+        salary_cap_25_smg_2 = self.get_salary_cap_25_smg_2(use_direct_daily_salary, wage_basis)
+        return (salary_cap_25_smg_2 * self.severance_and_old_age_employee) * self.days if salary_cap_25_smg_2 > self.smg else 0
 
     # TOTAL RCV TRABAJADOR ------- Columna ADnumero
-    def get_total_rcv_employee(self):
-        return self.get_severance_and_old_age_employee()
+    @_memoized
+    def get_total_rcv_employee(self, wage_basis=WAGE_BASIS_DECLARED):
+        return self.get_severance_and_old_age_employee(wage_basis=wage_basis)
 
     # ------------------------------------------------------ CALCULO TOTAL DEL PATRÓN ------------------------------------------------------
 
     # TOTAL TRABAJADOR ------- Columna AJnumero
-    def get_total_employee(self):
-        return self.get_quota_employee() + self.get_total_rcv_employee()
+    @_memoized
+    def get_total_employee(self, wage_basis=WAGE_BASIS_DECLARED):
+        return self.get_quota_employee(wage_basis=wage_basis) + self.get_total_rcv_employee(wage_basis)
 
     # ------------------------------------------------------ CALCULO TOTAL SUMA COSTO SOCIAL ------------------------------------------------------
 
     # SUMA COSTO SOCIAL ------- Columna ALnumero
-    def get_total_social_cost(self, use_smg=False, minimum_threshold_salary_override: Optional[float] = None):
-        return self.get_total_employer(use_smg, minimum_threshold_salary_override=minimum_threshold_salary_override) + self.get_total_employee()
+    @_memoized
+    def get_total_social_cost(self, use_smg=False, minimum_threshold_salary_override: Optional[float] = None, wage_basis=WAGE_BASIS_DECLARED):
+        return self.get_total_employer(use_smg, minimum_threshold_salary_override, wage_basis) + self.get_total_employee(wage_basis)
 
     # ------------------------------------------------------ CALCULO 2.5 INCREMENTO ------------------------------------------------------
 
     # 2.5 INCREMENTO ------- Columna ANnumero
-    def get_increment(self, use_smg=False, minimum_threshold_salary_override: Optional[float] = None):
-        return self.get_total_social_cost(use_smg, minimum_threshold_salary_override=minimum_threshold_salary_override) * self.increase
+    @_memoized
+    def get_increment(self, use_smg=False, minimum_threshold_salary_override: Optional[float] = None, wage_basis=WAGE_BASIS_DECLARED):
+        return self.get_total_social_cost(use_smg, minimum_threshold_salary_override, wage_basis) * self.increase
 
     # ------------------------------------------------------ CALCULO SUMA COSTO SOCIAL SUGERIDO ------------------------------------------------------
 
     # SUMA COSTO SOCIAL SUGERIDO ------- Columna APnumero
+    @_memoized
     def get_total_social_cost_suggested(self):
         return math.ceil(self.get_total_social_cost() + self.get_increment())
     
     # SALARIO DIARIO INTEGRADO PARA SMG, después de aplicar el factor de integración
+    @_memoized
     def get_integrated_daily_wage_for_smg(self, minimum_threshold_salary_override: Optional[float] = None):
         """Calcula el salario diario integrado basado en el salario mínimo en lugar del salario del empleado"""
         if minimum_threshold_salary_override is not None:
@@ -363,95 +452,101 @@ class IMSS:
         return daily_salary * self.integration_factor
     
     # SUMA COSTO SOCIAL SUGERIDO PARA OBTENER LA CUOTA FIJA ------- Columna APnumero
+    @_memoized
     def get_fixed_fee_for_smg(self, minimum_threshold_salary_override: Optional[float] = None):
-        original_method = self.get_integrated_daily_wage
-
-        # Override que ignora los args y usa siempre el SMG
-        def get_integrated_daily_wage_override(*args, **kwargs):
-            return self.get_integrated_daily_wage_for_smg(minimum_threshold_salary_override)
-
-        # Patch temporal
-        self.get_integrated_daily_wage = get_integrated_daily_wage_override
-
-        try:
-            # Cálculo usando salario mínimo integrado
-            total_social = self.get_total_social_cost(
-                use_smg=True,
-                minimum_threshold_salary_override=minimum_threshold_salary_override
-            )
-            increment = self.get_increment(
-                use_smg=True,
-                minimum_threshold_salary_override=minimum_threshold_salary_override
-            )
-            # print("TOTAL SOCIAL: ", total_social, "INCREMENT: ", increment)
-            return math.ceil(total_social + increment)
-            return math.ceil(self.get_total_social_cost(True, minimum_threshold_salary_override=minimum_threshold_salary_override) + self.get_increment(True, minimum_threshold_salary_override=minimum_threshold_salary_override))
-        finally:
-            # Restaurar método original
-            self.get_integrated_daily_wage = original_method
+        # Cálculo usando salario mínimo integrado como base salarial
+        wage_basis = smg_wage_basis(minimum_threshold_salary_override)
+        total_social = self.get_total_social_cost(
+            use_smg=True,
+            minimum_threshold_salary_override=minimum_threshold_salary_override,
+            wage_basis=wage_basis
+        )
+        increment = self.get_increment(
+            use_smg=True,
+            minimum_threshold_salary_override=minimum_threshold_salary_override,
+            wage_basis=wage_basis
+        )
+        # print("TOTAL SOCIAL: ", total_social, "INCREMENT: ", increment)
+        return math.ceil(total_social + increment)
 
 
 
-    # Método para calcular y almacenar los valores con daily_salary cuando imss_breakdown es True
-    def calculate_breakdown_values(self):
-        """
-        Calcula y almacena los valores desglosados usando salario diario directo.
+    # Método para calcular los valores con daily_salary cuando imss_breakdown es True
+    def evaluate_breakdown(self):
         """
-        # print("SE VA A EJECUTAR EL CALCULATE BREAKDOWN VALUES CON DAILY SALARY DE:", self.daily_salary)
+        Calcula los valores desglosados usando salario diario directo sin modificar la instancia.
 
+        Returns:
+            dict: Valores del desglose, o None si imss_breakdown no está activo
+        """
         if not self.imss_breakdown:
-            return
+            return None
 
         # 1) Obtiene el salario diario integrado directo
         integrated_direct = self.get_integrated_daily_wage(use_direct_daily_salary=True)
-        # 2) Crea una única instancia de RCV con ese salario
-        rcv_obj = RCV(integrated_direct, self.payment_period)
-
-        # 3) Cuota IMSS Patrón con salario diario - COLUMNA Vnumero
-        self.quota_employer_with_daily_salary = self.get_quota_employer(use_direct_daily_salary=True)
-        # 4) Cesantía y vejez (solo componente RCV) — reutiliza rcv_obj
-        self.severance_and_old_age_employer = rcv_obj.get_quota_employer()
-        # 5) Retiro PATRÓN con salario directo
+
+        # 2) Cuota IMSS Patrón con salario diario - COLUMNA Vnumero
+        quota_employer_with_daily_salary = self.get_quota_employer(use_direct_daily_salary=True)
+        # 3) Cesantía y vejez (solo componente RCV) con el salario integrado directo
+        severance_and_old_age_employer = self.get_severance_and_old_age_employer(use_direct_daily_salary=True)
+        # 4) Retiro PATRÓN con salario directo
         retiro_direct = self.get_retirement_employer(use_direct_daily_salary=True)
-        # 6) Total RCV Patrón con salario diario = Retiro + Cesantía
-        self.total_rcv_employer_with_daily_salary = retiro_direct + self.severance_and_old_age_employer
+        # 5) Total RCV Patrón con salario diario = Retiro + Cesantía
+        total_rcv_employer_with_daily_salary = retiro_direct + severance_and_old_age_employer
+
+        # 6) INFONAVIT y Nómina también con salario directo
+        infonavit_employer_with_daily_salary = self.get_infonavit_employer(use_direct_daily_salary=True)
+        tax_payroll_with_daily_salary = self.get_tax_payroll(use_direct_daily_salary=True)
+
+        quota_employe_with_daily_salary = self.get_quota_employee(use_direct_daily_salary=True)
 
-        # 7) INFONAVIT y Nómina también con salario directo
-        self.infonavit_employer_with_daily_salary = self.get_infonavit_employer(use_direct_daily_salary=True)
-        self.tax_payroll_with_daily_salary = self.get_tax_payroll(use_direct_daily_salary=True)
-        
-        self.quota_employe_with_daily_salary = self.get_quota_employee(use_direct_daily_salary=True)
-        
         # OBTENER RCV PARA EMPLEADO EN RETENCIONES ÚLTIMA TABLA
-        self.quota_employee_rcv_with_daily_salary = self.get_severance_and_old_age_employee(use_direct_daily_salary=True)
-        
+        quota_employee_rcv_with_daily_salary = self.get_severance_and_old_age_employee(use_direct_daily_salary=True)
+
         # Calcular las contribuciones del empleador (retenciones del empleado)
-        employer_contributions = self.quota_employe_with_daily_salary + self.quota_employee_rcv_with_daily_salary if not self.is_salary_bigger_than_smg else 0
-                
+        employer_contributions = quota_employe_with_daily_salary + quota_employee_rcv_with_daily_salary if not self.is_salary_bigger_than_smg else 0
+
         totals = [
-            self.quota_employer_with_daily_salary,
-            self.total_rcv_employer_with_daily_salary,
-            self.infonavit_employer_with_daily_salary,
-            self.tax_payroll_with_daily_salary,
+            quota_employer_with_daily_salary,
+            total_rcv_employer_with_daily_salary,
+            infonavit_employer_with_daily_salary,
+            tax_payroll_with_daily_salary,
             employer_contributions,  # Agregar las contribuciones del empleador
         ]
-        
-        
+
         total_tax_cost_breakdown = sum(totals)
 
-        # Crear un diccionario con los valores para devolver
         return {
             'integrated_direct': integrated_direct,
-            'quota_employer_with_daily_salary': self.quota_employer_with_daily_salary,
-            'total_rcv_employer_with_daily_salary': self.total_rcv_employer_with_daily_salary,
-            'infonavit_employer_with_daily_salary': self.infonavit_employer_with_daily_salary,
-            'tax_payroll_with_daily_salary': self.tax_payroll_with_daily_salary,
+            'quota_employer_with_daily_salary': quota_employer_with_daily_salary,
+            'severance_and_old_age_employer': severance_and_old_age_employer,
+            'total_rcv_employer_with_daily_salary': total_rcv_employer_with_daily_salary,
+            'infonavit_employer_with_daily_salary': infonavit_employer_with_daily_salary,
+            'tax_payroll_with_daily_salary': tax_payroll_with_daily_salary,
             'total_tax_cost_breakdown': total_tax_cost_breakdown,
-            'quota_employe_with_daily_salary': self.quota_employe_with_daily_salary,
-            'quota_employee_rcv_with_daily_salary': self.quota_employee_rcv_with_daily_salary,
+            'quota_employe_with_daily_salary': quota_employe_with_daily_salary,
+            'quota_employee_rcv_with_daily_salary': quota_employee_rcv_with_daily_salary,
             'employer_contributions': employer_contributions,  # Incluir en el retorno
         }
 
+    # Método para calcular y almacenar los valores con daily_salary cuando imss_breakdown es True
+    def calculate_breakdown_values(self):
+        """
+        Calcula y almacena los valores desglosados usando salario diario directo.
+        """
+        breakdown = self.evaluate_breakdown()
+        if breakdown is None:
+            return
+
+        self.quota_employer_with_daily_salary = breakdown['quota_employer_with_daily_salary']
+        self.severance_and_old_age_employer = breakdown['severance_and_old_age_employer']
+        self.total_rcv_employer_with_daily_salary = breakdown['total_rcv_employer_with_daily_salary']
+        self.infonavit_employer_with_daily_salary = breakdown['infonavit_employer_with_daily_salary']
+        self.tax_payroll_with_daily_salary = breakdown['tax_payroll_with_daily_salary']
+        self.quota_employe_with_daily_salary = breakdown['quota_employe_with_daily_salary']
+        self.quota_employee_rcv_with_daily_salary = breakdown['quota_employee_rcv_with_daily_salary']
+        return breakdown
+
     def __str__(self):
         """Método para mostrar información detallada de la instancia IMSS cuando se imprime"""
         # Formatear números para mejor legibilidad
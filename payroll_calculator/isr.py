@@ -1,88 +1,93 @@
 from .employees import Employee
 from .parameters import Parameters
+from .isr_tables import get_isr_brackets, get_employee_subsidy_brackets
 
 
 class ISR:
-    def __init__(self, monthly_salary, payment_period, periodicity, employee: Employee, minimum_threshold_salary=None, is_salary_bigger_than_smg=False, commission_and_bonus_for_isr=None, is_keep_declared_salary_and_breaked_mode=False):
+    def __init__(self, monthly_salary, payment_period, periodicity, employee: Employee, minimum_threshold_salary=None, is_salary_bigger_than_smg=False, commission_and_bonus_for_isr=None, is_keep_declared_salary_and_breaked_mode=False, parameters=None):
         self.employee = employee
         self.parameters = Parameters()
         self.monthly_salary = monthly_salary
         self.payment_period = payment_period
         self.periodicity = periodicity
-        self.SALARY_CREDIT_TABLE = Parameters.get_employee_subsidy_table(self.periodicity)
-        self.smg = Parameters.SMG
+        # SMG del ParameterSet de la corrida, o el de Parameters si no se recibe uno
+        self.smg = parameters.smg if parameters is not None else Parameters.SMG
         self.monthly_smg = minimum_threshold_salary
         self.is_salary_bigger_than_smg = is_salary_bigger_than_smg
         self.commission_and_bonus_for_isr = commission_and_bonus_for_isr
         self.is_keep_declared_salary_and_breaked_mode = is_keep_declared_salary_and_breaked_mode
 
+    # Tabla de subsidio del periodo; el cálculo usa get_salary_credit_brackets, así que solo se busca si se lee
+    @property
+    def SALARY_CREDIT_TABLE(self):
+        return Parameters.get_employee_subsidy_table(self.periodicity)
+
     # ------------------------------------------------------ CALCULO DEL IMPUESTO ------------------------------------------------------
 
     # Obtener la tabla del ISR según el periodo de pago
     def get_isr_table(self):
         return self.parameters.get_isr_table(self.periodicity)
 
+    # Tablas compiladas para búsqueda binaria del tramo aplicable
+    def get_isr_brackets(self):
+        return get_isr_brackets(self.periodicity)
+
+    def get_salary_credit_brackets(self):
+        return get_employee_subsidy_brackets(self.periodicity)
+
+    # Salario gravable (con comisiones y bonos si aplican)
+    def get_taxable_salary(self, use_smg=False):
+        salary = self.monthly_smg if use_smg else self.monthly_salary
+        if self.commission_and_bonus_for_isr is not None and not self.is_keep_declared_salary_and_breaked_mode:
+            salary += self.commission_and_bonus_for_isr
+        return salary
+
+    # Resuelve el tramo ISR una sola vez y devuelve las columnas E a J
+    def _resolve_tax(self, use_smg=False):
+        taxable_salary = self.get_taxable_salary(use_smg)
+        brackets = self.get_isr_brackets()
+        index = brackets.find(taxable_salary)
+        if index is None:
+            return None, 0, 0, 0, 0, 0
+        lower_limit = brackets.lower_limits[index]
+        surplus = taxable_salary - lower_limit
+        percentage = brackets.percentages[index]
+        fixed_fee = brackets.fixed_fees[index]
+        surplus_tax = surplus * percentage
+        return lower_limit, surplus, percentage, surplus_tax, fixed_fee, surplus_tax + fixed_fee
+
+    # Resuelve el tramo de crédito al salario y devuelve las columnas M y N
+    def _resolve_salary_credit(self):
+        brackets = self.get_salary_credit_brackets()
+        index = brackets.find(self.get_taxable_salary())
+        if index is None:
+            return None, 0
+        return brackets.lower_limits[index], brackets.credits[index]
+
     # Calcula el ISR mensual ------- Columna Enumero
     def get_lower_limit(self, use_smg=False):
         # Encuentra el mayor valor en lower_limit que sea menor o igual al salario mensual
-        applicable_limit = None
-        isr_table = self.get_isr_table()
-        
-        user_salary = self.monthly_smg if use_smg else self.monthly_salary
-        
-        if self.commission_and_bonus_for_isr is not None and not self.is_keep_declared_salary_and_breaked_mode:
-            user_salary +=  self.commission_and_bonus_for_isr
-            
-        for row in isr_table:
-            if row['lower_limit'] <= user_salary:
-                if applicable_limit is None or row['lower_limit'] > applicable_limit:
-                    applicable_limit = row['lower_limit']
-        return applicable_limit
+        return self._resolve_tax(use_smg)[0]
     
     # Calcula el excedente ------- Columna Fnumero
     def get_surplus(self, use_smg=False):
-        lower_limit = self.get_lower_limit(use_smg)
-        if lower_limit is None:
-            return 0
-        salary = self.monthly_smg if use_smg else self.monthly_salary
-        
-        # Agregar comisiones y bonos al salario si existen
-        if self.commission_and_bonus_for_isr is not None and not self.is_keep_declared_salary_and_breaked_mode:
-            salary += self.commission_and_bonus_for_isr
-        return salary - lower_limit
+        return self._resolve_tax(use_smg)[1]
 
     # Calcular el Porcentaje a aplicar en el excedente ------- Columna Gnumero
     def get_percentage_applied_to_excess(self, use_smg=False):
-        lower_limit = self.get_lower_limit(use_smg)
-        if lower_limit is None:
-            return 0
-            
-        isr_table = self.get_isr_table()
-        for row in isr_table:
-            if row['lower_limit'] == lower_limit:
-                return row['percentage']
-        return 0  # Default to 0 if no matching row is found
+        return self._resolve_tax(use_smg)[2]
             
     # Calcula el impuesto sobre el excedente ------- Columna Hnumero
     def get_surplus_tax(self, use_smg=False):
-        return self.get_surplus(use_smg) * self.get_percentage_applied_to_excess(use_smg)
+        return self._resolve_tax(use_smg)[3]
     
     # Calcula la Cuota Fija ------- Columna Inumero
     def get_fixed_fee(self, use_smg=False):
-        lower_limit = self.get_lower_limit(use_smg)
-        if lower_limit is None:
-            return 0
-            
-        get_isr_table = self.get_isr_table()
-        # Busca la cuota fija en la tabla ISR
-        for row in get_isr_table:
-            if row['lower_limit'] == lower_limit:
-                return row['fixed_fee']
-        return 0  # Default to 0 if no matching row is found
+        return self._resolve_tax(use_smg)[4]
 
     # Calcula el impuesto total ------- Columna Jnumero
     def get_total_tax(self, use_smg=False):
-        return self.get_surplus_tax(use_smg) + self.get_fixed_fee(use_smg)
+        return self._resolve_tax(use_smg)[5]
 
     # ------------------------------------------------------ CALCULO DE TOTALES ISR ------------------------------------------------------
 
@@ -93,36 +98,47 @@ class ISR:
     # Calcula el Rango crédito al Salario ------- Columna Mnumero
     def get_range_credit_to_salary(self):
         # Encuentra el mayor valor en lower_limit que sea menor o igual al salario mensual
-        applicable_limit = None
-        salary_with_commission = self.monthly_salary
-        
-        # Agregar comisiones y bonos al salario si existen
-        if self.commission_and_bonus_for_isr is not None and not self.is_keep_declared_salary_and_breaked_mode:
-            salary_with_commission += self.commission_and_bonus_for_isr
-            
-        for row in self.SALARY_CREDIT_TABLE:
-            if row['lower_limit'] <= salary_with_commission:
-                if applicable_limit is None or row['lower_limit'] > applicable_limit:
-                    applicable_limit = row['lower_limit']
-        return applicable_limit
+        return self._resolve_salary_credit()[0]
 
     # Calcula el Crédito al Salario ------- Columna Nnumero
     def get_salary_credit(self):
-        range_limit = self.get_range_credit_to_salary()
-        if range_limit is None:
-            return 0
-            
-        for row in self.SALARY_CREDIT_TABLE:
-            if row['lower_limit'] == range_limit:
-                return row['credit']
-        return 0
+        return self._resolve_salary_credit()[1]
 
     # Calculo del Impuesto a Cargo ------- Columna Onumero
     def get_tax_payable(self, use_smg=False):
         if self.is_salary_bigger_than_smg:
-            return self.get_isr(use_smg) - self.get_salary_credit() if self.get_isr(use_smg) > self.get_salary_credit() else 0
+            isr = self.get_isr(use_smg)
+            salary_credit = self.get_salary_credit()
+            return isr - salary_credit if isr > salary_credit else 0
         return 0
     
     # Calculo del Impuesto a Favor ------- Columna Pnumero
     def get_tax_in_favor(self):
-        return self.get_salary_credit() - self.get_isr() if self.get_isr() < self.get_salary_credit() else 0
+        isr = self.get_isr()
+        salary_credit = self.get_salary_credit()
+        return salary_credit - isr if isr < salary_credit else 0
+
+    def evaluate(self):
+        """
+        Calcula las columnas E a P del ISR resolviendo cada tramo una sola vez.
+
+        Returns:
+            dict: Valores de las columnas con las mismas llaves que combined_result
+        """
+        lower_limit, surplus, percentage, surplus_tax, fixed_fee, total_tax = self._resolve_tax()
+        range_credit, salary_credit = self._resolve_salary_credit()
+        tax_payable = total_tax - salary_credit if self.is_salary_bigger_than_smg and total_tax > salary_credit else 0
+        tax_in_favor = salary_credit - total_tax if total_tax < salary_credit else 0
+        return {
+            'isr_lower_limit': lower_limit,
+            'isr_surplus': surplus,
+            'isr_percentage_applied_to_surplus': percentage,
+            'isr_surplus_tax': surplus_tax,
+            'isr_fixed_fee': fixed_fee,
+            'isr_total_tax': total_tax,
+            'isr': total_tax,
+            'isr_range_credit_for_salary': range_credit,
+            'salary_credit': salary_credit,
+            'isr_tax_payable': tax_payable,
+            'isr_tax_in_favor': tax_in_favor,
+        }
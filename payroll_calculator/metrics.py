@@ -0,0 +1,226 @@
+"""
+Tiempos por etapa del cálculo.
+
+Un StageMetrics se pasa como `metrics=` a process_single_calculation, process_multiple_calculations,
+iter_calculations o export_to_excel y registra, para cada etapa (construcción de IMSS, desglose,
+ISR, Ahorro, armado de la fila, exportación, etc.), el número de llamadas, el tiempo total y un
+histograma logarítmico de duraciones. Sin metrics (el valor por defecto) cada etapa solo cuesta una
+comparación con None.
+
+Etapas que registra el motor:
+- rows: process_multiple_calculations completo (motor por objetos)
+- row: fila completa de calculate_row
+- row_cache: búsqueda en el RowCache
+- imss, imss_breakdown, isr, saving, saving_breakdown, employer_contributions: process_single_calculation
+- row_assembly: armado del diccionario de la fila; incluye los getters de IMSS, ISR y Ahorro, que
+  calculan sus valores al pedirlos
+- result_cache_lookup, result_cache_store: caché SQLite
+- batch, batch_rows: motor vectorizado y conversión de columnas a filas
+- export: export_to_excel
+
+Ejemplo:
+    metrics = StageMetrics()
+    rows = process_multiple_calculations(..., metrics=metrics)
+    print(metrics.report())
+"""
+import threading
+import time
+from contextlib import contextmanager
+
+# Cubetas del histograma: cada potencia de 2 (octava) se divide en 2^SUB_BUCKET_BITS cubetas del mismo
+# ancho, así que el límite de una cubeta está a lo más 12.5% del valor real. Las duraciones menores a
+# 2^(SUB_BUCKET_BITS + 1) ns tienen una cubeta por nanosegundo; se cubren hasta 2^HISTOGRAM_OCTAVES ns.
+SUB_BUCKET_BITS = 3
+HISTOGRAM_OCTAVES = 48
+HISTOGRAM_BUCKETS = (HISTOGRAM_OCTAVES - SUB_BUCKET_BITS + 1) << SUB_BUCKET_BITS
+
+
+def bucket_index(elapsed_ns):
+    """Cubeta del histograma de una duración en nanosegundos"""
+    exponent = elapsed_ns.bit_length() - 1
+    if exponent <= SUB_BUCKET_BITS:
+        return elapsed_ns
+    # Octava (exponent) y los SUB_BUCKET_BITS bits que siguen al más significativo
+    sub_bucket = (elapsed_ns >> (exponent - SUB_BUCKET_BITS)) & ((1 << SUB_BUCKET_BITS) - 1)
+    return min(((exponent - SUB_BUCKET_BITS + 1) << SUB_BUCKET_BITS) + sub_bucket, HISTOGRAM_BUCKETS - 1)
+
+
+def bucket_bounds(index):
+    """
+    Returns:
+        tuple: (límite inferior, ancho) en nanosegundos de la cubeta index
+    """
+    if index < 2 << SUB_BUCKET_BITS:
+        return index, 1
+    shift = (index >> SUB_BUCKET_BITS) - 1
+    sub_buckets = 1 << SUB_BUCKET_BITS
+    return (sub_buckets + index % sub_buckets) << shift, 1 << shift
+
+
+class StageStats:
+    """
+    Acumulado de una etapa.
+
+    Attributes:
+        count (int): Número de llamadas
+        total_ns (int): Tiempo total en nanosegundos
+        min_ns (int): Duración mínima
+        max_ns (int): Duración máxima
+        buckets (list): Conteo por cubeta del histograma
+    """
+
+    __slots__ = ('count', 'total_ns', 'min_ns', 'max_ns', 'buckets')
+
+    def __init__(self):
+        self.count = 0
+        self.total_ns = 0
+        self.min_ns = None
+        self.max_ns = 0
+        self.buckets = [0] * HISTOGRAM_BUCKETS
+
+    def add(self, elapsed_ns):
+        self.count += 1
+        self.total_ns += elapsed_ns
+        if self.min_ns is None or elapsed_ns < self.min_ns:
+            self.min_ns = elapsed_ns
+        if elapsed_ns > self.max_ns:
+            self.max_ns = elapsed_ns
+        self.buckets[bucket_index(elapsed_ns)] += 1
+
+    def merge(self, other):
+        self.count += other.count
+        self.total_ns += other.total_ns
+        if other.min_ns is not None and (self.min_ns is None or other.min_ns < self.min_ns):
+            self.min_ns = other.min_ns
+        self.max_ns = max(self.max_ns, other.max_ns)
+        self.buckets = [mine + theirs for mine, theirs in zip(self.buckets, other.buckets)]
+
+    def percentile(self, fraction):
+        """
+        Percentil aproximado con el histograma: se interpola linealmente dentro de la cubeta que lo
+        contiene y se acota por min y max.
+
+        Args:
+            fraction (float): Entre 0 y 1 (0.5 = mediana)
+
+        Returns:
+            float: Segundos, o None si no hay registros
+        """
+        if not self.count:
+            return None
+        target = fraction * self.count
+        seen = 0
+        for bucket, bucket_count in enumerate(self.buckets):
+            if bucket_count and seen + bucket_count >= target:
+                lower_ns, width_ns = bucket_bounds(bucket)
+                value_ns = lower_ns + width_ns * (target - seen) / bucket_count
+                return min(max(value_ns, self.min_ns), self.max_ns) / 1e9
+            seen += bucket_count
+        return self.max_ns / 1e9
+
+
+class StageMetrics:
+    """
+    Colector de tiempos por etapa, seguro para usarse desde varios hilos.
+
+    Las etapas se registran con `lap` (para código caliente) o con el context manager `stage`.
+    """
+
+    def __init__(self):
+        self._stages = {}
+        self._lock = threading.Lock()
+
+    def record(self, stage, elapsed_ns):
+        """Agrega una duración (en nanosegundos) a la etapa"""
+        with self._lock:
+            stats = self._stages.get(stage)
+            if stats is None:
+                stats = self._stages[stage] = StageStats()
+            stats.add(elapsed_ns)
+
+    def lap(self, stage, start_ns):
+        """
+        Registra el tiempo desde start_ns hasta ahora y regresa el instante actual para la siguiente etapa.
+
+        Ejemplo:
+            start = time.perf_counter_ns()
+            imss = IMSS(...)
+            start = metrics.lap('imss', start)
+        """
+        now = time.perf_counter_ns()
+        self.record(stage, now - start_ns)
+        return now
+
+    @contextmanager
+    def stage(self, name):
+        """Mide el bloque como una llamada de la etapa `name`"""
+        start = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter_ns() - start)
+
+    def merge(self, other):
+        """Suma los registros de otro StageMetrics (por ejemplo uno por cliente)"""
+        with other._lock:
+            stages = {name: stats for name, stats in other._stages.items()}
+        with self._lock:
+            for name, stats in stages.items():
+                self._stages.setdefault(name, StageStats()).merge(stats)
+
+    def reset(self):
+        with self._lock:
+            self._stages.clear()
+
+    @property
+    def stages(self):
+        """Nombres de las etapas registradas, en el orden en que aparecieron"""
+        return list(self._stages)
+
+    def __getitem__(self, stage):
+        return self._stages[stage]
+
+    def __contains__(self, stage):
+        return stage in self._stages
+
+    def totals(self):
+        """
+        Returns:
+            dict: Etapa -> {'count', 'total_seconds', 'mean_seconds', 'min_seconds', 'max_seconds', 'p50_seconds', 'p99_seconds'}
+        """
+        with self._lock:
+            return {
+                name: {
+                    'count': stats.count,
+                    'total_seconds': stats.total_ns / 1e9,
+                    'mean_seconds': stats.total_ns / stats.count / 1e9,
+                    'min_seconds': stats.min_ns / 1e9,
+                    'max_seconds': stats.max_ns / 1e9,
+                    'p50_seconds': stats.percentile(0.5),
+                    'p99_seconds': stats.percentile(0.99),
+                }
+                for name, stats in self._stages.items()
+            }
+
+    def histogram(self, stage):
+        """
+        Histograma de la etapa.
+
+        Returns:
+            list: Pares (límite superior en segundos, conteo) de las cubetas con registros
+        """
+        with self._lock:
+            buckets = list(self._stages[stage].buckets)
+        return [(sum(bucket_bounds(bucket)) / 1e9, count) for bucket, count in enumerate(buckets) if count]
+
+    def report(self):
+        """Tabla de texto con llamadas, tiempo total, promedio, p50 y p99 por etapa"""
+        lines = [f"{'Stage':<22}{'Calls':>10}{'Total (s)':>12}{'Mean (us)':>12}{'p50 (us)':>12}{'p99 (us)':>12}"]
+        for name, values in self.totals().items():
+            lines.append(f"{name:<22}{values['count']:>10}{values['total_seconds']:>12.4f}"
+                         f"{values['mean_seconds'] * 1e6:>12.1f}{values['p50_seconds'] * 1e6:>12.1f}"
+                         f"{values['p99_seconds'] * 1e6:>12.1f}")
+        return "\n".join(lines)
+
+    def __repr__(self):
+        return f"StageMetrics(stages={self.stages})"
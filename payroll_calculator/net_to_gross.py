@@ -0,0 +1,214 @@
+"""
+Cálculo inverso neto -> bruto para el modo puro especial.
+
+En el modo puro especial el neto del empleado es el salario del período menos las retenciones del
+esquema tradicional (ISR a cargo más cuotas IMSS del trabajador), es decir la columna
+salary_minus_retentions. Esa función del bruto es lineal por tramos: solo cambia de pendiente en los
+límites inferiores de las tablas ISR y de subsidio, en el SMG del período y en las fronteras de las
+curvas IMSS (ver cost_curves). Dentro de cada tramo es continua y creciente, y en las fronteras
+solo puede bajar (empiezan las cuotas del trabajador o baja el subsidio).
+
+solve_gross_for_net evalúa el neto en todas las fronteras de todos los empleados a la vez, elige para
+cada uno el primer tramo que alcanza su neto objetivo y resuelve dentro de ese tramo con regula
+falsi (método de Illinois). Como el tramo es lineal, salvo un posible quiebre donde el ISR causado
+iguala al subsidio, bastan uno o dos pasos por empleado.
+"""
+from collections import namedtuple
+import numpy as np
+from .isr_tables import get_isr_brackets, get_employee_subsidy_brackets
+from .parameter_set import resolve_parameters
+from .cost_curves import _curve_boundaries
+from .processors.batch import _imss_columns, _isr_columns, _salary_credit_columns
+
+DEFAULT_TOLERANCE = 1e-6
+DEFAULT_MAX_ITERATIONS = 50
+
+NetToGrossResult = namedtuple('NetToGrossResult', ['gross', 'net', 'iterations', 'converged'])
+NetToGrossResult.__doc__ = """
+Resultado de solve_gross_for_net (un arreglo por campo, una posición por empleado).
+
+- gross: Salario bruto del período (NaN si el neto objetivo no es finito)
+- net: Neto que produce ese bruto (salary_minus_retentions)
+- iterations: Pasos de regula falsi que usó cada empleado
+- converged: Si |net - objetivo| quedó dentro de la tolerancia
+"""
+
+
+def net_for_gross(gross, payment_periods, periodicity, integration_factors, risk_class='I',
+                  commissions_and_bonus_for_isr=None, parameters=None, uma=113.14, rcv_year=None):
+    """
+    Neto del modo puro especial (salary_minus_retentions) para arreglos de salarios brutos del período.
+
+    Usa las mismas fórmulas que process_batch_calculations, así que el resultado coincide con la
+    columna del motor para las mismas entradas.
+
+    Args:
+        gross (array): Salarios brutos del período
+        payment_periods (array o int): Días del período de cada empleado
+        periodicity (int): Periodicidad de las tablas ISR
+        integration_factors (array o float): Factor de integración de cada empleado
+        risk_class: Clase de riesgo ('I'...'V') o porcentaje directo
+        commissions_and_bonus_for_isr (array o float): Comisiones y bonos que se suman a la base del ISR
+        parameters (ParameterSet): Parámetros de la corrida; por defecto una foto de Parameters
+
+    Returns:
+        np.ndarray: Neto de cada empleado
+    """
+    parameters = resolve_parameters(parameters, uma, rcv_year)
+    gross = np.asarray(gross, dtype=float)
+    payment_period, integration_factor, commission_and_bonus = np.broadcast_arrays(
+        *(np.asarray(value, dtype=float) for value in (payment_periods, integration_factors,
+                                                        0.0 if commissions_and_bonus_for_isr is None else commissions_and_bonus_for_isr)))
+    return _net(gross, np.broadcast_to(payment_period, gross.shape), np.broadcast_to(integration_factor, gross.shape),
+                np.broadcast_to(commission_and_bonus, gross.shape), periodicity, parameters, parameters.risk_percentage(risk_class))
+
+
+def _net(salary, payment_period, integration_factor, commission_and_bonus, periodicity, parameters, risk_percentage):
+    # Mismo orden de operaciones que process_batch_calculations (traditional_retentions)
+    is_bigger = salary > parameters.smg * payment_period
+    imss = _imss_columns((salary / payment_period) * integration_factor, payment_period, parameters,
+                         risk_percentage, parameters.rcv_table())
+    taxable_salary = salary + commission_and_bonus
+    total_tax = _isr_columns(taxable_salary, get_isr_brackets(periodicity))['total_tax']
+    _, salary_credit = _salary_credit_columns(taxable_salary, get_employee_subsidy_brackets(periodicity))
+    isr_tax_payable = np.where(is_bigger & (total_tax > salary_credit), total_tax - salary_credit, 0.0)
+    retentions = np.where(is_bigger, isr_tax_payable + imss['quota_employee'] + imss['severance_employee'], isr_tax_payable)
+    return salary - retentions
+
+
+def _gross_breakpoints(payment_period, integration_factor, commission_and_bonus, periodicity, parameters):
+    """Matriz (empleados x fronteras) de salarios brutos donde el neto cambia de tramo, ordenada por fila"""
+    imss_boundaries = np.asarray(_curve_boundaries(parameters))
+    isr_limits = np.asarray(get_isr_brackets(periodicity).lower_limits)
+    subsidy_limits = np.asarray(get_employee_subsidy_brackets(periodicity).lower_limits)
+    columns = np.concatenate([
+        (parameters.smg * payment_period)[:, None],
+        # Salario diario integrado = (bruto / días) * factor
+        imss_boundaries[None, :] * (payment_period / integration_factor)[:, None],
+        isr_limits[None, :] - commission_and_bonus[:, None],
+        subsidy_limits[None, :] - commission_and_bonus[:, None],
+    ], axis=1)
+    return np.sort(np.maximum(columns, 0.0), axis=1)
+
+
+def solve_gross_for_net(target_nets, payment_periods, periodicity, integration_factors, risk_class='I',
+                        commissions_and_bonus_for_isr=None, parameters=None, uma=113.14, rcv_year=None,
+                        tolerance=DEFAULT_TOLERANCE, max_iterations=DEFAULT_MAX_ITERATIONS):
+    """
+    Encuentra el salario bruto del período que produce cada neto objetivo en el modo puro especial.
+
+    Cuando el neto no es monótono (por ejemplo justo arriba del SMG, donde empiezan las cuotas del
+    trabajador) regresa el bruto más bajo que alcanza el objetivo.
+
+    Args:
+        target_nets (array): Netos objetivo del período
+        payment_periods (array o int): Días del período de cada empleado
+        periodicity (int): Periodicidad de las tablas ISR
+        integration_factors (array o float): Factor de integración de cada empleado
+        risk_class: Clase de riesgo ('I'...'V') o porcentaje directo
+        commissions_and_bonus_for_isr (array o float): Comisiones y bonos que se suman a la base del ISR
+        parameters (ParameterSet): Parámetros de la corrida; por defecto una foto de Parameters
+        tolerance (float): Diferencia máxima aceptada entre el neto obtenido y el objetivo
+        max_iterations (int): Pasos máximos de regula falsi por empleado
+
+    Returns:
+        NetToGrossResult
+    """
+    parameters = resolve_parameters(parameters, uma, rcv_year)
+    risk_percentage = parameters.risk_percentage(risk_class)
+    target, payment_period, integration_factor, commission_and_bonus = (
+        np.array(value, dtype=float) for value in np.broadcast_arrays(
+            np.atleast_1d(np.asarray(target_nets, dtype=float)), payment_periods, integration_factors,
+            0.0 if commissions_and_bonus_for_isr is None else commissions_and_bonus_for_isr))
+    size = len(target)
+
+    gross = np.full(size, np.nan)
+    net = np.full(size, np.nan)
+    iterations = np.zeros(size, dtype=int)
+    converged = np.zeros(size, dtype=bool)
+
+    # Netos no positivos: el bruto es 0 (sin salario no hay retenciones)
+    non_positive = np.isfinite(target) & (target <= 0)
+    gross[non_positive] = 0.0
+    net[non_positive] = 0.0
+    converged[non_positive] = True
+    active = np.flatnonzero(np.isfinite(target) & (target > 0))
+    if len(active) == 0:
+        return NetToGrossResult(gross, net, iterations, converged)
+
+    target = target[active]
+    payment_period = payment_period[active]
+    integration_factor = integration_factor[active]
+    commission_and_bonus = commission_and_bonus[active]
+
+    def evaluate(salary, rows=slice(None)):
+        period, factor, commission = payment_period[rows], integration_factor[rows], commission_and_bonus[rows]
+        if salary.ndim == 2:
+            period, factor, commission = (np.broadcast_to(values[:, None], salary.shape) for values in (period, factor, commission))
+        return _net(salary, period, factor, commission, periodicity, parameters, risk_percentage)
+
+    # ------------------------------------------------------ ACOTAR ------------------------------------------------------
+
+    breakpoints = _gross_breakpoints(payment_period, integration_factor, commission_and_bonus, periodicity, parameters)
+    # Cota superior: arriba de la última frontera el neto crece con pendiente positiva, así que se duplica hasta alcanzar el objetivo
+    upper = np.maximum(breakpoints[:, -1], target) * 2
+    while True:
+        short = evaluate(upper) < target
+        if not np.any(short):
+            break
+        upper = np.where(short, upper * 2, upper)
+    grid = np.concatenate([np.zeros((len(target), 1)), breakpoints, upper[:, None]], axis=1)
+
+    # Valor en cada frontera y límite por la izquierda (justo antes de la frontera, donde el tramo sigue siendo continuo)
+    at_point = evaluate(grid)
+    left_grid = np.maximum(np.nextafter(grid, -np.inf), 0.0)
+    before_point = evaluate(left_grid)
+    reaches = (np.maximum(at_point, before_point) >= target[:, None])
+    reaches[:, 0] = False
+    segment = np.argmax(reaches, axis=1)
+    rows = np.arange(len(target))
+
+    low = grid[rows, segment - 1]
+    high = left_grid[rows, segment]
+    # Si el límite por la izquierda no alcanza el objetivo, el neto salta hacia arriba en la frontera y esa es la respuesta
+    at_boundary = before_point[rows, segment] < target
+    solution = np.where(at_boundary, grid[rows, segment], high)
+    solution_net = np.where(at_boundary, at_point[rows, segment], before_point[rows, segment])
+
+    # ------------------------------------------------------ RESOLVER ------------------------------------------------------
+
+    # Regula falsi (Illinois) dentro del tramo continuo (low, high]
+    f_low = evaluate(np.nextafter(low, np.inf)) - target
+    f_high = solution_net - target
+    done = at_boundary | (np.abs(f_high) <= tolerance)
+    steps = np.zeros(len(target), dtype=int)
+    side = np.zeros(len(target), dtype=int)
+    for _ in range(max_iterations):
+        pending = np.flatnonzero(~done)
+        if len(pending) == 0:
+            break
+        lo, hi, flo, fhi = low[pending], high[pending], f_low[pending], f_high[pending]
+        candidate = hi - fhi * (hi - lo) / (fhi - flo)
+        # Si la secante cae fuera del intervalo, se bisecta
+        candidate = np.where((candidate > lo) & (candidate < hi), candidate, (lo + hi) / 2)
+        value = evaluate(candidate, pending) - target[pending]
+        steps[pending] += 1
+        solution[pending] = candidate
+        solution_net[pending] = value + target[pending]
+
+        below = value < 0
+        # Illinois: si el mismo extremo se conserva dos veces, se divide su valor entre dos
+        keep_high = below & (side[pending] == -1)
+        keep_low = ~below & (side[pending] == 1)
+        f_high[pending] = np.where(below, np.where(keep_high, fhi / 2, fhi), value)
+        f_low[pending] = np.where(below, value, np.where(keep_low, flo / 2, flo))
+        high[pending] = np.where(below, hi, candidate)
+        low[pending] = np.where(below, candidate, lo)
+        side[pending] = np.where(below, -1, 1)
+        done[pending] = (np.abs(value) <= tolerance) | (high[pending] - low[pending] <= np.spacing(high[pending]) * 4)
+
+    gross[active] = solution
+    net[active] = solution_net
+    iterations[active] = steps
+    converged[active] = np.abs(solution_net - target) <= tolerance
+    return NetToGrossResult(gross, net, iterations, converged)
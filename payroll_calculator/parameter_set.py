@@ -0,0 +1,147 @@
+"""
+Parámetros de cálculo como valor inmutable.
+
+Un ParameterSet guarda todas las tasas, tablas y umbrales que usan IMSS, ISR, RCV y Ahorro (UMA,
+SMG, cuotas, niveles de riesgo, año de la tabla RCV, etc.). Se crea una vez por corrida y se pasa
+explícitamente al motor, así dos clientes con parámetros distintos se pueden calcular al mismo
+tiempo sin modificar los atributos de clase de Parameters. Las tablas ISR y RCV son datos fijos
+del paquete; el conjunto guarda el año con el que se elige la tabla RCV.
+"""
+import dataclasses
+import functools
+import hashlib
+import json
+from dataclasses import dataclass
+from typing import Tuple
+from .parameters import Parameters
+from .rcv_tables import get_compiled_rcv_table
+
+DEFAULT_UMA = 113.14
+
+
+@dataclass(frozen=True)
+class ParameterSet:
+    uma: float
+    smg: float
+    integration_factor: float
+    fixed_fee: float
+    surplus_employer: float
+    surplus_employee: float
+    cash_benefits_employer: float
+    cash_benefits_employee: float
+    benefits_in_kind_employer: float
+    benefits_in_kind_employee: float
+    invalidity_and_retirement_employer: float
+    invalidity_and_retirement_employee: float
+    childcare: float
+    retirement_employer: float
+    infonavit_employer: float
+    state_payroll_tax: float
+    severance_and_old_age_employee: float
+    increase: float
+    # Pares (clase de riesgo, porcentaje) ordenados por clase
+    risk_levels: Tuple[Tuple[str, float], ...]
+    rcv_year: int
+
+    def __post_init__(self):
+        # Se aceptan diccionarios de niveles de riesgo, pero se guardan como tupla para que el conjunto sea hashable
+        if isinstance(self.risk_levels, dict):
+            object.__setattr__(self, 'risk_levels', tuple(sorted(self.risk_levels.items())))
+        object.__setattr__(self, 'rcv_year', int(self.rcv_year))
+
+    @classmethod
+    def from_parameters(cls, uma=DEFAULT_UMA, rcv_year=None, **overrides):
+        """
+        Toma una foto de los valores actuales de Parameters.
+
+        Args:
+            uma (float): Valor de la UMA
+            rcv_year (int): Año de la tabla RCV (None = año actual, ver Parameters.resolve_rcv_year)
+            **overrides: Valores que reemplazan a los de Parameters (por ejemplo smg=315.04)
+
+        Returns:
+            ParameterSet
+        """
+        values = dict(
+            uma=uma,
+            smg=Parameters.SMG,
+            integration_factor=Parameters.INTEGRATION_FACTOR,
+            fixed_fee=Parameters.FIXED_FEE,
+            surplus_employer=Parameters.SURPLUS_EMPLOYER,
+            surplus_employee=Parameters.SURPLUS_EMPLOYEE,
+            cash_benefits_employer=Parameters.CASH_BENEFITS_EMPLOYER,
+            cash_benefits_employee=Parameters.CASH_BENEFITS_EMPLOYEE,
+            benefits_in_kind_employer=Parameters.BENEFITS_IN_KIND_EMPLOYER,
+            benefits_in_kind_employee=Parameters.BENEFITS_IN_KIND_EMPLOYEE,
+            invalidity_and_retirement_employer=Parameters.INVALIDITY_AND_RETIREMENT_EMPLOYER,
+            invalidity_and_retirement_employee=Parameters.INVALIDITY_AND_RETIREMENT_EMPLOYEE,
+            childcare=Parameters.CHILDCARE,
+            retirement_employer=Parameters.RETIREMENT_EMPLOYER,
+            infonavit_employer=Parameters.INFONAVIT_EMPLOYER,
+            state_payroll_tax=Parameters.STATE_PAYROLL_TAX,
+            severance_and_old_age_employee=Parameters.SEVERANCE_AND_OLD_AGE_EMPLOYEE,
+            increase=Parameters.INCREASE,
+            risk_levels=dict(Parameters.RISK_LEVELS),
+            rcv_year=Parameters.resolve_rcv_year(rcv_year),
+        )
+        unknown = set(overrides) - set(values)
+        if unknown:
+            raise TypeError(f"Parámetros desconocidos: {sorted(unknown)}")
+        values.update(overrides)
+        return cls(**values)
+
+    def replace(self, **changes):
+        """Copia con algunos valores cambiados"""
+        return dataclasses.replace(self, **changes)
+
+    def to_dict(self):
+        """Valores del conjunto como diccionario (risk_levels como dict)"""
+        values = dataclasses.asdict(self)
+        values['risk_levels'] = dict(self.risk_levels)
+        return values
+
+    @functools.cached_property
+    def content_hash(self):
+        """
+        Huella SHA-256 del contenido.
+
+        A diferencia de hash(), no depende del proceso (PYTHONHASHSEED), así que sirve como llave
+        de cachés compartidos entre procesos o guardados en disco.
+        """
+        payload = json.dumps(self.to_dict(), sort_keys=True, separators=(',', ':'))
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def risk_percentage(self, risk_class):
+        """Porcentaje de riesgo de trabajo; acepta la clase ('I'...'V') o el porcentaje directo"""
+        if type(risk_class) != str:
+            return risk_class
+        levels = dict(self.risk_levels)
+        risk_class = risk_class.upper()
+        if risk_class not in levels:
+            raise ValueError(
+                "Invalid risk class. Must be one of: I, II, III, IV, V, is receiving: ", risk_class)
+        return levels[risk_class]
+
+    def rcv_table(self):
+        """Tabla RCV compilada del año del conjunto"""
+        return get_compiled_rcv_table(self.rcv_year)
+
+    def retirement_percentage(self, salary_daily_wage):
+        """Porcentaje de cesantía y vejez para un salario diario integrado"""
+        return self.rcv_table().rate(salary_daily_wage)
+
+    def wage_and_salary_dsi(self, smg_multiplier, payment_period=None):
+        """Igual que Parameters.calculate_wage_and_salary_dsi, con el SMG del conjunto"""
+        daily_smg_value = self.smg * smg_multiplier
+        if payment_period is None:
+            return daily_smg_value
+        return daily_smg_value * payment_period
+
+
+def resolve_parameters(parameters=None, uma=DEFAULT_UMA, rcv_year=None):
+    """
+    Regresa el ParameterSet de una corrida: el que se recibió, o una foto de Parameters con la UMA y el año dados.
+    """
+    if parameters is not None:
+        return parameters
+    return ParameterSet.from_parameters(uma=uma, rcv_year=rcv_year)
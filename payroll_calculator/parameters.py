@@ -1,3 +1,6 @@
+from datetime import datetime
+
+
 class Parameters:
     # FACTOR DE INTEGRACIÓN
     INTEGRATION_FACTOR = 1.0493
@@ -124,23 +127,19 @@ class Parameters:
         return Parameters.RISK_LEVELS[risk_class]
 
     @staticmethod
-    def get_retirement_percentage(salary_daily_wage):
+    def get_retirement_percentage(salary_daily_wage, year=None):
         """
         Determina el porcentaje de retiro basado en el salario diario
         Args:
             salary_daily_wage (float): Salario diario
+            year (int | str): Año de la tabla RCV; por defecto el año actual (ver resolve_rcv_year)
         Returns:
             float: Porcentaje aplicable
         """
-        # Obtener la tabla RCV del año actual
-        rcv_table = Parameters.get_rcv_table_by_year()
-        
-        for range_data in rcv_table:
-            if range_data['lower_limit'] <= salary_daily_wage <= range_data['upper_limit']:
-                return range_data['percentage']
-        
-        # Último rango por defecto
-        return rcv_table[-1]['percentage']
+        from .rcv_tables import get_compiled_rcv_table
+
+        # Búsqueda binaria en la tabla RCV compilada del año
+        return get_compiled_rcv_table(Parameters.resolve_rcv_year(year)).rate(salary_daily_wage)
 
     @staticmethod
     def calculate_wage_and_salary_dsi(smg_multiplier, payment_period=None):
@@ -167,9 +166,24 @@ class Parameters:
         return period_smg_value
     
     @staticmethod
-    def get_rcv_table_by_year():
-        from datetime import datetime
+    def resolve_rcv_year(year=None):
+        """
+        Año de la tabla RCV que se usa en un cálculo.
+
+        Se resuelve una sola vez al iniciar cada corrida y se pasa explícitamente a cada fila, para que
+        una corrida que cruza el fin de año no mezcle tablas.
+
+        Args:
+            year (int | str): Año explícito; si es None se usa el año actual
+        Returns:
+            int: Año
+        """
+        if year is None:
+            return datetime.now().year
+        return int(year)
+
+    @staticmethod
+    def get_rcv_table_by_year(year=None):
         from .rcv_tables import get_rcv_table_by_year
-        
-        current_year = str(datetime.now().year)
-        return get_rcv_table_by_year(current_year)
+
+        return get_rcv_table_by_year(str(Parameters.resolve_rcv_year(year)))
@@ -1,5 +1,30 @@
 """
 Processors module for Payroll Calculator
+
+Los procesadores se importan al primer acceso (PEP 562): calculator y batch cargan NumPy y
+result_cache carga SQLite.
 """
+import importlib
+
+# Nombre -> módulo donde se define
+_LAZY_ATTRIBUTES = {
+    'process_single_calculation': 'calculator',
+    'process_multiple_calculations': 'calculator',
+    'iter_calculations': 'calculator',
+    'process_batch_calculations': 'batch',
+    'columns_to_rows': 'batch',
+    'RowCache': 'row_cache',
+    'ResultCache': 'result_cache',
+}
+
+
+def __getattr__(name):
+    if name in _LAZY_ATTRIBUTES:
+        value = getattr(importlib.import_module(f'.{_LAZY_ATTRIBUTES[name]}', __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
-from .calculator import process_single_calculation, process_multiple_calculations
\ No newline at end of file
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES))
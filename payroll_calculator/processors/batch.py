@@ -0,0 +1,489 @@
+import math
+import numpy as np
+from payroll_calculator.isr_tables import get_isr_brackets, get_employee_subsidy_brackets
+from payroll_calculator.parameter_set import resolve_parameters
+# Columnas cuyo valor puede ser None en el resultado por objetos (se representan con NaN)
+from payroll_calculator.results import NULLABLE_COLUMNS
+
+
+def _as_array(values, size, fill=0.0):
+    """
+    Convierte una lista opcional a un arreglo float de tamaño `size`.
+
+    Los valores faltantes (None o índices fuera de la lista) se reemplazan por `fill`.
+
+    Returns:
+    - (arreglo, máscara) donde la máscara indica qué posiciones tenían un valor real
+    """
+    result = np.full(size, fill, dtype=float)
+    present = np.zeros(size, dtype=bool)
+    if values is None:
+        return result, present
+    count = min(len(values), size)
+    given = np.asarray(values[:count], dtype=float)
+    present[:count] = ~np.isnan(given)
+    result[:count] = np.where(present[:count], given, fill)
+    return result, present
+
+
+def _rcv_percentage(wage, rcv_table):
+    """Porcentaje de cesantía y vejez con la tabla compilada (mismo resultado que Parameters.get_retirement_percentage)"""
+    return rcv_table.rates(wage)
+
+
+def _benefit(base_salary, employer_rate, employee_rate, days, smg):
+    """Versión vectorizada de IMSS._calculate_benefit"""
+    return np.where(base_salary > smg,
+                    (base_salary * employer_rate) * days,
+                    (base_salary * (employer_rate + employee_rate)) * days)
+
+
+def _imss_columns(wage, days, parameters, risk_percentage, rcv_table):
+    """
+    Calcula las columnas IMSS/RCV/INFONAVIT para un salario diario integrado dado.
+
+    Replica las fórmulas de IMSS con el mismo orden de operaciones para que el
+    resultado coincida exactamente con el cálculo por objetos.
+    """
+    uma = parameters.uma
+    smg = parameters.smg
+    tcf = uma * 3
+    salary_cap = np.minimum(wage, uma * 25)
+
+    # Cuotas patronales ------- Columnas H, I, K, M, O, R, T
+    diseases_quota = np.where(wage > 0, uma * days * parameters.fixed_fee, 0.0)
+    diseases_surplus = np.where(salary_cap > tcf, ((salary_cap - tcf) * parameters.surplus_employer) * days, 0.0)
+    cash_benefits = _benefit(salary_cap, parameters.cash_benefits_employer, parameters.cash_benefits_employee, days, smg)
+    benefits_in_kind = _benefit(salary_cap, parameters.benefits_in_kind_employer, parameters.benefits_in_kind_employee, days, smg)
+    occupational_risks = days * salary_cap * risk_percentage
+    invalidity = _benefit(salary_cap, parameters.invalidity_and_retirement_employer, parameters.invalidity_and_retirement_employee, days, smg)
+    childcare = parameters.childcare * salary_cap * days
+    quota_employer = diseases_quota + diseases_surplus + cash_benefits + benefits_in_kind + occupational_risks + invalidity + childcare
+
+    # Cuotas del trabajador ------- Columnas J, L, N, S
+    employee_surplus = np.where(salary_cap > tcf, ((salary_cap - tcf) * parameters.surplus_employee) * days, 0.0)
+    employee_cash = np.where(salary_cap > smg, salary_cap * parameters.cash_benefits_employee * days, 0.0)
+    employee_in_kind = np.where(salary_cap > smg, (salary_cap * parameters.benefits_in_kind_employee) * days, 0.0)
+    employee_invalidity = np.where(salary_cap > smg, (salary_cap * parameters.invalidity_and_retirement_employee) * days, 0.0)
+    quota_employee = employee_surplus + employee_cash + employee_in_kind + employee_invalidity
+
+    # RCV e INFONAVIT ------- Columnas Z, AA, AB, AE
+    retirement_employer = salary_cap * days * parameters.retirement_employer
+    severance_employer = np.where(wage <= 0, 0.0, (wage * _rcv_percentage(wage, rcv_table)) * days)
+    severance_employee = np.where(salary_cap > smg, (salary_cap * parameters.severance_and_old_age_employee) * days, 0.0)
+    infonavit_employer = salary_cap * days * parameters.infonavit_employer
+
+    return {
+        'quota_employer': quota_employer,
+        'quota_employee': quota_employee,
+        'retirement_employer': retirement_employer,
+        'severance_employer': severance_employer,
+        'total_rcv_employer': retirement_employer + severance_employer,
+        'severance_employee': severance_employee,
+        'infonavit_employer': infonavit_employer,
+    }
+
+
+def _isr_columns(taxable_salary, brackets):
+    """Columnas E a J del ISR para un arreglo de salarios gravables"""
+    lower_limits = np.asarray(brackets.lower_limits)
+    fixed_fees = np.asarray(brackets.fixed_fees)
+    percentages = np.asarray(brackets.percentages)
+    index = np.searchsorted(lower_limits, taxable_salary, side='right') - 1
+    found = index >= 0
+    safe_index = np.where(found, index, 0)
+
+    lower_limit = np.where(found, lower_limits[safe_index], np.nan)
+    surplus = np.where(found, taxable_salary - lower_limits[safe_index], 0.0)
+    percentage = np.where(found, percentages[safe_index], 0.0)
+    surplus_tax = surplus * percentage
+    fixed_fee = np.where(found, fixed_fees[safe_index], 0.0)
+    return {
+        'lower_limit': lower_limit,
+        'surplus': surplus,
+        'percentage': percentage,
+        'surplus_tax': surplus_tax,
+        'fixed_fee': fixed_fee,
+        'total_tax': surplus_tax + fixed_fee,
+    }
+
+
+def _salary_credit_columns(taxable_salary, brackets):
+    """Columnas M y N del ISR (rango y crédito al salario)"""
+    lower_limits = np.asarray(brackets.lower_limits)
+    credits = np.asarray(brackets.credits)
+    index = np.searchsorted(lower_limits, taxable_salary, side='right') - 1
+    found = index >= 0
+    safe_index = np.where(found, index, 0)
+    return (np.where(found, lower_limits[safe_index], np.nan),
+            np.where(found, credits[safe_index], 0.0))
+
+
+def process_batch_calculations(salaries, period_salaries, payment_periods, periodicity, integration_factors,
+                               use_increment_percentage, risk_class, smg_multiplier, commission_percentage_dsi,
+                               count_minimum_salary, stricted_mode, productivities=None, imss_breakdown=None,
+                               uma=113.14, applied_commission_to='salary', net_salaries=None, other_perceptions=None, productivity_to_zero=None, is_pure_mode=None,
+                               is_keep_declared_salary=None, is_pure_special_mode=None, is_standard_mode=None, is_staggered_mode=None, commissions_and_bonus_for_isr=None,
+                               rcv_year=None, parameters=None):
+    """
+    Versión columnar de process_multiple_calculations usando operaciones de NumPy.
+
+    Recibe los mismos parámetros que process_multiple_calculations (las listas pueden ser
+    arreglos de NumPy) y calcula todas las columnas de combined_result de una sola vez,
+    sin crear instancias de IMSS, ISR ni Saving por fila.
+
+    Parameters:
+    - rcv_year: Año de la tabla RCV (None = año actual, resuelto una sola vez para todo el lote)
+    - parameters: ParameterSet del lote; si se indica, uma y rcv_year se toman de él
+
+    Returns:
+    - columns: Diccionario {nombre de columna: arreglo} con una posición por salario procesado
+    - present: Diccionario {nombre de columna: máscara booleana} para las columnas que solo
+      existen en algunas filas (por ejemplo employer_contributions o isr_tax_payable_dsi)
+    """
+    parameters = resolve_parameters(parameters, uma, rcv_year)
+    salaries = [] if salaries is None else salaries
+    is_without_salary_mode = len(salaries) == 0
+    salaries_to_use = salaries if not is_without_salary_mode else productivities
+    is_percentage_mode = len(salaries) > 0 and productivities is not None and len(productivities) > 0
+
+    daily_salary = np.asarray(salaries_to_use if salaries_to_use is not None else [], dtype=float)
+    size = len(daily_salary)
+    payment_period = np.asarray(payment_periods[:size], dtype=float)
+    integration_factor = np.asarray(integration_factors[:size], dtype=float)
+    period_salary_input, has_period_salaries = _as_array(period_salaries, size)
+    if period_salaries is not None:
+        has_period_salaries = np.arange(size) < len(period_salaries)
+    productivity, _ = _as_array(productivities, size)
+    other_perception, has_other_perception = _as_array(other_perceptions, size)
+    commission_and_bonus, _ = _as_array(commissions_and_bonus_for_isr, size)
+    net_salary, _ = _as_array(net_salaries, size)
+    net_salary = np.where(np.isfinite(net_salary), net_salary, 0.0)
+
+    # Ignorar salarios que sean 0
+    keep = daily_salary != 0
+    daily_salary = daily_salary[keep]
+    payment_period = payment_period[keep]
+    integration_factor = integration_factor[keep]
+    period_salary_input = period_salary_input[keep]
+    has_period_salaries = has_period_salaries[keep]
+    productivity = productivity[keep]
+    other_perception = other_perception[keep]
+    has_other_perception = has_other_perception[keep]
+    commission_and_bonus = commission_and_bonus[keep]
+    net_salary = net_salary[keep]
+    if not len(daily_salary):
+        # Todas las filas se omiten: igual que process_multiple_calculations, no se valida nada más
+        return {}, {}
+
+    smg = parameters.smg
+    smg_for_period = smg * payment_period
+    salary = np.where(has_period_salaries, period_salary_input, daily_salary * payment_period)
+
+    if stricted_mode and np.any(smg_for_period > salary):
+        first = int(np.argmax(smg_for_period > salary))
+        raise ValueError(
+            f"SMG for {payment_period[first]:g} days is higher than salary. Skipping salary {salary[first]}.")
+
+    # ------------------------------------------------------ PARÁMETROS POR FILA ------------------------------------------------------
+
+    if count_minimum_salary > 0:
+        wage_and_salary_dsi = (smg * smg_multiplier) * payment_period
+    else:
+        wage_and_salary_dsi = salary
+    if is_percentage_mode:
+        wage_and_salary_dsi = daily_salary * payment_period
+
+    isr_threshold_salary = smg_for_period * count_minimum_salary if count_minimum_salary > 1 else np.zeros(len(salary))
+    imss_threshold_salary = smg_for_period * count_minimum_salary if count_minimum_salary > 0 else salary
+    period_salary = daily_salary * payment_period
+
+    salary_to_compare = np.where(wage_and_salary_dsi > 0, wage_and_salary_dsi, salary)
+    is_salary_processed_bigger_than_smg = salary_to_compare > smg_for_period
+    is_salary_completed_bigger_than_smg = salary > smg_for_period
+
+    daily_salary_to_use = np.where(has_period_salaries | bool(is_keep_declared_salary), daily_salary, wage_and_salary_dsi / periodicity)
+
+    risk_percentage = parameters.risk_percentage(risk_class)
+    increase = parameters.increase if use_increment_percentage else 0
+    rcv_table = parameters.rcv_table()
+    is_dsi_breakdown = imss_breakdown is not None
+
+    # ------------------------------------------------------ IMSS ------------------------------------------------------
+
+    integrated_daily_wage = (salary / payment_period) * integration_factor
+    imss = _imss_columns(integrated_daily_wage, payment_period, parameters, risk_percentage, rcv_table)
+    payroll_tax = salary * parameters.state_payroll_tax
+    total_employer = imss['quota_employer'] + imss['total_rcv_employer'] + imss['infonavit_employer'] + payroll_tax
+    total_employee = imss['quota_employee'] + imss['severance_employee']
+    total_social_cost = total_employer + total_employee
+    suggested_total_social_cost = np.ceil(total_social_cost + total_social_cost * increase)
+
+    # Cuota fija DSI calculada con el salario mínimo integrado (IMSS.get_fixed_fee_for_smg)
+    smg_wage = (imss_threshold_salary / payment_period) * integration_factor
+    imss_smg = _imss_columns(smg_wage, payment_period, parameters, risk_percentage, rcv_table)
+    smg_social_cost = (imss_smg['quota_employer'] + imss_smg['total_rcv_employer'] + imss_smg['infonavit_employer']
+                       + imss_threshold_salary * parameters.state_payroll_tax) + (imss_smg['quota_employee'] + imss_smg['severance_employee'])
+    fixed_fee_dsi = np.ceil(smg_social_cost + smg_social_cost * increase)
+
+    # Valores desglosados con salario diario directo (IMSS.calculate_breakdown_values)
+    integrated_direct = daily_salary_to_use * integration_factor
+    imss_direct = _imss_columns(integrated_direct, payment_period, parameters, risk_percentage, rcv_table)
+    tax_payroll_direct = daily_salary_to_use * payment_period * parameters.state_payroll_tax
+    employer_contributions_direct = np.where(is_salary_processed_bigger_than_smg, 0.0,
+                                             imss_direct['quota_employee'] + imss_direct['severance_employee'])
+    total_tax_cost_breakdown = (imss_direct['quota_employer'] + imss_direct['total_rcv_employer'] + imss_direct['infonavit_employer']
+                                + tax_payroll_direct + employer_contributions_direct)
+
+    # ------------------------------------------------------ ISR ------------------------------------------------------
+
+    isr_brackets = get_isr_brackets(periodicity)
+    subsidy_brackets = get_employee_subsidy_brackets(periodicity)
+
+    taxable_salary = salary + commission_and_bonus
+    isr = _isr_columns(taxable_salary, isr_brackets)
+    isr_smg = _isr_columns(isr_threshold_salary + commission_and_bonus, isr_brackets)
+    range_credit, salary_credit = _salary_credit_columns(taxable_salary, subsidy_brackets)
+
+    def tax_payable(total_tax, credit, is_bigger):
+        return np.where(is_bigger & (total_tax > credit), total_tax - credit, 0.0)
+
+    isr_tax_payable = tax_payable(isr['total_tax'], salary_credit, is_salary_completed_bigger_than_smg)
+    isr_tax_payable_smg = tax_payable(isr_smg['total_tax'], salary_credit, is_salary_completed_bigger_than_smg)
+    isr_tax_in_favor = np.where(isr['total_tax'] < salary_credit, salary_credit - isr['total_tax'], 0.0)
+
+    # ISR con salario del período, solo existe si hay desglose y el salario procesado supera el SMG
+    has_isr_breakdown = is_dsi_breakdown & is_salary_processed_bigger_than_smg
+    breakdown_commission = 0.0 if is_keep_declared_salary else commission_and_bonus
+    breakdown_taxable = period_salary + breakdown_commission
+    should_pass_true_for_tax = bool(is_staggered_mode or is_standard_mode)
+    breakdown_isr_base = breakdown_taxable if not should_pass_true_for_tax else isr_threshold_salary + breakdown_commission
+    isr_breakdown_total = _isr_columns(breakdown_isr_base, isr_brackets)['total_tax']
+    _, breakdown_credit = _salary_credit_columns(breakdown_taxable, subsidy_brackets)
+    isr_tax_payable_dsi = np.where(has_isr_breakdown, tax_payable(isr_breakdown_total, breakdown_credit, True), 0.0)
+
+    # ------------------------------------------------------ AHORRO ------------------------------------------------------
+
+    commission_and_bonus_for_saving = commission_and_bonus
+
+    def isr_retention_smg():
+        retention = np.where(isr_tax_payable_smg > isr_tax_in_favor, isr_tax_payable_smg, isr_tax_in_favor * -1)
+        return np.where(is_salary_processed_bigger_than_smg, retention, 0.0)
+
+    def total_retentions(traditional_schema=False, use_imss_breakdown=False):
+        is_bigger = is_salary_completed_bigger_than_smg if traditional_schema else is_salary_processed_bigger_than_smg
+        if use_imss_breakdown:
+            above = isr_tax_payable_dsi + imss_direct['quota_employee'] + imss_direct['severance_employee']
+            return np.where(is_bigger, above, isr_tax_payable_dsi)
+        above = isr_tax_payable + imss['quota_employee'] + imss['severance_employee']
+        return np.where(is_bigger, above, isr_tax_payable)
+
+    traditional_retentions = total_retentions(traditional_schema=True)
+    is_net_salary_mode = bool(is_pure_special_mode) & (net_salary > 0)
+
+    def productivity_for(wage_and_salary, use_original_wage=False):
+        wage_to_use = salary if use_original_wage else wage_and_salary
+        remaining_total = np.where(salary != wage_and_salary, wage_and_salary, wage_and_salary_dsi)
+        base_productivity = np.where(productivity != 0, productivity, wage_to_use - remaining_total)
+        base_productivity = base_productivity + other_perception
+        if is_keep_declared_salary:
+            base_productivity = other_perception
+        base_productivity = base_productivity + commission_and_bonus_for_saving
+        pure_special = net_salary - (wage_to_use - traditional_retentions)
+        return np.where(is_net_salary_mode, pure_special, base_productivity)
+
+    def total_income(wage_and_salary, original_wage_and_salary=None):
+        salary_to_use = wage_and_salary if original_wage_and_salary is None else np.where(original_wage_and_salary != 0, original_wage_and_salary, wage_and_salary)
+        return salary_to_use + other_perception + commission_and_bonus_for_saving
+
+    def commission_dsi(wage_and_salary, original_wage_and_salary=None):
+        if applied_commission_to == 'schema':
+            base_amount = productivity_for(wage_and_salary, use_original_wage=True)
+        elif applied_commission_to == 'total_income':
+            base_amount = total_income(wage_and_salary, original_wage_and_salary)
+        else:
+            base_amount = wage_and_salary
+        return base_amount * commission_percentage_dsi
+
+    employer_contributions = imss['quota_employee'] + imss['severance_employee']
+    total_traditional_scheme = np.where(is_salary_completed_bigger_than_smg, total_employer, total_employer + employer_contributions)
+
+    def traditional_scheme_biweekly(wage_and_salary):
+        income = total_income(wage_and_salary)
+        biweekly_total = income if is_without_salary_mode else income + total_traditional_scheme
+        if is_pure_mode:
+            biweekly_total = biweekly_total + commission_dsi(wage_and_salary)
+        return biweekly_total
+
+    def dsi_scheme_biweekly(wage_and_salary, original_wage_and_salary=None):
+        if is_percentage_mode is True or is_keep_declared_salary:
+            return (total_income(wage_and_salary, original_wage_and_salary) + total_tax_cost_breakdown
+                    + commission_dsi(wage_and_salary, original_wage_and_salary))
+        fixed_fee_to_use = 0 if is_without_salary_mode else fixed_fee_dsi
+        return total_income(wage_and_salary) + fixed_fee_to_use + commission_dsi(wage_and_salary)
+
+    def current_perception(wage_and_salary):
+        regular = total_income(wage_and_salary) - traditional_retentions
+        return np.where(is_net_salary_mode, productivity_for(wage_and_salary) + wage_and_salary - traditional_retentions, regular)
+
+    def current_perception_dsi(wage_and_salary):
+        total_wage_and_salary_dsi = wage_and_salary_dsi + productivity_for(wage_and_salary)
+        isr_retention_dsi = np.where(wage_and_salary > wage_and_salary_dsi, isr_retention_smg(), 0.0)
+        return np.where(is_salary_processed_bigger_than_smg, total_wage_and_salary_dsi - isr_retention_dsi, total_wage_and_salary_dsi)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        traditional_biweekly = traditional_scheme_biweekly(salary)
+        dsi_biweekly = dsi_scheme_biweekly(salary)
+        perception = current_perception(salary)
+        perception_dsi = current_perception_dsi(salary)
+        increment = perception_dsi - perception
+        productivity_column = productivity_for(salary)
+
+        saving_amount = traditional_biweekly - dsi_biweekly
+        saving_percentage = saving_amount / traditional_biweekly * 100
+        increment_percentage = increment / perception * 100
+
+        if is_dsi_breakdown:
+            # Saving.calculate_breakdown_values_for_dsi usa el salario del período en lugar del salario base
+            breakdown_traditional = traditional_scheme_biweekly(period_salary)
+            dsi_biweekly_column = dsi_scheme_biweekly(period_salary, salary)
+            saving_amount = breakdown_traditional - dsi_scheme_biweekly(period_salary)
+            saving_percentage = saving_amount / breakdown_traditional * 100
+
+            breakdown_retentions = total_retentions(use_imss_breakdown=True)
+            breakdown_income = total_income(period_salary, salary)
+            perception_dsi = np.where(is_salary_processed_bigger_than_smg, breakdown_income - breakdown_retentions, breakdown_income)
+
+            breakdown_perception = np.where(is_net_salary_mode,
+                                            productivity_for(period_salary) + period_salary - traditional_retentions,
+                                            total_income(salary) - total_retentions())
+            use_internal_perception = bool(is_percentage_mode or is_staggered_mode or is_keep_declared_salary or is_standard_mode)
+            regular_increment = current_perception_dsi(period_salary) - current_perception(period_salary)
+            if use_internal_perception:
+                increment = np.where(is_salary_processed_bigger_than_smg, perception_dsi - breakdown_perception, regular_increment)
+            else:
+                increment = regular_increment
+            increment_percentage = np.where(breakdown_perception != 0, increment / breakdown_perception * 100, 0.0)
+            productivity_column = productivity_for(period_salary, use_original_wage=True)
+        else:
+            dsi_biweekly_column = dsi_biweekly
+
+    if productivity_to_zero:
+        productivity_column = np.zeros(len(salary))
+
+    isr_retention_dsi = np.where(salary > wage_and_salary_dsi, isr_retention_smg(), 0.0)
+
+    columns = {
+        # IMSS results
+        "base_salary": salary,
+        "daily_salary": salary / payment_period,
+        "salary_for_calculation": daily_salary,
+        "integration_factor": integration_factor,
+        "integrated_daily_wage": integrated_daily_wage,
+        "imss_employer_fee": imss['quota_employer'],
+        "imss_employee_fee": np.where(is_salary_completed_bigger_than_smg, imss['quota_employee'], 0.0),
+        "rcv_employer_table": imss['severance_employer'],
+        "rcv_employer": imss['total_rcv_employer'],
+        "rcv_employee": np.where(is_salary_completed_bigger_than_smg, imss['severance_employee'], 0.0),
+        "infonavit_employer": imss['infonavit_employer'],
+        "payroll_tax": payroll_tax,
+        "suggested_total_social_cost": suggested_total_social_cost,
+        "minimum_salary": np.full(len(salary), smg),
+        "payment_period": payment_period,
+
+        # ISR results
+        "isr_lower_limit": isr['lower_limit'],
+        "isr_surplus": isr['surplus'],
+        "isr_percentage_applied_to_surplus": isr['percentage'],
+        "isr_surplus_tax": isr['surplus_tax'],
+        "isr_fixed_fee": isr['fixed_fee'],
+        "isr_total_tax": isr['total_tax'],
+        "isr": isr['total_tax'],
+        "isr_range_credit_for_salary": range_credit,
+        "salary_credit": salary_credit,
+        "isr_tax_payable": isr_tax_payable,
+        "isr_tax_in_favor": isr_tax_in_favor,
+
+        # Savings results
+        "dsi_salary": np.where(wage_and_salary_dsi != 0, wage_and_salary_dsi, salary),
+        "productivity": productivity_column,
+        "dsi_commission": commission_dsi(salary),
+        "total_traditional_scheme": total_traditional_scheme,
+        "traditional_scheme_biweekly": traditional_biweekly,
+        "dsi_scheme_biweekly": dsi_biweekly_column,
+        "traditional_scheme_monthly": traditional_biweekly * 2,
+        "dsi_scheme_monthly": dsi_biweekly * 2,
+        "saving_amount": saving_amount,
+        "saving_percentage": saving_percentage,
+        "total_retentions": traditional_retentions,
+        "current_perception": perception,
+        "dsi_perception": perception_dsi,
+        "increment": increment,
+        "increment_percentage": increment_percentage,
+        "dsi_scheme_fixed_fee": fixed_fee_dsi,
+        "salary_total_income": total_income(salary),
+        "other_perception": np.where(has_other_perception, other_perception, np.nan),
+
+        "commission_percentage_dsi": np.full(len(salary), commission_percentage_dsi * 100),
+        "isr_retention_dsi": isr_retention_dsi,
+        "uma_used": np.full(len(salary), parameters.uma),
+    }
+    present = {}
+
+    if imss_breakdown:
+        columns["total_retentions_dsi"] = total_retentions(use_imss_breakdown=True)
+        columns["total_tax_cost_breakdown"] = total_tax_cost_breakdown
+        columns["employer_contributions_dsi"] = employer_contributions_direct
+        columns["first_quota_employer_imss_dsi"] = imss_direct['quota_employer']
+        columns["first_total_rcv_employer_dsi"] = imss_direct['total_rcv_employer']
+        columns["first_infonavit_employer_dsi"] = imss_direct['infonavit_employer']
+        columns["first_tax_payroll_employer_dsi"] = tax_payroll_direct
+        columns["quota_employe_with_daily_salary"] = np.where(is_salary_processed_bigger_than_smg, imss_direct['quota_employee'], 0.0)
+        columns["quota_employee_rcv_with_daily_salary"] = np.where(is_salary_processed_bigger_than_smg, imss_direct['severance_employee'], 0.0)
+        columns["saving_total_retentions_isr_dsi"] = np.where(period_salary > wage_and_salary_dsi, isr_retention_smg(), 0.0)
+        columns["isr_tax_payable_dsi"] = isr_tax_payable_dsi
+        present["isr_tax_payable_dsi"] = has_isr_breakdown
+
+    # Solo las filas con salario menor o igual al SMG tienen aportaciones patronales
+    columns["employer_contributions"] = employer_contributions
+    present["employer_contributions"] = ~is_salary_completed_bigger_than_smg
+
+    if is_pure_special_mode is not None:
+        columns["net_salary"] = net_salary
+        columns["total_income_pure_special"] = np.where(net_salary > 0, productivity_for(salary) + salary, salary)
+
+    if is_pure_special_mode:
+        salary_minus_retentions = salary - traditional_retentions
+        columns["salary_minus_retentions"] = salary_minus_retentions
+        columns["total_cost_client"] = np.where(net_salary > 0, total_income(salary) + total_traditional_scheme, traditional_biweekly)
+        columns["total_cost_surplus"] = np.where(net_salary > 0, productivity_for(salary) + commission_dsi(salary), 0.0)
+        columns["productivity"] = np.where(net_salary > 0, net_salary - salary_minus_retentions, 0.0)
+
+    return columns, present
+
+
+def columns_to_rows(columns, present=None):
+    """
+    Convierte el resultado de process_batch_calculations en la lista de diccionarios
+    que devuelve process_multiple_calculations.
+    """
+    present = present or {}
+    names = list(columns)
+    values = {name: columns[name].tolist() for name in names}
+    masks = {name: mask.tolist() for name, mask in present.items()}
+    size = len(columns[names[0]]) if names else 0
+
+    rows = []
+    for i in range(size):
+        row = {}
+        for name in names:
+            if name in masks and not masks[name][i]:
+                continue
+            value = values[name][i]
+            if name in NULLABLE_COLUMNS and value != value:
+                value = None
+            elif name in ('suggested_total_social_cost', 'dsi_scheme_fixed_fee'):
+                value = math.ceil(value)
+            row[name] = value
+        rows.append(row)
+    return rows
@@ -1,31 +1,53 @@
 import os
+import time
+import functools
+import itertools
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
 from payroll_calculator.imss import IMSS
 from payroll_calculator.isr import ISR
 from payroll_calculator.saving import Saving
 from payroll_calculator.parameters import Parameters
+from payroll_calculator.parameter_set import resolve_parameters
 # Import the TotalCalculator class
 from payroll_calculator.totals import TotalCalculator
+from payroll_calculator.processors.batch import process_batch_calculations, columns_to_rows
+from payroll_calculator.processors.parallel import run_rows_in_processes
+from payroll_calculator.processors.row_cache import normalize_value
+from payroll_calculator.processors.result_cache import hash_row_key
+from payroll_calculator.readers import read_header, read_salary_columns
+from payroll_calculator.results import PayrollResults
+from payroll_calculator.progress import ProgressEvent, PROGRESS, ROW_SKIPPED, SMG_ABOVE_SALARY
 
 # VERIFICAR QUE SMG_MULTIPLIER Y COUNT_MINIMUM_SALARY SEAN LO MISMO, TAL PARECE QUE SÍ
 def process_single_calculation(salary, daily_salary, payment_period, periodicity, integration_factor, use_increment_percentage, 
                                risk_class, smg_multiplier, commission_percentage_dsi, count_minimum_salary, productivity=None, 
                                imss_breakdown=None, uma=113.14, applied_commission_to='salary', net_salary=None, other_perception=None, is_without_salary_mode=False, 
                                is_pure_mode=False, is_percentage_mode=False, is_keep_declared_salary=False, is_pure_special_mode=False, is_standard_mode=False, is_staggered_mode=False, commission_and_bonus_for_isr=None,
-                               has_period_salaries=False):
+                               has_period_salaries=False, rcv_year=None, parameters=None, metrics=None, progress=None):
     """
     Process a single calculation for IMSS, ISR, and Savings
     
     Parameters:
     - productivity: Valor opcional de productividad para este cálculo
+    - rcv_year: Año de la tabla RCV (None = año actual)
+    - parameters: ParameterSet con las tasas del cálculo; si se indica, uma y rcv_year se toman de él
+    - metrics: StageMetrics opcional; registra las etapas imss, imss_breakdown, isr, saving, saving_breakdown
+      y employer_contributions
+    - progress: ProgressSink opcional que recibe los diagnósticos del cálculo (ver payroll_calculator.progress)
     """    
+    if metrics is not None:
+        start = time.perf_counter_ns()
+    parameters = resolve_parameters(parameters, uma, rcv_year)
+
     # Calculate wage_and_salary_dsi based on SMG multiplier
-    wage_and_salary_dsi = Parameters.calculate_wage_and_salary_dsi(
+    wage_and_salary_dsi = parameters.wage_and_salary_dsi(
         smg_multiplier, payment_period) if count_minimum_salary > 0 else salary
     
     if is_percentage_mode:
         wage_and_salary_dsi = daily_salary * payment_period    
     # Calcular el salario mínimo para el período de pago
-    smg_for_period = Parameters.SMG * payment_period
+    smg_for_period = parameters.smg * payment_period
     
     # Determinar los umbrales para ISR e IMSS basados en count_minimum_salary
     isr_threshold_salary = (smg_for_period * count_minimum_salary if count_minimum_salary > 1 else 0) if count_minimum_salary > 0 else 0
@@ -48,9 +70,11 @@ def process_single_calculation(salary, daily_salary, payment_period, periodicity
     # print(f"DAILY SALARY TO USE: {daily_salary_to_use}")
     
     # IMSS calculations - usar la segunda comparación para DSI
-    imss = IMSS(uma=uma, imss_salary=salary, daily_salary=daily_salary_to_use, payment_period=payment_period, integration_factor=integration_factor,
+    imss = IMSS(uma=parameters.uma, imss_salary=salary, daily_salary=daily_salary_to_use, payment_period=payment_period, integration_factor=integration_factor,
                 risk_class=risk_class, minimum_threshold_salary=imss_threshold_salary, use_increment_percentage=use_increment_percentage, imss_breakdown=imss_breakdown, 
-                is_salary_bigger_than_smg=is_salary_processed_bigger_than_smg)
+                is_salary_bigger_than_smg=is_salary_processed_bigger_than_smg, parameters=parameters)
+    if metrics is not None:
+        start = metrics.lap('imss', start)
     
     # Calcular los valores de breakdown si es necesario
     # IMSS calculations
@@ -85,22 +109,27 @@ def process_single_calculation(salary, daily_salary, payment_period, periodicity
         # print("================ TOTAL ================", imss.total_tax_cost_breakdown)
         # print("================ TOTAL QUOTA_EMPLOYE_WITH_DAILY_SALARY ================", imss.quota_employe_with_daily_salary)
         # print("================ TOTAL QUOTA_EMPLOYEE_RCV_WITH_DAILY_SALARY ================", imss.quota_employee_rcv_with_daily_salary)
+        if metrics is not None:
+            start = metrics.lap('imss_breakdown', start)
     
     # ISR calculations - usar la primera comparación para cálculos tradicionales
     isr = ISR(monthly_salary=salary, payment_period=payment_period, periodicity=periodicity,
               employee=imss.employee, minimum_threshold_salary=isr_threshold_salary, is_salary_bigger_than_smg=is_salary_completed_bigger_than_smg,
-              commission_and_bonus_for_isr=commission_and_bonus_for_isr)
+              commission_and_bonus_for_isr=commission_and_bonus_for_isr, parameters=parameters)
     
     isr_with_imss_breakdown = None
     # Para el breakdown DSI, usar la segunda comparación
     if imss_breakdown is not None and is_salary_processed_bigger_than_smg:
         isr_with_imss_breakdown = ISR(monthly_salary=period_salary, payment_period=payment_period, periodicity=periodicity,
               employee=imss.employee, minimum_threshold_salary=isr_threshold_salary, is_salary_bigger_than_smg=is_salary_processed_bigger_than_smg,
-              commission_and_bonus_for_isr=commission_and_bonus_for_isr, is_keep_declared_salary_and_breaked_mode=is_keep_declared_salary)
+              commission_and_bonus_for_isr=commission_and_bonus_for_isr, is_keep_declared_salary_and_breaked_mode=is_keep_declared_salary,
+              parameters=parameters)
         isr.isr_imss_breakdown = isr_with_imss_breakdown
         
     if not hasattr(isr, 'isr_imss_breakdown'):
         isr.isr_imss_breakdown = None
+    if metrics is not None:
+        start = metrics.lap('isr', start)
         
     # Savings calculations - usar la primera comparación para cálculos tradicionales
     saving = Saving(
@@ -125,7 +154,10 @@ def process_single_calculation(salary, daily_salary, payment_period, periodicity
         is_standard_mode=is_standard_mode,
         is_staggered_mode=is_staggered_mode,
         commission_and_bonus_for_isr=commission_and_bonus_for_isr,
+        progress=progress,
     )
+    if metrics is not None:
+        start = metrics.lap('saving', start)
     
     # print("PASA SAVING")
     
@@ -154,9 +186,13 @@ def process_single_calculation(salary, daily_salary, payment_period, periodicity
         
         saving.saving_wage_and_salary = saving_breakdown_result['saving_wage_and_salary']
         saving.saving_productivity = saving_breakdown_result['saving_productivity']
+        if metrics is not None:
+            start = metrics.lap('saving_breakdown', start)
         
     if not is_salary_completed_bigger_than_smg:
         saving.employer_contributions = saving.get_employer_contributions_imss_rcv_traditional_scheme()
+        if metrics is not None:
+            metrics.lap('employer_contributions', start)
         
         
         # print("================ TOTAL SAVING.SAVING_TOTAL_RETENTIONS_isr_DSI ================", saving.saving_total_retentions_isr_dsi)
@@ -187,15 +223,388 @@ def get_value_or_default(obj, attr_name, default_func=None):
     return value
 
 
+# Entradas de una fila ya resueltas a partir de las listas de process_multiple_calculations
+RowInputs = namedtuple('RowInputs', [
+    'daily_salary', 'payment_period', 'integration_factor', 'productivity', 'other_perception',
+    'has_period_salaries', 'salary', 'net_salary', 'safe_net_salary', 'commission_and_bonus_for_isr',
+])
+
+# Opciones de la corrida que forman parte de la llave de caché de una fila (además de RowInputs y el ParameterSet)
+ROW_KEY_OPTIONS = (
+    'periodicity', 'use_increment_percentage', 'risk_class', 'smg_multiplier', 'commission_percentage_dsi',
+    'count_minimum_salary', 'stricted_mode', 'imss_breakdown', 'uma', 'applied_commission_to', 'productivity_to_zero',
+    'is_pure_mode', 'is_keep_declared_salary', 'is_pure_special_mode', 'is_standard_mode', 'is_staggered_mode',
+    'is_without_salary_mode', 'is_percentage_mode',
+)
+
+
+def _row_inputs(i, salaries_to_use, period_salaries, payment_periods, integration_factors, productivities,
+                other_perceptions, net_salaries, commissions_and_bonus_for_isr):
+    """Obtiene los valores de la fila i (las listas opcionales más cortas se completan con None)"""
+    daily_salary = salaries_to_use[i]
+    if daily_salary == 0:
+        # La fila se omite; no se leen las demás listas
+        return RowInputs(daily_salary, *([None] * (len(RowInputs._fields) - 1)))
+
+    # Obtener el período de pago correspondiente a este salario
+    payment_period = payment_periods[i]
+    integration_factor = integration_factors[i]
+
+    # Obtener el valor de productividad para este salario si existe
+    productivity = None
+    if productivities is not None and i < len(productivities):
+        productivity = productivities[i]
+
+    other_perception = None
+    if other_perceptions is not None and i < len(other_perceptions):
+        other_perception = other_perceptions[i]
+
+    has_period_salaries = period_salaries is not None and i < len(period_salaries)
+    salary = period_salaries[i] if has_period_salaries else daily_salary * payment_period
+
+    net_salary = net_salaries[i] if net_salaries is not None and i < len(net_salaries) else None
+    safe_net_salary = 0
+    if net_salary is not None and isinstance(net_salary, (int, float)) and not (net_salary != net_salary or net_salary == float('inf') or net_salary == float('-inf')):
+        safe_net_salary = net_salary
+    commission_and_bonus_for_isr = commissions_and_bonus_for_isr[i] if commissions_and_bonus_for_isr is not None and i < len(commissions_and_bonus_for_isr) else None
+
+    return RowInputs(daily_salary, payment_period, integration_factor, productivity, other_perception,
+                     has_period_salaries, salary, net_salary, safe_net_salary, commission_and_bonus_for_isr)
+
+
+def _row_key(inputs, options):
+    """Llave normalizada de una fila; el salario neto entra ya validado (safe_net_salary)"""
+    values = inputs._replace(net_salary=None) + tuple(options)
+    return tuple(normalize_value(value) for value in values)
+
+
+def row_input_key(i, row_options):
+    """
+    Llave de caché de las entradas de la fila i, sin el ParameterSet.
+
+    Args:
+        i (int): Índice de la fila
+        row_options (dict): Resultado de build_row_options
+
+    Returns:
+    - tuple, o None si la fila se omite (salario 0)
+    """
+    inputs = _row_inputs(i, row_options['salaries_to_use'], row_options['period_salaries'], row_options['payment_periods'],
+                         row_options['integration_factors'], row_options['productivities'], row_options['other_perceptions'],
+                         row_options['net_salaries'], row_options['commissions_and_bonus_for_isr'])
+    if inputs.daily_salary == 0:
+        return None
+    return _row_key(inputs, (row_options[name] for name in ROW_KEY_OPTIONS))
+
+
+def calculate_row(i, salaries_to_use, period_salaries, payment_periods, periodicity, integration_factors,
+                  use_increment_percentage, risk_class, smg_multiplier, commission_percentage_dsi,
+                  count_minimum_salary, stricted_mode, productivities, imss_breakdown, uma, applied_commission_to,
+                  net_salaries, other_perceptions, productivity_to_zero, is_pure_mode, is_keep_declared_salary,
+                  is_pure_special_mode, is_standard_mode, is_staggered_mode, commissions_and_bonus_for_isr,
+                  is_without_salary_mode, is_percentage_mode, rcv_year=None, parameters=None, row_cache=None,
+                  report_progress=True, metrics=None, progress=None):
+    """
+    Calcula el resultado combinado (IMSS, ISR y Ahorro) de la fila i.
+
+    No modifica ningún dato compartido, así que se puede llamar desde varios hilos o procesos a la vez.
+    El avance y los diagnósticos se envían a progress (un ProgressSink); con report_progress=False no se
+    envía el avance (el modo de procesos lo reporta de forma agregada).
+    Con row_cache (un RowCache) las filas con entradas idénticas se calculan una sola vez.
+    Con metrics (un StageMetrics) se registran las etapas row, row_cache, row_assembly y las de process_single_calculation.
+
+    Returns:
+    - dict con las columnas de la fila, o None si la fila se omite (salario 0)
+    """
+    if metrics is not None:
+        row_start = time.perf_counter_ns()
+    inputs = _row_inputs(i, salaries_to_use, period_salaries, payment_periods, integration_factors, productivities,
+                         other_perceptions, net_salaries, commissions_and_bonus_for_isr)
+    daily_salary = inputs.daily_salary
+    # Ignorar salarios que sean 0
+    if daily_salary == 0:
+        if progress is not None:
+            progress.emit(ProgressEvent(ROW_SKIPPED, i, len(salaries_to_use), {'salary': daily_salary}))
+        return None
+
+    payment_period = inputs.payment_period
+    integration_factor = inputs.integration_factor
+    productivity = inputs.productivity
+    other_perception = inputs.other_perception
+
+    # Calcular el salario mínimo para este período de pago específico
+    smg_for_payment_period = (parameters.smg if parameters is not None else Parameters.SMG) * payment_period
+
+    if progress is not None and report_progress:
+        progress.emit(ProgressEvent(PROGRESS, i + 1, len(salaries_to_use)))
+
+    has_period_salaries = inputs.has_period_salaries
+    salary = inputs.salary
+    # print(f"Salary: {salary} PERIOD SALARIES: {period_salaries[i] if period_salaries else "NO HAY"} DAILY SALARY: {daily_salary} PAYMENT PERIODS: {payment_period}")
+
+    if stricted_mode:
+        if smg_for_payment_period > salary:
+            if progress is not None:
+                progress.emit(ProgressEvent(SMG_ABOVE_SALARY, i, len(salaries_to_use),
+                                            {'payment_period': payment_period, 'salary': salary}))
+            raise ValueError(
+                f"SMG for {payment_period} days is higher than salary. Skipping salary {salary}.")
+
+    net_salary = inputs.net_salary
+    safe_net_salary = inputs.safe_net_salary
+    commission_and_bonus_for_isr = inputs.commission_and_bonus_for_isr
+
+    # Filas repetidas: se regresa una copia del resultado ya calculado
+    cache_key = None
+    if row_cache is not None:
+        if parameters is None:
+            # Llamada sin build_row_options: el ParameterSet se resuelve una vez para la llave y el cálculo
+            parameters = resolve_parameters(None, uma, rcv_year)
+        # Mismo orden que ROW_KEY_OPTIONS, para que coincida con row_input_key
+        options = (
+            periodicity, use_increment_percentage, risk_class, smg_multiplier, commission_percentage_dsi,
+            count_minimum_salary, stricted_mode, imss_breakdown, uma, applied_commission_to, productivity_to_zero,
+            is_pure_mode, is_keep_declared_salary, is_pure_special_mode, is_standard_mode, is_staggered_mode,
+            is_without_salary_mode, is_percentage_mode,
+        )
+        cache_key = _row_key(inputs, options) + (parameters.content_hash,)
+        cached_row = row_cache.get(cache_key)
+        if metrics is not None:
+            metrics.lap('row_cache', row_start)
+            if cached_row is not None:
+                metrics.lap('row', row_start)
+        if cached_row is not None:
+            return cached_row
+
+    # Get calculation instances
+    imss, isr, saving, wage_and_salary_dsi, is_salary_processed_bigger_than_smg = process_single_calculation(
+        salary, daily_salary, payment_period, periodicity, integration_factor, use_increment_percentage, risk_class,
+        smg_multiplier, commission_percentage_dsi, count_minimum_salary,
+        productivity, imss_breakdown, uma, applied_commission_to, safe_net_salary, other_perception, is_without_salary_mode, 
+        is_pure_mode, is_percentage_mode, is_keep_declared_salary, is_pure_special_mode, is_standard_mode, is_staggered_mode, commission_and_bonus_for_isr,
+        has_period_salaries, rcv_year=rcv_year, parameters=parameters, metrics=metrics, progress=progress
+    )
+    if metrics is not None:
+        assembly_start = time.perf_counter_ns()
+
+    # Create a combined dictionary for the current salary with column references
+    combined_result = {
+        # IMSS results
+        "base_salary": salary,  # Col. B - Salario Base
+        "daily_salary": imss.employee.calculate_salary_dialy(), # Col. C - Salario Diario
+        "salary_for_calculation": daily_salary,
+        "integration_factor": integration_factor, # Col. D - Factor de Integración
+        "integrated_daily_wage": imss.get_integrated_daily_wage(), # Col. E - Salario Diario Integrado
+        "imss_employer_fee": imss.get_quota_employer(),  # Col. V - Cuota Patrón IMSS
+        "imss_employee_fee": imss.get_quota_employee() if not hasattr(saving, 'employer_contributions') else 0,  # Col. W - Cuota Trabajador IMSS
+        "rcv_employer_table": imss.get_severance_and_old_age_employer(),  # Col. AA - CESANTIA Y VEJEZ PATRÓN
+        "rcv_employer": imss.get_total_rcv_employer(),  # Col. AC - RCV Patrón
+        "rcv_employee": imss.get_total_rcv_employee() if not hasattr(saving, 'employer_contributions') else 0,  # Col. AD - RCV Trabajador
+        "infonavit_employer": imss.get_infonavit_employer(),  # Col. AE - INFONAVIT Patrón
+        "payroll_tax": imss.get_tax_payroll(),  # Col. AF - Impuesto Sobre Nómina
+        "suggested_total_social_cost": imss.get_total_social_cost_suggested(), # Col. AP - Costo Social Total Sugerido
+        "minimum_salary": imss.smg,  # Col. AP - Costo Social Total Sugerido
+        "payment_period": payment_period,  # Período de pago para este salario
+
+        # ISR results - Col. E a P (Límite Inferior, Excedente, Porcentaje, Impuesto al Excedente, Cuota Fija,
+        # Impuesto Total, ISR, Rango y Crédito al Salario, Impuesto a Cargo, Impuesto a Favor)
+        **isr.evaluate(),
+
+        # Savings results
+        "dsi_salary": get_value_or_default(saving, "saving_wage_and_salary_dsi", lambda: wage_and_salary_dsi if wage_and_salary_dsi != 0 else salary),  # Col. M - Salario DSI
+        "productivity": get_value_or_default(saving, "saving_productivity", saving.get_productivity) if not productivity_to_zero else 0,  # Col. N - Productividad
+        "dsi_commission": saving.get_commission_dsi(),  # Col. Q - Comisión DSI
+        "total_traditional_scheme": saving.get_total_traditional_scheme(), # Col. J - Total Esquema Tradicional
+        "traditional_scheme_biweekly": saving.get_traditional_scheme_biweekly_total(), # Col. K - Esquema Tradicional Quincenal
+        "dsi_scheme_biweekly": get_value_or_default(saving, "dsi_total_fiscal_cost_with_breakdown", lambda: saving.get_dsi_scheme_biweekly_total()), # Col. R - Esquema DSI Quincenal
+        # "dsi_scheme_biweekly": saving.get_dsi_scheme_biweekly_total(), # Col. R - Esquema DSI Quincenal
+        "traditional_scheme_monthly": saving.get_traditional_scheme_biweekly_total() * 2, # Col. S - Esquema Tradicional Mensual
+        "dsi_scheme_monthly": saving.get_dsi_scheme_biweekly_total() * 2, # Col. R - Esquema DSI Mensual
+        "saving_amount": get_value_or_default(saving, "saving_amount", saving.get_amount), # Col. T - Ahorro
+        "saving_percentage": get_value_or_default(saving, "saving_percentage", lambda: saving.get_percentage() * 100),  # Col. U - Porcentaje de Ahorro
+        "total_retentions": saving.get_total_retentions(traditional_schema=True),  # Col. AE - Retenciones Total de Retenciones - ISR + IMSS + RCV
+        "current_perception": get_value_or_default(saving, "current_perception", saving.get_current_perception),  # Col. AF - Percepción Actual
+        "dsi_perception": get_value_or_default(saving, "saving_total_current_perception_dsi", saving.get_current_perception_dsi),  # Col. AO - Percepción DSI
+        "increment": get_value_or_default(saving, "saving_get_increment", saving.get_increment),  # Col. AQ - Incremento
+        "increment_percentage": get_value_or_default(saving, "saving_get_increment_percentage", lambda: saving.get_increment_percentage() * 100),  # Col. AR - Porcentaje de Incremento
+        "dsi_scheme_fixed_fee": saving.fixed_fee_dsi, # Col. P - Cuota Fija Esquema DSI
+        "salary_total_income": get_value_or_default(saving, "salary_total_income", saving.get_total_income_traditional_scheme), # Col. E - Salario (TOTAL INGRESOS)
+        "other_perception": other_perception, # Col. E Cuando se ocupe el template de Otras Percepciones
+
+        "commission_percentage_dsi": commission_percentage_dsi * 100, # Col. Q8 - Comisión DSI
+        "isr_retention_dsi": saving.get_total_isr_retention_dsi(), # Col. AK9 - ISR Retención DSI
+        "uma_used": uma # La que se manda como parámetro
+    }
+
+    if imss_breakdown:
+        combined_result["total_retentions_dsi"] = saving.saving_total_retentions_dsi # Col. AR (desglosado) o AN (normal),  - Total Retenciones DSI
+
+        employer_contributions_dsi = (imss.quota_employe_with_daily_salary + imss.quota_employee_rcv_with_daily_salary) if not is_salary_processed_bigger_than_smg else 0
+
+        combined_result["total_tax_cost_breakdown"] = imss.total_tax_cost_breakdown  # Col. AP - Costo Fiscal Total cuando es desglosado
+        combined_result["employer_contributions_dsi"] = employer_contributions_dsi # Col. U - Cuotas Patronales
+
+        combined_result["first_quota_employer_imss_dsi"] = imss.quota_employer_with_daily_salary # Col. P - Costo Fiscal IMSS para DSI cuando es desglosado - Hoja de Ahorro
+        combined_result["first_total_rcv_employer_dsi"] = imss.total_rcv_employer_with_daily_salary # Col. Q - Costo Fiscal RCV para DSI cuando es desglosado - Hoja de Ahorro
+        combined_result["first_infonavit_employer_dsi"] = imss.infonavit_employer_with_daily_salary # Col. R - Costo Fiscal Infonavit para DSI cuando es desglosado - Hoja de Ahorro
+        combined_result["first_tax_payroll_employer_dsi"] = imss.tax_payroll_with_daily_salary # Col. S - Costo Fiscal Impuesto Estatal para DSI cuando es desglosado - Hoja de Ahorro
+
+        combined_result["quota_employe_with_daily_salary"] = imss.quota_employe_with_daily_salary if is_salary_processed_bigger_than_smg else 0
+        combined_result["quota_employee_rcv_with_daily_salary"] = imss.quota_employee_rcv_with_daily_salary if is_salary_processed_bigger_than_smg else 0
+
+
+        combined_result["saving_total_retentions_isr_dsi"] = saving.saving_total_retentions_isr_dsi
+
+
+        if isr.isr_imss_breakdown is not None:
+            # print("=" * 92, "EMPIEZA EL BREAKDOWN", "=" * 92)
+            # Add ISR breakdown values to combined_result
+            # Validación limpia: pasar True solo si is_keep_declared_salary o is_standard_mode son verdaderos
+            should_pass_true = is_staggered_mode or is_standard_mode
+            combined_result["isr_tax_payable_dsi"] = (
+                isr.isr_imss_breakdown.get_tax_payable(True) if should_pass_true 
+                else isr.isr_imss_breakdown.get_tax_payable()
+            )  # Col. O - Impuesto a Cargo ISR para DSI
+
+    # Añadir employee_contributions si existe en el objeto saving
+    if hasattr(saving, 'employer_contributions'):
+        combined_result["employer_contributions"] = saving.employer_contributions
+
+    if is_pure_special_mode is not None:
+        # Validación para evitar valores NaN o None
+        safe_net_salary = 0
+        if net_salary is not None and isinstance(net_salary, (int, float)) and not (net_salary != net_salary or net_salary == float('inf') or net_salary == float('-inf')):
+            safe_net_salary = net_salary
+
+        combined_result["net_salary"] = safe_net_salary
+        combined_result["total_income_pure_special"] = saving.get_total_income_pure_special() if safe_net_salary > 0 else salary
+
+    # Agregar propiedad específica para modo puro especial
+    if is_pure_special_mode:
+        combined_result["salary_minus_retentions"] = salary - saving.get_total_retentions(traditional_schema=True)
+
+        # Usar el valor seguro de net_salary para evitar NaN en el cálculo
+        safe_net_salary = combined_result["net_salary"]
+
+        combined_result["total_cost_client"] = saving.get_total_cost_client() if safe_net_salary > 0 else saving.get_traditional_scheme_biweekly_total()
+        combined_result["total_cost_surplus"] = saving.get_total_cost_surplus() if safe_net_salary > 0 else 0
+
+        # Actualizar productividad restando salario neto y salary_minus_retentions
+        if is_pure_special_mode is not None:
+            if safe_net_salary > 0:
+                updated_productivity = safe_net_salary - combined_result["salary_minus_retentions"]
+                combined_result["productivity"] = updated_productivity
+            else:
+                combined_result["productivity"] = 0
+
+    if row_cache is not None:
+        row_cache.put(cache_key, combined_result)
+
+    if metrics is not None:
+        metrics.lap('row_assembly', assembly_start)
+        metrics.lap('row', row_start)
+
+    return combined_result
+
+
+def build_row_options(salaries, period_salaries, payment_periods, periodicity, integration_factors,
+                      use_increment_percentage, risk_class, smg_multiplier, commission_percentage_dsi,
+                      count_minimum_salary, stricted_mode, productivities=None, imss_breakdown=None,
+                      uma=113.14, applied_commission_to='salary', net_salaries=None, other_perceptions=None, productivity_to_zero=None, is_pure_mode=None,
+                      is_keep_declared_salary=None, is_pure_special_mode=None, is_standard_mode=None, is_staggered_mode=None, commissions_and_bonus_for_isr=None,
+                      rcv_year=None, parameters=None, row_cache=None, metrics=None, progress=None):
+    """
+    Arma los argumentos compartidos de calculate_row a partir de los parámetros de process_multiple_calculations.
+
+    El ParameterSet (con el año de la tabla RCV) se resuelve aquí una sola vez, así todas las filas de
+    la corrida usan los mismos parámetros.
+
+    Returns:
+    - dict con los argumentos de calculate_row (excepto el índice de la fila)
+    """
+    total_salaries = len(salaries)
+
+    salaries_to_use = salaries if total_salaries > 0 else productivities
+    is_without_salary_mode = total_salaries == 0
+
+    is_percentage_mode = len(salaries) > 0 and productivities is not None and len(productivities) > 0
+
+    parameters = resolve_parameters(parameters, uma, rcv_year)
+
+    return dict(
+        salaries_to_use=salaries_to_use, period_salaries=period_salaries, payment_periods=payment_periods,
+        periodicity=periodicity, integration_factors=integration_factors, use_increment_percentage=use_increment_percentage,
+        risk_class=risk_class, smg_multiplier=smg_multiplier, commission_percentage_dsi=commission_percentage_dsi,
+        count_minimum_salary=count_minimum_salary, stricted_mode=stricted_mode, productivities=productivities,
+        imss_breakdown=imss_breakdown, uma=parameters.uma, applied_commission_to=applied_commission_to, net_salaries=net_salaries,
+        other_perceptions=other_perceptions, productivity_to_zero=productivity_to_zero, is_pure_mode=is_pure_mode,
+        is_keep_declared_salary=is_keep_declared_salary, is_pure_special_mode=is_pure_special_mode,
+        is_standard_mode=is_standard_mode, is_staggered_mode=is_staggered_mode,
+        commissions_and_bonus_for_isr=commissions_and_bonus_for_isr, is_without_salary_mode=is_without_salary_mode,
+        is_percentage_mode=is_percentage_mode, rcv_year=parameters.rcv_year, parameters=parameters, row_cache=row_cache,
+        metrics=metrics, progress=progress,
+    )
+
+
+def iter_calculations(salaries, period_salaries, payment_periods, periodicity, integration_factors,
+                      use_increment_percentage, risk_class, smg_multiplier, commission_percentage_dsi,
+                      count_minimum_salary, stricted_mode, productivities=None, imss_breakdown=None,
+                      uma=113.14, applied_commission_to='salary', net_salaries=None, other_perceptions=None, productivity_to_zero=None, is_pure_mode=None,
+                      is_keep_declared_salary=None, is_pure_special_mode=None, is_standard_mode=None, is_staggered_mode=None, commissions_and_bonus_for_isr=None,
+                      chunk_size=None, rcv_year=None, parameters=None, row_cache=None, metrics=None, progress=None):
+    """
+    Versión generadora de process_multiple_calculations: calcula cada fila hasta que se pide.
+
+    Recibe los mismos parámetros y produce los mismos resultados en el mismo orden, pero sin
+    acumularlos, de modo que la memoria no crece con el tamaño de la nómina.
+
+    Parameters:
+    - chunk_size: Si se indica, produce listas de hasta chunk_size resultados en lugar de uno por uno
+    - rcv_year: Año de la tabla RCV (None = año actual, resuelto una sola vez al crear el generador)
+    - parameters: ParameterSet de la corrida (opcional)
+    - row_cache: RowCache para calcular una sola vez las filas repetidas (opcional)
+    - metrics: StageMetrics para registrar los tiempos por etapa de cada fila (opcional)
+    - progress: ProgressSink que recibe el avance y los diagnósticos (opcional; por defecto no se reporta nada)
+
+    Yields:
+    - dict por fila (o list de dicts si se usa chunk_size). Las filas con salario 0 se omiten
+    """
+    row_options = build_row_options(
+        salaries, period_salaries, payment_periods, periodicity, integration_factors,
+        use_increment_percentage, risk_class, smg_multiplier, commission_percentage_dsi,
+        count_minimum_salary, stricted_mode, productivities, imss_breakdown,
+        uma, applied_commission_to, net_salaries, other_perceptions, productivity_to_zero, is_pure_mode,
+        is_keep_declared_salary, is_pure_special_mode, is_standard_mode, is_staggered_mode, commissions_and_bonus_for_isr,
+        rcv_year, parameters, row_cache, metrics, progress
+    )
+    calculate = functools.partial(calculate_row, **row_options)
+    rows = (row for row in map(calculate, range(len(row_options['salaries_to_use']))) if row is not None)
+
+    if chunk_size is None:
+        yield from rows
+    else:
+        while True:
+            chunk = list(itertools.islice(rows, chunk_size))
+            if not chunk:
+                break
+            yield chunk
+
+    if progress is not None:
+        progress.flush()
+
+
 def process_multiple_calculations(salaries, period_salaries, payment_periods, periodicity, integration_factors, 
                                   use_increment_percentage, risk_class, smg_multiplier, commission_percentage_dsi, 
                                   count_minimum_salary, stricted_mode, productivities=None, imss_breakdown=None, 
                                   uma=113.14, applied_commission_to='salary', net_salaries=None, other_perceptions=None, productivity_to_zero=None, is_pure_mode=None, 
-                                  is_keep_declared_salary=None, is_pure_special_mode=None, is_standard_mode=None, is_staggered_mode=None, commissions_and_bonus_for_isr=None):
+                                  is_keep_declared_salary=None, is_pure_special_mode=None, is_standard_mode=None, is_staggered_mode=None, commissions_and_bonus_for_isr=None,
+                                  vectorized=False, threads=None, workers=None, chunk_size=None, as_results=False, rcv_year=None,
+                                  parameters=None, row_cache=None, result_cache=None, metrics=None, progress=None):
     """
     Process multiple calculations for IMSS, ISR, and Savings, adding column references to labels.
     This function now only returns the individual results for each salary.
-    Total calculations should be handled by the calling code after grouping if necessary.
+    Total calculations should be handled by the calling code after grouping if necessary
+    (see totals.TotalsAccumulator and totals.group_totals).
     
     Parameters:
     - salaries: Lista de salarios
@@ -206,213 +615,167 @@ def process_multiple_calculations(salaries, period_salaries, payment_periods, pe
     - count_minimum_salary: Contador de salario mínimo
     - stricted_mode: Modo estricto para validación de salarios
     - productivity: Lista opcional de valores de productividad correspondientes a cada salario
+    - vectorized: Si es True, calcula todas las filas con el motor columnar de NumPy (processors.batch). No se puede
+      combinar con threads, workers, chunk_size, row_cache, result_cache ni progress (ValueError)
+    - threads: Número de hilos para repartir las filas (None o 1 = secuencial). Los resultados conservan el orden de entrada
+    - workers: Número de procesos para repartir las filas en bloques (None o 1 = secuencial). Los resultados conservan el orden de entrada
+    - chunk_size: Filas por bloque cuando se usa workers (opcional)
+    - as_results: Si es True, regresa un PayrollResults (arreglos por columna) en lugar de la lista de diccionarios
+    - rcv_year: Año de la tabla RCV; si es None se usa el año actual, resuelto una sola vez al iniciar la corrida
+    - parameters: ParameterSet con todas las tasas y tablas de la corrida; si se indica, uma y rcv_year se toman de él.
+      Por defecto se toma una foto de Parameters al iniciar la corrida
+    - row_cache: RowCache (LRU acotado) para calcular una sola vez las filas con entradas idénticas; sus contadores
+      (hits, misses, evictions) sirven para dimensionarlo. Con workers cada proceso usa su propia copia vacía
+    - result_cache: ResultCache (SQLite) para reutilizar filas de corridas anteriores; solo se calculan las filas que
+      no están guardadas para el mismo ParameterSet. Las filas faltantes se calculan
+      en secuencia o con threads (no se puede combinar con workers). Las filas tomadas del caché no envían
+      eventos de avance ni diagnósticos (por ejemplo BELOW_SMG) a progress
+    - metrics: StageMetrics para registrar llamadas y tiempos por etapa (ver payroll_calculator.metrics). Con vectorized
+      registra batch y batch_rows; con workers solo se registra la etapa rows, porque las filas se calculan en otros procesos
+    - progress: ProgressSink que recibe el avance y los diagnósticos (ver payroll_calculator.progress). Por defecto no se
+      reporta nada; print_progress() imprime como máximo un mensaje por segundo. Con workers solo se reporta el avance
     """
+    if vectorized:
+        ignored = [name for name, value in (('threads', threads), ('workers', workers), ('chunk_size', chunk_size),
+                                            ('row_cache', row_cache), ('result_cache', result_cache),
+                                            ('progress', progress)) if value is not None]
+        if ignored:
+            raise ValueError(f"vectorized no se puede combinar con {', '.join(ignored)}")
+    if result_cache is not None and workers is not None and workers > 1:
+        raise ValueError("result_cache no se puede combinar con workers; usar threads para calcular las filas faltantes")
 
-    # Initialize a list to store combined results for each salary
-    individual_results = []
-
-    # Process salaries with a progress indicator
-    total_salaries = len(salaries)
-    
-    salaries_to_use = salaries if total_salaries > 0 else productivities
-    is_without_salary_mode = total_salaries == 0
-    
-    is_percentage_mode = len(salaries) > 0 and productivities is not None and len(productivities) > 0
-    
-    for i, daily_salary in enumerate(salaries_to_use):
-        # Ignorar salarios que sean 0
-        if daily_salary == 0:
-            print(f"Salary is 0. Skipping salary at index {i}. {daily_salary}")
-            continue
-            
-        # Obtener el período de pago correspondiente a este salario
-        payment_period = payment_periods[i]
-        integration_factor = integration_factors[i]
-        
-        # Obtener el valor de productividad para este salario si existe
-        productivity = None
-        if productivities is not None and i < len(productivities):
-            productivity = productivities[i]
-        
-        other_perception = None
-        if other_perceptions is not None and i < len(other_perceptions):
-            other_perception = other_perceptions[i]
-        
-        # Calcular el salario mínimo para este período de pago específico
-        smg_for_payment_period = Parameters.SMG * payment_period
-        
-        if i % 10 == 0 or i == len(salaries_to_use) - 1:
-            print(f"Processing salary {i+1}/{len(salaries_to_use)}...")
-            
-        has_period_salaries = period_salaries is not None and i < len(period_salaries)
-            
-        salary = period_salaries[i] if has_period_salaries else daily_salary * payment_period
-        # print(f"Salary: {salary} PERIOD SALARIES: {period_salaries[i] if period_salaries else "NO HAY"} DAILY SALARY: {daily_salary} PAYMENT PERIODS: {payment_period}")
-
-        if stricted_mode:
-            if smg_for_payment_period > salary:
-                print(
-                    f"SMG for {payment_period} days is higher than salary. Skipping salary {salary}.")
-                raise ValueError(
-                    f"SMG for {payment_period} days is higher than salary. Skipping salary {salary}.")
-                
-        net_salary = net_salaries[i] if net_salaries is not None and i < len(net_salaries) else None
-        safe_net_salary = 0
-        if net_salary is not None and isinstance(net_salary, (int, float)) and not (net_salary != net_salary or net_salary == float('inf') or net_salary == float('-inf')):
-            safe_net_salary = net_salary
-        commission_and_bonus_for_isr = commissions_and_bonus_for_isr[i] if commissions_and_bonus_for_isr is not None and i < len(commissions_and_bonus_for_isr) else None
-
-        # Get calculation instances
-        imss, isr, saving, wage_and_salary_dsi, is_salary_processed_bigger_than_smg = process_single_calculation(
-            salary, daily_salary, payment_period, periodicity, integration_factor, use_increment_percentage, risk_class,
-            smg_multiplier, commission_percentage_dsi, count_minimum_salary,
-            productivity, imss_breakdown, uma, applied_commission_to, safe_net_salary, other_perception, is_without_salary_mode, 
-            is_pure_mode, is_percentage_mode, is_keep_declared_salary, is_pure_special_mode, is_standard_mode, is_staggered_mode, commission_and_bonus_for_isr,
-            has_period_salaries
+    if metrics is not None:
+        start = time.perf_counter_ns()
+    if vectorized:
+        columns, present = process_batch_calculations(
+            salaries, period_salaries, payment_periods, periodicity, integration_factors,
+            use_increment_percentage, risk_class, smg_multiplier, commission_percentage_dsi,
+            count_minimum_salary, stricted_mode, productivities, imss_breakdown,
+            uma, applied_commission_to, net_salaries, other_perceptions, productivity_to_zero, is_pure_mode,
+            is_keep_declared_salary, is_pure_special_mode, is_standard_mode, is_staggered_mode, commissions_and_bonus_for_isr,
+            rcv_year, parameters
         )
-        
-        # Create a combined dictionary for the current salary with column references
-        combined_result = {
-            # IMSS results
-            "base_salary": salary,  # Col. B - Salario Base
-            "daily_salary": imss.employee.calculate_salary_dialy(), # Col. C - Salario Diario
-            "salary_for_calculation": daily_salary,
-            "integration_factor": integration_factor, # Col. D - Factor de Integración
-            "integrated_daily_wage": imss.get_integrated_daily_wage(), # Col. E - Salario Diario Integrado
-            "imss_employer_fee": imss.get_quota_employer(),  # Col. V - Cuota Patrón IMSS
-            "imss_employee_fee": imss.get_quota_employee() if not hasattr(saving, 'employer_contributions') else 0,  # Col. W - Cuota Trabajador IMSS
-            "rcv_employer_table": imss.get_severance_and_old_age_employer(),  # Col. AA - CESANTIA Y VEJEZ PATRÓN
-            "rcv_employer": imss.get_total_rcv_employer(),  # Col. AC - RCV Patrón
-            "rcv_employee": imss.get_total_rcv_employee() if not hasattr(saving, 'employer_contributions') else 0,  # Col. AD - RCV Trabajador
-            "infonavit_employer": imss.get_infonavit_employer(),  # Col. AE - INFONAVIT Patrón
-            "payroll_tax": imss.get_tax_payroll(),  # Col. AF - Impuesto Sobre Nómina
-            "suggested_total_social_cost": imss.get_total_social_cost_suggested(), # Col. AP - Costo Social Total Sugerido
-            "minimum_salary": imss.smg,  # Col. AP - Costo Social Total Sugerido
-            "payment_period": payment_period,  # Período de pago para este salario
-            
-            # ISR results
-            "isr_lower_limit": isr.get_lower_limit(),  # Col. E - Límite Inferior ISR
-            "isr_surplus": isr.get_surplus(),  # Col. F - Excedente ISR
-            "isr_percentage_applied_to_surplus": isr.get_percentage_applied_to_excess(), # Col. G - Porcentaje Aplicado al Excedente ISR
-            "isr_surplus_tax": isr.get_surplus_tax(),  # Col. H - Impuesto al Excedente ISR
-            "isr_fixed_fee": isr.get_fixed_fee(),  # Col. I - Cuota Fija ISR
-            "isr_total_tax": isr.get_total_tax(),  # Col. J - Impuesto Total ISR
-            "isr": isr.get_isr(),  # Col. L - ISR
-            "isr_range_credit_for_salary": isr.get_range_credit_to_salary(),  # Col. M - ISR
-            "salary_credit": isr.get_salary_credit(),  # Col. N - Crédito al Salario
-            "isr_tax_payable": isr.get_tax_payable(),  # Col. O - Impuesto a Cargo ISR
-            "isr_tax_in_favor": isr.get_tax_in_favor(),  # Col. P - Impuesto a Favor ISR
-
-            # Savings results
-            "dsi_salary": get_value_or_default(saving, "saving_wage_and_salary_dsi", lambda: wage_and_salary_dsi if wage_and_salary_dsi != 0 else salary),  # Col. M - Salario DSI
-            "productivity": get_value_or_default(saving, "saving_productivity", saving.get_productivity) if not productivity_to_zero else 0,  # Col. N - Productividad
-            "dsi_commission": saving.get_commission_dsi(),  # Col. Q - Comisión DSI
-            "total_traditional_scheme": saving.get_total_traditional_scheme(), # Col. J - Total Esquema Tradicional
-            "traditional_scheme_biweekly": saving.get_traditional_scheme_biweekly_total(), # Col. K - Esquema Tradicional Quincenal
-            "dsi_scheme_biweekly": get_value_or_default(saving, "dsi_total_fiscal_cost_with_breakdown", lambda: saving.get_dsi_scheme_biweekly_total()), # Col. R - Esquema DSI Quincenal
-            # "dsi_scheme_biweekly": saving.get_dsi_scheme_biweekly_total(), # Col. R - Esquema DSI Quincenal
-            "traditional_scheme_monthly": saving.get_traditional_scheme_biweekly_total() * 2, # Col. S - Esquema Tradicional Mensual
-            "dsi_scheme_monthly": saving.get_dsi_scheme_biweekly_total() * 2, # Col. R - Esquema DSI Mensual
-            "saving_amount": get_value_or_default(saving, "saving_amount", saving.get_amount), # Col. T - Ahorro
-            "saving_percentage": get_value_or_default(saving, "saving_percentage", lambda: saving.get_percentage() * 100),  # Col. U - Porcentaje de Ahorro
-            "total_retentions": saving.get_total_retentions(traditional_schema=True),  # Col. AE - Retenciones Total de Retenciones - ISR + IMSS + RCV
-            "current_perception": get_value_or_default(saving, "current_perception", saving.get_current_perception),  # Col. AF - Percepción Actual
-            "dsi_perception": get_value_or_default(saving, "saving_total_current_perception_dsi", saving.get_current_perception_dsi),  # Col. AO - Percepción DSI
-            "increment": get_value_or_default(saving, "saving_get_increment", saving.get_increment),  # Col. AQ - Incremento
-            "increment_percentage": get_value_or_default(saving, "saving_get_increment_percentage", lambda: saving.get_increment_percentage() * 100),  # Col. AR - Porcentaje de Incremento
-            "dsi_scheme_fixed_fee": saving.fixed_fee_dsi, # Col. P - Cuota Fija Esquema DSI
-            "salary_total_income": get_value_or_default(saving, "salary_total_income", saving.get_total_income_traditional_scheme), # Col. E - Salario (TOTAL INGRESOS)
-            "other_perception": other_perception, # Col. E Cuando se ocupe el template de Otras Percepciones
-
-            "commission_percentage_dsi": commission_percentage_dsi * 100, # Col. Q8 - Comisión DSI
-            "isr_retention_dsi": saving.get_total_isr_retention_dsi(), # Col. AK9 - ISR Retención DSI
-            "uma_used": uma # La que se manda como parámetro
-        }
-        
-        if imss_breakdown:
-            combined_result["total_retentions_dsi"] = saving.saving_total_retentions_dsi # Col. AR (desglosado) o AN (normal),  - Total Retenciones DSI
-            
-            employer_contributions_dsi = (imss.quota_employe_with_daily_salary + imss.quota_employee_rcv_with_daily_salary) if not is_salary_processed_bigger_than_smg else 0
-            
-            combined_result["total_tax_cost_breakdown"] = imss.total_tax_cost_breakdown  # Col. AP - Costo Fiscal Total cuando es desglosado
-            combined_result["employer_contributions_dsi"] = employer_contributions_dsi # Col. U - Cuotas Patronales
-            
-            combined_result["first_quota_employer_imss_dsi"] = imss.quota_employer_with_daily_salary # Col. P - Costo Fiscal IMSS para DSI cuando es desglosado - Hoja de Ahorro
-            combined_result["first_total_rcv_employer_dsi"] = imss.total_rcv_employer_with_daily_salary # Col. Q - Costo Fiscal RCV para DSI cuando es desglosado - Hoja de Ahorro
-            combined_result["first_infonavit_employer_dsi"] = imss.infonavit_employer_with_daily_salary # Col. R - Costo Fiscal Infonavit para DSI cuando es desglosado - Hoja de Ahorro
-            combined_result["first_tax_payroll_employer_dsi"] = imss.tax_payroll_with_daily_salary # Col. S - Costo Fiscal Impuesto Estatal para DSI cuando es desglosado - Hoja de Ahorro
-            
-            combined_result["quota_employe_with_daily_salary"] = imss.quota_employe_with_daily_salary if is_salary_processed_bigger_than_smg else 0
-            combined_result["quota_employee_rcv_with_daily_salary"] = imss.quota_employee_rcv_with_daily_salary if is_salary_processed_bigger_than_smg else 0
-            
-            
-            combined_result["saving_total_retentions_isr_dsi"] = saving.saving_total_retentions_isr_dsi
-            
-            
-            if isr.isr_imss_breakdown is not None:
-                # print("=" * 92, "EMPIEZA EL BREAKDOWN", "=" * 92)
-                # Add ISR breakdown values to combined_result
-                # Validación limpia: pasar True solo si is_keep_declared_salary o is_standard_mode son verdaderos
-                should_pass_true = is_staggered_mode or is_standard_mode
-                combined_result["isr_tax_payable_dsi"] = (
-                    isr.isr_imss_breakdown.get_tax_payable(True) if should_pass_true 
-                    else isr.isr_imss_breakdown.get_tax_payable()
-                )  # Col. O - Impuesto a Cargo ISR para DSI
-
-        # Añadir employee_contributions si existe en el objeto saving
-        if hasattr(saving, 'employer_contributions'):
-            combined_result["employer_contributions"] = saving.employer_contributions
-            
-        if is_pure_special_mode is not None:
-            # Validación para evitar valores NaN o None
-            safe_net_salary = 0
-            if net_salary is not None and isinstance(net_salary, (int, float)) and not (net_salary != net_salary or net_salary == float('inf') or net_salary == float('-inf')):
-                safe_net_salary = net_salary
-            
-            combined_result["net_salary"] = safe_net_salary
-            combined_result["total_income_pure_special"] = saving.get_total_income_pure_special() if safe_net_salary > 0 else salary
-            
-        # Agregar propiedad específica para modo puro especial
-        if is_pure_special_mode:
-            combined_result["salary_minus_retentions"] = salary - saving.get_total_retentions(traditional_schema=True)
-            
-            # Usar el valor seguro de net_salary para evitar NaN en el cálculo
-            safe_net_salary = combined_result["net_salary"]
-            
-            combined_result["total_cost_client"] = saving.get_total_cost_client() if safe_net_salary > 0 else saving.get_traditional_scheme_biweekly_total()
-            combined_result["total_cost_surplus"] = saving.get_total_cost_surplus() if safe_net_salary > 0 else 0
-            
-            # Actualizar productividad restando salario neto y salary_minus_retentions
-            if is_pure_special_mode is not None:
-                if safe_net_salary > 0:
-                    updated_productivity = safe_net_salary - combined_result["salary_minus_retentions"]
-                    combined_result["productivity"] = updated_productivity
-                else:
-                    combined_result["productivity"] = 0
-
-        # Append the combined result to the main list
-        individual_results.append(combined_result)
+        if metrics is not None:
+            start = metrics.lap('batch', start)
+        rows = PayrollResults.from_batch(columns, present) if as_results else columns_to_rows(columns, present)
+        if metrics is not None:
+            metrics.lap('batch_rows', start)
+        return rows
+
+    row_options = build_row_options(
+        salaries, period_salaries, payment_periods, periodicity, integration_factors,
+        use_increment_percentage, risk_class, smg_multiplier, commission_percentage_dsi,
+        count_minimum_salary, stricted_mode, productivities, imss_breakdown,
+        uma, applied_commission_to, net_salaries, other_perceptions, productivity_to_zero, is_pure_mode,
+        is_keep_declared_salary, is_pure_special_mode, is_standard_mode, is_staggered_mode, commissions_and_bonus_for_isr,
+        rcv_year, parameters, row_cache, metrics, progress
+    )
+    calculate = functools.partial(calculate_row, **row_options)
+    total_rows = len(row_options['salaries_to_use'])
+    indices = range(total_rows)
+
+    if result_cache is not None:
+        rows = _calculate_with_result_cache(result_cache, row_options, calculate, total_rows, threads)
+    elif workers is not None and workers > 1:
+        rows = run_rows_in_processes(calculate_row, dict(row_options, report_progress=False, metrics=None, progress=None),
+                                     total_rows, workers, chunk_size, progress=progress)
+    elif threads is not None and threads > 1:
+        # Las filas son independientes; map conserva el orden de entrada y propaga la primera excepción
+        with ThreadPoolExecutor(max_workers=threads) as executor:
+            rows = list(executor.map(calculate, indices))
+    else:
+        rows = map(calculate, indices)
+
+    if as_results:
+        individual_results = PayrollResults.from_rows(row for row in rows if row is not None)
+    else:
+        individual_results = [row for row in rows if row is not None]
+
+    if metrics is not None:
+        metrics.lap('rows', start)
+    if progress is not None:
+        progress.flush()
 
     return individual_results
 
 
+def _calculate_with_result_cache(result_cache, row_options, calculate, total_rows, threads=None):
+    """
+    Calcula las filas usando el caché persistente: busca todas las filas en un solo paso, calcula las
+    faltantes y las guarda en bloque.
+
+    Returns:
+    - list con el resultado de cada índice (None para las filas omitidas)
+    """
+    metrics = row_options.get('metrics')
+    if metrics is not None:
+        start = time.perf_counter_ns()
+    parameter_hash = row_options['parameters'].content_hash
+    row_hashes = []
+    for i in range(total_rows):
+        key = row_input_key(i, row_options)
+        row_hashes.append(None if key is None else hash_row_key(key))
+
+    cached = result_cache.get_many(parameter_hash, [row_hash for row_hash in row_hashes if row_hash is not None])
+    # Las filas omitidas (salario 0) también se "calculan" para conservar sus mensajes
+    missing = [i for i, row_hash in enumerate(row_hashes) if row_hash not in cached]
+    if metrics is not None:
+        metrics.lap('result_cache_lookup', start)
+
+    if threads is not None and threads > 1:
+        with ThreadPoolExecutor(max_workers=threads) as executor:
+            computed = list(executor.map(calculate, missing))
+    else:
+        computed = [calculate(i) for i in missing]
+
+    rows = [cached.get(row_hash) for row_hash in row_hashes]
+    new_rows = {}
+    for i, row in zip(missing, computed):
+        rows[i] = row
+        if row is not None:
+            new_rows[row_hashes[i]] = row
+    if metrics is not None:
+        start = time.perf_counter_ns()
+    result_cache.put_many(parameter_hash, new_rows.items())
+    if metrics is not None:
+        metrics.lap('result_cache_store', start)
+
+    # Cada fila repetida recibe su propia copia
+    seen = set()
+    for i, row_hash in enumerate(row_hashes):
+        if rows[i] is not None:
+            if row_hash in seen:
+                rows[i] = dict(rows[i])
+            seen.add(row_hash)
+    return rows
+
+
 def parse_salaries_input(salary_input):
     """
     Parse salary input from user, handling file paths and direct input
+
+    Si salary_input es la ruta de un archivo existente (absoluta o relativa) y el archivo tiene un
+    encabezado reconocido (ver readers.read_header), se lee con readers.read_salary_columns, que
+    acepta CSV/TSV con varias columnas, y aquí solo se regresa la columna de salario diario. Para
+    obtener todas las columnas usar readers.load_salary_columns. Cualquier otro archivo se lee como
+    antes: sus líneas se unen con comas y se procesan como entrada directa.
     """
     # Check if input is a file path
-    if salary_input.startswith('/') and ('.' in salary_input.split('/')[-1]):
-        try:
-            with open(salary_input, 'r') as file:
-                salary_lines = file.readlines()
-                # Process each line and combine into a single comma-separated string
-                salary_input = ','.join([line.strip()
-                                        for line in salary_lines if line.strip()])
-            print(
-                f"Successfully loaded {len(salary_input.split(','))} salaries from file")
-        except FileNotFoundError:
-            print(
-                f"File not found: {salary_input}. Processing as direct input.")
+    if os.path.isfile(salary_input.strip()):
+        path = salary_input.strip()
+        if read_header(path) is not None:
+            salaries = []
+            for chunk in read_salary_columns(path):
+                daily_salaries = chunk.get('daily_salary')
+                if daily_salaries is not None:
+                    salaries.extend(float(salary) for salary in daily_salaries if salary == salary)
+            print(f"Successfully loaded {len(salaries)} salaries from file")
+            return salaries
+
+        with open(path, 'r') as file:
+            # Process each line and combine into a single comma-separated string
+            salary_input = ','.join([line.strip() for line in file if line.strip()])
+        print(f"Successfully loaded {len(salary_input.split(','))} salaries from file")
 
     # Clean and parse the input
     salary_input = salary_input.replace('[', '').replace(']', '')
@@ -0,0 +1,110 @@
+"""
+Ejecución de filas en varios procesos para process_multiple_calculations.
+
+Las filas son independientes, así que la lista de índices se divide en bloques contiguos que se
+calculan en un ProcessPoolExecutor. Las opciones compartidas (listas de entrada y parámetros) se
+envían una sola vez a cada proceso en el inicializador; cada tarea solo recibe su rango de índices.
+"""
+import math
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from payroll_calculator.progress import ProgressEvent, PROGRESS
+
+# Chunks por proceso cuando no se indica chunk_size, para repartir mejor filas de distinto costo
+CHUNKS_PER_WORKER = 4
+
+# Estado de cada proceso de trabajo (se llena en _init_worker)
+_worker_row_function = None
+_worker_row_options = None
+
+
+def _init_worker(row_function, row_options):
+    """Guarda la función de fila y sus opciones en el proceso de trabajo"""
+    global _worker_row_function, _worker_row_options
+    _worker_row_function = row_function
+    _worker_row_options = row_options
+
+
+def _calculate_chunk(start, stop):
+    """Calcula las filas [start, stop) en el proceso de trabajo y omite las que regresan None"""
+    rows = []
+    for i in range(start, stop):
+        row = _worker_row_function(i, **_worker_row_options)
+        if row is not None:
+            rows.append(row)
+    return rows
+
+
+def split_chunks(total, workers, chunk_size=None):
+    """
+    Divide el rango [0, total) en bloques contiguos.
+
+    Args:
+        total (int): Número de filas
+        workers (int): Número de procesos
+        chunk_size (int): Filas por bloque; por defecto total / (workers * CHUNKS_PER_WORKER)
+
+    Returns:
+        list: Lista de tuplas (start, stop)
+    """
+    if chunk_size is None:
+        chunk_size = max(1, math.ceil(total / (workers * CHUNKS_PER_WORKER)))
+    return [(start, min(start + chunk_size, total)) for start in range(0, total, chunk_size)]
+
+
+def run_rows_in_processes(row_function, row_options, total, workers, chunk_size=None, progress=None):
+    """
+    Calcula las filas 0..total-1 con row_function(i, **row_options) en varios procesos.
+
+    El avance se envía a progress desde el proceso principal conforme terminan los bloques, con el
+    mismo evento PROGRESS del cálculo secuencial.
+
+    Args:
+        row_function: Función de nivel de módulo (debe poder serializarse con pickle)
+        row_options (dict): Argumentos compartidos por todas las filas
+        total (int): Número de filas
+        workers (int): Número de procesos
+        chunk_size (int): Filas por tarea (opcional)
+        progress (ProgressSink): Sink del avance (opcional)
+
+    Returns:
+        list: Resultados en el orden de entrada, sin las filas que regresaron None
+
+    Raises:
+        Exception: La excepción de la primera fila que falla en orden de entrada (no la del primer
+            bloque que termina), como en el cálculo secuencial
+    """
+    chunks = split_chunks(total, workers, chunk_size)
+    results = [None] * len(chunks)
+    # Índice del bloque -> excepción; se lanza la del primer bloque, igual que en el cálculo secuencial
+    errors = {}
+    processed = 0
+
+    executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(row_function, row_options))
+    try:
+        futures = {executor.submit(_calculate_chunk, start, stop): index for index, (start, stop) in enumerate(chunks)}
+        for future in as_completed(futures):
+            index = futures[future]
+            if future.cancelled():
+                continue
+            error = future.exception()
+            if error is not None:
+                errors[index] = error
+                # Los bloques posteriores ya no cambian el error; los anteriores pueden fallar en una fila previa
+                for pending, pending_index in futures.items():
+                    if pending_index > index:
+                        pending.cancel()
+                continue
+            results[index] = future.result()
+            start, stop = chunks[index]
+            processed += stop - start
+            if progress is not None:
+                progress.emit(ProgressEvent(PROGRESS, processed, total))
+        if errors:
+            raise errors[min(errors)]
+    except BaseException:
+        # Si un bloque falla (por ejemplo en modo estricto) no se esperan los bloques pendientes
+        executor.shutdown(wait=True, cancel_futures=True)
+        raise
+    executor.shutdown(wait=True)
+
+    return [row for rows in results for row in rows]
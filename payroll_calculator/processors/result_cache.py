@@ -0,0 +1,239 @@
+"""
+Caché persistente (SQLite) de filas calculadas.
+
+Cada fila se guarda con la llave (huella del ParameterSet, huella de las entradas de la fila), así
+una nómina que se vuelve a correr solo recalcula las filas que cambiaron. La base usa WAL para que
+las lecturas no bloqueen las escrituras, las escrituras se hacen en bloque con executemany y el
+número de filas está acotado: al excederlo se descartan las menos usadas recientemente (LRU).
+El número de filas se lleva en cache_info (lo actualizan triggers al insertar y al borrar), así que
+revisar el límite en cada escritura no recorre la tabla con COUNT(*).
+
+La base guarda la versión del motor que calculó las filas (ENGINE_VERSION); si al abrirla no
+coincide con la actual, las filas guardadas se descartan, porque un cambio en el cálculo no
+cambia la llave de las filas.
+
+Uso desde la línea de comandos:
+    python -m payroll_calculator.processors.result_cache stats <ruta>
+    python -m payroll_calculator.processors.result_cache clear <ruta>
+"""
+import argparse
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from payroll_calculator import __version__
+from payroll_calculator.serialization import json_default
+
+DEFAULT_MAX_ROWS = 1_000_000
+
+# Formato de las filas guardadas; se incrementa si cambia el cálculo o las columnas sin cambiar __version__
+SCHEMA_VERSION = 1
+ENGINE_VERSION = f"{__version__}/{SCHEMA_VERSION}"
+
+# Máximo de parámetros por consulta IN (SQLITE_MAX_VARIABLE_NUMBER conservador)
+_QUERY_CHUNK = 500
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS row_results (
+    parameter_hash TEXT NOT NULL,
+    row_hash TEXT NOT NULL,
+    result TEXT NOT NULL,
+    last_used INTEGER NOT NULL,
+    PRIMARY KEY (parameter_hash, row_hash)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS row_results_last_used ON row_results (last_used);
+CREATE TABLE IF NOT EXISTS cache_info (
+    name TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TRIGGER IF NOT EXISTS row_results_count_insert AFTER INSERT ON row_results BEGIN
+    UPDATE cache_info SET value = CAST(value AS INTEGER) + 1 WHERE name = 'row_count';
+END;
+CREATE TRIGGER IF NOT EXISTS row_results_count_delete AFTER DELETE ON row_results BEGIN
+    UPDATE cache_info SET value = CAST(value AS INTEGER) - 1 WHERE name = 'row_count';
+END;
+"""
+
+
+def hash_row_key(key):
+    """Huella SHA-256 de la llave de una fila (ver calculator.row_input_key)"""
+    return hashlib.sha256(repr(key).encode('utf-8')).hexdigest()
+
+
+class ResultCache:
+    """
+    Caché de filas en un archivo SQLite.
+
+    Attributes:
+        path (str): Ruta de la base de datos
+        max_rows (int): Número máximo de filas guardadas
+        hits (int): Filas encontradas en esta sesión
+        misses (int): Filas buscadas que no estaban guardadas
+        evictions (int): Filas descartadas por exceder max_rows
+        discarded (int): Filas descartadas al abrir la base porque las calculó otra versión del motor
+    """
+
+    def __init__(self, path, max_rows=DEFAULT_MAX_ROWS, engine_version=ENGINE_VERSION):
+        if max_rows <= 0:
+            raise ValueError("max_rows debe ser mayor que 0")
+        self.path = path
+        self.max_rows = max_rows
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.discarded = 0
+        self.engine_version = engine_version
+        self._lock = threading.Lock()
+        # Modo autocommit: cada operación abre su propia transacción explícita
+        self._connection = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.executescript(_SCHEMA)
+        self._init_row_count()
+        self._check_engine_version()
+
+    def _init_row_count(self):
+        """Cuenta las filas una vez si la base no lleva la cuenta en cache_info (bases de versiones anteriores)"""
+        with self._connection:
+            self._connection.execute("BEGIN IMMEDIATE")
+            self._connection.execute(
+                "INSERT OR IGNORE INTO cache_info (name, value) SELECT 'row_count', COUNT(*) FROM row_results "
+                "WHERE NOT EXISTS (SELECT 1 FROM cache_info WHERE name = 'row_count')")
+
+    def _check_engine_version(self):
+        """Descarta las filas guardadas si las calculó otra versión del motor"""
+        stored = self._connection.execute("SELECT value FROM cache_info WHERE name = 'engine_version'").fetchone()
+        if stored is not None and stored[0] == self.engine_version:
+            return
+        with self._connection:
+            self._connection.execute("BEGIN")
+            self.discarded = self._connection.execute("DELETE FROM row_results").rowcount
+            self._connection.execute("INSERT OR REPLACE INTO cache_info (name, value) VALUES ('engine_version', ?)",
+                                     (self.engine_version,))
+
+    def get_many(self, parameter_hash, row_hashes):
+        """
+        Busca varias filas y marca las encontradas como usadas.
+
+        Args:
+            parameter_hash (str): ParameterSet.content_hash de la corrida
+            row_hashes (iterable): Huellas de las filas (hash_row_key)
+
+        Returns:
+            dict: Huella -> fila (dict) para las filas encontradas
+        """
+        row_hashes = list(dict.fromkeys(row_hashes))
+        found = {}
+        with self._lock:
+            for start in range(0, len(row_hashes), _QUERY_CHUNK):
+                chunk = row_hashes[start:start + _QUERY_CHUNK]
+                placeholders = ','.join('?' * len(chunk))
+                cursor = self._connection.execute(
+                    f"SELECT row_hash, result FROM row_results WHERE parameter_hash = ? AND row_hash IN ({placeholders})",
+                    [parameter_hash, *chunk])
+                for row_hash, result in cursor:
+                    found[row_hash] = json.loads(result)
+            if found:
+                now = time.time_ns()
+                with self._connection:
+                    self._connection.execute("BEGIN")
+                    self._connection.executemany(
+                        "UPDATE row_results SET last_used = ? WHERE parameter_hash = ? AND row_hash = ?",
+                        [(now, parameter_hash, row_hash) for row_hash in found])
+            self.hits += len(found)
+            self.misses += len(row_hashes) - len(found)
+        return found
+
+    def put_many(self, parameter_hash, rows):
+        """
+        Guarda varias filas en una sola transacción y aplica el límite de tamaño.
+
+        Args:
+            parameter_hash (str): ParameterSet.content_hash de la corrida
+            rows (iterable): Pares (huella de la fila, fila)
+        """
+        now = time.time_ns()
+        values = [(parameter_hash, row_hash, json.dumps(row, default=json_default), now) for row_hash, row in rows]
+        if not values:
+            return
+        with self._lock:
+            with self._connection:
+                self._connection.execute("BEGIN")
+                # Un upsert (y no INSERT OR REPLACE) para que el trigger de inserción solo cuente filas nuevas
+                self._connection.executemany(
+                    "INSERT INTO row_results (parameter_hash, row_hash, result, last_used) VALUES (?, ?, ?, ?) "
+                    "ON CONFLICT (parameter_hash, row_hash) DO UPDATE SET result = excluded.result, "
+                    "last_used = excluded.last_used",
+                    values)
+                self._evict()
+
+    def _evict(self):
+        excess = len(self) - self.max_rows
+        if excess <= 0:
+            return
+        self._connection.execute(
+            "DELETE FROM row_results WHERE (parameter_hash, row_hash) IN "
+            "(SELECT parameter_hash, row_hash FROM row_results ORDER BY last_used LIMIT ?)", (excess,))
+        self.evictions += excess
+
+    def clear(self):
+        """Borra todas las filas guardadas y reinicia los contadores"""
+        with self._lock:
+            self._connection.execute("DELETE FROM row_results")
+            self._connection.execute("VACUUM")
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self):
+        """
+        Returns:
+            dict: rows, max_rows, engine_version, hits, misses, evictions, discarded y hit_rate de esta sesión
+        """
+        lookups = self.hits + self.misses
+        return {
+            'rows': len(self),
+            'max_rows': self.max_rows,
+            'engine_version': self.engine_version,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'discarded': self.discarded,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+        }
+
+    def __len__(self):
+        return int(self._connection.execute("SELECT value FROM cache_info WHERE name = 'row_count'").fetchone()[0])
+
+    def close(self):
+        self._connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __repr__(self):
+        return f"ResultCache(path={self.path!r}, max_rows={self.max_rows})"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m payroll_calculator.processors.result_cache',
+                                     description='Administra el caché SQLite de resultados por fila')
+    parser.add_argument('command', choices=['stats', 'clear'])
+    parser.add_argument('path', help='Ruta del archivo SQLite')
+    args = parser.parse_args(argv)
+
+    with ResultCache(args.path) as cache:
+        if args.command == 'clear':
+            rows = len(cache)
+            cache.clear()
+            print(f"Cache cleared: {rows} rows removed from {args.path}")
+        else:
+            print(f"Rows: {len(cache)}")
+            print(f"Engine version: {cache.engine_version}")
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,108 @@
+"""
+Caché LRU de filas para process_multiple_calculations.
+
+Las nóminas repiten mucho las mismas entradas (por ejemplo miles de empleados con salario mínimo y
+el mismo período), así que el resultado combinado de una fila se guarda con una llave hecha de sus
+entradas numéricas normalizadas, las opciones de la corrida y la huella del ParameterSet. Las filas
+idénticas se calculan una sola vez y las demás reciben una copia del resultado.
+"""
+import threading
+from collections import OrderedDict
+
+DEFAULT_MAXSIZE = 4096
+
+_MISSING = object()
+_NAN = ('nan',)
+
+
+def normalize_value(value):
+    """
+    Convierte un valor de entrada en una parte de llave hashable y estable.
+
+    Los escalares de NumPy se convierten a tipos de Python y se conserva el tipo (15 y 15.0 generan
+    filas distintas porque el resultado repite el valor de entrada). NaN se representa con un marcador,
+    ya que NaN != NaN.
+    """
+    if hasattr(value, 'item'):
+        value = value.item()
+    if isinstance(value, float) and value != value:
+        return _NAN
+    return (type(value), value)
+
+
+class RowCache:
+    """
+    Caché LRU acotado de filas calculadas, seguro para usarse desde varios hilos.
+
+    Attributes:
+        maxsize (int): Número máximo de filas guardadas
+        hits (int): Filas que se tomaron del caché
+        misses (int): Filas que se tuvieron que calcular
+        evictions (int): Filas descartadas por exceder maxsize
+    """
+
+    def __init__(self, maxsize=DEFAULT_MAXSIZE):
+        if maxsize <= 0:
+            raise ValueError("maxsize debe ser mayor que 0")
+        self.maxsize = maxsize
+        self._rows = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        """Regresa una copia de la fila guardada, o None si no existe (cuenta un acierto o un fallo)"""
+        with self._lock:
+            row = self._rows.get(key, _MISSING)
+            if row is _MISSING:
+                self.misses += 1
+                return None
+            self._rows.move_to_end(key)
+            self.hits += 1
+        return dict(row)
+
+    def put(self, key, row):
+        """Guarda una copia de la fila y descarta las menos usadas recientemente si se excede maxsize"""
+        row = dict(row)
+        with self._lock:
+            self._rows[key] = row
+            self._rows.move_to_end(key)
+            while len(self._rows) > self.maxsize:
+                self._rows.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        """Vacía el caché y reinicia los contadores"""
+        with self._lock:
+            self._rows.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self):
+        """
+        Returns:
+            dict: hits, misses, evictions, size, maxsize y hit_rate (0 si no hubo consultas)
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'size': len(self._rows),
+                'maxsize': self.maxsize,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+            }
+
+    def __len__(self):
+        return len(self._rows)
+
+    def __getstate__(self):
+        # En el modo de procesos cada proceso recibe un caché vacío del mismo tamaño (los candados no se serializan)
+        return {'maxsize': self.maxsize}
+
+    def __setstate__(self, state):
+        self.__init__(state['maxsize'])
+
+    def __repr__(self):
+        return f"RowCache(size={len(self._rows)}, maxsize={self.maxsize}, hits={self.hits}, misses={self.misses}, evictions={self.evictions})"
@@ -0,0 +1,159 @@
+"""
+Avance y diagnósticos del cálculo.
+
+El motor no imprime nada: emite eventos estructurados (ProgressEvent) a un sink que se pasa como
+`progress=` a process_multiple_calculations, iter_calculations o process_single_calculation. Sin
+sink (el valor por defecto) los eventos no se crean, así que usar el paquete como biblioteca es
+silencioso y el ciclo de filas no paga escrituras a stdout.
+
+Sinks incluidos:
+- PrintSink: imprime cada evento con los mismos mensajes que antes se imprimían
+- LoggingSink: envía los eventos a un logger (avance en INFO, diagnósticos en WARNING)
+- CollectingSink: guarda los eventos en una lista
+- RateLimitedSink: limita por tiempo los eventos que llegan a otro sink; del avance deja pasar el
+  primero, el último y como máximo uno por intervalo, y de cada diagnóstico uno por intervalo con el
+  número de eventos omitidos desde el anterior
+
+Ejemplo:
+    rows = process_multiple_calculations(..., progress=print_progress(interval=1.0))
+"""
+import logging
+import sys
+import threading
+import time
+from collections import namedtuple
+
+# Tipos de evento
+PROGRESS = 'progress'
+ROW_SKIPPED = 'row_skipped'
+BELOW_SMG = 'below_smg'
+SMG_ABOVE_SALARY = 'smg_above_salary'
+
+MESSAGES = {
+    PROGRESS: "Processing salary {index}/{total}...",
+    ROW_SKIPPED: "Salary is 0. Skipping salary at index {index}. {salary}",
+    BELOW_SMG: "SALARIO MENOR O IGUAL AL SMG, NO APLICAR RETENCIONES",
+    SMG_ABOVE_SALARY: "SMG for {payment_period} days is higher than salary. Skipping salary {salary}.",
+}
+
+DEFAULT_INTERVAL = 1.0
+
+ProgressEvent = namedtuple('ProgressEvent', ['kind', 'index', 'total', 'data', 'suppressed'],
+                           defaults=(None, None, None, 0))
+ProgressEvent.__doc__ = """
+Evento del cálculo.
+
+- kind: Tipo de evento (PROGRESS, ROW_SKIPPED, BELOW_SMG, SMG_ABOVE_SALARY)
+- index: Fila a la que se refiere (en PROGRESS, filas procesadas)
+- total: Número total de filas de la corrida
+- data: dict con los valores del mensaje (por ejemplo salary o payment_period)
+- suppressed: Eventos del mismo tipo que RateLimitedSink omitió antes de este
+"""
+
+
+def format_event(event):
+    """Texto del evento, con los mismos mensajes que imprimía el motor"""
+    message = MESSAGES.get(event.kind, event.kind).format(index=event.index, total=event.total, **(event.data or {}))
+    if event.suppressed:
+        message += f" ({event.suppressed} similar events suppressed)"
+    return message
+
+
+class ProgressSink:
+    """Sink base: ignora todos los eventos. Las subclases implementan emit y, si acumulan, flush"""
+
+    def emit(self, event):
+        pass
+
+    def flush(self):
+        """Se llama al terminar la corrida"""
+        pass
+
+
+class PrintSink(ProgressSink):
+    """Imprime cada evento en `stream` (por defecto sys.stdout al momento de emitir)"""
+
+    def __init__(self, stream=None):
+        self.stream = stream
+
+    def emit(self, event):
+        print(format_event(event), file=self.stream or sys.stdout)
+
+
+class LoggingSink(ProgressSink):
+    """Envía los eventos a un logger: el avance en INFO y los diagnósticos en WARNING"""
+
+    def __init__(self, logger=None):
+        self.logger = logger or logging.getLogger('payroll_calculator')
+
+    def emit(self, event):
+        level = logging.INFO if event.kind == PROGRESS else logging.WARNING
+        if self.logger.isEnabledFor(level):
+            self.logger.log(level, format_event(event), extra={'payroll_event': event})
+
+
+class CollectingSink(ProgressSink):
+    """Guarda los eventos en `events` (útil en pruebas o para reportarlos al final)"""
+
+    def __init__(self):
+        self.events = []
+        self._lock = threading.Lock()
+
+    def emit(self, event):
+        with self._lock:
+            self.events.append(event)
+
+    def of_kind(self, kind):
+        return [event for event in self.events if event.kind == kind]
+
+
+class RateLimitedSink(ProgressSink):
+    """
+    Limita por tiempo los eventos que llegan a `sink`. Seguro para usarse desde varios hilos.
+
+    Args:
+        sink (ProgressSink): Sink que recibe los eventos que pasan
+        interval (float): Segundos mínimos entre dos eventos del mismo tipo
+        clock: Función que regresa el tiempo actual en segundos (time.monotonic por defecto)
+    """
+
+    def __init__(self, sink, interval=DEFAULT_INTERVAL, clock=time.monotonic):
+        self.sink = sink
+        self.interval = interval
+        self.clock = clock
+        self._last_sent = {}
+        self._suppressed = {}
+        self._last_suppressed = {}
+        self._lock = threading.Lock()
+
+    def emit(self, event):
+        now = self.clock()
+        with self._lock:
+            last = self._last_sent.get(event.kind)
+            is_final = event.kind == PROGRESS and event.index is not None and event.index == event.total
+            if last is not None and now - last < self.interval and not is_final:
+                self._suppressed[event.kind] = self._suppressed.get(event.kind, 0) + 1
+                self._last_suppressed[event.kind] = event
+                return
+            self._last_sent[event.kind] = now
+            suppressed = self._suppressed.pop(event.kind, 0)
+            self._last_suppressed.pop(event.kind, None)
+        if event.kind != PROGRESS and suppressed:
+            event = event._replace(suppressed=suppressed)
+        self.sink.emit(event)
+
+    def flush(self):
+        """Envía el último diagnóstico omitido de cada tipo con el número de eventos omitidos"""
+        with self._lock:
+            pending = [(self._last_suppressed[kind], count) for kind, count in self._suppressed.items()
+                       if kind != PROGRESS and kind in self._last_suppressed]
+            self._suppressed.clear()
+            self._last_suppressed.clear()
+        for event, count in pending:
+            self.sink.emit(event._replace(suppressed=count - 1))
+        self.sink.flush()
+
+
+def print_progress(interval=DEFAULT_INTERVAL, stream=None):
+    """Sink que imprime el avance y los diagnósticos como máximo una vez por intervalo"""
+    return RateLimitedSink(PrintSink(stream), interval)
@@ -1,20 +1,21 @@
 from .parameters import Parameters
 from .employees import Employee
-import inspect
+from . import tracing
 
 
 class RCV:
-    def __init__(self, daily_integrated_wage, payment_period):
-        frame_llamador = inspect.currentframe().f_back
-        info = inspect.getframeinfo(frame_llamador)
-        # print(f"Instanciado desde {info.filename}, función {info.function}, línea {info.lineno}")
+    def __init__(self, daily_integrated_wage, payment_period, year=None):
+        if tracing.enabled:
+            tracing.record_call_site('RCV')
         self.daily_integrated_wage = daily_integrated_wage
         self.days = payment_period
+        # Año de la tabla de cesantía y vejez (None = año actual)
+        self.year = year
         self.parameters = Parameters()
 
     # Porcentaje de integración ------- Columna Enumero
     def get_retirement_percentage(self):
-        return Parameters.get_retirement_percentage(self.daily_integrated_wage)
+        return Parameters.get_retirement_percentage(self.daily_integrated_wage, self.year)
 
     # Cuota patronal ------- Columna Fnumero
     def get_quota_employer(self):
@@ -1,3 +1,5 @@
+from bisect import bisect_left
+
 rates_by_year = {
     "2023": [0.03150, 0.03281, 0.03575, 0.03751, 0.03869, 0.03953, 0.04016, 0.04241],
     "2024": [0.03150, 0.03413, 0.04000, 0.04353, 0.04588, 0.04756, 0.04882, 0.05331],
@@ -49,4 +51,73 @@ def get_rcv_table_by_year(year):
         available_years = list(severance_and_old_age_by_year.keys())
         raise KeyError(f"Año {year} no disponible. Años disponibles: {available_years}")
     
-    return severance_and_old_age_by_year[str(year)]
\ No newline at end of file
+    return severance_and_old_age_by_year[str(year)]
+
+
+class CompiledRcvTable:
+    """
+    Tabla RCV de un año convertida en fronteras ordenadas para buscar el porcentaje en O(log n).
+
+    Los rangos de la tabla se revisan en orden y gana el primero que contiene al salario (con límites
+    inclusivos); si ninguno lo contiene se usa el último porcentaje. Como los rangos no son contiguos
+    (y alguno está invertido), ese resultado se precalcula para cada frontera y para cada intervalo
+    abierto entre fronteras consecutivas, así la búsqueda binaria da exactamente el mismo porcentaje
+    que el recorrido lineal.
+    """
+    __slots__ = ('boundaries', 'boundary_rates', 'interval_rates', '_boundaries_array', '_boundary_rates_array', '_interval_rates_array')
+
+    def __init__(self, table):
+        self.boundaries = sorted({limit for row in table for limit in (row['lower_limit'], row['upper_limit']) if limit != float('inf')})
+        self.boundary_rates = [_scan_rcv_table(table, boundary) for boundary in self.boundaries]
+        # interval_rates[i] corresponde a (boundaries[i - 1], boundaries[i]); los extremos son abiertos hacia +-inf
+        representatives = [self.boundaries[0] - 1]
+        representatives += [(low + high) / 2 for low, high in zip(self.boundaries, self.boundaries[1:])]
+        representatives.append(self.boundaries[-1] + 1)
+        self.interval_rates = [_scan_rcv_table(table, value) for value in representatives]
+        # Los arreglos de NumPy se crean al primer uso de rates, así el cálculo por objetos no carga NumPy
+        self._boundaries_array = self._boundary_rates_array = self._interval_rates_array = None
+
+    def rate(self, wage):
+        """Porcentaje de cesantía y vejez para un salario diario integrado"""
+        index = bisect_left(self.boundaries, wage)
+        if index < len(self.boundaries) and self.boundaries[index] == wage:
+            return self.boundary_rates[index]
+        return self.interval_rates[index]
+
+    def rates(self, wages):
+        """Versión vectorizada de rate para un arreglo de salarios"""
+        import numpy as np
+        if self._boundaries_array is None:
+            self._boundary_rates_array = np.array(self.boundary_rates)
+            self._interval_rates_array = np.array(self.interval_rates)
+            self._boundaries_array = np.array(self.boundaries)
+        wages = np.asarray(wages, dtype=float)
+        index = np.searchsorted(self._boundaries_array, wages, side='left')
+        safe_index = np.minimum(index, len(self.boundaries) - 1)
+        on_boundary = (index < len(self.boundaries)) & (self._boundaries_array[safe_index] == wages)
+        return np.where(on_boundary, self._boundary_rates_array[safe_index], self._interval_rates_array[index])
+
+
+def _scan_rcv_table(table, wage):
+    """Búsqueda lineal original: primer rango que contiene al salario, o el último porcentaje"""
+    for range_data in table:
+        if range_data['lower_limit'] <= wage <= range_data['upper_limit']:
+            return range_data['percentage']
+    return table[-1]['percentage']
+
+
+# Tablas compiladas una sola vez al importar el módulo
+compiled_rcv_tables = {year: CompiledRcvTable(table) for year, table in severance_and_old_age_by_year.items()}
+
+
+def get_compiled_rcv_table(year):
+    """
+    Obtiene la tabla RCV compilada (CompiledRcvTable) de un año.
+
+    Raises:
+        KeyError: Si el año no está disponible en las tablas
+    """
+    compiled = compiled_rcv_tables.get(str(year))
+    if compiled is None:
+        raise KeyError(f"Año {year} no disponible. Años disponibles: {list(compiled_rcv_tables.keys())}")
+    return compiled
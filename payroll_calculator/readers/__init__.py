@@ -0,0 +1,5 @@
+"""
+Readers module for Payroll Calculator
+"""
+
+from .salary_reader import read_salary_columns, read_header, load_salary_columns, calculation_arguments
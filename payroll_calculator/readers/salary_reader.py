@@ -0,0 +1,253 @@
+"""
+Lectura por bloques de archivos CSV/TSV con los datos de nómina.
+
+Cada bloque se entrega como un diccionario de columnas con arreglos de NumPy ya tipados, listos
+para process_batch_calculations (o para process_multiple_calculations vía calculation_arguments).
+El archivo se recorre con el módulo csv sin cargarlo completo en memoria.
+"""
+import csv
+import logging
+import re
+import numpy as np
+from payroll_calculator.parameters import Parameters
+
+DEFAULT_CHUNK_SIZE = 10000
+
+# Columnas reconocidas, en el orden que se asume cuando el archivo no tiene encabezado
+COLUMNS = (
+    'daily_salary', 'period_salary', 'payment_period', 'integration_factor',
+    'productivity', 'net_salary', 'other_perception', 'commission_and_bonus',
+)
+
+# Nombres de encabezado aceptados para cada columna (se comparan en minúsculas y sin espacios extra)
+COLUMN_ALIASES = {
+    'daily_salary': ('daily_salary', 'salary', 'salario_diario', 'salario diario', 'salario'),
+    'period_salary': ('period_salary', 'salario_periodo', 'salario del periodo', 'sueldo_periodo'),
+    'payment_period': ('payment_period', 'periodo_pago', 'periodo de pago', 'dias', 'días'),
+    'integration_factor': ('integration_factor', 'factor_integracion', 'factor de integración', 'factor de integracion'),
+    'productivity': ('productivity', 'productividad'),
+    'net_salary': ('net_salary', 'salario_neto', 'salario neto'),
+    'other_perception': ('other_perception', 'otras_percepciones', 'otras percepciones'),
+    'commission_and_bonus': ('commission_and_bonus', 'commission_and_bonus_for_isr', 'comision_bono', 'comisiones y bonos'),
+}
+
+# Tipo de cada columna; las celdas vacías o inválidas quedan como NaN (o 0 en enteros)
+COLUMN_TYPES = {column: np.float64 for column in COLUMNS}
+COLUMN_TYPES['payment_period'] = np.int64
+
+# Alias de encabezado (en minúsculas) -> columna
+HEADER_LOOKUP = {alias: column for column, aliases in COLUMN_ALIASES.items() for alias in aliases}
+
+# Una coma solo se acepta como separador de miles: "1,234.56" sí, "1234,56" o "1,2" no
+_THOUSANDS = re.compile(r'[-+]?\d{1,3}(,\d{3})+(\.\d*)?')
+
+logger = logging.getLogger('payroll_calculator')
+
+
+def parse_number(cell):
+    """
+    Convierte una celda a float; acepta separadores de miles y signo de pesos. Celda vacía = NaN
+
+    Raises:
+        ValueError: Si la celda no es un número, o si trae comas que no separan miles (p. ej. una
+            coma decimal como "1234,56", que es ambigua)
+    """
+    cell = cell.strip().replace('$', '')
+    if ',' in cell:
+        if not _THOUSANDS.fullmatch(cell):
+            raise ValueError(f"número ambiguo o inválido: {cell!r}")
+        cell = cell.replace(',', '')
+    if not cell:
+        return float('nan')
+    return float(cell)
+
+
+def detect_delimiter(path, sample):
+    """Separador del archivo: '\\t' para .tsv, o el que se detecte en `sample` entre ',', '\\t' y ';'"""
+    if path.lower().endswith('.tsv'):
+        return '\t'
+    try:
+        return csv.Sniffer().sniff(sample, delimiters=',\t;').delimiter
+    except csv.Error:
+        # Una sola columna sin separadores
+        return ','
+
+
+def resolve_header(first_row):
+    """
+    Regresa la lista de columnas del archivo, o None si la primera fila ya son datos.
+
+    Las columnas desconocidas se ignoran (se marcan como None).
+    """
+    try:
+        parse_number(first_row[0])
+        return None
+    except ValueError:
+        pass
+    columns = [HEADER_LOOKUP.get(cell.strip().lower()) for cell in first_row]
+    if 'daily_salary' not in columns and 'productivity' not in columns:
+        raise ValueError(f"El archivo no tiene una columna de salario diario o productividad: {first_row}")
+    return columns
+
+
+def read_header(path, delimiter=None):
+    """
+    Regresa las columnas del encabezado del archivo (ver resolve_header), o None si su primera
+    fila con datos no tiene ningún nombre de columna conocido.
+    """
+    with open(path, 'r', newline='', encoding='utf-8-sig') as file:
+        line = next((line for line in file if line.strip()), None)
+    if line is None:
+        return None
+    first_row = next(csv.reader([line], delimiter=delimiter or detect_delimiter(path, line)))
+    if not any(cell.strip().lower() in HEADER_LOOKUP for cell in first_row):
+        return None
+    return resolve_header(first_row)
+
+
+def _build_chunk(rows, columns, start_line):
+    """Convierte una lista de filas de texto en un diccionario de arreglos tipados"""
+    values = {column: [] for column in columns if column is not None}
+    for offset, row in enumerate(rows):
+        for index, column in enumerate(columns):
+            if column is None:
+                continue
+            cell = row[index] if index < len(row) else ''
+            try:
+                value = parse_number(cell)
+            except ValueError:
+                logger.warning("Skipping invalid %s value at line %d: %s", column, start_line + offset, cell.strip())
+                value = float('nan')
+            values[column].append(value)
+    return typed_columns(values)
+
+
+def typed_columns(values):
+    """
+    Convierte listas de valores (float, NaN si falta) en arreglos con el tipo de COLUMN_TYPES.
+
+    Args:
+        values (dict): Columna -> lista de valores
+
+    Returns:
+        dict: Columna -> np.ndarray
+    """
+    chunk = {}
+    for column, column_values in values.items():
+        array = np.array(column_values, dtype=np.float64)
+        if COLUMN_TYPES[column] is np.int64:
+            array = np.nan_to_num(array, nan=0.0).astype(np.int64)
+        chunk[column] = array
+    return chunk
+
+
+def read_salary_columns(path, chunk_size=DEFAULT_CHUNK_SIZE, delimiter=None):
+    """
+    Lee un archivo CSV/TSV de nómina por bloques.
+
+    El archivo puede tener encabezado (ver COLUMN_ALIASES) o no tenerlo; sin encabezado las columnas
+    se toman en el orden de COLUMNS, así que un archivo con un salario por línea sigue funcionando.
+    Las líneas vacías se ignoran.
+
+    Args:
+        path (str): Ruta del archivo
+        chunk_size (int): Número máximo de filas por bloque
+        delimiter (str): Separador; por defecto '\\t' para .tsv o se detecta a partir del contenido
+
+    Yields:
+        dict: Columna -> np.ndarray con hasta chunk_size valores
+    """
+    with open(path, 'r', newline='', encoding='utf-8-sig') as file:
+        if delimiter is None:
+            delimiter = detect_delimiter(path, file.readline())
+            file.seek(0)
+
+        reader = csv.reader(file, delimiter=delimiter)
+        columns = None
+        rows = []
+        start_line = 1
+        for row in reader:
+            if not any(cell.strip() for cell in row):
+                continue
+            if columns is None:
+                columns = resolve_header(row)
+                if columns is not None:
+                    start_line = reader.line_num + 1
+                    continue
+                columns = list(COLUMNS[:len(row)])
+            rows.append(row)
+            if len(rows) >= chunk_size:
+                yield _build_chunk(rows, columns, start_line)
+                start_line = reader.line_num + 1
+                rows = []
+
+        if rows:
+            yield _build_chunk(rows, columns, start_line)
+
+
+def load_salary_columns(path, delimiter=None):
+    """
+    Lee el archivo completo y une los bloques en un solo diccionario de columnas.
+
+    Returns:
+        dict: Columna -> np.ndarray (vacío si el archivo no tiene filas)
+    """
+    chunks = list(read_salary_columns(path, delimiter=delimiter))
+    if not chunks:
+        return {}
+    return {column: np.concatenate([chunk[column] for chunk in chunks]) for column in chunks[0]}
+
+
+def calculation_arguments(columns, payment_period=15, integration_factor=Parameters.INTEGRATION_FACTOR):
+    """
+    Convierte las columnas leídas en los argumentos por fila de process_multiple_calculations
+    y process_batch_calculations.
+
+    Args:
+        columns (dict): Bloque de read_salary_columns o resultado de load_salary_columns
+        payment_period (int): Período de pago cuando el archivo no trae la columna (o la celda está vacía)
+        integration_factor (float): Factor de integración cuando el archivo no lo trae
+
+    Returns:
+        dict: salaries, period_salaries, payment_periods, integration_factors, productivities,
+              net_salaries, other_perceptions y commissions_and_bonus_for_isr. Las columnas opcionales
+              que no vienen en el archivo quedan como None
+    """
+    reference = columns.get('daily_salary', columns.get('productivity'))
+    size = 0 if reference is None else len(reference)
+
+    payment_periods = columns.get('payment_period')
+    if payment_periods is None:
+        payment_periods = np.full(size, payment_period, dtype=np.int64)
+    else:
+        payment_periods = np.where(payment_periods > 0, payment_periods, payment_period)
+
+    integration_factors = columns.get('integration_factor')
+    if integration_factors is None:
+        integration_factors = np.full(size, integration_factor)
+    else:
+        integration_factors = np.where(np.isnan(integration_factors), integration_factor, integration_factors)
+
+    salaries = columns.get('daily_salary')
+    salaries = np.array([]) if salaries is None else np.nan_to_num(salaries, nan=0.0)
+
+    # Si falta el salario del período en una fila se usa salario diario * período, como en el cálculo normal
+    period_salaries = columns.get('period_salary')
+    if period_salaries is not None and len(salaries) == len(period_salaries):
+        period_salaries = np.where(np.isnan(period_salaries), salaries * payment_periods, period_salaries)
+
+    def optional(column):
+        values = columns.get(column)
+        return None if values is None else np.nan_to_num(values, nan=0.0)
+
+    return {
+        'salaries': salaries,
+        'period_salaries': period_salaries,
+        'payment_periods': payment_periods,
+        'integration_factors': integration_factors,
+        'productivities': optional('productivity'),
+        # El salario neto conserva NaN; el cálculo lo trata como 0
+        'net_salaries': columns.get('net_salary'),
+        'other_perceptions': optional('other_perception'),
+        'commissions_and_bonus_for_isr': optional('commission_and_bonus'),
+    }
@@ -0,0 +1,236 @@
+"""
+Contenedor columnar para los resultados de process_multiple_calculations.
+
+En lugar de una lista de diccionarios (uno por fila, con las mismas ~50 llaves repetidas) se guarda
+un arreglo de NumPy por columna y, para las columnas que no todas las filas traen (por ejemplo
+total_retentions_dsi o employer_contributions), una máscara de validez.
+"""
+from collections.abc import Mapping
+import numpy as np
+
+# Columnas que process_multiple_calculations redondea con math.ceil y que se guardan como enteros
+INTEGER_COLUMNS = ('suggested_total_social_cost', 'dsi_scheme_fixed_fee', 'payment_period')
+
+# Columnas del motor vectorizado cuyo NaN equivale a None en el resultado por objetos
+NULLABLE_COLUMNS = ('isr_lower_limit', 'isr_range_credit_for_salary', 'other_perception')
+
+
+def _python_value(value):
+    return value.item() if hasattr(value, 'item') else value
+
+
+class PayrollRow(Mapping):
+    """
+    Vista de solo lectura de una fila de PayrollResults.
+
+    Se comporta como el diccionario de process_multiple_calculations: las columnas opcionales que la
+    fila no tiene no aparecen como llaves y las que tiene con valor None regresan None.
+    """
+    __slots__ = ('_results', '_index')
+
+    def __init__(self, results, index):
+        self._results = results
+        self._index = index
+
+    def __getitem__(self, name):
+        results = self._results
+        if name not in results.columns:
+            raise KeyError(name)
+        mask = results.masks.get(name)
+        if mask is not None and not mask[self._index]:
+            if results.is_null(name, self._index):
+                return None
+            raise KeyError(name)
+        return _python_value(results.columns[name][self._index])
+
+    def __iter__(self):
+        results = self._results
+        for name in results.columns:
+            mask = results.masks.get(name)
+            if mask is None or mask[self._index] or results.is_null(name, self._index):
+                yield name
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def __repr__(self):
+        return f"PayrollRow({dict(self)!r})"
+
+
+class PayrollResults:
+    """
+    Resultados de varias filas guardados por columna.
+
+    Attributes:
+        columns (dict): Nombre de columna -> np.ndarray (float64, int64 u object si hay texto)
+        masks (dict): Nombre de columna -> np.ndarray de bool, solo para columnas opcionales o nulas
+        nulls (dict): Nombre de columna -> np.ndarray de bool con las filas que tienen la llave con valor
+            None; las demás filas inválidas de la columna no tienen la llave
+    """
+    __slots__ = ('columns', 'masks', 'nulls', '_size')
+
+    def __init__(self, columns, masks=None, nulls=None):
+        self.columns = dict(columns)
+        self.masks = dict(masks or {})
+        self.nulls = dict(nulls or {})
+        self._size = len(next(iter(self.columns.values()))) if self.columns else 0
+
+    @classmethod
+    def from_batch(cls, columns, present=None):
+        """
+        Crea el contenedor a partir del resultado de process_batch_calculations.
+
+        Args:
+            columns (dict): Columnas del motor vectorizado
+            present (dict): Máscaras de las llaves opcionales
+
+        Returns:
+            PayrollResults
+        """
+        masks = {name: np.asarray(mask, dtype=bool) for name, mask in (present or {}).items()}
+        stored = {}
+        nulls = {}
+        for name, values in columns.items():
+            values = np.asarray(values)
+            if name in NULLABLE_COLUMNS:
+                valid = ~np.isnan(values)
+                if not valid.all():
+                    masks[name] = valid
+                    nulls[name] = ~valid
+            elif name in INTEGER_COLUMNS and values.dtype.kind == 'f':
+                values = np.ceil(values).astype(np.int64)
+            stored[name] = values
+        return cls(stored, masks, nulls)
+
+    @classmethod
+    def from_rows(cls, rows):
+        """
+        Crea el contenedor a partir de diccionarios por fila (lista o generador, p. ej. iter_calculations).
+
+        Las filas se recorren una sola vez; cada valor se guarda en listas por columna y al final se
+        convierte a arreglos tipados. Una llave con valor None se distingue de una llave ausente, así que
+        to_dicts regresa las mismas filas.
+
+        Returns:
+            PayrollResults
+        """
+        values = {}
+        valid = {}
+        # Columna -> índices de las filas que traen la llave con valor None
+        null_rows = {}
+        size = 0
+        for row in rows:
+            for name, value in row.items():
+                if name not in values:
+                    # Columna nueva: las filas anteriores no la tenían
+                    values[name] = [0] * size
+                    valid[name] = [False] * size
+                if value is None:
+                    null_rows.setdefault(name, []).append(size)
+                values[name].append(0 if value is None else value)
+                valid[name].append(value is not None)
+            size += 1
+            for name in values:
+                if len(values[name]) < size:
+                    values[name].append(0)
+                    valid[name].append(False)
+
+        columns = {}
+        masks = {}
+        nulls = {}
+        for name, indices in null_rows.items():
+            nulls[name] = np.zeros(size, dtype=bool)
+            nulls[name][indices] = True
+        for name, column_values in values.items():
+            column_valid = np.array(valid[name], dtype=bool)
+            if all(isinstance(value, (int, np.integer)) and not isinstance(value, bool) for value in column_values):
+                array = np.array(column_values, dtype=np.int64)
+            else:
+                try:
+                    array = np.array(column_values, dtype=np.float64)
+                    array[~column_valid] = np.nan
+                except (TypeError, ValueError):
+                    array = np.array(column_values, dtype=object)
+            columns[name] = array
+            if not column_valid.all():
+                masks[name] = column_valid
+        return cls(columns, masks, nulls)
+
+    def __len__(self):
+        return self._size
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += self._size
+        if not 0 <= index < self._size:
+            raise IndexError(index)
+        return PayrollRow(self, index)
+
+    def __iter__(self):
+        for index in range(self._size):
+            yield PayrollRow(self, index)
+
+    def is_null(self, name, index):
+        """True si la fila index tiene la llave name con valor None"""
+        nulls = self.nulls.get(name)
+        return nulls is not None and bool(nulls[index])
+
+    def names(self):
+        """Nombres de las columnas en el orden en que aparecen en las filas"""
+        return list(self.columns)
+
+    def column(self, name):
+        """Arreglo de la columna (las filas inválidas de columnas float son NaN)"""
+        return self.columns[name]
+
+    def valid(self, name):
+        """Máscara de filas que tienen un valor en la columna"""
+        mask = self.masks.get(name)
+        if mask is None:
+            return np.ones(self._size, dtype=bool)
+        return mask
+
+    def sum(self, name, default=0):
+        """
+        Suma de una columna sobre las filas válidas, en el mismo orden que sum(row.get(name, 0) ...).
+
+        Regresa default si la columna no existe.
+        """
+        if name not in self.columns:
+            return default
+        values = self.columns[name]
+        mask = self.masks.get(name)
+        if mask is not None:
+            values = values[mask]
+        return sum(values.tolist())
+
+    def to_dicts(self):
+        """
+        Regresa la lista de diccionarios equivalente a process_multiple_calculations.
+
+        Returns:
+            list: Un dict por fila
+        """
+        names = list(self.columns)
+        values = {name: self.columns[name].tolist() for name in names}
+        masks = {name: mask.tolist() for name, mask in self.masks.items()}
+        nulls = {name: mask.tolist() for name, mask in self.nulls.items()}
+        rows = []
+        for index in range(self._size):
+            row = {}
+            for name in names:
+                if name in masks and not masks[name][index]:
+                    if name in nulls and nulls[name][index]:
+                        row[name] = None
+                    continue
+                row[name] = values[name][index]
+            rows.append(row)
+        return rows
+
+    def nbytes(self):
+        """Memoria aproximada de los arreglos (columnas y máscaras) en bytes"""
+        masks = list(self.masks.values()) + list(self.nulls.values())
+        return sum(array.nbytes for array in self.columns.values()) + sum(mask.nbytes for mask in masks)
+
+    def __repr__(self):
+        return f"PayrollResults(rows={self._size}, columns={len(self.columns)})"
@@ -1,5 +1,7 @@
+import copy
 from .imss import IMSS
 from .isr import ISR
+from .progress import ProgressEvent, BELOW_SMG
 from typing import Optional
 
 
@@ -11,7 +13,8 @@ class Saving:
                  minimum_threshold_salary: Optional[float] = None, productivity: Optional[float] = None, applied_commission_to: str = 'salary', 
                  net_salary: Optional[float] = None, other_perception: Optional[float] = None, is_without_salary_mode: bool = False, is_salary_processed_bigger_than_smg = False,
                  is_salary_completed_bigger_than_smg = False, is_pure_mode=False, is_percentage_mode=False, is_keep_declared_salary=False, is_pure_special_mode: bool = False,
-                 is_standard_mode: bool = False, is_staggered_mode: bool = False, commission_and_bonus_for_isr: Optional[float] = None):
+                 is_standard_mode: bool = False, is_staggered_mode: bool = False, commission_and_bonus_for_isr: Optional[float] = None,
+                 progress=None):
         self.wage_and_salary = wage_and_salary
         self.original_wage_and_salary = wage_and_salary  # Guardar el valor original
         self.imss: IMSS = imss_instance # Now non-optional
@@ -37,6 +40,8 @@ class Saving:
         self.is_standard_mode = is_standard_mode
         self.is_staggered_mode = is_staggered_mode
         self.commission_and_bonus_for_isr = commission_and_bonus_for_isr if commission_and_bonus_for_isr else 0
+        # ProgressSink opcional para los diagnósticos (ver payroll_calculator.progress)
+        self.progress = progress
 
     # set_imss might be less necessary if IMSS is required at init, but keep for flexibility
     def set_imss(self, imss_instance: IMSS) -> None:
@@ -49,6 +54,17 @@ class Saving:
         """Establece una instancia de ISR para usar sus métodos"""
         self.isr = isr_instance
 
+    def with_wage_and_salary(self, wage_and_salary) -> 'Saving':
+        """
+        Devuelve una copia de esta instancia que calcula con otro sueldo y salario.
+
+        La copia comparte las instancias de IMSS e ISR (que no se modifican al calcular) y conserva
+        original_wage_and_salary, así que la instancia original no cambia.
+        """
+        saving = copy.copy(self)
+        saving.wage_and_salary = wage_and_salary
+        return saving
+
     # ------------------------------------------------------ CALCULO DE ESQUEMA TRADICIONAL QUINCENAL ------------------------------------------------------
 
     # Obtener el total de ingresos esquema tradicional ------- Columna Enumero
@@ -283,7 +299,8 @@ class Saving:
     def get_current_perception_dsi(self, original_wage_and_salary=None, use_imss_breakdown=False):
         # Si is_salary_bigger_than_smg NO es True (salario menor o igual al SMG), no aplicar retenciones
         if not self.is_salary_bigger_than_smg:
-            print("SALARIO MENOR O IGUAL AL SMG, NO APLICAR RETENCIONES")
+            if self.progress is not None:
+                self.progress.emit(ProgressEvent(BELOW_SMG))
             if use_imss_breakdown:
                 return original_wage_and_salary
             return self.get_total_wage_and_salary_dsi()
@@ -318,69 +335,64 @@ class Saving:
         if self.imss is None:
             raise ValueError("IMSS instance is not set. Use set_imss() method first.")
             
-        # Guardar el valor original de wage_and_salary
+        # Valor original de wage_and_salary
         original_wage_and_salary = self.wage_and_salary
         
-        # Si use_direct_daily_salary es True y se proporciona period_salary, usar ese valor
+        # Si use_direct_daily_salary es True y se proporciona period_salary, calcular sobre una copia con ese valor
+        saving = self
         if use_direct_daily_salary and period_salary is not None:
-            # Temporalmente reemplazar wage_and_salary con period_salary
-            self.wage_and_salary = period_salary
+            saving = self.with_wage_and_salary(period_salary)
         
-        try:
-            # Invocar la función get_dsi_scheme_biweekly_total con use_imss_breakdown=
-            # print("ORIGINAL WAGE AND SALARY: ", original_wage_and_salary)
-            dsi_total_fiscal_cost = self.get_dsi_scheme_biweekly_total(original_wage_and_salary, use_imss_breakdown=True)
-            
-            saving_amount = self.get_amount(use_imss_breakdown=True)
-            
-            saving_percentage = self.get_percentage(use_imss_breakdown=True) * 100
-            
-            saving_traditional_scheme_total = self.get_traditional_scheme_biweekly_total()
-            # print("================================== SAVING TRADITIONAL SCHEME TOTAL: ", saving_traditional_scheme_total, " =========================================")
+        # Invocar la función get_dsi_scheme_biweekly_total con use_imss_breakdown=
+        # print("ORIGINAL WAGE AND SALARY: ", original_wage_and_salary)
+        dsi_total_fiscal_cost = saving.get_dsi_scheme_biweekly_total(original_wage_and_salary, use_imss_breakdown=True)
+        
+        saving_amount = saving.get_amount(use_imss_breakdown=True)
+        
+        saving_percentage = saving.get_percentage(use_imss_breakdown=True) * 100
+        
+        saving_traditional_scheme_total = saving.get_traditional_scheme_biweekly_total()
+        # print("================================== SAVING TRADITIONAL SCHEME TOTAL: ", saving_traditional_scheme_total, " =========================================")
 
-            saving_total_retentions_isr = self.isr.get_tax_payable()
-            
-            # print("SELF.WAGE AND SALARY: ", self.wage_and_salary)
-            saving_total_retentions_isr_dsi = self.get_total_isr_retention_dsi(use_imss_breakdown=True)
-            # print("VALOR DE SAVING TOTAL RETENTIONS ISR DSI: ", saving_total_retentions_isr_dsi)
-            
-            saving_total_retentions_dsi = self.get_total_retentions(use_imss_breakdown=True)
-            
-            total_income = self.get_total_income_traditional_scheme(original_wage_and_salary=original_wage_and_salary)
-            
-            saving_total_current_perception_dsi = self.get_current_perception_dsi(original_wage_and_salary=total_income, use_imss_breakdown=True)
-            # print("SAVING TOTAL CURRENT PERCEPTION: ", saving_total_current_perception_dsi)
+        saving_total_retentions_isr = saving.isr.get_tax_payable()
+        
+        # print("SELF.WAGE AND SALARY: ", saving.wage_and_salary)
+        saving_total_retentions_isr_dsi = saving.get_total_isr_retention_dsi(use_imss_breakdown=True)
+        # print("VALOR DE SAVING TOTAL RETENTIONS ISR DSI: ", saving_total_retentions_isr_dsi)
+        
+        saving_total_retentions_dsi = saving.get_total_retentions(use_imss_breakdown=True)
+        
+        total_income = saving.get_total_income_traditional_scheme(original_wage_and_salary=original_wage_and_salary)
+        
+        saving_total_current_perception_dsi = saving.get_current_perception_dsi(original_wage_and_salary=total_income, use_imss_breakdown=True)
+        # print("SAVING TOTAL CURRENT PERCEPTION: ", saving_total_current_perception_dsi)
 
-            # Guardar temporalmente los valores actuales para calcular el incremento
-            current_perception = self.get_current_perception(original_wage_and_salary, use_imss_breakdown=True)
-            # print("CURRENT PERCEPTION: ", current_perception, " CON ORIGINAL WAGE AND SALARY: ", original_wage_and_salary)
-            
-            use_internal_perception = self.is_percentage_mode or self.is_staggered_mode or self.is_keep_declared_salary_mode or self.is_standard_mode
-            
-            # Calcular el incremento y porcentaje de incremento usando los valores guardados
-            saving_get_increment = (saving_total_current_perception_dsi - current_perception) if use_internal_perception and self.is_salary_bigger_than_smg else self.get_increment()
-            saving_get_increment_percentage = (saving_get_increment / current_perception) * 100 if current_perception != 0 else 0
-            
-            saving_productivity = self.get_productivity(use_original_wage=True)
-            
-            # Aquí puedes almacenar el resultado en una variable si es necesario
-            self.dsi_total_with_breakdown = dsi_total_fiscal_cost
-            return { 
-                'dsi_total_fiscal_cost': dsi_total_fiscal_cost, 
-                'saving_amount': saving_amount, 
-                'saving_percentage': saving_percentage, 
-                'saving_total_retentions_isr_dsi': saving_total_retentions_isr_dsi,
-                'saving_total_retentions_dsi': saving_total_retentions_dsi,
-                'saving_total_current_perception_dsi': saving_total_current_perception_dsi,
-                'saving_total_current_perception': current_perception,
-                'saving_get_increment': saving_get_increment,
-                'saving_get_increment_percentage': saving_get_increment_percentage,
-                'saving_wage_and_salary': self.wage_and_salary,
-                'saving_productivity': saving_productivity,
-                'use_direct_daily_salary': use_direct_daily_salary,  # Agregar este valor al resultado
-                'saving_wage_and_salary_dsi': self.wage_and_salary_dsi,
-            }
-        finally:
-            # Restaurar el valor original de wage_and_salary
-            if use_direct_daily_salary and period_salary is not None:
-                self.wage_and_salary = original_wage_and_salary
+        # Guardar temporalmente los valores actuales para calcular el incremento
+        current_perception = saving.get_current_perception(original_wage_and_salary, use_imss_breakdown=True)
+        # print("CURRENT PERCEPTION: ", current_perception, " CON ORIGINAL WAGE AND SALARY: ", original_wage_and_salary)
+        
+        use_internal_perception = self.is_percentage_mode or self.is_staggered_mode or self.is_keep_declared_salary_mode or self.is_standard_mode
+        
+        # Calcular el incremento y porcentaje de incremento usando los valores guardados
+        saving_get_increment = (saving_total_current_perception_dsi - current_perception) if use_internal_perception and self.is_salary_bigger_than_smg else saving.get_increment()
+        saving_get_increment_percentage = (saving_get_increment / current_perception) * 100 if current_perception != 0 else 0
+        
+        saving_productivity = saving.get_productivity(use_original_wage=True)
+        
+        # Aquí puedes almacenar el resultado en una variable si es necesario
+        self.dsi_total_with_breakdown = dsi_total_fiscal_cost
+        return { 
+            'dsi_total_fiscal_cost': dsi_total_fiscal_cost, 
+            'saving_amount': saving_amount, 
+            'saving_percentage': saving_percentage, 
+            'saving_total_retentions_isr_dsi': saving_total_retentions_isr_dsi,
+            'saving_total_retentions_dsi': saving_total_retentions_dsi,
+            'saving_total_current_perception_dsi': saving_total_current_perception_dsi,
+            'saving_total_current_perception': current_perception,
+            'saving_get_increment': saving_get_increment,
+            'saving_get_increment_percentage': saving_get_increment_percentage,
+            'saving_wage_and_salary': saving.wage_and_salary,
+            'saving_productivity': saving_productivity,
+            'use_direct_daily_salary': use_direct_daily_salary,  # Agregar este valor al resultado
+            'saving_wage_and_salary_dsi': self.wage_and_salary_dsi,
+        }
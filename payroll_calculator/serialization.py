@@ -0,0 +1,20 @@
+"""
+Serialización a JSON de las filas de resultados.
+
+Las filas del motor vectorizado (o calculadas a partir de arreglos) traen escalares de NumPy, que
+json no sabe escribir. json_default los convierte a tipos de Python sin importar NumPy, así que lo
+usan por igual la línea de comandos, el modo filtro, el servicio de cotizaciones y el caché SQLite.
+"""
+import json
+
+
+def json_default(value):
+    """Argumento `default` de json.dump/json.dumps: convierte los escalares de NumPy con .item()"""
+    if hasattr(value, 'item'):
+        return value.item()
+    raise TypeError(f"Valor no serializable en la fila: {value!r}")
+
+
+def dumps_row(row):
+    """Una fila (o cualquier valor de resultados) como JSON en una línea, sin escapar acentos"""
+    return json.dumps(row, ensure_ascii=False, default=json_default)
@@ -0,0 +1,382 @@
+"""
+Servicio local de cotizaciones por HTTP/JSON (solo biblioteca estándar: asyncio).
+
+    payroll-calc serve --params parametros.json --port 8080
+
+    curl -s localhost:8080/quote -d '{"salary": 500, "payment_period": 15, "mode": "pure"}'
+    curl -s localhost:8080/stats
+
+Rutas:
+- POST /quote: una cotización. El cuerpo trae las columnas de una fila (mismos nombres y alias que
+  readers.salary_reader: salary, payment_period, integration_factor, productivity, net_salary,
+  other_perception, commission_and_bonus...) y, opcionalmente, las opciones de QUOTE_OPTIONS que
+  reemplazan a las del archivo de parámetros. Responde 200 con la fila de resultados, 400 si la
+  solicitud es inválida, 422 si la fila se omite (salario 0 o error de stricted_mode) y 503 si el
+  servicio está saturado
+- GET /stats: contadores y latencias (p50/p99) de las cotizaciones
+- GET /health
+
+Las cotizaciones que llegan con pocos milisegundos de diferencia (max_delay) se juntan en un solo
+lote y se calculan en un hilo aparte, para no detener el ciclo de eventos, con una llamada al motor
+(streaming.calculate_records) por cada combinación de opciones y columnas presentes. Las solicitudes idénticas que llegan mientras otra igual está pendiente
+o calculándose esperan ese mismo resultado en lugar de calcularse de nuevo. Cuando hay max_pending
+cotizaciones pendientes las nuevas se rechazan con 503 y Retry-After (contrapresión).
+"""
+import asyncio
+import json
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+
+from payroll_calculator.cli import MODES, calculation_options
+from payroll_calculator.metrics import StageMetrics
+from payroll_calculator.readers.salary_reader import HEADER_LOOKUP
+from payroll_calculator.serialization import dumps_row
+from payroll_calculator.streaming import calculate_records, record_values
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8080
+DEFAULT_MAX_DELAY = 0.002
+DEFAULT_MAX_BATCH = 512
+DEFAULT_MAX_PENDING = 10000
+# Conexiones en espera de accept(); asyncio usa 100 y se llena con ráfagas de clientes nuevos.
+# El sistema lo recorta a net.core.somaxconn
+DEFAULT_BACKLOG = 1024
+MAX_BODY_BYTES = 64 * 1024
+
+# Opciones del archivo de parámetros que cada cotización puede reemplazar
+QUOTE_OPTIONS = (
+    'mode', 'periodicity', 'risk_class', 'smg_multiplier', 'commission_percentage_dsi', 'count_minimum_salary',
+    'use_increment_percentage', 'stricted_mode', 'imss_breakdown', 'applied_commission_to', 'productivity_to_zero',
+)
+
+# Combinaciones de opciones cuyos argumentos (con su ParameterSet) se guardan ya resueltos
+_MAX_OPTION_SETS = 128
+
+
+class Overloaded(Exception):
+    """Hay demasiadas cotizaciones pendientes"""
+
+
+class InvalidQuote(ValueError):
+    """La solicitud no es una cotización válida"""
+
+
+def parse_quote(body):
+    """
+    Separa el cuerpo de una cotización en columnas de la fila y opciones.
+
+    Returns:
+        tuple: (valores de la fila para calculate_records, tupla ordenada de opciones (nombre, valor))
+
+    Raises:
+        InvalidQuote: Si el cuerpo no es JSON, trae llaves desconocidas o valores inválidos
+    """
+    try:
+        quote = json.loads(body)
+    except (json.JSONDecodeError, UnicodeDecodeError) as error:
+        raise InvalidQuote(f"JSON inválido: {error}") from None
+    if not isinstance(quote, dict):
+        raise InvalidQuote("se esperaba un objeto JSON")
+    overrides = {name: quote.pop(name) for name in QUOTE_OPTIONS if name in quote}
+    unknown = sorted(key for key in quote if HEADER_LOOKUP.get(str(key).strip().lower()) is None)
+    if unknown:
+        raise InvalidQuote(f"llaves desconocidas: {', '.join(unknown)}")
+    if overrides.get('mode', 'traditional') not in MODES:
+        raise InvalidQuote(f"modo inválido {overrides['mode']!r} (opciones: {', '.join(MODES)})")
+    for name, value in overrides.items():
+        if isinstance(value, (dict, list)):
+            raise InvalidQuote(f"valor inválido para {name}: {value!r}")
+    try:
+        values = record_values(quote)
+    except ValueError as error:
+        raise InvalidQuote(str(error)) from None
+    return values, tuple(sorted(overrides.items()))
+
+
+class QuoteBatcher:
+    """
+    Junta las cotizaciones concurrentes en lotes y las calcula fuera del ciclo de eventos.
+
+    Args:
+        options (dict): Archivo de parámetros completo (ver cli.load_options)
+        max_delay (float): Segundos que la primera cotización de un lote espera a las demás
+        max_batch (int): Cotizaciones máximas por lote (al llegar a este número el lote sale de inmediato)
+        max_pending (int): Cotizaciones distintas pendientes o en cálculo antes de rechazar nuevas
+        vectorized (bool): Calcular los lotes con el motor vectorizado de NumPy
+        metrics (StageMetrics): Recibe la etapa 'batch' (opcional)
+    """
+
+    def __init__(self, options, max_delay=DEFAULT_MAX_DELAY, max_batch=DEFAULT_MAX_BATCH,
+                 max_pending=DEFAULT_MAX_PENDING, vectorized=False, metrics=None):
+        self.options = options
+        self.max_delay = max_delay
+        self.max_batch = max_batch
+        self.max_pending = max_pending
+        self.vectorized = vectorized
+        self.metrics = metrics
+        self.requests = 0
+        self.deduplicated = 0
+        self.rejected = 0
+        self.batches = 0
+        self.rows = 0
+        # Llave -> (opciones, valores, future) de las cotizaciones que esperan lote
+        self._queued = {}
+        # Llave -> future de las cotizaciones que se están calculando
+        self._in_flight = {}
+        self._timer = None
+        self._tasks = set()
+        self._kwargs = {}
+        # Un solo hilo: los lotes se calculan en orden y el ciclo de eventos sigue atendiendo conexiones
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='quote-batch')
+
+    @property
+    def pending(self):
+        return len(self._queued) + len(self._in_flight)
+
+    async def quote(self, values, overrides=()):
+        """
+        Calcula una cotización dentro del siguiente lote.
+
+        Returns:
+            dict o str: Fila de resultados, o el mensaje de error si la fila se omitió
+
+        Raises:
+            Overloaded: Si ya hay max_pending cotizaciones pendientes
+        """
+        self.requests += 1
+        # La llave incluye las columnas presentes: una cotización sin una columna no es igual a otra que la trae en 0
+        key = json.dumps([overrides, sorted(values.items())])
+        future = self._in_flight.get(key)
+        if future is None and key in self._queued:
+            future = self._queued[key][2]
+        if future is not None:
+            self.deduplicated += 1
+            return await asyncio.shield(future)
+
+        if self.pending >= self.max_pending:
+            self.rejected += 1
+            raise Overloaded(f"{self.pending} cotizaciones pendientes")
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._queued[key] = (overrides, values, future)
+        if len(self._queued) >= self.max_batch:
+            self._dispatch()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_delay, self._dispatch)
+        # shield: si el cliente se desconecta, las solicitudes duplicadas siguen esperando el mismo resultado
+        return await asyncio.shield(future)
+
+    def _dispatch(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._queued:
+            return
+        batch, self._queued = self._queued, {}
+        for key, (_, _, future) in batch.items():
+            self._in_flight[key] = future
+        task = asyncio.get_running_loop().create_task(self._run(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, batch):
+        loop = asyncio.get_running_loop()
+        # Un cálculo por opciones y columnas presentes: el modo (porcentaje, sin salario) depende de las
+        # columnas, así que una cotización no cambia el resultado de las demás del lote
+        groups = {}
+        for key, (overrides, values, future) in batch.items():
+            groups.setdefault((overrides, frozenset(values)), []).append((key, values, future))
+        self.batches += 1
+        self.rows += len(batch)
+        for (overrides, _), entries in groups.items():
+            try:
+                results = await loop.run_in_executor(self._executor, self._calculate, overrides,
+                                                     [values for _, values, _ in entries])
+            except Exception as error:
+                results = [error] * len(entries)
+            for (key, _, future), result in zip(entries, results):
+                self._in_flight.pop(key, None)
+                if future.done():
+                    continue
+                if isinstance(result, Exception):
+                    future.set_exception(result)
+                else:
+                    future.set_result(result)
+
+    def _calculate(self, overrides, records):
+        options = dict(self.options, **dict(overrides))
+        kwargs = self._kwargs.get(overrides)
+        if kwargs is None:
+            if len(self._kwargs) >= _MAX_OPTION_SETS:
+                self._kwargs.clear()
+            kwargs = self._kwargs[overrides] = calculation_options(options)
+        if self.metrics is None:
+            return calculate_records(records, options, kwargs, self.vectorized)
+        with self.metrics.stage('batch'):
+            return calculate_records(records, options, kwargs, self.vectorized)
+
+    def close(self):
+        if self._timer is not None:
+            self._timer.cancel()
+        self._executor.shutdown(wait=False)
+
+
+class QuoteService:
+    """
+    Servidor HTTP/1.1 (con keep-alive) que atiende las cotizaciones con un QuoteBatcher.
+
+    Args:
+        options (dict): Archivo de parámetros completo (ver cli.load_options)
+        **batcher_options: max_delay, max_batch, max_pending y vectorized de QuoteBatcher
+    """
+
+    def __init__(self, options, **batcher_options):
+        self.metrics = StageMetrics()
+        self.batcher = QuoteBatcher(options, metrics=self.metrics, **batcher_options)
+        self.server = None
+        self.started = time.monotonic()
+
+    async def start(self, host=DEFAULT_HOST, port=DEFAULT_PORT, backlog=DEFAULT_BACKLOG):
+        """Empieza a escuchar; con port=0 se elige un puerto libre (ver self.port)"""
+        self.server = await asyncio.start_server(self._handle_connection, host, port, backlog=backlog)
+        self.started = time.monotonic()
+        return self.server
+
+    @property
+    def port(self):
+        return self.server.sockets[0].getsockname()[1]
+
+    async def close(self):
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+        self.batcher.close()
+
+    def stats(self):
+        """Contadores del servicio y latencia de las cotizaciones (desde que llega la solicitud hasta la respuesta)"""
+        batcher = self.batcher
+        totals = self.metrics.totals()
+        latency = totals.get('quote', {})
+        elapsed = time.monotonic() - self.started
+        return {
+            'requests': batcher.requests,
+            'deduplicated': batcher.deduplicated,
+            'rejected': batcher.rejected,
+            'pending': batcher.pending,
+            'batches': batcher.batches,
+            'mean_batch_size': batcher.rows / batcher.batches if batcher.batches else 0.0,
+            'requests_per_second': latency.get('count', 0) / elapsed if elapsed else 0.0,
+            'latency': {name: latency.get(name) for name in ('p50_seconds', 'p99_seconds', 'mean_seconds', 'max_seconds')},
+            'batch_seconds': {name: totals.get('batch', {}).get(name) for name in ('p50_seconds', 'p99_seconds')},
+        }
+
+    async def handle(self, method, path, body):
+        """
+        Atiende una solicitud ya leída.
+
+        Returns:
+            tuple: (HTTPStatus, objeto JSON de la respuesta, encabezados extra)
+        """
+        path = path.split('?', 1)[0]
+        if path == '/quote':
+            if method != 'POST':
+                return HTTPStatus.METHOD_NOT_ALLOWED, {'error': 'usa POST'}, {'Allow': 'POST'}
+            start = time.perf_counter_ns()
+            try:
+                values, overrides = parse_quote(body)
+                result = await self.batcher.quote(values, overrides)
+            except InvalidQuote as error:
+                return HTTPStatus.BAD_REQUEST, {'error': str(error)}, {}
+            except Overloaded as error:
+                return HTTPStatus.SERVICE_UNAVAILABLE, {'error': f"servicio saturado: {error}"}, {'Retry-After': '1'}
+            except Exception as error:
+                return HTTPStatus.INTERNAL_SERVER_ERROR, {'error': f"{type(error).__name__}: {error}"}, {}
+            self.metrics.lap('quote', start)
+            if isinstance(result, str):
+                return HTTPStatus.UNPROCESSABLE_ENTITY, {'error': result}, {}
+            return HTTPStatus.OK, result, {}
+        if path in ('/stats', '/health'):
+            if method != 'GET':
+                return HTTPStatus.METHOD_NOT_ALLOWED, {'error': 'usa GET'}, {'Allow': 'GET'}
+            return HTTPStatus.OK, self.stats() if path == '/stats' else {'status': 'ok'}, {}
+        return HTTPStatus.NOT_FOUND, {'error': f"ruta desconocida: {path}"}, {}
+
+    async def _handle_connection(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                try:
+                    method, path, version = request_line.decode('latin-1').split()
+                except ValueError:
+                    await self._respond(writer, HTTPStatus.BAD_REQUEST, {'error': 'solicitud inválida'}, {}, False)
+                    break
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+
+                connection = headers.get('connection', '').lower()
+                keep_alive = connection == 'keep-alive' if version == 'HTTP/1.0' else connection != 'close'
+                try:
+                    length = int(headers.get('content-length') or 0)
+                except ValueError:
+                    length = -1
+                if length < 0 or length > MAX_BODY_BYTES:
+                    await self._respond(writer, HTTPStatus.REQUEST_ENTITY_TOO_LARGE if length > 0 else HTTPStatus.BAD_REQUEST,
+                                        {'error': f"Content-Length inválido (máximo {MAX_BODY_BYTES} bytes)"}, {}, False)
+                    break
+                body = await reader.readexactly(length) if length else b''
+
+                status, payload, extra = await self.handle(method.upper(), path, body)
+                await self._respond(writer, status, payload, extra, keep_alive)
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    async def _respond(writer, status, payload, extra, keep_alive):
+        body = dumps_row(payload).encode('utf-8')
+        head = [f"HTTP/1.1 {status.value} {status.phrase}", 'Content-Type: application/json; charset=utf-8',
+                f"Content-Length: {len(body)}", f"Connection: {'keep-alive' if keep_alive else 'close'}"]
+        head += [f"{name}: {value}" for name, value in extra.items()]
+        writer.write(('\r\n'.join(head) + '\r\n\r\n').encode('latin-1') + body)
+        # drain espera si el cliente no está leyendo (contrapresión por conexión)
+        await writer.drain()
+
+
+def format_stats(stats):
+    """Línea de resumen para el reporte periódico"""
+    latency = stats['latency']
+    p50 = latency['p50_seconds'] * 1e3 if latency['p50_seconds'] is not None else float('nan')
+    p99 = latency['p99_seconds'] * 1e3 if latency['p99_seconds'] is not None else float('nan')
+    return (f"requests={stats['requests']:,} ({stats['requests_per_second']:,.0f}/s) p50={p50:.2f} ms "
+            f"p99={p99:.2f} ms batches={stats['batches']:,} mean_batch={stats['mean_batch_size']:.1f} "
+            f"deduplicated={stats['deduplicated']:,} rejected={stats['rejected']:,} pending={stats['pending']:,}")
+
+
+async def serve(options, host=DEFAULT_HOST, port=DEFAULT_PORT, report_interval=10.0, stream=None,
+                backlog=DEFAULT_BACKLOG, **batcher_options):
+    """Ejecuta el servicio hasta que se cancela; cada report_interval segundos imprime format_stats en stream"""
+    stream = stream or sys.stderr
+    service = QuoteService(options, **batcher_options)
+    await service.start(host, port, backlog)
+    print(f"Listening on http://{host}:{service.port}", file=stream, flush=True)
+    try:
+        while True:
+            await asyncio.sleep(report_interval or 3600)
+            if report_interval:
+                print(format_stats(service.stats()), file=stream, flush=True)
+    finally:
+        print(format_stats(service.stats()), file=stream, flush=True)
+        await service.close()
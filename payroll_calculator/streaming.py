@@ -0,0 +1,285 @@
+"""
+Modo filtro: filas de nómina por stdin, una línea de resultado por stdout.
+
+    cat nomina.csv | payroll-calc stream --params parametros.json | jq .saving_amount
+
+La entrada se lee línea por línea, como CSV/TSV (con o sin encabezado, con las columnas y alias de
+readers.salary_reader) o como JSONL (un objeto por línea con esas mismas llaves). Las filas se
+agrupan en micro-lotes de hasta `batch_size` filas o de las que lleguen en `max_delay` segundos, lo
+que pase primero; cada lote se calcula con calculate_row (la lógica de process_single_calculation)
+y sus resultados se escriben de inmediato, así que la salida empieza antes de que termine la entrada.
+
+La memoria está acotada: un hilo lee la entrada a una cola de a lo más `buffer_size` líneas (si el
+cálculo se atrasa, la lectura espera) y solo se guarda en memoria el lote en curso.
+
+Cada fila de entrada produce exactamente una línea JSON en la salida, en el mismo orden: el
+diccionario de resultados, o {"line": n, "error": "..."} si la fila no se pudo leer, se omitió
+(salario 0, o salario menor al SMG en stricted_mode) o su cálculo falló. Un error en una fila no
+detiene el filtro. El encabezado y las líneas vacías no producen salida.
+"""
+import csv
+import json
+import queue
+import threading
+import time
+
+from payroll_calculator.cli import INPUT_FORMATS, calculation_options, row_arguments
+from payroll_calculator.readers.salary_reader import (
+    COLUMNS, HEADER_LOOKUP, detect_delimiter, parse_number, resolve_header, typed_columns,
+)
+from payroll_calculator.serialization import dumps_row
+
+DEFAULT_BATCH_SIZE = 256
+DEFAULT_MAX_DELAY = 0.05
+DEFAULT_BUFFER_SIZE = 4096
+
+SKIPPED_ROW = "salario 0, fila omitida"
+
+# Marca de fin de la entrada en la cola de líneas
+_END = object()
+
+
+def _read_lines(source, lines):
+    try:
+        for line in source:
+            lines.put(line)
+    except Exception as error:
+        lines.put(error)
+    lines.put(_END)
+
+
+def iter_micro_batches(source, batch_size=DEFAULT_BATCH_SIZE, max_delay=DEFAULT_MAX_DELAY,
+                       buffer_size=DEFAULT_BUFFER_SIZE):
+    """
+    Agrupa las líneas de `source` en lotes.
+
+    Un lote se entrega al juntar batch_size líneas, al pasar max_delay segundos desde su primera
+    línea o al terminar la entrada. Entre la lectura y los lotes hay a lo más buffer_size líneas.
+
+    Yields:
+        list: Líneas de texto del lote
+    """
+    lines = queue.Queue(maxsize=buffer_size)
+    threading.Thread(target=_read_lines, args=(source, lines), daemon=True).start()
+
+    finished = False
+    while not finished:
+        item = lines.get()
+        if item is _END:
+            return
+        if isinstance(item, Exception):
+            raise item
+        batch = [item]
+        deadline = time.monotonic() + max_delay
+        while len(batch) < batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                item = lines.get(timeout=remaining) if remaining > 0 else lines.get_nowait()
+            except queue.Empty:
+                break
+            if item is _END or isinstance(item, Exception):
+                finished = True
+                break
+            batch.append(item)
+        yield batch
+        if isinstance(item, Exception):
+            raise item
+
+
+def error_message(error):
+    """Mensaje de error de una fila: el texto de los ValueError (entrada inválida) o el tipo y el texto de los demás"""
+    if isinstance(error, ValueError):
+        return str(error)
+    return f"{type(error).__name__}: {error}"
+
+
+def _number(value):
+    if value is None:
+        return float('nan')
+    if isinstance(value, bool):
+        raise ValueError(f"valor inválido: {value!r}")
+    if isinstance(value, (int, float)):
+        return float(value)
+    return parse_number(str(value))
+
+
+def record_values(record):
+    """
+    Convierte un objeto JSON de una fila en un diccionario columna -> float. Las llaves se reconocen
+    con los alias de readers.salary_reader y las desconocidas se ignoran.
+
+    Raises:
+        ValueError: Si no es un objeto, un valor no es numérico o no trae salario diario ni productividad
+    """
+    if not isinstance(record, dict):
+        raise ValueError("se esperaba un objeto JSON")
+    values = {}
+    for key, value in record.items():
+        column = HEADER_LOOKUP.get(str(key).strip().lower())
+        if column is not None:
+            values[column] = _number(value)
+    if 'daily_salary' not in values and 'productivity' not in values:
+        raise ValueError("la fila no tiene salario diario ni productividad")
+    return values
+
+
+class RecordParser:
+    """
+    Convierte cada línea de entrada en un diccionario columna -> float (NaN si la celda está vacía).
+
+    Args:
+        input_format (str): 'csv', 'jsonl' o 'auto' (JSONL si la primera línea con datos empieza con '{')
+    """
+
+    def __init__(self, input_format='auto'):
+        self.input_format = input_format
+        self.columns = None
+        self.delimiter = None
+
+    def parse(self, line):
+        """
+        Returns:
+            dict o None: None si la línea no es una fila (vacía o encabezado)
+
+        Raises:
+            ValueError: Si la línea no se puede leer
+        """
+        text = line.strip()
+        if not text:
+            return None
+        if self.input_format == 'auto':
+            self.input_format = 'jsonl' if text.startswith('{') else 'csv'
+        if self.input_format == 'jsonl':
+            return self._parse_json(text)
+        return self._parse_csv(line.rstrip('\r\n'))
+
+    def _parse_json(self, text):
+        try:
+            record = json.loads(text)
+        except json.JSONDecodeError as error:
+            raise ValueError(f"JSON inválido: {error}") from None
+        return record_values(record)
+
+    def _parse_csv(self, line):
+        if self.delimiter is None:
+            self.delimiter = detect_delimiter('', line)
+        cells = next(csv.reader([line], delimiter=self.delimiter))
+        if self.columns is None:
+            self.columns = resolve_header(cells)
+            if self.columns is not None:
+                return None
+            self.columns = list(COLUMNS[:len(cells)])
+        values = {}
+        for index, column in enumerate(self.columns):
+            if column is not None:
+                values[column] = _number(cells[index] if index < len(cells) else '')
+        return values
+
+
+def calculate_records(records, options, kwargs=None, vectorized=False):
+    """
+    Calcula un lote de filas ya leídas.
+
+    El modo de cálculo depende de las columnas presentes (con productividad y salario es el modo de
+    porcentaje, sin salario el modo sin salario), así que las filas se agrupan por el conjunto de
+    columnas que traen y cada grupo se calcula por separado: el resultado de una fila no depende de
+    las demás filas del lote. Si un grupo falla en conjunto, sus filas se calculan una por una para
+    que el error quede solo en las filas que lo causan.
+
+    Args:
+        records (list): Diccionarios columna -> float de RecordParser.parse o record_values
+        options (dict): Archivo de parámetros completo (ver cli.load_options)
+        kwargs (dict): Resultado de cli.calculation_options(options), para no resolverlo en cada lote
+        vectorized (bool): Calcular el lote con el motor vectorizado de NumPy (no aplica con stricted_mode,
+            que necesita el error de cada fila)
+
+    Returns:
+        list: Por cada fila, el diccionario de resultados o el mensaje de error (str)
+    """
+    kwargs = kwargs if kwargs is not None else calculation_options(options)
+    groups = {}
+    for index, record in enumerate(records):
+        groups.setdefault(frozenset(record), []).append(index)
+
+    results = [None] * len(records)
+    for indices in groups.values():
+        try:
+            group_results = _calculate_group([records[index] for index in indices], options, kwargs, vectorized)
+        except Exception as error:
+            if len(indices) == 1:
+                group_results = [error_message(error)]
+            else:
+                group_results = [calculate_records([records[index]], options, kwargs, vectorized)[0] for index in indices]
+        for index, result in zip(indices, group_results):
+            results[index] = result
+    return results
+
+
+def _calculate_group(records, options, kwargs, vectorized):
+    """Calcula filas que traen las mismas columnas (ver calculate_records)"""
+    from payroll_calculator.processors.calculator import build_row_options, calculate_row, process_multiple_calculations
+
+    present = [column for column in COLUMNS if column in records[0]]
+    columns = typed_columns({column: [record[column] for record in records] for column in present})
+    arguments = row_arguments(columns, options)
+
+    if vectorized and not kwargs['stricted_mode']:
+        rows = iter(process_multiple_calculations(**arguments, **kwargs, vectorized=True))
+        # El motor omite las filas cuyo salario a usar es 0, igual que calculate_row
+        salaries_to_use = arguments['salaries'] if len(arguments['salaries']) else arguments['productivities']
+        return [next(rows) if salary != 0 else SKIPPED_ROW for salary in salaries_to_use]
+
+    row_options = build_row_options(**arguments, **kwargs)
+
+    results = []
+    for i in range(len(records)):
+        try:
+            row = calculate_row(i, **row_options)
+        except Exception as error:
+            results.append(error_message(error))
+            continue
+        results.append(row if row is not None else SKIPPED_ROW)
+    return results
+
+
+def stream_calculations(source, output, options, input_format='auto', batch_size=DEFAULT_BATCH_SIZE,
+                        max_delay=DEFAULT_MAX_DELAY, buffer_size=DEFAULT_BUFFER_SIZE, vectorized=False):
+    """
+    Lee filas de `source` y escribe una línea JSON por fila en `output`, lote por lote.
+
+    Con vectorized cada micro-lote se calcula con el motor vectorizado de NumPy (ver calculate_records).
+
+    Returns:
+        tuple: (filas calculadas, filas con error)
+    """
+    kwargs = calculation_options(options)
+    parser = RecordParser(input_format)
+    line_number = 0
+    calculated = failed = 0
+    for batch in iter_micro_batches(source, batch_size, max_delay, buffer_size):
+        # Por fila de entrada: (número de línea, registro o mensaje de error)
+        entries = []
+        for line in batch:
+            line_number += 1
+            try:
+                record = parser.parse(line)
+            except Exception as error:
+                entries.append((line_number, error_message(error)))
+                continue
+            if record is not None:
+                entries.append((line_number, record))
+
+        records = [entry for _, entry in entries if isinstance(entry, dict)]
+        results = iter(calculate_records(records, options, kwargs, vectorized))
+        lines = []
+        for number, entry in entries:
+            result = next(results) if isinstance(entry, dict) else entry
+            if isinstance(result, dict):
+                calculated += 1
+            else:
+                failed += 1
+                result = {'line': number, 'error': result}
+            lines.append(dumps_row(result) + '\n')
+        output.writelines(lines)
+        output.flush()
+    return calculated, failed
@@ -1,3 +1,5 @@
+import itertools
+import math
 from typing import List, Dict, Any
 from .imss import IMSS
 from .isr import ISR
@@ -8,89 +10,428 @@ def safe_get(row, idx, default=0):
     return row[idx] if len(row) > idx else default
 
 
+# Totales de cada sección: (nombre del total, columna del resultado), en el orden en que se reportan
+IMSS_TOTALS = (
+    ('total_imss_employer', 'imss_employer_fee'),
+    ('total_imss_employee', 'imss_employee_fee'),
+    ('total_rcv_employer', 'rcv_employer'),
+    ('total_rcv_employee', 'rcv_employee'),
+    ('total_infonavit', 'infonavit_employer'),
+    ('total_tax_payroll', 'payroll_tax'),
+    ('total_social_cost', 'suggested_total_social_cost'),
+    # Totales DSI
+    ('total_imss_employer_dsi', 'first_quota_employer_imss_dsi'),
+    ('total_rcv_employer_dsi', 'first_total_rcv_employer_dsi'),
+    ('total_infonavit_dsi', 'first_infonavit_employer_dsi'),
+    ('total_tax_payroll_dsi', 'first_tax_payroll_employer_dsi'),
+    ('total_imss_employee_dsi', 'quota_employe_with_daily_salary'),
+    ('total_rcv_employee_dsi', 'quota_employee_rcv_with_daily_salary'),
+)
+
+ISR_TOTALS = (
+    ('total_isr', 'isr'),
+    ('total_salary_credit', 'salary_credit'),
+    ('total_tax_payable', 'isr_tax_payable'),
+    ('total_tax_in_favor', 'isr_tax_in_favor'),
+    ('total_isr_tax_payable_dsi', 'isr_tax_payable_dsi'),
+)
+
+SAVING_TOTALS = (
+    ('total_wage_and_salary_dsi', 'dsi_salary'),
+    ('total_productivity', 'productivity'),
+    ('total_commission_dsi', 'dsi_commission'),
+    ('total_traditional_scheme', 'traditional_scheme_biweekly'),
+    ('total_dsi_scheme', 'dsi_scheme_biweekly'),
+    ('total_saving_amount', 'saving_amount'),
+    ('total_current_perception', 'current_perception'),
+    ('total_current_perception_dsi', 'dsi_perception'),
+    ('total_increment', 'increment'),
+    ('total_fixed_fee_dsi', 'dsi_scheme_fixed_fee'),
+    ('total_income', 'salary_total_income'),
+    ('total_retention', 'total_traditional_scheme'),
+    ('total_employer_contributions', 'total_employer_contributions'),
+    ('total_employer_contributions_dsi', 'total_employer_contributions_dsi'),
+)
+
+# Totales que solo se reportan si la primera fila trae la columna
+ISR_CONDITIONAL_TOTALS = (
+    ('first_tax_payroll_employer_dsi', 'first_tax_payroll_employer_dsi'),
+)
+SAVING_CONDITIONAL_TOTALS = (
+    ('total_retentions_isr_dsi', 'saving_total_retentions_isr_dsi'),
+    ('total_other_perceptions', 'other_perception'),
+)
+
+
+def _columns(*definitions):
+    """Columnas de una o varias definiciones de totales, sin repetir y en orden"""
+    return tuple(dict.fromkeys(column for pairs in definitions for _, column in pairs))
+
+
+# Columnas que suma cada sección y todas las columnas que se suman (sin repetir)
+IMSS_COLUMNS = _columns(IMSS_TOTALS)
+ISR_COLUMNS = _columns(ISR_TOTALS, ISR_CONDITIONAL_TOTALS)
+SAVING_COLUMNS = _columns(SAVING_TOTALS, SAVING_CONDITIONAL_TOTALS)
+_SUMMED_COLUMNS = _columns(IMSS_TOTALS, ISR_TOTALS, SAVING_TOTALS, ISR_CONDITIONAL_TOTALS, SAVING_CONDITIONAL_TOTALS)
+_CONDITIONAL_COLUMNS = frozenset(_columns(ISR_CONDITIONAL_TOTALS, SAVING_CONDITIONAL_TOTALS))
+
+# Filas que add() junta antes de sumarlas por columna
+_CHUNK_SIZE = 4096
+# Parciales por columna a partir de los cuales se compactan en uno
+_MAX_PARTIALS = 1024
+
+
+def _safe_divide(numerator, denominator):
+    return numerator / denominator if denominator else 0.0
+
+
+class TotalsAccumulator:
+    """
+    Acumula en una sola pasada los totales de IMSS, ISR y Ahorro.
+
+    Se alimenta fila por fila (add), por bloques (add_rows, por ejemplo con iter_calculations(chunk_size=...))
+    o por columnas (add_results con un PayrollResults). Los valores de cada bloque se juntan por columna y
+    se suman con un solo math.fsum, que se guarda como parcial; total() suma los parciales con otro fsum.
+    Cada bloque se redondea una vez, así que el total puede variar en el último dígito según cómo se
+    repartieron las filas. Los enteros se suman aparte: una columna sin flotantes da un total entero,
+    como sum(). Los acumuladores parciales de varios procesos se combinan con merge().
+    """
+    __slots__ = ('count', 'first_row_columns', '_partials', '_integers', '_floats', '_pending')
+
+    def __init__(self, columns=_SUMMED_COLUMNS):
+        """
+        Args:
+            columns (tuple): Columnas a sumar; por omisión las de todas las secciones. TotalCalculator
+                pasa solo las de la sección que calcula (IMSS_COLUMNS, ISR_COLUMNS o SAVING_COLUMNS)
+        """
+        self.count = 0
+        # Columnas condicionales presentes en la primera fila (decide qué totales opcionales se reportan)
+        self.first_row_columns = frozenset()
+        self._partials = {column: [] for column in columns}
+        self._integers = dict.fromkeys(columns, 0)
+        # Columnas que han recibido algún valor no entero (su total es flotante)
+        self._floats = set()
+        # Filas de add() que todavía no se suman
+        self._pending = []
+
+    @classmethod
+    def from_rows(cls, rows, columns=_SUMMED_COLUMNS):
+        """Crea un acumulador con todas las filas de rows (lista, generador o PayrollResults)"""
+        # results usa NumPy; se importa aquí para que importar totals no lo cargue
+        from .results import PayrollResults
+        accumulator = cls(columns)
+        if isinstance(rows, PayrollResults):
+            accumulator.add_results(rows)
+        else:
+            accumulator.add_rows(rows)
+        return accumulator
+
+    def _set_first_row(self, row):
+        self.first_row_columns = frozenset(
+            column for column in _CONDITIONAL_COLUMNS if column in self._partials and column in row
+        )
+
+    def _add_partial(self, column, value):
+        partials = self._partials[column]
+        partials.append(value)
+        if len(partials) > _MAX_PARTIALS:
+            partials[:] = [math.fsum(partials)]
+
+    def _add_values(self, column, values):
+        """Suma a una columna los valores de un bloque (los None, de columnas nulas, no cuentan)"""
+        try:
+            # sum() regresa int solo si todos los valores son enteros
+            total = sum(values)
+        except TypeError:
+            values = [value for value in values if value is not None]
+            total = sum(values)
+        if isinstance(total, int):
+            self._integers[column] += total
+        else:
+            self._floats.add(column)
+            self._add_partial(column, math.fsum(values))
+
+    def _add_chunk(self, rows):
+        for column in self._partials:
+            self._add_values(column, [row.get(column, 0) for row in rows])
+
+    def _flush(self):
+        if self._pending:
+            self._add_chunk(self._pending)
+            self._pending = []
+
+    def add(self, row):
+        """Agrega una fila (dict o PayrollRow); se suma junto con las siguientes en bloques de _CHUNK_SIZE"""
+        if not self.count:
+            self._set_first_row(row)
+        self.count += 1
+        self._pending.append(row)
+        if len(self._pending) >= _CHUNK_SIZE:
+            self._flush()
+        return self
+
+    def add_rows(self, rows):
+        """Agrega un bloque de filas (lista o iterable; los iterables se consumen en bloques de _CHUNK_SIZE)"""
+        if not isinstance(rows, list):
+            rows = iter(rows)
+            while chunk := list(itertools.islice(rows, _CHUNK_SIZE)):
+                self.add_rows(chunk)
+            return self
+        if not rows:
+            return self
+        if not self.count:
+            self._set_first_row(rows[0])
+        self.count += len(rows)
+        self._add_chunk(rows)
+        return self
+
+    def add_results(self, results):
+        """Agrega un PayrollResults columna por columna"""
+        if not len(results):
+            return self
+        if not self.count:
+            self._set_first_row(results[0])
+        self.count += len(results)
+        for column in self._partials:
+            if column in results.columns:
+                self._add_values(column, results.column(column)[results.valid(column)].tolist())
+        return self
+
+    def merge(self, other):
+        """
+        Agrega los totales de otro acumulador (cuyas filas van después de las de este).
+
+        Returns:
+            TotalsAccumulator: self
+        """
+        if not other.count:
+            return self
+        if not self.count:
+            self.first_row_columns = other.first_row_columns
+        self.count += other.count
+        other._flush()
+        for column in self._partials:
+            if column not in other._partials:
+                continue
+            self._integers[column] += other._integers[column]
+            if column in other._floats:
+                self._floats.add(column)
+                for value in other._partials[column]:
+                    self._add_partial(column, value)
+        return self
+
+    def total(self, column):
+        """Suma de una columna del resultado (entera si la columna solo ha recibido enteros)"""
+        self._flush()
+        if column not in self._floats:
+            return self._integers[column]
+        return math.fsum(self._partials[column] + [self._integers[column]])
+
+    def _section(self, definitions, conditional=()):
+        totals = {name: self.total(column) for name, column in definitions}
+        for name, column in conditional:
+            if column in self.first_row_columns:
+                totals[name] = self.total(column)
+        return totals
+
+    def imss_totals(self) -> Dict[str, float]:
+        return self._section(IMSS_TOTALS)
+
+    def isr_totals(self) -> Dict[str, float]:
+        return self._section(ISR_TOTALS, ISR_CONDITIONAL_TOTALS)
+
+    def saving_totals(self) -> Dict[str, float]:
+        totals = self._section(SAVING_TOTALS)
+        # Calcular promedios (0 si no hay base para dividir)
+        if self.count:
+            totals['avg_saving_percentage'] = _safe_divide(totals["total_saving_amount"], totals["total_traditional_scheme"])
+            totals['avg_dsi_saving_percentage'] = _safe_divide(totals["total_increment"], totals["total_current_perception"])
+        for name, column in SAVING_CONDITIONAL_TOTALS:
+            if column in self.first_row_columns:
+                totals[name] = self.total(column)
+        return totals
+
+
+# Secciones de totales: (nombre en la hoja de Excel, método de TotalsAccumulator)
+TOTALS_SECTIONS = (
+    ('IMSS', 'imss_totals'),
+    ('ISR', 'isr_totals'),
+    ('Ahorro', 'saving_totals'),
+)
+
+
+class GroupedTotals:
+    """
+    Totales de IMSS, ISR y Ahorro por grupo, calculados en una sola pasada.
+
+    Cada fila se asigna a un grupo con un diccionario (hash) según sus columnas llave, por ejemplo
+    payment_period, y cada grupo tiene su propio TotalsAccumulator. Las llaves que no vienen en los
+    resultados (clase de riesgo, centro de costos o cualquier etiqueta) se pasan en tags, alineadas
+    con las filas del resultado (o con las de la entrada, ver from_rows).
+    """
+    __slots__ = ('keys', 'groups')
+
+    def __init__(self, keys):
+        self.keys = (keys,) if isinstance(keys, str) else tuple(keys)
+        if not self.keys:
+            raise ValueError("Se necesita al menos una columna para agrupar")
+        # Llave del grupo (tupla) -> TotalsAccumulator, en el orden en que aparece cada grupo
+        self.groups = {}
+
+    @classmethod
+    def from_rows(cls, rows, keys, tags=None, input_salaries=None):
+        """
+        Agrupa y acumula todas las filas.
+
+        Args:
+            rows: Lista o generador de diccionarios por fila (o un PayrollResults)
+            keys (str | list): Columnas llave; pueden ser columnas del resultado o nombres de tags
+            tags (dict): Nombre -> secuencia de valores por fila, para llaves que no están en el resultado.
+                Van alineados con las filas del resultado, que no incluye las filas de entrada con salario 0
+            input_salaries (list): Salarios a usar de la entrada (salaries, o productivities en el modo sin
+                salario). Si se indican, los tags van alineados con la entrada y se descartan los de las
+                filas con salario 0, igual que hace process_multiple_calculations
+
+        Returns:
+            GroupedTotals
+
+        Raises:
+            ValueError: Si los tags no tienen un valor por fila
+        """
+        grouped = cls(keys)
+        if not tags:
+            for row in rows:
+                grouped.add(row)
+            return grouped
+        names = list(tags)
+        values = list(zip(*(tags[name] for name in names)))
+        lengths = {len(tags[name]) for name in names}
+        if input_salaries is not None:
+            lengths.add(len(input_salaries))
+        if len(lengths) > 1:
+            raise ValueError(f"Los tags y los salarios de entrada no tienen el mismo número de filas: {sorted(lengths)}")
+        if input_salaries is not None:
+            values = [row_values for row_values, salary in zip(values, input_salaries) if salary != 0]
+
+        rows = iter(rows)
+        for row_values in values:
+            row = next(rows, None)
+            if row is None:
+                raise ValueError(f"Los tags tienen {len(values)} filas y el resultado tiene menos")
+            grouped.add(row, dict(zip(names, row_values)))
+        if next(rows, None) is not None:
+            raise ValueError(f"Los tags tienen {len(values)} filas y el resultado tiene más")
+        return grouped
+
+    def group_key(self, row, tags=None):
+        """Tupla con el valor de cada columna llave (primero se busca en tags y luego en la fila)"""
+        if tags:
+            return tuple(tags[key] if key in tags else row.get(key) for key in self.keys)
+        return tuple(row.get(key) for key in self.keys)
+
+    def add(self, row, tags=None):
+        """Agrega una fila al grupo que le corresponde"""
+        key = self.group_key(row, tags)
+        accumulator = self.groups.get(key)
+        if accumulator is None:
+            accumulator = self.groups[key] = TotalsAccumulator()
+        accumulator.add(row)
+        return self
+
+    def merge(self, other):
+        """Combina los grupos de otro GroupedTotals con las mismas llaves (sus filas van después)"""
+        if other.keys != self.keys:
+            raise ValueError(f"Las llaves no coinciden: {self.keys} != {other.keys}")
+        for key, accumulator in other.groups.items():
+            if key in self.groups:
+                self.groups[key].merge(accumulator)
+            else:
+                self.groups[key] = TotalsAccumulator().merge(accumulator)
+        return self
+
+    def __len__(self):
+        return len(self.groups)
+
+    def __iter__(self):
+        return iter(self.groups)
+
+    def __getitem__(self, key):
+        if not isinstance(key, tuple):
+            key = (key,)
+        return self.groups[key]
+
+    def totals(self):
+        """
+        Returns:
+            dict: Llave del grupo -> {'count', 'imss', 'isr', 'saving'} con los diccionarios de TotalCalculator
+        """
+        return {
+            key: {
+                'count': accumulator.count,
+                'imss': accumulator.imss_totals(),
+                'isr': accumulator.isr_totals(),
+                'saving': accumulator.saving_totals(),
+            }
+            for key, accumulator in self.groups.items()
+        }
+
+    def to_excel_rows(self):
+        """
+        Filas para la hoja de totales de Excel (una por grupo y concepto), con el mismo formato de
+        format_totals_for_excel más una columna por llave y la sección.
+
+        Returns:
+            list: Diccionarios {<llave>..., 'Sección', 'Concepto', 'Total'}, listos para pd.DataFrame
+        """
+        rows = []
+        for key, accumulator in self.groups.items():
+            group = dict(zip(self.keys, key))
+            for section, method in TOTALS_SECTIONS:
+                for concept, value in getattr(accumulator, method)().items():
+                    rows.append({**group, 'Sección': section, 'Concepto': concept, 'Total': value})
+        return rows
+
+
+def group_totals(rows, keys, tags=None, input_salaries=None):
+    """
+    Calcula los totales de IMSS, ISR y Ahorro por grupo en una sola pasada.
+
+    Args:
+        rows: Resultados de process_multiple_calculations (lista, PayrollResults o iter_calculations)
+        keys (str | list): Columnas llave, por ejemplo 'payment_period' o ['payment_period', 'risk_class']
+        tags (dict): Valores por fila para las llaves que no están en el resultado
+        input_salaries (list): Salarios a usar de la entrada, si los tags van alineados con la entrada
+            (ver GroupedTotals.from_rows)
+
+    Returns:
+        GroupedTotals
+    """
+    return GroupedTotals.from_rows(rows, keys, tags, input_salaries)
+
+
 class TotalCalculator:
     """
     Utility class to calculate totals across multiple salary calculations.
     This class aggregates results from multiple IMSS, ISR, and Saving instances.
+
+    Each method runs a TotalsAccumulator pass over its own section's columns only; use TotalsAccumulator
+    directly to get all sections at once or to aggregate a streaming run.
     """
     
     @staticmethod
     def calculate_traditional_scheme_totals(imss_data: List[Dict[str, Any]]) -> Dict[str, float]:
         """Calcula totales IMSS usando diccionarios en lugar de listas."""
-        totals = {
-            'total_imss_employer': sum(row.get('imss_employer_fee', 0) for row in imss_data),
-            'total_imss_employee': sum(row.get('imss_employee_fee', 0) for row in imss_data),
-            'total_rcv_employer': sum(row.get('rcv_employer', 0) for row in imss_data),
-            'total_rcv_employee': sum(row.get('rcv_employee', 0) for row in imss_data),
-            'total_infonavit': sum(row.get('infonavit_employer', 0) for row in imss_data),
-            'total_tax_payroll': sum(row.get('payroll_tax', 0) for row in imss_data),
-            'total_social_cost': sum(row.get('suggested_total_social_cost', 0) for row in imss_data),
-        }
-        
-        # Agregar totales DSI si existen
-        
-        totals.update({
-            'total_imss_employer_dsi': sum(row.get('first_quota_employer_imss_dsi', 0) for row in imss_data),
-            'total_rcv_employer_dsi': sum(row.get('first_total_rcv_employer_dsi', 0) for row in imss_data),
-            'total_infonavit_dsi': sum(row.get('first_infonavit_employer_dsi', 0) for row in imss_data),
-            'total_tax_payroll_dsi': sum(row.get('first_tax_payroll_employer_dsi', 0) for row in imss_data),
-            'total_imss_employee_dsi': sum(row.get('quota_employe_with_daily_salary', 0) for row in imss_data),
-            'total_rcv_employee_dsi': sum(row.get('quota_employee_rcv_with_daily_salary', 0) for row in imss_data),
-        })
-        
-        return totals
+        return TotalsAccumulator.from_rows(imss_data, IMSS_COLUMNS).imss_totals()
 
     @staticmethod
     def calculate_isr_totals(isr_data: List[Dict[str, Any]]) -> Dict[str, float]:
         """Calcula totales ISR usando diccionarios."""
-        totals = {
-            'total_isr': sum(row.get('isr', 0) for row in isr_data),
-            'total_salary_credit': sum(row.get('salary_credit', 0) for row in isr_data),
-            'total_tax_payable': sum(row.get('isr_tax_payable', 0) for row in isr_data),
-            'total_tax_in_favor': sum(row.get('isr_tax_in_favor', 0) for row in isr_data),
-            'total_isr_tax_payable_dsi': sum(row.get('isr_tax_payable_dsi', 0) for row in isr_data),
-        }
-        
-        if isr_data and 'first_tax_payroll_employer_dsi' in isr_data[0]:
-            totals['first_tax_payroll_employer_dsi'] = sum(row.get('first_tax_payroll_employer_dsi', 0) for row in isr_data)
-        
-        return totals
+        return TotalsAccumulator.from_rows(isr_data, ISR_COLUMNS).isr_totals()
 
     @staticmethod
     def calculate_saving_totals(saving_data: List[Dict[str, Any]]) -> Dict[str, float]:
         """Calcula totales de ahorro usando diccionarios."""
-        # print("SAVING DATA: ", saving_data[0])
-        totals = {
-            'total_wage_and_salary_dsi': sum(row.get('dsi_salary', 0) for row in saving_data),
-            'total_productivity': sum(row.get('productivity', 0) for row in saving_data),
-            'total_commission_dsi': sum(row.get('dsi_commission', 0) for row in saving_data),
-            'total_traditional_scheme': sum(row.get('traditional_scheme_biweekly', 0) for row in saving_data),
-            'total_dsi_scheme': sum(row.get('dsi_scheme_biweekly', 0) for row in saving_data),
-            'total_saving_amount': sum(row.get('saving_amount', 0) for row in saving_data),
-            'total_current_perception': sum(row.get('current_perception', 0) for row in saving_data),
-            'total_current_perception_dsi': sum(row.get('dsi_perception', 0) for row in saving_data),
-            'total_increment': sum(row.get('increment', 0) for row in saving_data),
-            'total_fixed_fee_dsi': sum(row.get('dsi_scheme_fixed_fee', 0) for row in saving_data),
-            'total_income': sum(row.get('salary_total_income', 0) for row in saving_data),
-            'total_retention': sum(row.get('total_traditional_scheme', 0) for row in saving_data),
-            'total_employer_contributions': sum(row.get('total_employer_contributions', 0) for row in saving_data),
-            'total_employer_contributions_dsi': sum(row.get('total_employer_contributions_dsi', 0) for row in saving_data)
-        }        
-        
-        # Calcular promedios
-        if saving_data:
-            totals['avg_saving_percentage'] = (totals["total_saving_amount"] / totals["total_traditional_scheme"])
-            totals['avg_dsi_saving_percentage'] = totals["total_increment"] / totals["total_current_perception"]
-
-        
-        # Agregar campos condicionales
-        if saving_data and 'saving_total_retentions_isr_dsi' in saving_data[0]:
-            totals['total_retentions_isr_dsi'] = sum(row.get('saving_total_retentions_isr_dsi', 0) for row in saving_data)
-        
-        if saving_data and 'other_perception' in saving_data[0]:
-            totals['total_other_perceptions'] = sum(row.get('other_perception', 0) for row in saving_data)
-        
-        return totals
+        return TotalsAccumulator.from_rows(saving_data, SAVING_COLUMNS).saving_totals()
 
     @staticmethod
     def format_totals_table(totals: Dict[str, float], is_percentage: List[str] = None, column_references: Dict[str, str] = None) -> List[List[Any]]:
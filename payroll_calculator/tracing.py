@@ -0,0 +1,110 @@
+"""
+Registro opcional del lugar desde donde se crean los objetos de cálculo.
+
+Por defecto está apagado y los constructores solo revisan la bandera `enabled`.
+Se activa para toda la ejecución con la variable de entorno PAYROLL_TRACE_PROVENANCE=1
+o para un bloque de código con el context manager `trace_provenance()`.
+"""
+import contextvars
+import os
+import sys
+import threading
+from collections import deque, namedtuple
+from contextlib import contextmanager
+
+ENV_VAR = 'PAYROLL_TRACE_PROVENANCE'
+
+# Registros que se conservan cuando el rastreo está activo para toda la ejecución (los más recientes)
+MAX_RECORDS = 10000
+
+CallSite = namedtuple('CallSite', ['source', 'filename', 'function', 'lineno'])
+
+# Rastreo activado por la variable de entorno o con enable_tracing()
+_globally_enabled = os.environ.get(ENV_VAR, '').strip().lower() in ('1', 'true', 'yes', 'on')
+# Bloques trace_provenance() abiertos en cualquier hilo
+_active_blocks = 0
+_lock = threading.Lock()
+
+# Bandera que revisan los constructores: rastreo global o algún bloque abierto
+enabled = _globally_enabled
+
+# Registros del rastreo global, acotados a MAX_RECORDS
+records = deque(maxlen=MAX_RECORDS)
+
+# Lista del bloque trace_provenance() activo en el hilo o tarea actual
+_block_records = contextvars.ContextVar('payroll_trace_block_records', default=None)
+
+
+def _update_enabled():
+    global enabled
+    enabled = _globally_enabled or _active_blocks > 0
+
+
+def record_call_site(source, depth=2):
+    """
+    Guarda el archivo, función y línea desde donde se llamó a `source`.
+
+    Dentro de trace_provenance() el registro va a la lista del bloque del hilo actual; fuera de él va a
+    `records` solo si el rastreo global está activo. Usa sys._getframe en lugar de inspect.getframeinfo
+    para no leer el código fuente del disco.
+
+    Args:
+        source (str): Nombre del objeto o método que se está rastreando
+        depth (int): Cuántos frames subir desde esta función (2 = quien llamó al constructor)
+
+    Returns:
+        CallSite, o None si en este hilo no se está rastreando
+    """
+    block = _block_records.get()
+    if block is None and not _globally_enabled:
+        return None
+    frame = sys._getframe(depth)
+    call_site = CallSite(source, frame.f_code.co_filename, frame.f_code.co_name, frame.f_lineno)
+    (block if block is not None else records).append(call_site)
+    return call_site
+
+
+def enable_tracing():
+    global _globally_enabled
+    with _lock:
+        _globally_enabled = True
+        _update_enabled()
+
+
+def disable_tracing():
+    global _globally_enabled
+    with _lock:
+        _globally_enabled = False
+        _update_enabled()
+
+
+def clear_records():
+    records.clear()
+
+
+@contextmanager
+def trace_provenance():
+    """
+    Activa el rastreo dentro del bloque y devuelve la lista de CallSite registrados en él.
+
+    La lista es del hilo (o tarea de asyncio) que abrió el bloque: los objetos creados al mismo tiempo
+    en otros hilos no se mezclan en ella.
+
+    Ejemplo:
+        with trace_provenance() as call_sites:
+            process_single_calculation(...)
+        print(call_sites[0].filename, call_sites[0].lineno)
+    """
+    global _active_blocks
+    call_sites = []
+    token = _block_records.set(call_sites)
+    with _lock:
+        _active_blocks += 1
+        _update_enabled()
+    try:
+        yield call_sites
+    finally:
+        with _lock:
+            _active_blocks -= 1
+            _update_enabled()
+        _block_records.reset(token)
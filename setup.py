@@ -5,10 +5,16 @@ setup(
     version="0.1.0",
     packages=find_packages(),
     install_requires=[
+        "numpy",
         "pandas",
         "xlsxwriter",
         "tabulate",
     ],
+    entry_points={
+        "console_scripts": [
+            "payroll-calc=payroll_calculator.cli:main",
+        ],
+    },
     author="Anonimo Tech",
     author_email="tu@email.com",
     description="A package for calculating IMSS, ISR, and savings for Mexican payroll",
@@ -21,5 +27,5 @@ setup(
         "License :: OSI Approved :: MIT License",
         "Operating System :: OS Independent",
     ],
-    python_requires=">=3.6",
+    python_requires=">=3.9",
 )
\ No newline at end of file
@@ -0,0 +1,54 @@
+import pytest
+
+# Nómina de ejemplo: un salario 0 (se omite), uno bajo el SMG y distintos períodos de pago
+SALARIES = [278.80, 350.0, 0, 812.45, 1500.0, 4200.0, 95.0]
+PAYMENT_PERIODS = [15, 15, 15, 7, 30, 15, 10]
+OTHER_PERCEPTIONS = [0, 500.0, 0, 0, 250.0, 0, 0]
+
+# Argumentos por fila que aceptan un escalar (se repite para cada salario)
+PER_ROW_ARGUMENTS = ('payment_periods', 'integration_factors', 'other_perceptions')
+
+
+def build_payroll_inputs(**overrides):
+    """
+    Argumentos de process_multiple_calculations para las pruebas.
+
+    payment_periods, integration_factors y other_perceptions aceptan un escalar, que se repite para
+    cada salario (o cada productividad en el modo sin salario).
+    """
+    params = dict(
+        salaries=SALARIES,
+        period_salaries=None,
+        payment_periods=PAYMENT_PERIODS,
+        periodicity=15,
+        integration_factors=1.0493,
+        use_increment_percentage=True,
+        risk_class='I',
+        smg_multiplier=1,
+        commission_percentage_dsi=0.03,
+        count_minimum_salary=1,
+        stricted_mode=False,
+        other_perceptions=OTHER_PERCEPTIONS,
+        imss_breakdown=True,
+    )
+    params.update(overrides)
+    size = len(params['salaries']) or len(params.get('productivities') or [])
+    for name in PER_ROW_ARGUMENTS:
+        value = params[name]
+        params[name] = list(value) if hasattr(value, '__len__') else [value] * size
+    params['salaries'] = list(params['salaries'])
+    return params
+
+
+@pytest.fixture
+def build_inputs():
+    """
+    Fábrica de argumentos de process_multiple_calculations (ver build_payroll_inputs).
+
+    Un módulo con otra nómina de ejemplo redefine el fixture a partir de este:
+
+        @pytest.fixture
+        def build_inputs(build_inputs):
+            return functools.partial(build_inputs, salaries=[...], payment_periods=15)
+    """
+    return build_payroll_inputs
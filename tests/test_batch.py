@@ -0,0 +1,85 @@
+import functools
+import math
+import pytest
+import numpy as np
+from payroll_calculator.processors.calculator import process_multiple_calculations
+from payroll_calculator.processors.batch import process_batch_calculations, columns_to_rows
+
+
+@pytest.fixture
+def build_inputs(build_inputs):
+    return functools.partial(
+        build_inputs,
+        imss_breakdown=None,
+        commissions_and_bonus_for_isr=[None, 0, None, 300.0, None, None, None],
+    )
+
+
+def assert_same_rows(expected, actual):
+    assert len(expected) == len(actual)
+    for expected_row, actual_row in zip(expected, actual):
+        assert list(expected_row) == list(actual_row)
+        for key, value in expected_row.items():
+            if value is None:
+                assert actual_row[key] is None, key
+            else:
+                assert actual_row[key] == value, key
+
+
+@pytest.mark.parametrize("overrides", [
+    {},
+    {'imss_breakdown': True},
+    {'imss_breakdown': True, 'is_keep_declared_salary': True},
+    {'imss_breakdown': True, 'productivities': [1200.0, None, 0, 800.0, 0, 0, 0]},
+    {'imss_breakdown': True, 'is_standard_mode': True, 'applied_commission_to': 'total_income'},
+    {'imss_breakdown': True, 'is_staggered_mode': True, 'count_minimum_salary': 2},
+    {'is_pure_mode': True, 'applied_commission_to': 'schema'},
+    {'is_pure_special_mode': True, 'net_salaries': [0, 6000.0, 0, float('nan'), 9000.0, 0, 0]},
+    {'period_salaries': [4500.0, 5300.0, 0, 5687.15]},
+    {'count_minimum_salary': 0, 'productivity_to_zero': True},
+])
+def test_batch_matches_object_path(overrides, capsys, build_inputs):
+    params = build_inputs(**overrides)
+    expected = process_multiple_calculations(**params)
+    actual = process_multiple_calculations(vectorized=True, **params)
+    assert_same_rows(expected, actual)
+
+
+def test_batch_without_salary_mode(build_inputs):
+    params = build_inputs(salaries=[], productivities=[1000.0, 0, 2500.0, 3000.0, 0, 0, 0])
+    expected = process_multiple_calculations(**params)
+    actual = process_multiple_calculations(vectorized=True, **params)
+    assert_same_rows(expected, actual)
+
+
+def test_batch_returns_columns_and_optional_masks(build_inputs):
+    columns, present = process_batch_calculations(**build_inputs(imss_breakdown=True))
+    # El salario 0 se omite
+    assert len(columns['base_salary']) == 6
+    assert isinstance(columns['imss_employer_fee'], np.ndarray)
+    # Solo las filas con salario completo menor o igual al SMG tienen aportaciones patronales
+    assert present['employer_contributions'].tolist() == (columns['base_salary'] <= 278.80 * columns['payment_period']).tolist()
+    rows = columns_to_rows(columns, present)
+    assert isinstance(rows[0]['suggested_total_social_cost'], int)
+
+
+def test_batch_stricted_mode_raises(build_inputs):
+    with pytest.raises(ValueError):
+        process_batch_calculations(**build_inputs(stricted_mode=True))
+
+
+@pytest.mark.parametrize("option", [
+    {'threads': 2}, {'workers': 2}, {'chunk_size': 10}, {'row_cache': object()}, {'result_cache': object()},
+    {'progress': object()},
+])
+def test_vectorized_rejects_row_options(option, build_inputs):
+    with pytest.raises(ValueError, match=next(iter(option))):
+        process_multiple_calculations(vectorized=True, **build_inputs(), **option)
+
+
+def test_all_rows_skipped_matches_object_path(build_inputs):
+    # Sin filas que calcular no se valida la periodicidad, igual que en el cálculo por objetos
+    params = build_inputs(salaries=[0, 0], payment_periods=15, other_perceptions=0, periodicity=99)
+    assert process_multiple_calculations(**params) == []
+    assert process_multiple_calculations(vectorized=True, **params) == []
+    assert len(process_multiple_calculations(vectorized=True, as_results=True, **params)) == 0
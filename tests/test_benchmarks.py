@@ -0,0 +1,39 @@
+import importlib.util
+import json
+import os
+
+BENCHMARK_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'benchmarks', 'bench_pipeline.py')
+
+
+def load_benchmarks():
+    spec = importlib.util.spec_from_file_location('bench_pipeline', BENCHMARK_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+class TestBenchmarkSuite:
+    def test_writes_json_report(self, tmp_path, capsys):
+        bench = load_benchmarks()
+        output = tmp_path / "results.json"
+        assert bench.main(['--sizes', '20', '--repeats', '1', '--engine', 'vectorized', '--output', str(output)]) == 0
+        report = json.loads(output.read_text())
+        names = {entry['name'] for entry in report['results']}
+        assert len(names) == len(bench.SCENARIOS) * 2 + 2
+        assert 'calculate/vectorized/pure_special/breakdown' in names
+        assert 'export/constant_memory' in names
+        for entry in report['results']:
+            assert entry['rows'] == 20
+            assert entry['rows_per_second'] > 0
+            assert entry['peak_memory_bytes'] > 0
+
+    def test_compare_flags_regressions(self):
+        bench = load_benchmarks()
+        baseline = {'results': [{'name': 'calculate/object/pure/breakdown', 'rows': 1000, 'rows_per_second': 1000.0,
+                                 'peak_memory_bytes': 100}]}
+        slower = [dict(baseline['results'][0], rows_per_second=700.0)]
+        similar = [dict(baseline['results'][0], rows_per_second=950.0)]
+        assert len(bench.compare(slower, baseline, max_regression=0.2)) == 1
+        assert bench.compare(similar, baseline, max_regression=0.2) == []
+        # Mediciones que fallaron (sin rows_per_second) no se comparan
+        assert bench.compare([{'name': 'calculate/object/pure/breakdown', 'rows': 1000, 'error': 'x'}], baseline) == []
@@ -0,0 +1,133 @@
+import csv
+import json
+import subprocess
+import sys
+import pytest
+from payroll_calculator import cli
+from payroll_calculator.cli import main, load_options, iter_file_rows, process_file
+from payroll_calculator.totals import TotalsAccumulator
+
+
+@pytest.fixture
+def inputs(tmp_path):
+    first = tmp_path / 'cliente_a.csv'
+    first.write_text('salario,dias,otras_percepciones\n300,15,0\n450,15,500\n0,15,0\n1200,30,0\n', encoding='utf-8')
+    second = tmp_path / 'cliente_b.csv'
+    second.write_text('salario\n500\n800\n', encoding='utf-8')
+    return [str(first), str(second)]
+
+
+@pytest.fixture
+def params(tmp_path):
+    path = tmp_path / 'params.json'
+    path.write_text(json.dumps({'mode': 'traditional', 'commission_percentage_dsi': 0.03, 'rcv_year': 2025}))
+    return str(path)
+
+
+def read_totals(path):
+    with open(path, newline='', encoding='utf-8') as file:
+        return {(row['Sección'], row['Concepto']): float(row['Total']) for row in csv.DictReader(file)}
+
+
+class TestBatch:
+    def test_writes_results_and_totals(self, inputs, params, tmp_path, capsys):
+        output_dir = tmp_path / 'out'
+        assert main(['batch', *inputs, '--params', params, '--output-dir', str(output_dir), '--jobs', '2']) == 0
+
+        with open(output_dir / 'cliente_a.csv', newline='', encoding='utf-8') as file:
+            rows = list(csv.DictReader(file))
+        # La fila con salario 0 se omite, como en process_multiple_calculations
+        assert [float(row['base_salary']) for row in rows] == [4500.0, 6750.0, 36000.0]
+        assert 'employer_contributions' in rows[0]
+
+        expected = TotalsAccumulator()
+        for chunk in iter_file_rows(inputs[0], load_options(params)):
+            expected.add_rows(chunk)
+        totals = read_totals(output_dir / 'cliente_a.totals.csv')
+        assert totals[('IMSS', 'total_imss_employer')] == pytest.approx(expected.total('imss_employer_fee'))
+        assert totals[('Ahorro', 'total_other_perceptions')] == pytest.approx(500.0)
+
+        output = capsys.readouterr().out
+        assert 'cliente_b.csv: 2 rows' in output
+        assert 'Processed 2 files, 5 rows' in output
+
+    @pytest.mark.parametrize('output_format', ['jsonl', 'json', 'xlsx'])
+    def test_formats(self, inputs, params, tmp_path, output_format):
+        output_dir = tmp_path / output_format
+        assert main(['batch', inputs[1], '--params', params, '--output-dir', str(output_dir),
+                     '--format', output_format]) == 0
+        if output_format == 'jsonl':
+            lines = (output_dir / 'cliente_b.jsonl').read_text(encoding='utf-8').splitlines()
+            assert [json.loads(line)['base_salary'] for line in lines] == [7500.0, 12000.0]
+            assert json.loads((output_dir / 'cliente_b.totals.json').read_text())['count'] == 2
+        elif output_format == 'json':
+            data = json.loads((output_dir / 'cliente_b.json').read_text(encoding='utf-8'))
+            assert len(data['rows']) == 2
+            assert set(data['totals']) == {'count', 'IMSS', 'ISR', 'Ahorro'}
+        else:
+            pandas = pytest.importorskip('pandas')
+            pytest.importorskip('openpyxl')
+            sheets = pandas.read_excel(output_dir / 'cliente_b.xlsx', sheet_name=None)
+            assert list(sheets) == ['Resultados', 'Totales']
+            assert list(sheets['Resultados']['base_salary']) == [7500.0, 12000.0]
+
+    def test_vectorized_and_chunked_totals_match(self, inputs, params, tmp_path):
+        options = load_options(params)
+        object_summary = process_file(inputs[0], options, str(tmp_path / 'object'), 'csv')
+        vectorized_summary = process_file(inputs[0], options, str(tmp_path / 'vectorized'), 'csv', vectorized=True,
+                                          chunk_size=1)
+        assert object_summary['error'] is None and vectorized_summary['error'] is None
+        assert object_summary['rows'] == vectorized_summary['rows'] == 3
+        object_totals = read_totals(tmp_path / 'object' / 'cliente_a.totals.csv')
+        vectorized_totals = read_totals(tmp_path / 'vectorized' / 'cliente_a.totals.csv')
+        assert object_totals.keys() == vectorized_totals.keys()
+        for key, value in object_totals.items():
+            assert vectorized_totals[key] == pytest.approx(value, abs=1e-6)
+
+    def test_failed_file_sets_exit_code(self, inputs, params, tmp_path, capsys, monkeypatch):
+        def fail_on_first(path, *args):
+            if path == inputs[0]:
+                raise ValueError('archivo dañado')
+            return original(path, *args)
+
+        original = cli.iter_file_rows
+        monkeypatch.setattr(cli, 'iter_file_rows', fail_on_first)
+        assert main(['batch', *inputs, '--params', params, '--output-dir', str(tmp_path / 'out'),
+                     '--jobs', '1']) == 1
+        output = capsys.readouterr().out
+        assert 'cliente_a.csv: error ValueError: archivo dañado' in output
+        assert '1 files failed' in output
+        assert (tmp_path / 'out' / 'cliente_b.csv').exists()
+
+    @pytest.mark.parametrize('output_format', cli.FORMATS)
+    def test_failed_file_removes_partial_outputs(self, inputs, params, tmp_path, monkeypatch, output_format):
+        if output_format == 'xlsx':
+            pytest.importorskip('xlsxwriter')
+
+        def fail_after_first_chunk(path, options, *args):
+            yield from original(path, options, *args)
+            raise ValueError('archivo dañado')
+
+        original = cli.iter_file_rows
+        monkeypatch.setattr(cli, 'iter_file_rows', fail_after_first_chunk)
+        output_dir = tmp_path / 'out'
+        summary = process_file(inputs[0], load_options(params), str(output_dir), output_format)
+        assert summary['error'] == 'ValueError: archivo dañado'
+        assert summary['outputs'] == []
+        assert list(output_dir.iterdir()) == []
+
+    def test_parser_does_not_import_subcommands(self):
+        script = ("import sys\n"
+                  "from payroll_calculator.cli import build_parser\n"
+                  "build_parser().parse_args(['stream'])\n"
+                  "print([name for name in ('payroll_calculator.streaming', 'payroll_calculator.service', 'numpy')"
+                  " if name in sys.modules])\n")
+        output = subprocess.run([sys.executable, '-c', script], capture_output=True, text=True, check=True).stdout
+        assert output.strip() == '[]'
+
+    def test_rejects_unknown_parameters(self, inputs, tmp_path):
+        path = tmp_path / 'params.json'
+        path.write_text(json.dumps({'modo': 'pure'}))
+        with pytest.raises(SystemExit) as error:
+            main(['batch', *inputs, '--params', str(path)])
+        assert error.value.code == 2
@@ -0,0 +1,107 @@
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from payroll_calculator.imss import IMSS, WAGE_BASIS_DIRECT, smg_wage_basis
+from payroll_calculator.processors.calculator import process_single_calculation, process_multiple_calculations
+from payroll_calculator.processors.parallel import split_chunks
+from payroll_calculator.progress import CollectingSink, ProgressEvent, PROGRESS
+from tests import conftest
+
+
+def build_imss():
+    return IMSS(113.14, 6000.0, 350.0, 15, 1.0493, minimum_threshold_salary=4182.0, use_increment_percentage=True, imss_breakdown=True)
+
+
+class TestWageBasis:
+    def test_direct_basis_matches_use_direct_daily_salary(self):
+        imss = build_imss()
+        assert imss.get_integrated_daily_wage(wage_basis=WAGE_BASIS_DIRECT) == 350.0 * 1.0493
+        assert imss.get_quota_employer(wage_basis=WAGE_BASIS_DIRECT) == imss.get_quota_employer(True)
+        assert imss.get_infonavit_employer(wage_basis=WAGE_BASIS_DIRECT) == imss.get_infonavit_employer(True)
+
+    def test_smg_basis_ignores_direct_daily_salary(self):
+        imss = build_imss()
+        wage_basis = smg_wage_basis(4182.0)
+        expected = imss.get_integrated_daily_wage_for_smg(4182.0)
+        assert imss.get_integrated_daily_wage(wage_basis=wage_basis) == expected
+        assert imss.get_integrated_daily_wage(True, wage_basis) == expected
+
+    def test_getters_do_not_replace_methods(self):
+        imss = build_imss()
+        imss.get_fixed_fee_for_smg(4182.0)
+        imss.get_quota_employee(use_direct_daily_salary=True)
+        assert 'get_integrated_daily_wage' not in vars(imss)
+
+    def test_evaluate_breakdown_does_not_store_values(self):
+        imss = build_imss()
+        breakdown = imss.evaluate_breakdown()
+        assert imss.quota_employer_with_daily_salary is None
+        assert imss.calculate_breakdown_values() == breakdown
+        assert imss.quota_employer_with_daily_salary == breakdown['quota_employer_with_daily_salary']
+
+
+class TestSavingBreakdown:
+    def test_breakdown_does_not_mutate_wage_and_salary(self):
+        _, _, saving, _, _ = process_single_calculation(
+            5300.0, 278.80, 15, 15, 1.0493, True, 'I', 1, 0.03, 1, imss_breakdown=True,
+            other_perception=0, has_period_salaries=True)
+        wage_and_salary = saving.wage_and_salary
+        result = saving.calculate_breakdown_values_for_dsi(use_direct_daily_salary=True, period_salary=4182.0)
+        assert saving.wage_and_salary == wage_and_salary
+        assert result['saving_wage_and_salary'] == 4182.0
+
+
+@pytest.fixture
+def params(build_inputs):
+    # La nómina de ejemplo repetida 6 veces (42 filas)
+    return build_inputs(salaries=conftest.SALARIES * 6, payment_periods=conftest.PAYMENT_PERIODS * 6,
+                        other_perceptions=conftest.OTHER_PERCEPTIONS * 6)
+
+
+class TestThreadedCalculations:
+    def test_threads_match_sequential_results(self, params):
+        assert process_multiple_calculations(threads=4, **params) == process_multiple_calculations(**params)
+
+    def test_threads_propagate_errors(self, params):
+        with pytest.raises(ValueError):
+            process_multiple_calculations(threads=4, **dict(params, stricted_mode=True))
+
+    def test_shared_imss_evaluated_from_threads(self):
+        expected = build_imss().get_fixed_fee_for_smg(4182.0), build_imss().get_total_social_cost_suggested()
+        imss = build_imss()
+
+        def evaluate(_):
+            return imss.get_fixed_fee_for_smg(4182.0), imss.get_total_social_cost_suggested()
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(evaluate, range(64)))
+        assert all(result == expected for result in results)
+
+
+class TestProcessPoolCalculations:
+    def test_workers_match_sequential_results(self, params):
+        expected = process_multiple_calculations(**params)
+        assert process_multiple_calculations(workers=2, chunk_size=5, **params) == expected
+
+    def test_workers_aggregate_progress(self, params):
+        sink = CollectingSink()
+        process_multiple_calculations(workers=2, chunk_size=10, progress=sink, **params)
+        assert sink.events[-1] == ProgressEvent(PROGRESS, 42, 42)
+
+    def test_workers_propagate_errors(self, params):
+        with pytest.raises(ValueError):
+            process_multiple_calculations(workers=2, **dict(params, stricted_mode=True))
+
+    def test_workers_raise_first_failing_row(self, params):
+        # Fallan la fila 3 y varias posteriores; el error debe ser el de la fila 3 aunque otro bloque termine antes
+        params = dict(params, stricted_mode=True, salaries=[4200.0] * 3 + [100.0] + [4200.0] * 30 + [50.0] * 8)
+        with pytest.raises(ValueError) as expected:
+            process_multiple_calculations(**params)
+        for _ in range(3):
+            with pytest.raises(ValueError) as actual:
+                process_multiple_calculations(workers=4, chunk_size=2, **params)
+            assert str(actual.value) == str(expected.value)
+
+    def test_split_chunks_covers_all_rows(self):
+        chunks = split_chunks(42, 2, 10)
+        assert chunks == [(0, 10), (10, 20), (20, 30), (30, 40), (40, 42)]
+        assert split_chunks(0, 4) == []
@@ -0,0 +1,59 @@
+import numpy as np
+import pytest
+from payroll_calculator.cost_curves import CURVE_COLUMNS, compile_imss_curves
+from payroll_calculator.imss import IMSS
+from payroll_calculator.parameter_set import ParameterSet
+
+
+def object_columns(daily_salary, payment_period, integration_factor, risk_class, parameters):
+    imss = IMSS(uma=parameters.uma, imss_salary=daily_salary * payment_period, daily_salary=daily_salary,
+                payment_period=payment_period, integration_factor=integration_factor, risk_class=risk_class,
+                parameters=parameters)
+    return {
+        'quota_employer': imss.get_quota_employer(),
+        'quota_employee': imss.get_quota_employee(),
+        'severance_employer': imss.get_severance_and_old_age_employer(),
+        'total_rcv_employer': imss.get_total_rcv_employer(),
+        'severance_employee': imss.get_severance_and_old_age_employee(),
+        'infonavit_employer': imss.get_infonavit_employer(),
+    }
+
+
+@pytest.fixture
+def parameters():
+    return ParameterSet.from_parameters(rcv_year=2025)
+
+
+class TestImssCostCurves:
+    @pytest.mark.parametrize("payment_period,risk_class", [(15, 'I'), (7, 'III'), (30, 'V')])
+    def test_matches_object_model(self, parameters, payment_period, risk_class):
+        curves = compile_imss_curves(payment_period, 1.0493, risk_class, parameters)
+        # Salarios de todo el rango, más los que caen justo en las fronteras (saltos)
+        salaries = list(np.linspace(0.5, 4000, 400)) + [boundary / 1.0493 for boundary in curves.boundaries if boundary > 0]
+        for daily_salary in salaries:
+            expected = object_columns(daily_salary, payment_period, 1.0493, risk_class, parameters)
+            # Mismo camino que el modelo: salario del período / días * factor
+            actual = curves.evaluate((daily_salary * payment_period) / payment_period)
+            for column, value in expected.items():
+                assert actual[column] == pytest.approx(value, rel=1e-12, abs=1e-9), (daily_salary, column)
+
+    def test_evaluate_many_matches_evaluate(self, parameters):
+        curves = compile_imss_curves(15, 1.0493, 'II', parameters)
+        salaries = np.concatenate([np.linspace(-10, 5000, 1000), np.array(curves.boundaries) / 1.0493])
+        columns = curves.evaluate_many(salaries)
+        assert set(columns) == set(CURVE_COLUMNS)
+        for index in range(0, len(salaries), 37):
+            single = curves.evaluate(salaries[index])
+            for column in CURVE_COLUMNS:
+                assert columns[column][index] == pytest.approx(single[column], rel=1e-15, abs=1e-12)
+
+    def test_boundaries_include_thresholds(self, parameters):
+        curves = compile_imss_curves(15, 1.0493, 'I', parameters)
+        for threshold in (0.0, parameters.uma * 3, parameters.uma * 25, parameters.smg):
+            assert threshold in curves.boundaries
+        assert set(parameters.rcv_table().boundaries) <= set(curves.boundaries)
+
+    def test_compiled_once_per_configuration(self, parameters):
+        assert compile_imss_curves(15, 1.0493, 'I', parameters) is compile_imss_curves(15, 1.0493, 'I', parameters)
+        other = compile_imss_curves(15, 1.0493, 'I', parameters.replace(smg=315.04))
+        assert other.evaluate(300.0)['quota_employee'] != compile_imss_curves(15, 1.0493, 'I', parameters).evaluate(300.0)['quota_employee']
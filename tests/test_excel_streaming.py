@@ -0,0 +1,62 @@
+import re
+import zipfile
+import numpy as np
+import pytest
+from payroll_calculator.exporters import export_to_excel, rows_from_columns
+
+IMSS_HEADERS = ["Salario Base", "Salario Diario", "SDI (Col. D)", "IMSS Patrón (Col. V)"]
+ISR_HEADERS = ["Salario Base", "Límite Inferior (Col. E)", "Crédito al Salario (Col. N)"]
+SAVING_HEADERS = ["Columna %d" % index for index in range(14)]
+
+
+def read_cells(path):
+    """Lee los valores de cada hoja de un .xlsx sin dependencias externas: {hoja: {celda: valor}}"""
+    with zipfile.ZipFile(path) as workbook:
+        names = re.findall(r'<sheet name="([^"]+)"', workbook.read('xl/workbook.xml').decode())
+        shared = []
+        if 'xl/sharedStrings.xml' in workbook.namelist():
+            shared = re.findall(r'<t[^>]*>([^<]*)</t>', workbook.read('xl/sharedStrings.xml').decode())
+        sheets = {}
+        for index, name in enumerate(names, start=1):
+            xml = workbook.read(f'xl/worksheets/sheet{index}.xml').decode()
+            cells = {}
+            for ref, attributes, body in re.findall(r'<c r="([A-Z]+\d+)"([^>]*?)(?:/>|>(.*?)</c>)', xml):
+                value = re.search(r'<v>([^<]*)</v>', body or '')
+                inline = re.search(r'<t[^>]*>([^<]*)</t>', body or '')
+                if 't="s"' in attributes:
+                    cells[ref] = shared[int(value.group(1))]
+                elif inline:
+                    cells[ref] = inline.group(1)
+                elif value:
+                    cells[ref] = float(value.group(1))
+            sheets[name] = (cells, re.findall(r'<col [^>]*/>', xml))
+        return sheets
+
+
+@pytest.fixture
+def results():
+    imss = [[5000.0, 333.33, 349.76, 812.5], [9000.0, 600.0, np.nan, 1500.25]]
+    isr = [[5000.0, 4910.19, None], [9000.0, 7487.86, 0.0]]
+    saving = [[float(row * 100 + column) for column in range(14)] for row in range(2)]
+    return imss, isr, saving
+
+
+class TestConstantMemoryExport:
+    def test_matches_dataframe_export(self, results, tmp_path):
+        imss, isr, saving = results
+        expected = export_to_excel(imss, IMSS_HEADERS, None, isr, ISR_HEADERS, None, saving, SAVING_HEADERS, None,
+                                   filepath=str(tmp_path / "pandas.xlsx"))
+        actual = export_to_excel(iter(imss), IMSS_HEADERS, None, iter(isr), ISR_HEADERS, None, iter(saving), SAVING_HEADERS, None,
+                                 constant_memory=True, filepath=str(tmp_path / "streaming.xlsx"))
+        expected_sheets, actual_sheets = read_cells(expected), read_cells(actual)
+        assert list(actual_sheets) == ['IMSS', 'ISR', 'Ahorro']
+        for name in expected_sheets:
+            assert actual_sheets[name][0] == expected_sheets[name][0], name
+        assert actual_sheets['Ahorro'][0]['N2'] == 'Salario'
+        assert actual_sheets['Ahorro'][0]['P4'] == 113.0
+        assert 'C3' not in actual_sheets['IMSS'][0]  # NaN queda vacío
+
+    def test_rows_from_columns(self):
+        columns = {'base_salary': np.array([5000.0, 9000.0]), 'imss_employer_fee': np.array([812.5, 1500.25]), 'other': [1, 2]}
+        rows = rows_from_columns(columns, ['base_salary', 'imss_employer_fee'])
+        assert list(rows) == [[5000.0, 812.5], [9000.0, 1500.25]]
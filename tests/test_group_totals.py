@@ -0,0 +1,94 @@
+import functools
+import pytest
+from payroll_calculator.processors.calculator import process_multiple_calculations
+from payroll_calculator.totals import GroupedTotals, TotalCalculator, TotalsAccumulator, group_totals
+
+
+@pytest.fixture
+def build_inputs(build_inputs):
+    return functools.partial(
+        build_inputs,
+        salaries=[278.80, 350.0, 812.45, 1500.0, 4200.0, 95.0, 612.3, 2750.55],
+        payment_periods=[15, 7, 15, 30, 15, 7, 15, 30], other_perceptions=[0, 200.0, 0, 0, 150.0, 0, 0, 0],
+    )
+
+
+class TestGroupedTotals:
+    def test_groups_match_filtered_totals(self, build_inputs):
+        rows = process_multiple_calculations(**build_inputs())
+        grouped = group_totals(rows, 'payment_period')
+
+        assert list(grouped) == [(15,), (7,), (30,)]
+        for period in (15, 7, 30):
+            subset = [row for row in rows if row['payment_period'] == period]
+            accumulator = grouped[period]
+            assert accumulator.count == len(subset)
+            assert accumulator.imss_totals() == pytest.approx(TotalCalculator.calculate_traditional_scheme_totals(subset))
+            assert accumulator.saving_totals() == pytest.approx(TotalCalculator.calculate_saving_totals(subset))
+
+    def test_tags_and_multiple_keys(self, build_inputs):
+        rows = process_multiple_calculations(**build_inputs())
+        tags = {'area': ['A', 'B'] * 4}
+        grouped = group_totals(rows, ['area', 'payment_period'], tags=tags)
+
+        assert set(grouped) == {('A', 15), ('B', 7), ('B', 30)}
+        assert sum(grouped[key].count for key in grouped) == len(rows)
+        expected = TotalsAccumulator.from_rows([rows[0], rows[2], rows[4], rows[6]]).isr_totals()
+        assert grouped[('A', 15)].isr_totals() == pytest.approx(expected)
+
+    def test_tags_length_mismatch(self, build_inputs):
+        rows = process_multiple_calculations(**build_inputs())
+        with pytest.raises(ValueError, match='menos'):
+            group_totals(rows, 'area', tags={'area': ['A'] * (len(rows) + 1)})
+        with pytest.raises(ValueError, match='más'):
+            group_totals(iter(rows), 'area', tags={'area': ['A'] * (len(rows) - 1)})
+        with pytest.raises(ValueError, match='mismo número'):
+            group_totals(rows, ['area', 'centro'], tags={'area': ['A'] * len(rows), 'centro': ['X']})
+
+    def test_input_aligned_tags_skip_zero_salaries(self, build_inputs):
+        # La fila con salario 0 no aparece en el resultado; su tag se descarta
+        params = build_inputs(salaries=[278.80, 0, 350.0], payment_periods=15, other_perceptions=0)
+        rows = process_multiple_calculations(**params)
+        grouped = group_totals(rows, 'area', tags={'area': ['A', 'X', 'B']}, input_salaries=params['salaries'])
+
+        assert len(rows) == 2
+        assert list(grouped) == [('A',), ('B',)]
+        assert grouped['B'].saving_totals() == pytest.approx(TotalsAccumulator.from_rows([rows[1]]).saving_totals())
+
+    def test_merge_matches_single_pass(self, build_inputs):
+        rows = process_multiple_calculations(**build_inputs())
+        serial = group_totals(rows, 'payment_period')
+        merged = group_totals(rows[:3], 'payment_period').merge(group_totals(rows[3:], 'payment_period'))
+        # Cada bloque se redondea por separado: los totales coinciden salvo en el último dígito
+        assert list(merged.totals()) == list(serial.totals())
+        for key, totals in serial.totals().items():
+            assert merged.totals()[key]['count'] == totals['count']
+            for section in ('imss', 'isr', 'saving'):
+                assert merged.totals()[key][section] == pytest.approx(totals[section])
+
+        with pytest.raises(ValueError):
+            merged.merge(GroupedTotals('risk_class'))
+
+    def test_results_container(self, build_inputs):
+        params = build_inputs()
+        rows = process_multiple_calculations(**params)
+        results = process_multiple_calculations(as_results=True, **params)
+        expected = group_totals(rows, 'payment_period')
+        grouped = group_totals(results, 'payment_period')
+        assert list(grouped) == list(expected)
+        for key in expected:
+            assert grouped[key].count == expected[key].count
+            assert grouped[key].saving_totals() == pytest.approx(expected[key].saving_totals())
+
+    def test_excel_rows(self, build_inputs):
+        rows = process_multiple_calculations(**build_inputs())
+        grouped = group_totals(rows, 'payment_period')
+        excel_rows = grouped.to_excel_rows()
+
+        first = excel_rows[0]
+        assert list(first) == ['payment_period', 'Sección', 'Concepto', 'Total']
+        assert first['payment_period'] == 15
+        assert first['Sección'] == 'IMSS'
+        assert first['Concepto'] == 'total_imss_employer'
+        assert first['Total'] == grouped[15].imss_totals()['total_imss_employer']
+        assert {row['Sección'] for row in excel_rows} == {'IMSS', 'ISR', 'Ahorro'}
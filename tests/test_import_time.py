@@ -0,0 +1,71 @@
+import json
+import os
+import subprocess
+import sys
+import pytest
+import payroll_calculator
+
+PACKAGE_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Tiempo máximo para importar el cálculo por objetos en un intérprete nuevo (hoy ~60 ms; con pandas eran ~400 ms)
+IMPORT_BUDGET_SECONDS = 0.25
+
+HEAVY_MODULES = ('numpy', 'pandas', 'sqlite3', 'xlsxwriter')
+
+_IMPORT_SCRIPT = """
+import json, sys, time
+start = time.perf_counter()
+import payroll_calculator
+from payroll_calculator import IMSS, ISR, Saving, TotalCalculator, ParameterSet
+elapsed = time.perf_counter() - start
+print(json.dumps({'elapsed': elapsed, 'loaded': [name for name in %r if name in sys.modules]}))
+"""
+
+
+def import_in_fresh_interpreter():
+    output = subprocess.run([sys.executable, '-c', _IMPORT_SCRIPT % (HEAVY_MODULES,)], cwd=PACKAGE_ROOT,
+                            capture_output=True, text=True, check=True).stdout
+    return json.loads(output)
+
+
+class TestLazyImports:
+    def test_core_import_does_not_load_heavy_modules(self):
+        assert import_in_fresh_interpreter()['loaded'] == []
+
+    def test_core_import_within_budget(self):
+        # Mejor de tres corridas para no depender de la carga momentánea de la máquina
+        elapsed = min(import_in_fresh_interpreter()['elapsed'] for _ in range(3))
+        assert elapsed < IMPORT_BUDGET_SECONDS, f"import payroll_calculator took {elapsed * 1000:.0f} ms"
+
+    def test_constant_memory_export_does_not_load_pandas(self, tmp_path):
+        script = (
+            "import sys\n"
+            "from payroll_calculator.exporters import export_to_excel\n"
+            "export_to_excel([[1.0]], ['A'], {}, [[1.0]], ['B'], {}, [[0.0] * 14], [], {},\n"
+            "                constant_memory=True, filepath=sys.argv[1])\n"
+            "print('pandas' in sys.modules)\n"
+        )
+        output = subprocess.run([sys.executable, '-c', script, str(tmp_path / 'libro.xlsx')], cwd=PACKAGE_ROOT,
+                                capture_output=True, text=True, check=True).stdout
+        assert output.splitlines()[-1] == 'False'
+
+    def test_lazy_attributes_resolve(self):
+        from payroll_calculator import process_multiple_calculations, export_to_excel, RowCache, PayrollResults
+        from payroll_calculator.processors import calculator
+        from payroll_calculator.exporters import excel_exporter
+        assert process_multiple_calculations is calculator.process_multiple_calculations
+        assert export_to_excel is excel_exporter.export_to_excel
+        assert RowCache.__module__ == 'payroll_calculator.processors.row_cache'
+        assert PayrollResults.__module__ == 'payroll_calculator.results'
+        assert payroll_calculator.processors.process_batch_calculations is not None
+
+    def test_dir_lists_lazy_names(self):
+        names = dir(payroll_calculator)
+        for name in ('IMSS', 'process_multiple_calculations', 'export_to_excel', 'solve_gross_for_net', 'exporters'):
+            assert name in names
+
+    def test_unknown_attribute(self):
+        with pytest.raises(AttributeError):
+            payroll_calculator.does_not_exist
+        with pytest.raises(AttributeError):
+            payroll_calculator.processors.does_not_exist
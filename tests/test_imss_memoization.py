@@ -0,0 +1,46 @@
+import pytest
+from payroll_calculator.imss import IMSS, WAGE_BASIS_DIRECT
+
+
+class TestIMSSMemoization:
+    @pytest.fixture
+    def imss(self):
+        return IMSS(113.14, 6000.0, 350.0, 15, 1.0493, minimum_threshold_salary=4182.0, use_increment_percentage=True, imss_breakdown=True)
+
+    def test_repeated_getters_are_served_from_cache(self, imss):
+        first = imss.get_total_social_cost_suggested()
+        cached_entries = len(imss._cache)
+        assert imss.get_total_social_cost_suggested() == first
+        assert imss.get_total_employer() == imss.get_total_employer()
+        assert len(imss._cache) == cached_entries
+
+    def test_variants_are_cached_separately(self, imss):
+        declared = imss.get_quota_employer()
+        direct = imss.get_quota_employer(use_direct_daily_salary=True)
+        fixed_fee = imss.get_fixed_fee_for_smg(4182.0)
+        assert declared != direct
+        # Las variantes no contaminan el resultado declarado
+        assert imss.get_quota_employer() == declared
+        assert imss.get_quota_employer(True) == direct
+        assert imss.get_fixed_fee_for_smg(4182.0) == fixed_fee
+        assert imss.get_quota_employer(wage_basis=WAGE_BASIS_DIRECT) == direct
+
+    def test_cached_values_match_fresh_instance(self, imss):
+        imss.get_fixed_fee_for_smg(4182.0)
+        imss.calculate_breakdown_values()
+        fresh = IMSS(113.14, 6000.0, 350.0, 15, 1.0493, minimum_threshold_salary=4182.0, use_increment_percentage=True, imss_breakdown=True)
+        assert imss.get_total_social_cost() == fresh.get_total_social_cost()
+        assert imss.get_infonavit_employer(True) == fresh.get_infonavit_employer(True)
+        assert imss.get_fixed_fee_for_smg(4182.0) == fresh.get_fixed_fee_for_smg(4182.0)
+
+    def test_changing_inputs_invalidates_cache(self, imss):
+        before = imss.get_quota_employer(use_direct_daily_salary=True)
+        imss.daily_salary = 700.0
+        after = imss.get_quota_employer(use_direct_daily_salary=True)
+        assert after > before
+
+    def test_invalidate_cache_after_mutating_employee(self, imss):
+        before = imss.get_integrated_daily_wage()
+        imss.employee.imss_salary = 9000.0
+        imss.invalidate_cache()
+        assert imss.get_integrated_daily_wage() == pytest.approx(before * 1.5)
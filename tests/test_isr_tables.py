@@ -0,0 +1,57 @@
+import pytest
+from payroll_calculator.isr import ISR
+from payroll_calculator.isr_tables import (
+    BracketTable, get_isr_table, get_isr_brackets, get_employee_subsidy_brackets
+)
+
+
+class TestBracketTable:
+    def test_compiled_tables_follow_source_tables(self):
+        for period in (1, 7, 10, 15, 30):
+            table = get_isr_table(period)
+            brackets = get_isr_brackets(period)
+            assert brackets.lower_limits == tuple(row['lower_limit'] for row in table)
+            assert brackets.fixed_fees == tuple(row['fixed_fee'] for row in table)
+            assert brackets.percentages == tuple(row['percentage'] for row in table)
+
+    def test_find_returns_last_bracket_with_lower_limit_below_amount(self):
+        brackets = get_isr_brackets(15)
+        assert brackets.find(0) is None
+        assert brackets.find(0.01) == 0
+        assert brackets.find(368.10) == 0
+        assert brackets.find(368.11) == 1
+        assert brackets.find(10 ** 9) == len(brackets) - 1
+
+    def test_unsorted_rows_are_sorted(self):
+        brackets = BracketTable([
+            {'lower_limit': 100, 'upper_limit': float('inf'), 'credit': 1},
+            {'lower_limit': 0.01, 'upper_limit': 99.99, 'credit': 2},
+        ])
+        assert brackets.lower_limits == (0.01, 100)
+        assert brackets.credits[brackets.find(50)] == 2
+
+    def test_invalid_period_raises(self):
+        with pytest.raises(ValueError):
+            get_employee_subsidy_brackets(14)
+
+
+class TestISREvaluate:
+    @pytest.mark.parametrize("salary", [0, 500.0, 3124.36, 5710.64, 50000.0])
+    def test_evaluate_matches_getters(self, salary):
+        isr = ISR(salary, 15, 15, None, is_salary_bigger_than_smg=True, commission_and_bonus_for_isr=150.0)
+        result = isr.evaluate()
+        assert result['isr_lower_limit'] == isr.get_lower_limit()
+        assert result['isr_surplus'] == isr.get_surplus()
+        assert result['isr_percentage_applied_to_surplus'] == isr.get_percentage_applied_to_excess()
+        assert result['isr_surplus_tax'] == isr.get_surplus_tax()
+        assert result['isr_fixed_fee'] == isr.get_fixed_fee()
+        assert result['isr_total_tax'] == isr.get_total_tax()
+        assert result['isr_range_credit_for_salary'] == isr.get_range_credit_to_salary()
+        assert result['salary_credit'] == isr.get_salary_credit()
+        assert result['isr_tax_payable'] == isr.get_tax_payable()
+        assert result['isr_tax_in_favor'] == isr.get_tax_in_favor()
+
+    def test_lower_limit_uses_commission(self):
+        isr = ISR(3000.0, 15, 15, None, commission_and_bonus_for_isr=200.0)
+        assert isr.get_lower_limit() == 3124.36
+        assert isr.get_surplus() == pytest.approx(3200.0 - 3124.36)
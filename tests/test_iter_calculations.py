@@ -0,0 +1,29 @@
+import types
+import pytest
+from payroll_calculator.processors import iter_calculations, process_multiple_calculations
+
+
+class TestIterCalculations:
+    def test_yields_same_rows_as_process_multiple_calculations(self, build_inputs):
+        params = build_inputs()
+        rows = iter_calculations(**params)
+        assert isinstance(rows, types.GeneratorType)
+        assert list(rows) == process_multiple_calculations(**params)
+
+    def test_chunks_preserve_order_and_skip_zero_salaries(self, build_inputs):
+        params = build_inputs()
+        chunks = list(iter_calculations(chunk_size=4, **params))
+        assert [len(chunk) for chunk in chunks] == [4, 2]
+        assert [row for chunk in chunks for row in chunk] == process_multiple_calculations(**params)
+
+    def test_rows_are_calculated_on_demand(self, build_inputs):
+        # En modo estricto el salario 95.0 (última fila) falla, pero solo cuando se llega a ella
+        rows = iter_calculations(**build_inputs(stricted_mode=True, salaries=[350.0, 812.45, 95.0]))
+        assert next(rows)['base_salary'] == 350.0 * 15
+        assert next(rows)['base_salary'] == 812.45 * 15
+        with pytest.raises(ValueError):
+            next(rows)
+
+    def test_without_salary_mode_uses_productivities(self, build_inputs):
+        params = build_inputs(salaries=[], productivities=[1000.0, 0, 2500.0, 3000.0, 0, 0, 0])
+        assert list(iter_calculations(**params)) == process_multiple_calculations(**params)
@@ -0,0 +1,127 @@
+import io
+import contextlib
+import threading
+import pytest
+from payroll_calculator.exporters import export_to_excel
+from payroll_calculator.metrics import StageMetrics, StageStats
+from payroll_calculator.processors import RowCache, process_multiple_calculations
+
+
+def run(metrics=None, **options):
+    kwargs = dict(salaries=[300.0, 500.0, 278.8, 0, 1200.0], period_salaries=None, payment_periods=[15, 15, 7, 15, 30],
+                  periodicity=15, integration_factors=[1.0493] * 5, use_increment_percentage=True, risk_class='I',
+                  smg_multiplier=1, commission_percentage_dsi=0.03, count_minimum_salary=1, stricted_mode=False,
+                  imss_breakdown=True, other_perceptions=[0.0] * 5)
+    kwargs.update(options)
+    with contextlib.redirect_stdout(io.StringIO()):
+        return process_multiple_calculations(metrics=metrics, **kwargs)
+
+
+class TestStageStats:
+    def test_totals_and_percentiles(self):
+        stats = StageStats()
+        for elapsed in [1000] * 98 + [1_000_000, 2_000_000]:
+            stats.add(elapsed)
+        assert stats.count == 100
+        assert stats.total_ns == 98 * 1000 + 3_000_000
+        assert (stats.min_ns, stats.max_ns) == (1000, 2_000_000)
+        # Mediana dentro de la cubeta [960, 1024) ns, acotada por el mínimo; p99 en la cubeta de 1 ms
+        assert stats.percentile(0.5) == pytest.approx(1000e-9)
+        assert 1e-3 <= stats.percentile(0.99) <= 1.1e-3
+
+    def test_percentiles_within_bucket_resolution(self):
+        stats = StageStats()
+        durations = range(1000, 1_001_000, 1000)
+        for elapsed in durations:
+            stats.add(elapsed)
+        assert stats.percentile(0.5) == pytest.approx(500_000e-9, rel=0.02)
+        assert stats.percentile(0.99) == pytest.approx(990_000e-9, rel=0.02)
+        assert stats.percentile(0.1) == pytest.approx(100_000e-9, rel=0.02)
+
+    def test_merge(self):
+        first, second = StageStats(), StageStats()
+        first.add(10)
+        second.add(5000)
+        second.add(20)
+        first.merge(second)
+        assert (first.count, first.total_ns, first.min_ns, first.max_ns) == (3, 5030, 10, 5000)
+        assert sum(first.buckets) == 3
+
+
+class TestStageMetrics:
+    def test_lap_and_stage(self):
+        metrics = StageMetrics()
+        start = metrics.lap('first', 0)
+        assert start > 0
+        metrics.lap('second', start)
+        with metrics.stage('second'):
+            pass
+        assert metrics.stages == ['first', 'second']
+        assert metrics['second'].count == 2
+        assert sum(count for _, count in metrics.histogram('second')) == 2
+        assert 'Stage' in metrics.report() and 'second' in metrics.report()
+
+    def test_thread_safe(self):
+        metrics = StageMetrics()
+
+        def work():
+            for _ in range(1000):
+                metrics.record('row', 100)
+
+        threads = [threading.Thread(target=work) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert metrics.totals()['row']['count'] == 8000
+
+    def test_merge_and_reset(self):
+        first, second = StageMetrics(), StageMetrics()
+        first.record('imss', 100)
+        second.record('imss', 300)
+        second.record('isr', 50)
+        first.merge(second)
+        assert first.totals()['imss']['count'] == 2
+        assert first.totals()['isr']['total_seconds'] == pytest.approx(50e-9)
+        first.reset()
+        assert first.stages == []
+
+
+class TestPipelineStages:
+    def test_records_row_stages(self):
+        metrics = StageMetrics()
+        rows = run(metrics)
+        totals = metrics.totals()
+        # La fila con salario 0 se omite antes de medir
+        assert totals['row']['count'] == len(rows) == 4
+        for stage in ('imss', 'imss_breakdown', 'isr', 'saving', 'saving_breakdown', 'row_assembly'):
+            assert totals[stage]['count'] == 4, stage
+        # Solo las filas que no superan el SMG calculan las aportaciones patronales
+        assert totals['employer_contributions']['count'] == 1
+        assert totals['rows']['count'] == 1
+        assert totals['rows']['total_seconds'] >= totals['row']['total_seconds']
+
+    def test_same_results_with_and_without_metrics(self):
+        assert run(StageMetrics()) == run()
+        assert run(StageMetrics(), threads=2) == run()
+
+    def test_row_cache_hits_skip_calculation(self):
+        metrics = StageMetrics()
+        run(metrics, salaries=[300.0] * 5, payment_periods=[15] * 5, row_cache=RowCache())
+        totals = metrics.totals()
+        assert totals['row']['count'] == 5
+        assert totals['row_cache']['count'] == 5
+        assert totals['imss']['count'] == 1
+
+    def test_vectorized_stages(self):
+        metrics = StageMetrics()
+        run(metrics, vectorized=True)
+        assert set(metrics.stages) == {'batch', 'batch_rows'}
+
+    def test_export_stage(self, tmp_path):
+        metrics = StageMetrics()
+        with contextlib.redirect_stdout(io.StringIO()):
+            path = export_to_excel([[1.0]], ['A'], None, [[1.0]], ['A'], None, [[0.0] * 14], ['A'] * 14, None,
+                                   constant_memory=True, filepath=str(tmp_path / "out.xlsx"), metrics=metrics)
+        assert path is not None
+        assert metrics.totals()['export']['count'] == 1
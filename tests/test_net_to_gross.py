@@ -0,0 +1,84 @@
+import io
+import contextlib
+import numpy as np
+import pytest
+from payroll_calculator.net_to_gross import solve_gross_for_net, net_for_gross
+from payroll_calculator.parameter_set import ParameterSet
+from payroll_calculator.processors.batch import process_batch_calculations
+from payroll_calculator.processors.calculator import process_multiple_calculations
+
+
+@pytest.fixture
+def parameters():
+    return ParameterSet.from_parameters(rcv_year=2025)
+
+
+def engine_net(gross, payment_periods, integration_factors, commissions, parameters, periodicity=15):
+    size = len(gross)
+    columns, _ = process_batch_calculations(
+        salaries=gross / payment_periods, period_salaries=gross, payment_periods=payment_periods, periodicity=periodicity,
+        integration_factors=integration_factors, use_increment_percentage=False, risk_class='I', smg_multiplier=1,
+        commission_percentage_dsi=0, count_minimum_salary=1, stricted_mode=False, net_salaries=np.full(size, 1.0),
+        other_perceptions=np.zeros(size), is_pure_special_mode=True, commissions_and_bonus_for_isr=commissions,
+        parameters=parameters)
+    return columns['salary_minus_retentions']
+
+
+class TestSolveGrossForNet:
+    def test_thousands_of_employees(self, parameters):
+        rng = np.random.default_rng(7)
+        size = 5000
+        targets = rng.uniform(1, 150000, size)
+        payment_periods = rng.choice([7, 15, 30], size).astype(float)
+        integration_factors = rng.uniform(1.04, 1.1, size)
+        commissions = rng.choice([0.0, 0.0, 500.0], size)
+
+        result = solve_gross_for_net(targets, payment_periods, 15, integration_factors,
+                                     commissions_and_bonus_for_isr=commissions, parameters=parameters)
+
+        assert result.converged.all()
+        assert np.abs(result.net - targets).max() <= 1e-6
+        # Tramo lineal: la regula falsi termina en muy pocos pasos
+        assert result.iterations.max() <= 4
+        # El neto obtenido es el que calcula el motor con ese bruto
+        np.testing.assert_allclose(engine_net(result.gross, payment_periods, integration_factors, commissions, parameters),
+                                   result.net, rtol=0, atol=1e-9)
+
+    def test_matches_object_model(self, parameters):
+        targets = [2500.0, 4200.0, 9000.0, 31000.0]
+        result = solve_gross_for_net(targets, 15, 15, 1.0493, parameters=parameters)
+        with contextlib.redirect_stdout(io.StringIO()):
+            rows = process_multiple_calculations(
+                salaries=list(result.gross / 15), period_salaries=list(result.gross), payment_periods=[15] * 4,
+                periodicity=15, integration_factors=[1.0493] * 4, use_increment_percentage=False, risk_class='I',
+                smg_multiplier=1, commission_percentage_dsi=0, count_minimum_salary=1, stricted_mode=False,
+                imss_breakdown=True, net_salaries=targets, other_perceptions=[0.0] * 4, is_pure_special_mode=True,
+                parameters=parameters)
+        for row, target in zip(rows, targets):
+            assert row['salary_minus_retentions'] == pytest.approx(target, abs=1e-6)
+
+    def test_returns_lowest_gross_near_smg(self, parameters):
+        # Justo arriba del SMG empiezan las cuotas del trabajador y el neto baja; se espera el primer bruto que alcanza el neto
+        smg_period = parameters.smg * 15
+        targets = np.array([smg_period - 1.0, smg_period])
+        result = solve_gross_for_net(targets, 15, 15, 1.0493, parameters=parameters)
+        assert result.converged.all()
+        assert result.gross[0] == pytest.approx(smg_period - 1.0)
+        assert result.gross[1] == pytest.approx(smg_period)
+        grid = np.linspace(1.0, result.gross[1], 2000)[:-1]
+        assert np.all(net_for_gross(grid, 15, 15, 1.0493, parameters=parameters) < targets[1])
+
+    def test_non_positive_and_missing_targets(self, parameters):
+        result = solve_gross_for_net([0.0, -5.0, np.nan, 1000.0], 15, 15, 1.0493, parameters=parameters)
+        assert list(result.gross[:2]) == [0.0, 0.0]
+        assert np.isnan(result.gross[2]) and not result.converged[2]
+        assert result.converged[[0, 1, 3]].all()
+
+    def test_net_for_gross_matches_engine(self, parameters):
+        gross = np.linspace(100, 200000, 3000)
+        payment_periods = np.full(len(gross), 15.0)
+        integration_factors = np.full(len(gross), 1.0493)
+        commissions = np.full(len(gross), 250.0)
+        np.testing.assert_array_equal(
+            net_for_gross(gross, 15, 15, 1.0493, commissions_and_bonus_for_isr=250.0, parameters=parameters),
+            engine_net(gross, payment_periods, integration_factors, commissions, parameters))
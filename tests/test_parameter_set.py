@@ -0,0 +1,77 @@
+import functools
+import dataclasses
+import pickle
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from payroll_calculator.parameter_set import ParameterSet
+from payroll_calculator.parameters import Parameters
+from payroll_calculator.processors.calculator import process_multiple_calculations
+
+
+@pytest.fixture
+def build_inputs(build_inputs):
+    return functools.partial(
+        build_inputs,
+        salaries=[278.80, 350.0, 812.45, 1500.0, 4200.0], payment_periods=[15, 15, 7, 30, 15],
+        other_perceptions=0, risk_class='II', rcv_year=2025,
+    )
+
+
+class TestParameterSet:
+    def test_snapshot_of_parameters(self):
+        parameters = ParameterSet.from_parameters(uma=108.57, rcv_year=2024)
+        assert parameters.uma == 108.57
+        assert parameters.smg == Parameters.SMG
+        assert parameters.rcv_year == 2024
+        assert parameters.risk_percentage('iii') == Parameters.RISK_LEVELS['III']
+        assert parameters.risk_percentage(0.02) == 0.02
+        with pytest.raises(ValueError):
+            parameters.risk_percentage('VI')
+        with pytest.raises(TypeError):
+            ParameterSet.from_parameters(minimum_wage=1)
+
+    def test_frozen_and_hashable(self):
+        parameters = ParameterSet.from_parameters(rcv_year=2025)
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            parameters.smg = 300.0
+        same = ParameterSet.from_parameters(rcv_year=2025)
+        other = parameters.replace(smg=315.04)
+        assert parameters == same and hash(parameters) == hash(same)
+        assert len({parameters, same, other}) == 2
+
+    def test_content_hash(self):
+        parameters = ParameterSet.from_parameters(rcv_year=2025)
+        assert parameters.content_hash == ParameterSet.from_parameters(rcv_year=2025).content_hash
+        assert parameters.content_hash != parameters.replace(increase=0.03).content_hash
+        assert parameters.content_hash != parameters.replace(rcv_year=2026).content_hash
+        # La huella no depende del proceso ni se pierde al serializar
+        assert pickle.loads(pickle.dumps(parameters)).content_hash == parameters.content_hash
+
+
+class TestExplicitParameters:
+    def test_matches_patched_class_attributes(self, monkeypatch, build_inputs):
+        parameters = ParameterSet.from_parameters(uma=113.14, rcv_year=2025).replace(smg=315.04, state_payroll_tax=0.04)
+        explicit = process_multiple_calculations(parameters=parameters, **build_inputs())
+
+        monkeypatch.setattr(Parameters, 'SMG', 315.04)
+        monkeypatch.setattr(Parameters, 'STATE_PAYROLL_TAX', 0.04)
+        patched = process_multiple_calculations(**build_inputs())
+        assert explicit == patched
+
+    def test_vectorized_engine(self, build_inputs):
+        parameters = ParameterSet.from_parameters(rcv_year=2025).replace(smg=315.04, increase=0.03)
+        expected = process_multiple_calculations(parameters=parameters, **build_inputs())
+        rows = process_multiple_calculations(parameters=parameters, vectorized=True, **build_inputs())
+        for key in ('suggested_total_social_cost', 'payroll_tax', 'dsi_scheme_fixed_fee', 'uma_used'):
+            assert [row[key] for row in rows] == pytest.approx([row[key] for row in expected])
+
+    def test_concurrent_tenants(self, build_inputs):
+        base = ParameterSet.from_parameters(rcv_year=2025)
+        tenants = [base, base.replace(smg=315.04), base.replace(uma=108.57, fixed_fee=0.21), base.replace(rcv_year=2030)]
+        serial = [process_multiple_calculations(parameters=parameters, **build_inputs()) for parameters in tenants]
+
+        with ThreadPoolExecutor(max_workers=len(tenants)) as executor:
+            concurrent = list(executor.map(lambda parameters: process_multiple_calculations(parameters=parameters, **build_inputs()), tenants * 3))
+
+        assert concurrent == serial * 3
+        assert serial[0] != serial[1] and serial[0] != serial[2] and serial[0] != serial[3]
@@ -0,0 +1,114 @@
+import io
+import logging
+import pytest
+from payroll_calculator.processors import process_multiple_calculations, iter_calculations
+from payroll_calculator.progress import (
+    BELOW_SMG, PROGRESS, ROW_SKIPPED, SMG_ABOVE_SALARY, CollectingSink, LoggingSink, PrintSink, ProgressEvent,
+    RateLimitedSink, format_event, print_progress,
+)
+
+PARAMS = dict(salaries=[300.0, 0, 200.0, 500.0], period_salaries=None, payment_periods=[15] * 4, periodicity=15,
+              integration_factors=[1.0493] * 4, use_increment_percentage=True, risk_class='I', smg_multiplier=1,
+              commission_percentage_dsi=0.03, count_minimum_salary=1, stricted_mode=False, imss_breakdown=True,
+              other_perceptions=[0.0] * 4)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestFormatEvent:
+    def test_keeps_previous_messages(self):
+        assert format_event(ProgressEvent(PROGRESS, 10, 42)) == "Processing salary 10/42..."
+        assert format_event(ProgressEvent(ROW_SKIPPED, 3, 42, {'salary': 0})) == "Salary is 0. Skipping salary at index 3. 0"
+        assert format_event(ProgressEvent(BELOW_SMG)) == "SALARIO MENOR O IGUAL AL SMG, NO APLICAR RETENCIONES"
+        assert format_event(ProgressEvent(SMG_ABOVE_SALARY, 0, 1, {'payment_period': 15, 'salary': 100.0})) == \
+            "SMG for 15 days is higher than salary. Skipping salary 100.0."
+        assert format_event(ProgressEvent(BELOW_SMG, suppressed=4)).endswith("(4 similar events suppressed)")
+
+
+class TestRateLimitedSink:
+    def test_progress_first_last_and_one_per_interval(self):
+        clock = FakeClock()
+        collected = CollectingSink()
+        sink = RateLimitedSink(collected, interval=1.0, clock=clock)
+        for index in range(1, 101):
+            clock.now = index * 0.05
+            sink.emit(ProgressEvent(PROGRESS, index, 100))
+        indexes = [event.index for event in collected.events]
+        assert indexes[0] == 1 and indexes[-1] == 100
+        assert len(indexes) == 6
+
+    def test_diagnostics_report_suppressed_count(self):
+        clock = FakeClock()
+        collected = CollectingSink()
+        sink = RateLimitedSink(collected, interval=1.0, clock=clock)
+        for _ in range(5):
+            sink.emit(ProgressEvent(BELOW_SMG))
+        clock.now = 2.0
+        sink.emit(ProgressEvent(BELOW_SMG))
+        sink.emit(ProgressEvent(BELOW_SMG))
+        sink.emit(ProgressEvent(BELOW_SMG))
+        assert [event.suppressed for event in collected.events] == [0, 4]
+        sink.flush()
+        assert [event.suppressed for event in collected.events] == [0, 4, 1]
+
+    def test_print_progress(self):
+        stream = io.StringIO()
+        sink = print_progress(interval=60, stream=stream)
+        for index in range(1, 4):
+            sink.emit(ProgressEvent(PROGRESS, index, 3))
+        assert stream.getvalue().splitlines() == ["Processing salary 1/3...", "Processing salary 3/3..."]
+
+
+class TestSinks:
+    def test_print_sink(self):
+        stream = io.StringIO()
+        PrintSink(stream).emit(ProgressEvent(PROGRESS, 1, 2))
+        assert stream.getvalue() == "Processing salary 1/2...\n"
+
+    def test_logging_sink_levels(self, caplog):
+        logger = logging.getLogger('payroll_calculator.test')
+        with caplog.at_level(logging.INFO, logger='payroll_calculator.test'):
+            sink = LoggingSink(logger)
+            sink.emit(ProgressEvent(PROGRESS, 1, 2))
+            sink.emit(ProgressEvent(BELOW_SMG))
+        assert [record.levelno for record in caplog.records] == [logging.INFO, logging.WARNING]
+        assert caplog.records[1].payroll_event.kind == BELOW_SMG
+
+
+class TestCalculationEvents:
+    def test_silent_by_default(self, capsys):
+        process_multiple_calculations(**PARAMS)
+        assert capsys.readouterr().out == ""
+
+    def test_events_from_calculation(self):
+        sink = CollectingSink()
+        rows = process_multiple_calculations(progress=sink, **PARAMS)
+        assert len(rows) == 3
+        assert [event.index for event in sink.of_kind(PROGRESS)] == [1, 3, 4]
+        assert sink.of_kind(ROW_SKIPPED) == [ProgressEvent(ROW_SKIPPED, 1, 4, {'salary': 0})]
+        # El salario de 200 diarios no supera el SMG
+        assert len(sink.of_kind(BELOW_SMG)) >= 1
+
+    def test_strict_mode_event(self):
+        sink = CollectingSink()
+        with pytest.raises(ValueError):
+            process_multiple_calculations(progress=sink, **dict(PARAMS, stricted_mode=True))
+        event = sink.of_kind(SMG_ABOVE_SALARY)[0]
+        assert event.data == {'payment_period': 15, 'salary': 3000.0}
+
+    def test_iter_calculations_flushes_at_end(self):
+        flushed = []
+
+        class Sink(CollectingSink):
+            def flush(self):
+                flushed.append(len(self.events))
+
+        sink = Sink()
+        list(iter_calculations(progress=sink, **PARAMS))
+        assert flushed == [len(sink.events)]
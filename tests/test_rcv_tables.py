@@ -0,0 +1,79 @@
+import functools
+import itertools
+import numpy as np
+import pytest
+from payroll_calculator import parameters
+from payroll_calculator.parameters import Parameters
+from payroll_calculator.processors.calculator import iter_calculations, process_multiple_calculations
+from payroll_calculator.rcv import RCV
+from payroll_calculator.rcv_tables import compiled_rcv_tables, get_compiled_rcv_table, severance_and_old_age_by_year
+
+
+def linear_scan(table, wage):
+    for range_data in table:
+        if range_data['lower_limit'] <= wage <= range_data['upper_limit']:
+            return range_data['percentage']
+    return table[-1]['percentage']
+
+
+def sample_wages(table):
+    limits = [limit for row in table for limit in (row['lower_limit'], row['upper_limit'])]
+    nearby = [limit + delta for limit in limits if limit != float('inf') for delta in (-0.005, 0.005)]
+    return limits + nearby + list(np.linspace(-5, 600, 2001)) + [0, 0.005, 282.9, 1e6]
+
+
+@pytest.fixture
+def build_inputs(build_inputs):
+    return functools.partial(
+        build_inputs,
+        salaries=[278.80, 350.0, 812.45, 1500.0], payment_periods=15, other_perceptions=0,
+    )
+
+
+class TestCompiledRcvTable:
+    @pytest.mark.parametrize("year", sorted(severance_and_old_age_by_year))
+    def test_matches_linear_scan(self, year):
+        table = severance_and_old_age_by_year[year]
+        compiled = compiled_rcv_tables[year]
+        wages = sample_wages(table)
+        expected = [linear_scan(table, wage) for wage in wages]
+        assert [compiled.rate(wage) for wage in wages] == expected
+        assert compiled.rates(wages).tolist() == expected
+
+    def test_unknown_year(self):
+        with pytest.raises(KeyError):
+            get_compiled_rcv_table(1999)
+
+    def test_explicit_year(self):
+        assert Parameters.get_retirement_percentage(500.0, 2023) == 0.04241
+        assert Parameters.get_retirement_percentage(500.0, '2030') == 0.11875
+        assert RCV(500.0, 15, year=2024).get_retirement_percentage() == 0.05331
+
+
+class TestRcvYearPinning:
+    def test_year_changes_results(self, build_inputs):
+        rows_2024 = process_multiple_calculations(rcv_year=2024, **build_inputs())
+        rows_2030 = process_multiple_calculations(rcv_year=2030, **build_inputs())
+        assert rows_2024[-1]['rcv_employer'] < rows_2030[-1]['rcv_employer']
+
+    @pytest.mark.parametrize("vectorized", [False, True])
+    def test_vectorized_uses_same_year(self, vectorized, build_inputs):
+        expected = process_multiple_calculations(rcv_year=2027, **build_inputs())
+        rows = process_multiple_calculations(rcv_year=2027, vectorized=vectorized, **build_inputs())
+        assert [row['rcv_employer'] for row in rows] == pytest.approx([row['rcv_employer'] for row in expected])
+
+    def test_year_resolved_once_per_run(self, monkeypatch, build_inputs):
+        # Un reloj que avanza un año en cada consulta, como una corrida que cruza el 31 de diciembre
+        years = itertools.count(2024)
+
+        class AdvancingClock:
+            @staticmethod
+            def now():
+                return type('Now', (), {'year': next(years)})()
+
+        monkeypatch.setattr(parameters, 'datetime', AdvancingClock)
+        rows = list(iter_calculations(**build_inputs()))
+
+        pinned = process_multiple_calculations(rcv_year=2024, **build_inputs())
+        assert [row['rcv_employer'] for row in rows] == [row['rcv_employer'] for row in pinned]
+        assert next(years) == 2025
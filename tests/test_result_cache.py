@@ -0,0 +1,142 @@
+import functools
+import sqlite3
+import pytest
+from payroll_calculator.processors.calculator import process_multiple_calculations
+from payroll_calculator.processors.result_cache import ENGINE_VERSION, ResultCache, hash_row_key, main
+from payroll_calculator.parameter_set import ParameterSet
+
+
+@pytest.fixture
+def build_inputs(build_inputs):
+    return functools.partial(
+        build_inputs,
+        salaries=[278.80, 350.0, 0, 812.45, 350.0, 1500.0], payment_periods=15,
+        other_perceptions=[0, 100.0, 0, 0, 100.0, 0], rcv_year=2025,
+    )
+
+
+@pytest.fixture
+def cache_path(tmp_path):
+    return str(tmp_path / 'results.sqlite')
+
+
+class TestResultCache:
+    def test_wal_mode(self, cache_path):
+        with ResultCache(cache_path):
+            pass
+        connection = sqlite3.connect(cache_path)
+        assert connection.execute("PRAGMA journal_mode").fetchone()[0] == 'wal'
+        connection.close()
+
+    def test_put_and_get(self, cache_path):
+        with ResultCache(cache_path) as cache:
+            cache.put_many('p', [('a', {'x': 1.5, 'y': None}), ('b', {'x': 2})])
+            assert cache.get_many('p', ['a', 'b', 'c']) == {'a': {'x': 1.5, 'y': None}, 'b': {'x': 2}}
+            assert cache.get_many('other', ['a']) == {}
+            assert cache.stats()['hits'] == 2 and cache.stats()['misses'] == 2
+
+    def test_lru_eviction(self, cache_path):
+        with ResultCache(cache_path, max_rows=2) as cache:
+            cache.put_many('p', [('a', {'x': 1})])
+            cache.put_many('p', [('b', {'x': 2})])
+            cache.get_many('p', ['a'])
+            cache.put_many('p', [('c', {'x': 3})])
+            assert len(cache) == 2
+            assert set(cache.get_many('p', ['a', 'b', 'c'])) == {'a', 'c'}
+            assert cache.evictions == 1
+
+    def test_row_count_is_kept_in_cache_info(self, cache_path):
+        def count_rows():
+            connection = sqlite3.connect(cache_path)
+            try:
+                return connection.execute("SELECT COUNT(*) FROM row_results").fetchone()[0]
+            finally:
+                connection.close()
+
+        with ResultCache(cache_path, max_rows=3) as cache:
+            cache.put_many('p', [('a', {'x': 1}), ('b', {'x': 2})])
+            # Reemplazar una fila no cambia la cuenta
+            cache.put_many('p', [('a', {'x': 10}), ('c', {'x': 3})])
+            assert len(cache) == count_rows() == 3
+            assert cache.get_many('p', ['a'])['a'] == {'x': 10}
+            cache.put_many('p', [('d', {'x': 4}), ('e', {'x': 5})])
+            assert len(cache) == count_rows() == 3 and cache.evictions == 2
+
+        # Una base sin la cuenta (versiones anteriores) la calcula al abrirse
+        connection = sqlite3.connect(cache_path)
+        with connection:
+            connection.execute("DELETE FROM cache_info WHERE name = 'row_count'")
+        connection.close()
+        with ResultCache(cache_path, max_rows=3) as cache:
+            assert len(cache) == 3
+
+    def test_clear_command(self, cache_path, capsys):
+        with ResultCache(cache_path) as cache:
+            cache.put_many('p', [('a', {'x': 1})])
+        assert main(['clear', cache_path]) == 0
+        assert '1 rows removed' in capsys.readouterr().out
+        with ResultCache(cache_path) as cache:
+            assert len(cache) == 0
+
+    def test_other_engine_version_is_discarded(self, cache_path):
+        with ResultCache(cache_path, engine_version='0.0.1/1') as cache:
+            cache.put_many('p', [('a', {'x': 1}), ('b', {'x': 2})])
+        with ResultCache(cache_path, engine_version='0.0.1/1') as cache:
+            assert len(cache) == 2 and cache.discarded == 0
+        with ResultCache(cache_path) as cache:
+            assert len(cache) == 0 and cache.discarded == 2
+            assert cache.stats()['engine_version'] == ENGINE_VERSION
+
+    def test_hash_row_key_is_stable(self):
+        assert hash_row_key(((float, 1.5), (int, 15))) == hash_row_key(((float, 1.5), (int, 15)))
+        assert hash_row_key(((float, 15.0),)) != hash_row_key(((int, 15),))
+
+
+class TestCachedRuns:
+    def test_warm_run_matches_cold_run(self, cache_path, build_inputs):
+        params = build_inputs()
+        expected = process_multiple_calculations(**params)
+        with ResultCache(cache_path) as cache:
+            assert process_multiple_calculations(result_cache=cache, **params) == expected
+            # 5 filas válidas, 4 distintas
+            assert len(cache) == 4
+
+        with ResultCache(cache_path) as cache:
+            warm = process_multiple_calculations(result_cache=cache, **params)
+            assert warm == expected
+            assert cache.stats()['misses'] == 0
+            warm[1]['saving_amount'] = -1
+            assert warm[3]['saving_amount'] != -1
+
+    def test_only_changed_rows_are_computed(self, cache_path, build_inputs):
+        params = build_inputs()
+        with ResultCache(cache_path) as cache:
+            process_multiple_calculations(result_cache=cache, **params)
+            changed = build_inputs(salaries=[278.80, 350.0, 0, 900.0, 350.0, 1500.0])
+            misses = cache.misses
+            rows = process_multiple_calculations(result_cache=cache, **changed)
+            assert cache.misses - misses == 1
+            assert rows == process_multiple_calculations(**changed)
+
+    def test_parameters_and_options_are_part_of_key(self, cache_path, build_inputs):
+        params = build_inputs()
+        with ResultCache(cache_path) as cache:
+            process_multiple_calculations(result_cache=cache, **params)
+            other_commission = process_multiple_calculations(result_cache=cache, **dict(params, commission_percentage_dsi=0.05))
+            assert other_commission == process_multiple_calculations(**dict(params, commission_percentage_dsi=0.05))
+
+            parameters = ParameterSet.from_parameters(rcv_year=2025).replace(smg=315.04)
+            other_parameters = process_multiple_calculations(result_cache=cache, parameters=parameters, **params)
+            assert other_parameters == process_multiple_calculations(parameters=parameters, **params)
+            assert cache.stats()['hits'] == 0
+
+    def test_threads(self, cache_path, build_inputs):
+        params = build_inputs()
+        with ResultCache(cache_path) as cache:
+            rows = process_multiple_calculations(result_cache=cache, threads=3, **params)
+        assert rows == process_multiple_calculations(**params)
+
+    def test_workers_are_rejected(self, cache_path, build_inputs):
+        with ResultCache(cache_path) as cache:
+            with pytest.raises(ValueError, match='workers'):
+                process_multiple_calculations(result_cache=cache, workers=2, **build_inputs())
@@ -0,0 +1,62 @@
+import functools
+import numpy as np
+import pytest
+from payroll_calculator.processors.calculator import process_multiple_calculations
+from payroll_calculator.results import PayrollResults
+from payroll_calculator.totals import TotalCalculator
+
+
+@pytest.fixture
+def build_inputs(build_inputs):
+    return functools.partial(
+        build_inputs,
+        commissions_and_bonus_for_isr=[None, 0, None, 300.0, None, None, None],
+    )
+
+
+class TestPayrollResults:
+    @pytest.mark.parametrize("vectorized", [False, True])
+    def test_to_dicts_matches_row_dicts(self, vectorized, build_inputs):
+        params = build_inputs()
+        expected = process_multiple_calculations(vectorized=vectorized, **params)
+        results = process_multiple_calculations(vectorized=vectorized, as_results=True, **params)
+        assert isinstance(results, PayrollResults)
+        assert len(results) == len(expected)
+        assert results.to_dicts() == expected
+
+    def test_optional_columns_use_masks(self, build_inputs):
+        results = process_multiple_calculations(as_results=True, **build_inputs())
+        mask = results.valid('employer_contributions')
+        # Solo las filas con salario completo menor o igual al SMG tienen aportaciones patronales
+        assert mask.tolist() == [row['base_salary'] <= 278.80 * row['payment_period'] for row in results]
+        assert results.column('suggested_total_social_cost').dtype == np.int64
+
+    def test_row_views_behave_like_dicts(self, build_inputs):
+        expected = process_multiple_calculations(**build_inputs())
+        results = PayrollResults.from_rows(expected)
+        for row, expected_row in zip(results, expected):
+            assert dict(row) == expected_row
+            assert ('employer_contributions' in row) == ('employer_contributions' in expected_row)
+            assert row.get('employer_contributions', 0) == expected_row.get('employer_contributions', 0)
+        assert results[-1]['base_salary'] == expected[-1]['base_salary']
+        with pytest.raises(IndexError):
+            results[len(results)]
+
+    def test_none_and_absent_keys_round_trip(self):
+        rows = [{'a': 1.5, 'b': None}, {'a': 2.5, 'b': 3.0}, {'a': 4.0}, {'b': None, 'a': 5.0}]
+        results = PayrollResults.from_rows(rows)
+        assert results.to_dicts() == rows
+        assert [dict(row) for row in results] == rows
+        assert 'b' not in results[2] and results[3]['b'] is None
+        assert results.sum('b') == 3.0
+        assert results.sum('missing') == 0
+
+    def test_totals_accept_results(self, build_inputs):
+        rows = process_multiple_calculations(**build_inputs())
+        results = PayrollResults.from_rows(rows)
+        assert TotalCalculator.calculate_traditional_scheme_totals(results) == TotalCalculator.calculate_traditional_scheme_totals(rows)
+        assert TotalCalculator.calculate_isr_totals(results) == TotalCalculator.calculate_isr_totals(rows)
+
+    def test_arrays_use_less_memory_than_dicts(self, build_inputs):
+        results = process_multiple_calculations(as_results=True, vectorized=True, **build_inputs())
+        assert results.nbytes() < len(results) * len(results.names()) * 9
@@ -0,0 +1,110 @@
+import functools
+import pickle
+import numpy as np
+import pytest
+from payroll_calculator.parameter_set import ParameterSet
+from payroll_calculator.processors.calculator import (
+    build_row_options, calculate_row, iter_calculations, process_multiple_calculations, row_input_key,
+)
+from payroll_calculator.processors.row_cache import RowCache, normalize_value
+
+
+@pytest.fixture
+def build_inputs(build_inputs):
+    return functools.partial(
+        build_inputs,
+        # Nómina repetitiva: tres niveles de tabulador
+        salaries=[278.80, 350.0, 278.80, 812.45, 350.0, 278.80, 812.45, 278.80], payment_periods=15,
+        other_perceptions=0, rcv_year=2025,
+    )
+
+
+class TestRowCache:
+    def test_lru_eviction_and_counters(self):
+        cache = RowCache(maxsize=2)
+        cache.put('a', {'value': 1})
+        cache.put('b', {'value': 2})
+        assert cache.get('a') == {'value': 1}
+        cache.put('c', {'value': 3})
+        # 'b' era la menos usada recientemente
+        assert cache.get('b') is None
+        assert cache.get('c') == {'value': 3}
+        assert cache.stats() == {'hits': 2, 'misses': 1, 'evictions': 1, 'size': 2, 'maxsize': 2, 'hit_rate': 2 / 3}
+
+        cache.clear()
+        assert len(cache) == 0 and cache.stats()['hits'] == 0
+
+    def test_returns_copies(self):
+        cache = RowCache()
+        row = {'value': 1}
+        cache.put('a', row)
+        row['value'] = 2
+        cached = cache.get('a')
+        cached['value'] = 3
+        assert cache.get('a') == {'value': 1}
+
+    def test_normalize_value(self):
+        assert normalize_value(np.float64(1.5)) == normalize_value(1.5)
+        assert normalize_value(15) != normalize_value(15.0)
+        assert normalize_value(float('nan')) == normalize_value(np.nan)
+
+    def test_pickle_creates_empty_cache(self):
+        cache = RowCache(maxsize=8)
+        cache.put('a', {'value': 1})
+        copy = pickle.loads(pickle.dumps(cache))
+        assert copy.maxsize == 8 and len(copy) == 0
+
+    def test_invalid_maxsize(self):
+        with pytest.raises(ValueError):
+            RowCache(maxsize=0)
+
+
+class TestCachedCalculations:
+    def test_matches_uncached_results(self, build_inputs):
+        params = build_inputs()
+        cache = RowCache()
+        assert process_multiple_calculations(row_cache=cache, **params) == process_multiple_calculations(**params)
+        assert cache.stats()['misses'] == 3
+        assert cache.stats()['hits'] == 5
+
+    def test_rows_are_independent_copies(self, build_inputs):
+        rows = process_multiple_calculations(row_cache=RowCache(), **build_inputs())
+        rows[0]['saving_amount'] = -1
+        assert rows[2]['saving_amount'] != -1
+
+    def test_key_includes_options_and_parameters(self, build_inputs):
+        cache = RowCache()
+        params = build_inputs(salaries=[350.0], payment_periods=[15], integration_factors=[1.0493], other_perceptions=[0])
+        first = process_multiple_calculations(row_cache=cache, **params)
+        other_risk = process_multiple_calculations(row_cache=cache, **dict(params, risk_class='V'))
+        other_parameters = process_multiple_calculations(row_cache=cache, parameters=ParameterSet.from_parameters(rcv_year=2025).replace(smg=315.04), **params)
+        assert cache.stats()['hits'] == 0 and cache.stats()['misses'] == 3
+        assert first != other_risk and first != other_parameters
+
+        assert process_multiple_calculations(row_cache=cache, **params) == first
+        assert cache.stats()['hits'] == 1
+
+    def test_key_matches_row_input_key(self, build_inputs):
+        row_options = build_row_options(**build_inputs())
+        cache = RowCache()
+        calculate_row(0, **dict(row_options, row_cache=cache))
+        # Sin ParameterSet resuelto (llamada directa) la llave es la misma
+        calculate_row(0, **dict(row_options, row_cache=cache, parameters=None))
+        [key] = cache._rows
+        assert key == row_input_key(0, row_options) + (row_options['parameters'].content_hash,)
+        assert cache.stats()['hits'] == 1
+
+    def test_bounded_cache_and_streaming(self, build_inputs):
+        params = build_inputs()
+        cache = RowCache(maxsize=1)
+        assert list(iter_calculations(row_cache=cache, **params)) == process_multiple_calculations(**params)
+        assert len(cache) == 1
+        assert cache.evictions > 0
+
+    def test_threads_share_cache(self, build_inputs):
+        params = build_inputs()
+        cache = RowCache()
+        rows = process_multiple_calculations(row_cache=cache, threads=4, **params)
+        assert rows == process_multiple_calculations(**params)
+        stats = cache.stats()
+        assert stats['hits'] + stats['misses'] == len(params['salaries'])
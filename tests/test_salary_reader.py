@@ -0,0 +1,106 @@
+import numpy as np
+import pytest
+from payroll_calculator.readers import read_salary_columns, load_salary_columns, calculation_arguments
+from payroll_calculator.processors.calculator import process_multiple_calculations, parse_salaries_input
+from payroll_calculator.processors.batch import process_batch_calculations
+
+
+@pytest.fixture
+def csv_file(tmp_path):
+    path = tmp_path / "nomina.csv"
+    path.write_text(
+        "salario_diario,salario_periodo,periodo_pago,factor_integracion,productividad,salario_neto,otras_percepciones,comision_bono,notas\n"
+        "278.80,4182,15,1.0493,,,0,,a\n"
+        "350,\"5,300.00\",15,,1200,,500,,b\n"
+        "\n"
+        "812.45,,7,1.0452,0,6000,0,300,c\n"
+    )
+    return str(path)
+
+
+class TestReadSalaryColumns:
+    def test_reads_typed_columns_from_header(self, csv_file):
+        columns = load_salary_columns(csv_file)
+        assert set(columns) == {'daily_salary', 'period_salary', 'payment_period', 'integration_factor',
+                                'productivity', 'net_salary', 'other_perception', 'commission_and_bonus'}
+        assert columns['daily_salary'].tolist() == [278.80, 350.0, 812.45]
+        assert columns['period_salary'][1] == 5300.0
+        assert columns['payment_period'].dtype == np.int64
+        assert columns['payment_period'].tolist() == [15, 15, 7]
+        assert np.isnan(columns['integration_factor'][1])
+
+    def test_reads_in_chunks(self, csv_file):
+        chunks = list(read_salary_columns(csv_file, chunk_size=2))
+        assert [len(chunk['daily_salary']) for chunk in chunks] == [2, 1]
+
+    def test_tsv_without_header_uses_column_order(self, tmp_path):
+        path = tmp_path / "salarios.tsv"
+        path.write_text("278.80\t4182\t15\n350\t5250\t15\n")
+        columns = load_salary_columns(str(path))
+        assert list(columns) == ['daily_salary', 'period_salary', 'payment_period']
+        assert columns['period_salary'].tolist() == [4182.0, 5250.0]
+
+    def test_invalid_values_become_nan(self, tmp_path, capsys, caplog):
+        path = tmp_path / "salarios.csv"
+        path.write_text("salary\n278.80\nabc\n")
+        columns = load_salary_columns(str(path))
+        assert np.isnan(columns['daily_salary'][1])
+        assert "invalid daily_salary value at line 3: abc" in caplog.text
+        assert capsys.readouterr().out == ""
+
+    def test_ambiguous_comma_is_rejected(self, tmp_path):
+        path = tmp_path / "salarios.tsv"
+        path.write_text("salario\tsalario_periodo\n278.80\t1,234.50\n350\t1234,56\n")
+        columns = load_salary_columns(str(path))
+        assert columns['period_salary'][0] == 1234.5
+        assert np.isnan(columns['period_salary'][1])
+
+    def test_missing_salary_column_raises(self, tmp_path):
+        path = tmp_path / "salarios.csv"
+        path.write_text("nombre,puesto\nAna,Analista\n")
+        with pytest.raises(ValueError):
+            load_salary_columns(str(path))
+
+
+class TestCalculationArguments:
+    def test_fills_defaults_and_feeds_calculators(self, csv_file):
+        arguments = calculation_arguments(load_salary_columns(csv_file))
+        assert arguments['integration_factors'].tolist() == [1.0493, 1.0493, 1.0452]
+        assert arguments['period_salaries'].tolist() == [4182.0, 5300.0, 812.45 * 7]
+        assert arguments['productivities'].tolist() == [0.0, 1200.0, 0.0]
+        params = dict(arguments, periodicity=15, use_increment_percentage=True, risk_class='I', smg_multiplier=1,
+                      commission_percentage_dsi=0.03, count_minimum_salary=1, stricted_mode=False, imss_breakdown=True)
+        columns, _ = process_batch_calculations(**params)
+        rows = process_multiple_calculations(**params)
+        assert columns['base_salary'].tolist() == [row['base_salary'] for row in rows]
+
+    def test_missing_optional_columns_are_none(self, tmp_path):
+        path = tmp_path / "salarios.csv"
+        path.write_text("278.80\n350\n")
+        arguments = calculation_arguments(load_salary_columns(str(path)), payment_period=7)
+        assert arguments['payment_periods'].tolist() == [7, 7]
+        assert arguments['period_salaries'] is None
+        assert arguments['net_salaries'] is None
+
+
+class TestParseSalariesInput:
+    def test_relative_file_path(self, tmp_path, monkeypatch):
+        (tmp_path / "salarios.txt").write_text("5000.50\n6000.75\n\n7500.25\n")
+        monkeypatch.chdir(tmp_path)
+        assert parse_salaries_input("salarios.txt") == [5000.50, 6000.75, 7500.25]
+
+    def test_legacy_comma_separated_file(self, tmp_path):
+        path = tmp_path / "salarios.txt"
+        path.write_text("300.5,400,500\n600\n")
+        assert parse_salaries_input(str(path)) == [300.5, 400.0, 500.0, 600.0]
+
+    def test_legacy_bracketed_file(self, tmp_path):
+        path = tmp_path / "salarios.txt"
+        path.write_text("[300.5, 400, 500]\n")
+        assert parse_salaries_input(str(path)) == [300.5, 400.0, 500.0]
+
+    def test_file_with_header_uses_reader(self, csv_file):
+        assert parse_salaries_input(csv_file) == [278.80, 350.0, 812.45]
+
+    def test_direct_input(self):
+        assert parse_salaries_input("[5000.50, 6000.75, abc]") == [5000.50, 6000.75]
@@ -0,0 +1,12 @@
+import numpy as np
+import pytest
+from payroll_calculator.serialization import dumps_row, json_default
+
+
+class TestJsonDefault:
+    def test_numpy_scalars(self):
+        assert dumps_row({'salario': np.float64(350.5), 'días': np.int64(15)}) == '{"salario": 350.5, "días": 15}'
+
+    def test_unknown_values_raise(self):
+        with pytest.raises(TypeError):
+            json_default(object())
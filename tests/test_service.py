@@ -0,0 +1,186 @@
+import asyncio
+import json
+import pytest
+from payroll_calculator.cli import DEFAULT_OPTIONS
+from payroll_calculator.service import (
+    DEFAULT_BACKLOG, InvalidQuote, Overloaded, QuoteBatcher, QuoteService, format_stats, parse_quote,
+)
+from payroll_calculator.streaming import calculate_records
+
+
+@pytest.fixture
+def options():
+    return dict(DEFAULT_OPTIONS, rcv_year=2025)
+
+
+async def request(port, method, path, payload=None):
+    """Solicitud HTTP/1.1 mínima; regresa (status, cuerpo JSON, encabezados)"""
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    body = b'' if payload is None else (payload if isinstance(payload, bytes) else json.dumps(payload).encode())
+    writer.write(f"{method} {path} HTTP/1.1\r\nHost: localhost\r\nConnection: close\r\n"
+                 f"Content-Length: {len(body)}\r\n\r\n".encode() + body)
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    head, _, content = response.partition(b'\r\n\r\n')
+    lines = head.decode().split('\r\n')
+    headers = dict(line.split(': ', 1) for line in lines[1:])
+    return int(lines[0].split()[1]), json.loads(content), headers
+
+
+def run_service(options, scenario, **batcher_options):
+    async def main():
+        service = QuoteService(options, **batcher_options)
+        await service.start('127.0.0.1', 0)
+        try:
+            return await scenario(service)
+        finally:
+            await service.close()
+    return asyncio.run(main())
+
+
+class TestQuoteService:
+    def test_concurrent_quotes_are_batched(self, options):
+        quotes = [{'salary': 300 + i, 'payment_period': 15} for i in range(40)]
+
+        async def scenario(service):
+            responses = await asyncio.gather(*(request(service.port, 'POST', '/quote', quote) for quote in quotes))
+            return responses, service.stats()
+
+        responses, stats = run_service(options, scenario, max_delay=0.05)
+        expected = calculate_records([{'daily_salary': float(quote['salary']), 'payment_period': 15.0} for quote in quotes],
+                                     options)
+        assert [status for status, _, _ in responses] == [200] * 40
+        assert [body for _, body, _ in responses] == json.loads(json.dumps(expected))
+        assert stats['requests'] == 40
+        assert stats['batches'] < 40
+        assert stats['latency']['p50_seconds'] is not None and stats['latency']['p99_seconds'] is not None
+
+    def test_batched_quotes_match_unbatched(self, options):
+        # Modo normal, de porcentaje y sin salario en el mismo lote
+        quotes = [{'salary': 400}, {'salary': 500, 'productivity': 1200}, {'productivity': 900},
+                  {'salary': 350, 'dias': 7, 'mode': 'pure'}, {'salary': 600}]
+
+        async def batched(service):
+            return await asyncio.gather(*(request(service.port, 'POST', '/quote', quote) for quote in quotes))
+
+        async def one_by_one(service):
+            return [await request(service.port, 'POST', '/quote', quote) for quote in quotes]
+
+        together = run_service(options, batched, max_delay=0.2)
+        separate = run_service(options, one_by_one, max_delay=0)
+        assert [status for status, _, _ in together] == [200] * len(quotes)
+        assert [body for _, body, _ in together] == [body for _, body, _ in separate]
+        assert together[0][1]['productivity'] != 0
+
+    def test_identical_requests_are_deduplicated(self, options):
+        async def scenario(service):
+            responses = await asyncio.gather(*(request(service.port, 'POST', '/quote', {'salario': 500})
+                                               for _ in range(10)))
+            return responses, service.stats()
+
+        responses, stats = run_service(options, scenario, max_delay=0.05)
+        assert len({json.dumps(body) for _, body, _ in responses}) == 1
+        assert stats['deduplicated'] == 9
+        assert stats['mean_batch_size'] == 1
+
+    def test_vectorized_matches_object_engine(self, options):
+        quote = {'salary': 450, 'payment_period': 7, 'other_perception': 500, 'mode': 'pure'}
+
+        async def scenario(service):
+            return await request(service.port, 'POST', '/quote', quote)
+
+        _, vectorized, _ = run_service(options, scenario, vectorized=True)
+        _, objects, _ = run_service(options, scenario)
+        assert vectorized.keys() == objects.keys()
+        for key, value in objects.items():
+            assert vectorized[key] == pytest.approx(value, abs=1e-6)
+
+    def test_listen_backlog(self, options, monkeypatch):
+        backlogs = []
+        start_server = asyncio.start_server
+
+        async def recording_start_server(*args, **kwargs):
+            backlogs.append(kwargs['backlog'])
+            return await start_server(*args, **kwargs)
+
+        async def scenario(service):
+            return await request(service.port, 'GET', '/health')
+
+        monkeypatch.setattr(asyncio, 'start_server', recording_start_server)
+        status, _, _ = run_service(options, scenario)
+        assert status == 200
+        assert backlogs == [DEFAULT_BACKLOG] and DEFAULT_BACKLOG > 100
+
+    def test_errors(self, options):
+        async def scenario(service):
+            return [
+                await request(service.port, 'POST', '/quote', {'salary': 0}),
+                await request(service.port, 'POST', '/quote', b'{nope'),
+                await request(service.port, 'POST', '/quote', {'salary': 300, 'mode': 'otro'}),
+                await request(service.port, 'GET', '/quote'),
+                await request(service.port, 'GET', '/missing'),
+                await request(service.port, 'GET', '/health'),
+            ]
+
+        statuses = [status for status, _, _ in run_service(options, scenario)]
+        assert statuses == [422, 400, 400, 405, 404, 200]
+
+    def test_backpressure(self, options):
+        async def scenario(service):
+            first = asyncio.ensure_future(request(service.port, 'POST', '/quote', {'salary': 300}))
+            await asyncio.sleep(0.2)
+            second = await request(service.port, 'POST', '/quote', {'salary': 400})
+            return await first, second, service.stats()
+
+        first, second, stats = run_service(options, scenario, max_delay=0.5, max_pending=1)
+        assert first[0] == 200
+        assert second[0] == 503 and second[2]['Retry-After'] == '1'
+        assert stats['rejected'] == 1
+        assert 'rejected=1' in format_stats(stats)
+
+    def test_keep_alive(self, options):
+        async def scenario(service):
+            reader, writer = await asyncio.open_connection('127.0.0.1', service.port)
+            statuses = []
+            for salary in (300, 400):
+                body = json.dumps({'salary': salary}).encode()
+                writer.write(f"POST /quote HTTP/1.1\r\nContent-Length: {len(body)}\r\n\r\n".encode() + body)
+                status = await reader.readline()
+                headers = {}
+                while (line := await reader.readline()) != b'\r\n':
+                    name, _, value = line.decode().partition(':')
+                    headers[name.lower()] = value.strip()
+                await reader.readexactly(int(headers['content-length']))
+                statuses.append(int(status.split()[1]))
+            writer.close()
+            return statuses
+
+        assert run_service(options, scenario) == [200, 200]
+
+
+class TestQuoteBatcher:
+    def test_rejects_when_full(self, options):
+        async def scenario():
+            batcher = QuoteBatcher(options, max_delay=0.05, max_pending=1)
+            first = asyncio.ensure_future(batcher.quote({'daily_salary': 300.0}))
+            await asyncio.sleep(0)
+            with pytest.raises(Overloaded):
+                await batcher.quote({'daily_salary': 400.0})
+            # Una cotización idéntica a la pendiente no cuenta contra el límite
+            duplicate = await batcher.quote({'daily_salary': 300.0})
+            assert duplicate == await first
+            batcher.close()
+
+        asyncio.run(scenario())
+
+
+class TestParseQuote:
+    def test_splits_values_and_options(self):
+        values, overrides = parse_quote(b'{"salario": 500, "dias": 7, "mode": "pure", "imss_breakdown": false}')
+        assert values == {'daily_salary': 500.0, 'payment_period': 7.0}
+        assert overrides == (('imss_breakdown', False), ('mode', 'pure'))
+
+    def test_unknown_keys(self):
+        with pytest.raises(InvalidQuote, match='llaves desconocidas: foo'):
+            parse_quote(b'{"salary": 500, "foo": 1}')
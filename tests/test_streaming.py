@@ -0,0 +1,130 @@
+import io
+import json
+import threading
+import pytest
+from payroll_calculator.cli import DEFAULT_OPTIONS, iter_file_rows
+from payroll_calculator.streaming import RecordParser, calculate_records, iter_micro_batches, stream_calculations
+
+
+@pytest.fixture
+def options():
+    return dict(DEFAULT_OPTIONS, rcv_year=2025)
+
+
+def run(text, options, **kwargs):
+    output = io.StringIO()
+    counts = stream_calculations(io.StringIO(text), output, options, **kwargs)
+    return [json.loads(line) for line in output.getvalue().splitlines()], counts
+
+
+class TestStreamCalculations:
+    def test_one_line_per_input_row(self, options):
+        lines, counts = run('salario,dias\n300,15\n0,15\nabc,15\n\n1200,30\n', options, batch_size=2)
+        assert counts == (2, 2)
+        assert [line.get('base_salary') for line in lines] == [4500.0, None, None, 36000.0]
+        assert lines[1] == {'line': 3, 'error': 'salario 0, fila omitida'}
+        assert lines[2]['line'] == 4
+
+    def test_matches_file_calculation(self, options, tmp_path):
+        text = 'salario,dias,otras_percepciones\n300,15,0\n450,7,500\n1200,30,0\n278.8,15,0\n'
+        path = tmp_path / 'nomina.csv'
+        path.write_text(text)
+        expected = [row for chunk in iter_file_rows(str(path), options) for row in chunk]
+        lines, _ = run(text, options, batch_size=3)
+        assert lines == json.loads(json.dumps(expected))
+
+    def test_jsonl_input(self, options):
+        text = '{"salario": 500}\n[1]\n{"salary": 800, "payment_period": 7, "otra": "x"}\n{"dias": 15}\n'
+        lines, counts = run(text, options)
+        assert counts == (2, 2)
+        assert lines[0]['base_salary'] == 7500.0
+        assert lines[1] == {'line': 2, 'error': 'se esperaba un objeto JSON'}
+        assert lines[2]['base_salary'] == 5600.0
+        assert lines[3]['line'] == 4
+
+    def test_rows_do_not_depend_on_their_batch(self, options):
+        # Modo normal, de porcentaje (salario y productividad) y sin salario en el mismo lote
+        text = ('{"salary": 400}\n{"salary": 500, "productivity": 1200}\n{"productivity": 900}\n'
+                '{"salary": 350, "dias": 7}\n{"salary": 600}\n')
+        batched, _ = run(text, options, batch_size=256)
+        assert batched == run(text, options, batch_size=1)[0]
+        assert batched[0]['productivity'] != 0 and batched[0]['saving_amount'] != 0
+
+    @pytest.mark.parametrize('vectorized', [False, True])
+    def test_calculate_records_groups_by_columns(self, options, vectorized):
+        records = [{'daily_salary': 400.0}, {'daily_salary': 500.0, 'productivity': 1200.0},
+                   {'productivity': 900.0}, {'daily_salary': 0.0}, {'daily_salary': 600.0, 'productivity': 0.0}]
+        expected = [calculate_records([record], options, vectorized=vectorized)[0] for record in records]
+        assert calculate_records(records, options, vectorized=vectorized) == expected
+
+    def test_unexpected_row_error_does_not_stop_stream(self, options, monkeypatch):
+        from payroll_calculator.processors import calculator
+        calculate_row = calculator.calculate_row
+
+        def failing_row(i, **row_options):
+            if row_options['salaries_to_use'][i] == 450:
+                raise ZeroDivisionError('fila rota')
+            return calculate_row(i, **row_options)
+
+        monkeypatch.setattr(calculator, 'calculate_row', failing_row)
+        lines, counts = run('salario\n300\n450\n1200\n', options)
+        assert counts == (2, 1)
+        assert lines[1] == {'line': 3, 'error': 'ZeroDivisionError: fila rota'}
+        assert lines[2]['base_salary'] == 18000.0
+
+    def test_vectorized_matches_object_engine(self, options):
+        text = 'salario,dias,otras_percepciones\n300,15,0\n0,15,0\n450,7,500\nabc,15,0\n1200,30,0\n'
+        vectorized, counts = run(text, options, vectorized=True)
+        objects, _ = run(text, options)
+        assert counts == (3, 2)
+        assert [line.keys() for line in vectorized] == [line.keys() for line in objects]
+        for vectorized_line, object_line in zip(vectorized, objects):
+            for key, value in object_line.items():
+                assert vectorized_line[key] == pytest.approx(value, abs=1e-6)
+
+    def test_emits_before_input_ends(self, options):
+        release = threading.Event()
+        emitted = threading.Event()
+
+        class Output(io.StringIO):
+            def flush(self):
+                emitted.set()
+
+        def source():
+            yield 'salario\n'
+            yield '300\n'
+            # La entrada sigue abierta hasta que la salida del primer lote llegó
+            assert release.wait(5)
+            yield '400\n'
+
+        output = Output()
+        worker = threading.Thread(target=stream_calculations, args=(source(), output, options),
+                                  kwargs=dict(batch_size=100, max_delay=0.01))
+        worker.start()
+        assert emitted.wait(5)
+        assert len(output.getvalue().splitlines()) == 1
+        release.set()
+        worker.join(5)
+        assert len(output.getvalue().splitlines()) == 2
+
+
+class TestMicroBatches:
+    def test_batch_size_and_order(self):
+        batches = list(iter_micro_batches(iter(f'{i}\n' for i in range(10)), batch_size=4, max_delay=1))
+        assert [len(batch) for batch in batches] == [4, 4, 2]
+        assert [line for batch in batches for line in batch] == [f'{i}\n' for i in range(10)]
+
+    def test_read_errors_are_raised(self):
+        def source():
+            yield '1\n'
+            raise UnicodeDecodeError('utf-8', b'\xff', 0, 1, 'invalid start byte')
+
+        with pytest.raises(UnicodeDecodeError):
+            list(iter_micro_batches(source(), batch_size=10, max_delay=1))
+
+
+class TestRecordParser:
+    def test_headerless_csv_uses_column_order(self):
+        parser = RecordParser()
+        assert parser.parse('300;4500;15\n') == {'daily_salary': 300.0, 'period_salary': 4500.0, 'payment_period': 15.0}
+        assert parser.parse('\n') is None
@@ -0,0 +1,117 @@
+import functools
+import math
+import pytest
+from payroll_calculator.processors.calculator import iter_calculations, process_multiple_calculations
+from payroll_calculator.totals import ISR_COLUMNS, TotalCalculator, TotalsAccumulator
+
+
+@pytest.fixture
+def build_inputs(build_inputs):
+    return functools.partial(
+        build_inputs,
+        salaries=[278.80, 350.0, 0, 812.45, 1500.0, 4200.0, 95.0, 612.3, 2750.55],
+        payment_periods=[15, 15, 15, 7, 30, 15, 10, 15, 15],
+        other_perceptions=[0, 500.0, 0, 0, 250.0, 0, 0, 100.0, 0],
+    )
+
+
+def naive_totals(rows, pairs):
+    return {name: sum(row.get(column, 0) for row in rows) for name, column in pairs}
+
+
+class TestTotalsAccumulator:
+    def test_single_pass_matches_per_key_sums(self, build_inputs):
+        rows = process_multiple_calculations(**build_inputs())
+        accumulator = TotalsAccumulator.from_rows(rows)
+
+        imss = accumulator.imss_totals()
+        assert list(imss) == list(TotalCalculator.calculate_traditional_scheme_totals(rows))
+        for name, column in [('total_imss_employer', 'imss_employer_fee'), ('total_social_cost', 'suggested_total_social_cost')]:
+            assert imss[name] == pytest.approx(sum(row[column] for row in rows))
+
+        saving = accumulator.saving_totals()
+        assert saving['total_saving_amount'] == pytest.approx(sum(row['saving_amount'] for row in rows))
+        assert saving['avg_saving_percentage'] == pytest.approx(saving['total_saving_amount'] / saving['total_traditional_scheme'])
+        assert saving['total_other_perceptions'] == pytest.approx(850.0)
+
+    def test_merge_matches_serial_pass(self, build_inputs):
+        rows = process_multiple_calculations(**build_inputs())
+        serial = TotalsAccumulator.from_rows(rows)
+
+        left = TotalsAccumulator.from_rows(rows[:3])
+        middle = TotalsAccumulator.from_rows(rows[3:5])
+        right = TotalsAccumulator.from_rows(rows[5:])
+        merged = left.merge(middle).merge(right)
+
+        # Cada bloque se redondea por separado: los totales coinciden salvo en el último dígito
+        assert merged.count == serial.count
+        assert merged.imss_totals() == pytest.approx(serial.imss_totals())
+        assert merged.isr_totals() == pytest.approx(serial.isr_totals())
+        assert merged.saving_totals() == pytest.approx(serial.saving_totals())
+
+    def test_merge_into_empty_keeps_first_row_columns(self, build_inputs):
+        rows = process_multiple_calculations(**build_inputs())
+        merged = TotalsAccumulator().merge(TotalsAccumulator.from_rows(rows))
+        assert 'total_other_perceptions' in merged.saving_totals()
+
+    def test_streaming_chunks(self, build_inputs):
+        params = build_inputs()
+        rows = process_multiple_calculations(**params)
+        accumulator = TotalsAccumulator()
+        for row in iter_calculations(**params):
+            accumulator.add(row)
+        assert accumulator.saving_totals() == TotalsAccumulator.from_rows(rows).saving_totals()
+
+        chunked = TotalsAccumulator()
+        for chunk in iter_calculations(chunk_size=4, **params):
+            chunked.add_rows(chunk)
+        assert chunked.imss_totals() == pytest.approx(accumulator.imss_totals())
+
+    def test_compensated_summation(self):
+        rows = [{'saving_amount': value} for value in (1e16, 1.0, -1e16)] * 3
+        accumulator = TotalsAccumulator.from_rows(rows)
+        assert accumulator.total('saving_amount') == 3.0
+
+    def test_results_container(self, build_inputs):
+        params = build_inputs()
+        rows = process_multiple_calculations(**params)
+        results = process_multiple_calculations(as_results=True, **params)
+        expected = TotalsAccumulator.from_rows(rows)
+        accumulator = TotalsAccumulator.from_rows(results)
+        assert accumulator.count == len(rows)
+        assert accumulator.isr_totals() == pytest.approx(expected.isr_totals())
+        assert accumulator.saving_totals() == pytest.approx(expected.saving_totals())
+
+    def test_zero_denominators(self):
+        totals = TotalsAccumulator.from_rows([{'saving_amount': 10.0}]).saving_totals()
+        assert totals['avg_saving_percentage'] == 0.0
+        assert totals['avg_dsi_saving_percentage'] == 0.0
+
+    def test_empty_input(self):
+        totals = TotalCalculator.calculate_saving_totals([])
+        assert 'avg_saving_percentage' not in totals
+        assert totals['total_saving_amount'] == 0
+        assert 'first_tax_payroll_employer_dsi' not in TotalCalculator.calculate_isr_totals([])
+
+    def test_integer_columns_stay_int(self):
+        rows = [{'suggested_total_social_cost': 100, 'saving_amount': 1.5}, {'suggested_total_social_cost': 250, 'saving_amount': 0.0}]
+        accumulator = TotalsAccumulator.from_rows(rows)
+        assert accumulator.total('suggested_total_social_cost') == 350
+        assert type(accumulator.total('suggested_total_social_cost')) is int
+        assert type(accumulator.total('saving_amount')) is float
+        assert type(TotalCalculator.calculate_traditional_scheme_totals(rows)['total_social_cost']) is int
+
+    def test_chunk_sums_are_correctly_rounded(self):
+        values = [0.1 * index + 1e15 * (-1) ** index for index in range(1, 500)]
+        rows = [{'saving_amount': value} for value in values]
+        assert TotalsAccumulator.from_rows(rows).total('saving_amount') == math.fsum(values)
+        chunked = TotalsAccumulator()
+        for start in range(0, len(rows), 7):
+            chunked.merge(TotalsAccumulator.from_rows(rows[start:start + 7]))
+        assert chunked.total('saving_amount') == pytest.approx(math.fsum(values))
+
+    def test_section_sums_only_its_columns(self):
+        accumulator = TotalsAccumulator.from_rows([{'isr': 10.0, 'saving_amount': 5.0}], ISR_COLUMNS)
+        assert accumulator.isr_totals()['total_isr'] == 10.0
+        with pytest.raises(KeyError):
+            accumulator.total('saving_amount')
@@ -0,0 +1,80 @@
+import inspect
+import threading
+from unittest.mock import patch
+from payroll_calculator import tracing
+from payroll_calculator.employees import Employee
+from payroll_calculator.imss import IMSS
+from payroll_calculator.rcv import RCV
+
+
+class TestTracing:
+    def test_disabled_by_default_does_not_record(self):
+        tracing.clear_records()
+        with patch.object(tracing, 'enabled', False):
+            Employee(5000, 15)
+            RCV(300.0, 15)
+        assert list(tracing.records) == []
+
+    def test_disabled_does_not_inspect_frames(self):
+        with patch.object(tracing, 'enabled', False), patch.object(inspect, 'getframeinfo') as getframeinfo:
+            imss = IMSS(113.14, 5000, 333.33, 15, 1.0493)
+            imss.get_severance_and_old_age_employer()
+        getframeinfo.assert_not_called()
+
+    def test_context_manager_records_call_sites(self):
+        with tracing.trace_provenance() as call_sites:
+            Employee(5000, 15)
+        assert len(call_sites) == 1
+        assert call_sites[0].source == 'Employee'
+        assert call_sites[0].filename == __file__
+        assert call_sites[0].function == 'test_context_manager_records_call_sites'
+
+    def test_context_manager_restores_previous_state(self):
+        previous = tracing.enabled
+        with tracing.trace_provenance():
+            assert tracing.enabled is True
+        assert tracing.enabled == previous
+
+    def test_records_rcv_created_by_imss(self):
+        imss = IMSS(113.14, 5000, 333.33, 15, 1.0493)
+        with tracing.trace_provenance() as call_sites:
+            imss.get_severance_and_old_age_employer()
+        sources = [call_site.source for call_site in call_sites]
+        assert sources == ['IMSS._get_rcv', 'RCV']
+        assert call_sites[0].function == 'get_severance_and_old_age_employer'
+        assert call_sites[1].function == '_get_rcv'
+
+    def test_blocks_are_isolated_between_threads(self):
+        inside = threading.Event()
+        release = threading.Event()
+        other_sites = []
+
+        def other_thread():
+            with tracing.trace_provenance() as call_sites:
+                inside.set()
+                release.wait(5)
+                RCV(300.0, 15)
+            other_sites.extend(call_sites)
+
+        thread = threading.Thread(target=other_thread)
+        thread.start()
+        inside.wait(5)
+        with tracing.trace_provenance() as call_sites:
+            Employee(5000, 15)
+        release.set()
+        thread.join(5)
+        assert [call_site.source for call_site in call_sites] == ['Employee']
+        assert [call_site.source for call_site in other_sites] == ['RCV']
+
+    def test_global_records_are_bounded(self):
+        tracing.clear_records()
+        tracing.enable_tracing()
+        try:
+            for _ in range(tracing.MAX_RECORDS + 10):
+                Employee(5000, 15)
+        finally:
+            tracing.disable_tracing()
+        assert len(tracing.records) == tracing.MAX_RECORDS
+        tracing.clear_records()
+        Employee(5000, 15)
+        assert len(tracing.records) == 0